@@ -0,0 +1,294 @@
+"""
+Couche de calcul mémoïsée de l'interface Streamlit.
+
+Les calculs du moteur explotarget sont mis en cache avec st.cache_data. Les corps
+minéralisés sont passés dans un argument préfixé par "_", que Streamlit ne hache
+pas: la clé de cache est leur empreinte stable (explotarget.empreinte), calculée
+une seule fois par exécution de la page, plus les paramètres dont dépend chaque calcul.
+Les caches sont bornés en nombre d'entrées et en durée de vie.
+
+Les résultats par corps (estimation, plan de forage) sont évalués de façon
+incrémentale (explotarget.incremental): l'état de chaque calcul est conservé
+dans la session et seuls les corps ajoutés ou modifiés sont recalculés.
+
+Chaque session ouvre sa propre connexion au dépôt SQLite des scénarios,
+conservée dans son état de session.
+
+explotarget.figures (Plotly) n'est importé qu'au premier calcul de figure.
+"""
+import os
+
+import streamlit as st
+
+from explotarget import (
+    balayer_mailles,
+    classifier_blocs,
+    courbes_teneur_tonnage,
+    empreinte,
+    etat_vide,
+    evaluer,
+    facteurs_blocs,
+    interpoler_teneurs,
+    lire_composites,
+    mailles_balayees,
+    modele_blocs,
+    optimiser_plan,
+    recoupements_composites,
+    recoupements_plan,
+    sensibilite_corps,
+    simuler_campagne,
+    simuler_monte_carlo,
+    table_forages,
+    teneurs_lognormales,
+    tonnages_classes,
+    volumes_partages,
+)
+from explotarget.comparaison import evaluer_scenarios, tableau_comparaison
+from explotarget.depot import ouvrir_depot
+
+# Durée de vie des entrées en cache (secondes)
+CACHE_TTL = 3600
+
+# Nombre maximal d'entrées conservées par cache
+CACHE_MAX_RESULTATS = 64
+CACHE_MAX_MAILLAGES = 1024
+CACHE_MAX_FIGURES = 16
+CACHE_MAX_COMPOSITES = 4
+
+# Fichier de la base des scénarios (variable d'environnement EXPLOTARGET_DEPOT)
+CHEMIN_DEPOT = os.environ.get("EXPLOTARGET_DEPOT", "scenarios.sqlite")
+
+
+def depot_scenarios(chemin=CHEMIN_DEPOT):
+    """
+    Connexion de la session au dépôt des scénarios (voir explotarget.depot.ouvrir_depot).
+
+    Chaque session ouvre sa propre connexion: les transactions de deux sessions
+    ne s'entremêlent pas sur une connexion partagée (SQLite sérialise leurs écritures).
+    """
+    connexions = st.session_state.setdefault("connexions_depot", {})
+    if chemin not in connexions:
+        connexions[chemin] = ouvrir_depot(chemin)
+    return connexions[chemin]
+
+
+def evaluation_incrementale(calcul, corps_mineralises, **parametres):
+    """
+    Résultats par corps d'un calcul de explotarget.incremental.CALCULS, mis à jour de façon incrémentale.
+
+    L'état du calcul est conservé dans la session: seuls les corps ajoutés ou
+    modifiés depuis l'exécution précédente sont recalculés, et tous si un
+    paramètre dont dépend le calcul a changé.
+
+    Returns:
+        Un tuple (tableau, totaux, nb_recalcules), voir explotarget.evaluer
+    """
+    etats = st.session_state.setdefault("evaluations_incrementales", {})
+    if calcul not in etats:
+        etats[calcul] = etat_vide(calcul)
+    return evaluer(etats[calcul], corps_mineralises, **parametres)
+
+
+def details_incrementaux(calcul):
+    """
+    Table de détail de tous les corps de la dernière évaluation incrémentale d'un calcul.
+
+    Returns:
+        Un DataFrame (par exemple la table des forages, voir explotarget.table_forages),
+        ou None si le calcul n'a pas de détail ou n'a pas encore été évalué
+    """
+    etat = st.session_state.get("evaluations_incrementales", {}).get(calcul)
+    return etat["details"] if etat is not None else None
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_RESULTATS, show_spinner=False)
+def volumes_chevauchements(empreinte_corps, _corps_mineralises):
+    """Volume de chaque corps déjà compté dans un corps précédent (voir explotarget.volumes_partages)."""
+    return volumes_partages(_corps_mineralises)
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_RESULTATS, show_spinner=False)
+def courbes_sensibilite(empreinte_corps, _corps, facteur_confiance):
+    """Sensibilité d'un corps à sa teneur et à son épaisseur (voir explotarget.sensibilite_corps)."""
+    return sensibilite_corps(_corps, facteur_confiance)
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_RESULTATS, show_spinner=False)
+def simulation_monte_carlo(empreinte_corps, _corps_mineralises, distributions, facteur_confiance,
+                           nb_tirages, graine, independants, correlations):
+    """Simulation Monte Carlo du scénario (voir explotarget.simuler_monte_carlo)."""
+    return simuler_monte_carlo(_corps_mineralises, distributions, facteur_confiance=facteur_confiance,
+                               nb_tirages=nb_tirages, graine=graine, independants=independants,
+                               correlations=correlations)
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_COMPOSITES, show_spinner=False)
+def composites_forage(identifiants, _collars, _analyses, _leves, colonne_teneur):
+    """
+    Composites de forage lus depuis les fichiers téléversés (voir explotarget.composites.lire_composites).
+
+    La clé de cache est l'identifiant des fichiers téléversés, pas leur contenu.
+    """
+    return lire_composites(_collars, _analyses, _leves, colonne_teneur=colonne_teneur or None)
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_RESULTATS, show_spinner=False)
+def courbes_modele_blocs(empreinte_corps, _corps_mineralises, taille_bloc, coefficient_variation, graine,
+                         facteur_confiance, empreinte_composites=None, _composites=None, interpolation=None,
+                         classification=None):
+    """
+    Courbes teneur-tonnage du modèle de blocs du scénario (voir explotarget.modele_blocs).
+
+    Les teneurs des blocs sont interpolées depuis les composites si interpolation
+    (paramètres de explotarget.interpoler_teneurs) est fourni, sinon tirées selon
+    une loi lognormale. Si classification est fourni, chaque bloc est classé selon
+    la distance aux recoupements (explotarget.classifier_blocs) des forages de la
+    grille (source "plan": maille_x, maille_y, azimuth_forage, inclinaison_forage,
+    profondeur_forage_max)
+    ou des composites (source "composites"), et son tonnage est ajusté par le
+    facteur de sa classe au lieu de facteur_confiance. Seuls les résultats sont
+    mis en cache, pas le modèle de blocs lui-même.
+
+    Returns:
+        Un tuple (nb_blocs, tonnage_total, courbes_df, nb_blocs_estimes, classes_df),
+        nb_blocs_estimes valant None sans interpolation et classes_df (voir
+        explotarget.tonnages_classes) None sans classification
+    """
+    modele = modele_blocs(_corps_mineralises, taille_bloc)
+    nb_blocs_estimes = None
+    if interpolation is not None:
+        interpolees = interpoler_teneurs(modele, _corps_mineralises, _composites, **interpolation)
+        modele["teneur"] = interpolees["teneur"]
+        nb_blocs_estimes = int(interpolees["estime"].sum())
+    else:
+        modele["teneur"] = teneurs_lognormales(modele, coefficient_variation, graine)
+
+    classes_df = None
+    if classification is not None:
+        if classification["source"] == "composites":
+            recoupements = recoupements_composites(_corps_mineralises, _composites)
+        else:
+            recoupements = [recoupements_plan(corps, classification["maille_x"], classification["maille_y"],
+                                              classification["azimuth_forage"], classification["inclinaison_forage"],
+                                              profondeur_forage_max=classification["profondeur_forage_max"])
+                            for corps in _corps_mineralises]
+        classes = classifier_blocs(modele, recoupements, classification["maille_mesurees"],
+                                   classification["maille_indiquees"], classification["nb_recoupements"])["classe"]
+        classes_df = tonnages_classes(modele, _corps_mineralises, classes, classification["facteurs"])
+        facteur_confiance = facteurs_blocs(classes, classification["facteurs"])
+
+    courbes = courbes_teneur_tonnage(modele, _corps_mineralises, facteur_confiance=facteur_confiance)
+    tonnage_total = float((modele["tonnage"] * facteur_confiance).sum())
+    return len(modele["volume"]), tonnage_total, courbes, nb_blocs_estimes, classes_df
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_RESULTATS, show_spinner=False)
+def comparaison_scenarios(empreinte_scenarios, _scenarios, parametres, plan_sauvegarde):
+    """Tableau de comparaison de scénarios évalués en parallèle (voir explotarget.comparaison)."""
+    return tableau_comparaison(evaluer_scenarios(_scenarios, parametres, plan_sauvegarde))
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_RESULTATS, show_spinner=False)
+def echeancier_campagne(empreinte_plan, _forages, **parametres):
+    """
+    Ordonnancement des forages sur les foreuses (voir explotarget.simuler_campagne).
+
+    empreinte_plan identifie la table des forages _forages (corps et paramètres du plan).
+    """
+    return simuler_campagne(_forages, **parametres)
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_RESULTATS, show_spinner=False)
+def balayage_mailles(empreinte_corps, _corps_mineralises, parametres_forages, maille_min, maille_max, nb_mailles,
+                     _forages=None, **parametres):
+    """
+    Balayage des mailles de forage sur une grille carrée d'espacements (voir explotarget.balayer_mailles).
+
+    _forages est la table des forages de référence, déjà générée pour les corps et
+    parametres_forages (paramètres de explotarget.table_forages); elle est générée
+    ici quand elle n'est pas fournie.
+    """
+    if _forages is None:
+        _forages = table_forages(_corps_mineralises, **parametres_forages)
+    mailles = mailles_balayees(maille_min, maille_max, nb_mailles)
+    return balayer_mailles(_corps_mineralises, _forages, mailles, mailles, **parametres)
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_RESULTATS, show_spinner=False)
+def optimisation_forage(empreinte_corps, _corps_selectionnes, candidats, **parametres):
+    """Optimisation des plans de forage (voir explotarget.optimisation.optimiser_plan)."""
+    return optimiser_plan(_corps_selectionnes, candidats, **parametres)
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_MAILLAGES, show_spinner=False)
+def maillage_filon(empreinte_filon, _corps, corps_idx, opacity=0.7):
+    """Trace Mesh3d d'un corps minéralisé (voir explotarget.figures.create_filon_3d)."""
+    from explotarget.figures import create_filon_3d
+    return create_filon_3d(_corps, corps_idx, opacity)
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_FIGURES, show_spinner=False)
+def maillage_fusionne(empreinte_corps, _corps_mineralises, opacity=0.7):
+    """Trace Mesh3d unique de tous les corps minéralisés (voir explotarget.figures.maillage_filons)."""
+    from explotarget.figures import maillage_filons
+    return maillage_filons(_corps_mineralises, opacity)
+
+
+def _maillages(corps_mineralises, opacity):
+    """
+    Traces Mesh3d de tous les corps, chacune mise en cache selon l'empreinte du corps.
+
+    Au-delà de explotarget.figures.SEUIL_FUSION_MAILLAGES corps, une seule trace
+    regroupe tous les corps, mise en cache selon l'empreinte de l'ensemble.
+    """
+    from explotarget.figures import SEUIL_FUSION_MAILLAGES
+    if len(corps_mineralises) > SEUIL_FUSION_MAILLAGES:
+        return [maillage_fusionne(empreinte(corps_mineralises), corps_mineralises, opacity)]
+    return [maillage_filon(empreinte(corps), corps, corps_idx, opacity)
+            for corps_idx, corps in enumerate(corps_mineralises)]
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_FIGURES, show_spinner=False)
+def figure_modele(empreinte_corps, _corps_mineralises, maille_x, maille_y):
+    """Figure 3D simplifiée des corps minéralisés (voir explotarget.figures.figure_modele_3d)."""
+    from explotarget.figures import figure_modele_3d
+    return figure_modele_3d(_corps_mineralises, maille_x, maille_y,
+                            maillages=_maillages(_corps_mineralises, 0.7))
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_FIGURES, show_spinner=False)
+def figure_forage(empreinte_corps, _corps_selectionnes, maille_initiale_x, maille_initiale_y,
+                  maille_detail_x, maille_detail_y, azimuth_forage, inclinaison_forage, profondeur_forage_max,
+                  marge_sortie, budget_forages, _forages=None):
+    """
+    Figure 3D du plan de forage, au plus budget_forages forages affichés (voir explotarget.figures.figure_plan_forage).
+
+    _forages est la table des forages déjà générée pour ces paramètres (non hachée:
+    elle est entièrement déterminée par les corps et les paramètres de la clé).
+    """
+    from explotarget.figures import figure_plan_forage
+    return figure_plan_forage(_corps_selectionnes, maille_initiale_x, maille_initiale_y,
+                              maille_detail_x, maille_detail_y, azimuth_forage, inclinaison_forage,
+                              profondeur_forage_max, maillages=_maillages(_corps_selectionnes, 0.5),
+                              marge_sortie=marge_sortie, budget_forages=budget_forages, forages=_forages)
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_FIGURES, show_spinner=False)
+def figure_balayage_mailles(empreinte_balayage, _balayage, grandeur, maille_courante):
+    """Carte de chaleur d'une grandeur d'un balayage des mailles (voir explotarget.figures.figure_balayage)."""
+    from explotarget.figures import figure_balayage
+    return figure_balayage(_balayage, grandeur, maille_courante)
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_FIGURES, show_spinner=False)
+def figure_courbe_balayage(empreinte_balayage, _balayage, maille_courante):
+    """Budget selon l'espacement des mailles carrées d'un balayage (voir explotarget.figures.figure_courbe_mailles)."""
+    from explotarget.figures import figure_courbe_mailles
+    return figure_courbe_mailles(_balayage, maille_courante)
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_FIGURES, show_spinner=False)
+def figure_echeancier(empreinte_echeancier, _chronologie, date_debut, jours_mobilisation):
+    """Diagramme de Gantt des foreuses (voir explotarget.figures.figure_chronologie)."""
+    from explotarget.figures import figure_chronologie
+    return figure_chronologie(_chronologie, date_debut, jours_mobilisation)
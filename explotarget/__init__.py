@@ -0,0 +1,105 @@
+"""
+Moteur de calcul de Preliminary Explo Target Estimation.
+
+Géométrie des filons, estimation des ressources et planification des forages,
+utilisables sans Streamlit (traitements par lots, mesures de performance).
+Les figures Plotly sont dans explotarget.figures, importé à la demande.
+
+Les noms publics sont importés à la demande: "from explotarget import x"
+ne charge que le sous-module qui définit x (et ses dépendances, pandas par
+exemple), au premier accès (voir __getattr__).
+"""
+import importlib
+
+# Noms publics de chaque sous-module
+NOMS_SOUS_MODULES = {
+    "balayage": [
+        "MAILLE_MAX_BALAYAGE", "MAILLE_MIN_BALAYAGE", "NB_MAILLES_BALAYAGE", "balayer_mailles", "classifier_mailles",
+        "courbe_mailles_carrees", "mailles_balayees", "profils_forages",
+    ],
+    "blocs": [
+        "TAILLE_BLOC_DEFAUT", "courbe_teneur_tonnage", "courbes_teneur_tonnage", "modele_blocs", "nombre_blocs",
+        "teneurs_lognormales",
+    ],
+    "chevauchements": [
+        "RESOLUTION_CHEVAUCHEMENT", "volumes_partages",
+    ],
+    "classification": [
+        "COLONNES_CLASSES", "NB_RECOUPEMENTS_DEFAUT", "classifier_blocs", "facteurs_blocs", "recoupements_composites",
+        "recoupements_plan", "tonnages_classes",
+    ],
+    "composites": [
+        "lire_composites",
+    ],
+    "depot": [
+        "ajouter_corps", "charger_scenario", "compter_scenarios", "enregistrer_scenario", "exporter_scenarios",
+        "importer_scenarios", "lister_scenarios", "ouvrir_depot", "statistiques_depot", "supprimer_scenario",
+    ],
+    "echeancier": [
+        "COLONNES_CHRONOLOGIE", "COLONNES_FOREUSES", "durees_phases", "flux_tresorerie", "simuler_campagne",
+    ],
+    "empreintes": [
+        "empreinte",
+    ],
+    "estimation": [
+        "CLASSIFICATIONS", "COLONNES_RESULTATS", "GRAMMES_PAR_ONCE", "NB_POINTS_SENSIBILITE", "classifier_maille",
+        "deduire_volumes_partages", "estimer_corps", "estimer_scenario", "estimer_tableau", "quantite_metal",
+        "sensibilite_corps", "unite_metal",
+    ],
+    "forage": [
+        "COLONNES_FORAGES", "FORAGES_MIN_DETAIL", "FORAGES_MIN_INITIAL", "PHASES", "budget_campagne", "chiffrer_corps",
+        "forages_par_axe", "noeuds_communs", "nombres_noeuds_communs", "planifier_campagne", "resumer_forages",
+        "table_forages",
+    ],
+    "geometrie": [
+        "FACES_I", "FACES_J", "FACES_K", "POSITION_DEFAUT", "axes_filon", "centre_filon", "centres_filons",
+        "direction_forage", "extremites_forages", "faces_filons", "filons_positionnes", "lignes_directrices",
+        "lignes_directrices_filons", "repere_filon", "reperes_filons", "rotations_filons", "sommets_filon",
+        "sommets_filons", "volume_filon",
+    ],
+    "importation": [
+        "importer_fichier", "signaler_rejet", "valider_corps", "valider_scenario",
+    ],
+    "incremental": [
+        "CALCULS", "etat_vide", "evaluer",
+    ],
+    "index_spatial": [
+        "boites_filons", "construire_index", "corps_dans_boite", "corps_voisins", "paires_chevauchantes",
+    ],
+    "interpolation": [
+        "METHODES", "RAYONS_DEFAUT", "interpoler_teneurs",
+    ],
+    "intersection": [
+        "MARGE_SORTIE_DEFAUT", "intersecter_forages", "intersecter_reperes", "longueurs_requises",
+    ],
+    "monte_carlo": [
+        "LOIS", "PARAMETRES_INCERTAINS", "courbe_depassement", "distributions_defaut", "simuler_monte_carlo",
+        "statistiques_tirages",
+    ],
+    "niveau_detail": [
+        "NIVEAU_DETAIL_DEFAUT", "NIVEAUX_DETAIL", "decimer_points", "pas_decimation",
+    ],
+    "optimisation": [
+        "evaluer_candidat", "front_pareto", "grille_candidats", "optimiser_plan",
+    ],
+}
+
+# Sous-module de chaque nom public
+_SOUS_MODULE_DU_NOM = {nom: module for module, noms in NOMS_SOUS_MODULES.items() for nom in noms}
+
+__all__ = sorted(_SOUS_MODULE_DU_NOM)
+
+
+def __getattr__(nom):
+    """Importe à la demande le sous-module qui définit un nom public."""
+    module = _SOUS_MODULE_DU_NOM.get(nom)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nom!r}")
+    valeur = getattr(importlib.import_module(f".{module}", __name__), nom)
+    # Mise en cache: les accès suivants ne passent plus par __getattr__
+    globals()[nom] = valeur
+    return valeur
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
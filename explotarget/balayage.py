@@ -0,0 +1,173 @@
+"""
+Balayage des mailles de forage sur une grille de couples d'espacements (x, y).
+
+Pour chaque couple (maille_x, maille_y) d'une grille, le balayage donne le
+nombre de forages, le métrage, le budget de la campagne et la classification
+des ressources qui en résulte, sans générer les forages: le nombre de
+positions de chaque corps suit les règles de forage.table_forages (nombre de
+forages par axe, nœuds détaillés confondus avec un collar initial), et le
+métrage d'une position est le métrage moyen par position du corps et de la
+phase dans une table de forages de référence (le plan courant). Les résultats
+sont exacts pour les mailles de la table de référence et estimés ailleurs.
+
+Le nombre de positions d'un corps est un produit d'un terme par axe
+(puissance x profondeur): les sommes sur les corps se calculent pour toute la
+grille par un produit matriciel de tableaux (corps, mailles_x) et
+(corps, mailles_y), en quelques millisecondes pour une grille de 100 x 100.
+"""
+import numpy as np
+
+from .forage import FORAGES_MIN_DETAIL, FORAGES_MIN_INITIAL, PHASES, forages_par_axe, nombres_noeuds_communs
+
+# Nombre d'espacements balayés par axe par défaut
+NB_MAILLES_BALAYAGE = 100
+
+# Bornes par défaut des espacements balayés (m)
+MAILLE_MIN_BALAYAGE = 10.0
+MAILLE_MAX_BALAYAGE = 200.0
+
+
+def mailles_balayees(maille_min=MAILLE_MIN_BALAYAGE, maille_max=MAILLE_MAX_BALAYAGE, nb_mailles=NB_MAILLES_BALAYAGE):
+    """Espacements régulièrement répartis entre maille_min et maille_max (m)."""
+    return np.linspace(maille_min, maille_max, nb_mailles)
+
+
+def classifier_mailles(mailles_x, mailles_y, maille_mesurees, maille_indiquees, facteurs_confiance):
+    """
+    Classification des ressources de couples d'espacements (version vectorisée de
+    estimation.classifier_maille).
+
+    Args:
+        mailles_x, mailles_y: espacements des forages (m), diffusés ensemble
+        maille_mesurees, maille_indiquees: mailles maximales des ressources mesurées et indiquées (m)
+        facteurs_confiance: facteurs (mesurées, indiquées, inférées)
+
+    Returns:
+        Un tuple (codes, facteurs): rang de la classification dans CLASSIFICATIONS
+        et facteur de confiance de chaque couple
+    """
+    maille_moyenne = (np.asarray(mailles_x, dtype=float) + np.asarray(mailles_y, dtype=float)) / 2
+    codes = np.where(maille_moyenne < maille_mesurees, 0, np.where(maille_moyenne <= maille_indiquees, 1, 2))
+    return codes, np.asarray(facteurs_confiance, dtype=float)[codes]
+
+
+def profils_forages(forages, nb_corps):
+    """
+    Métrage moyen et proportion de forages qui recoupent le filon par position,
+    pour chaque corps et chaque phase d'une table de forages.
+
+    Args:
+        forages: table des forages (voir forage.table_forages)
+        nb_corps: nombre de corps (rangs de la colonne "corps")
+
+    Returns:
+        Un tuple (metres, recoupements) de tableaux de forme (len(PHASES), nb_corps)
+    """
+    cles = forages["phase"].cat.codes.to_numpy().astype(np.int64) * nb_corps + forages["corps"].to_numpy()
+    taille = len(PHASES) * nb_corps
+    positions = np.bincount(cles, minlength=taille)
+    metres = np.bincount(cles, weights=forages["longueur"].to_numpy(dtype=float), minlength=taille)
+    touches = np.bincount(cles, weights=forages["touche"].to_numpy(dtype=float), minlength=taille)
+    diviseur = np.maximum(positions, 1)
+    return (metres / diviseur).reshape(len(PHASES), nb_corps), (touches / diviseur).reshape(len(PHASES), nb_corps)
+
+
+def _somme(termes_x, termes_y, poids):
+    """Somme sur les corps de termes_x[c, i] * termes_y[c, j] * poids[c], de forme (len(j), len(i))."""
+    return (termes_y.T * poids) @ termes_x
+
+
+def balayer_mailles(corps_mineralises, forages, mailles_x, mailles_y, longueur_echantillon, cout_metre,
+                    cout_analyses, cout_mobilisation, maille_mesurees, maille_indiquees, facteurs_confiance,
+                    phase=None, maille_initiale=None, maille_detail=None, tonnage_brut=None):
+    """
+    Nombres de forages, métrages, budgets et classifications sur une grille d'espacements.
+
+    Trois balayages sont possibles:
+    - phase None: une seule grille de forages (minimum de la phase initiale) à
+      l'espacement balayé, qui détermine aussi la classification;
+    - phase "Initiale": espacement initial balayé, maille détaillée fixe;
+    - phase "Détaillée": espacement détaillé balayé, maille initiale fixe.
+    Avec deux phases, la classification est celle de la maille détaillée.
+
+    Args:
+        corps_mineralises: liste de dictionnaires de corps minéralisés
+        forages: table des forages de référence de ces corps (voir forage.table_forages);
+            seule la phase initiale est utilisée quand phase est None
+        mailles_x, mailles_y: espacements balayés le long de la puissance et de la profondeur (m)
+        longueur_echantillon, cout_metre, cout_analyses, cout_mobilisation: paramètres du budget
+        maille_mesurees, maille_indiquees, facteurs_confiance: paramètres de classification
+        phase: phase balayée (None, ou une valeur de PHASES)
+        maille_initiale, maille_detail: couples (x, y) des mailles fixes
+        tonnage_brut: tonnage total avant facteur de confiance (optionnel)
+
+    Returns:
+        Un dictionnaire de tableaux de forme (len(mailles_y), len(mailles_x)):
+        "nb_forages" (forages qui recoupent le filon), "metres", "budget",
+        "classification" (rangs dans CLASSIFICATIONS), "facteur" et, avec
+        tonnage_brut, "tonnage" (tonnage ajusté); plus "mailles_x" et "mailles_y"
+    """
+    mailles_x = np.asarray(mailles_x, dtype=float)
+    mailles_y = np.asarray(mailles_y, dtype=float)
+    nb_corps = len(corps_mineralises)
+    puissances = np.array([corps["puissance"] for corps in corps_mineralises], dtype=float)[:, None]
+    profondeurs = np.array([corps["profondeur"] for corps in corps_mineralises], dtype=float)[:, None]
+    metres_position, recoupements_position = profils_forages(forages, nb_corps)
+
+    def axes(maille_fixe, indice):
+        # Espacements de l'axe x (indice 0) ou y (indice 1): balayés ou fixes, diffusés en (corps, mailles)
+        balayees = (mailles_x, mailles_y)[indice]
+        return balayees if maille_fixe is None else np.full(len(balayees), float(maille_fixe[indice]))
+
+    if phase is None:
+        # Une seule grille de forages
+        termes = [(forages_par_axe(puissances, mailles_x, FORAGES_MIN_INITIAL),
+                   forages_par_axe(profondeurs, mailles_y, FORAGES_MIN_INITIAL), 0, 1.0)]
+        mailles_classification = (mailles_x[None, :], mailles_y[:, None])
+    else:
+        initiale = None if phase == PHASES[0] else maille_initiale
+        detail = None if phase == PHASES[1] else maille_detail
+        nb_x = forages_par_axe(puissances, axes(initiale, 0), FORAGES_MIN_INITIAL)
+        nb_y = forages_par_axe(profondeurs, axes(initiale, 1), FORAGES_MIN_INITIAL)
+        nb_x_detail = forages_par_axe(puissances, axes(detail, 0), FORAGES_MIN_DETAIL)
+        nb_y_detail = forages_par_axe(profondeurs, axes(detail, 1), FORAGES_MIN_DETAIL)
+        # Positions détaillées: grille complète moins les nœuds confondus avec un collar initial
+        termes = [(nb_x, nb_y, 0, 1.0), (nb_x_detail, nb_y_detail, 1, 1.0),
+                  (nombres_noeuds_communs(nb_x, nb_x_detail), nombres_noeuds_communs(nb_y, nb_y_detail), 1, -1.0)]
+        mailles_classification = (axes(detail, 0)[None, :], axes(detail, 1)[:, None])
+
+    nb_forages = sum(signe * _somme(termes_x, termes_y, recoupements_position[rang])
+                     for termes_x, termes_y, rang, signe in termes)
+    metres = sum(signe * _somme(termes_x, termes_y, metres_position[rang])
+                 for termes_x, termes_y, rang, signe in termes)
+    codes, facteurs = classifier_mailles(*mailles_classification, maille_mesurees, maille_indiquees, facteurs_confiance)
+    codes, facteurs = (np.broadcast_to(valeurs, metres.shape) for valeurs in (codes, facteurs))
+
+    resultats = {
+        "mailles_x": mailles_x,
+        "mailles_y": mailles_y,
+        "nb_forages": nb_forages,
+        "metres": metres,
+        # Analyses au prorata du métrage (au plus un échantillon d'écart par corps et par phase avec budget_campagne)
+        "budget": cout_mobilisation + metres * cout_metre + np.ceil(metres / longueur_echantillon) * cout_analyses,
+        "classification": codes,
+        "facteur": facteurs,
+    }
+    if tonnage_brut is not None:
+        resultats["tonnage"] = tonnage_brut * facteurs
+    return resultats
+
+
+def courbe_mailles_carrees(balayage):
+    """
+    Coupe d'un balayage le long des mailles carrées (maille_x = maille_y), pour une
+    courbe coût / espacement; les deux axes du balayage doivent être identiques.
+
+    Returns:
+        Un dictionnaire de tableaux de forme (len(mailles_x),): "maille" et les
+        grandeurs du balayage sur la diagonale
+    """
+    if not np.array_equal(balayage["mailles_x"], balayage["mailles_y"]):
+        raise ValueError("Les mailles balayées en x et en y doivent être identiques")
+    return {"maille": balayage["mailles_x"],
+            **{cle: np.diagonal(valeurs) for cle, valeurs in balayage.items() if cle not in ("mailles_x", "mailles_y")}}
@@ -0,0 +1,381 @@
+"""
+Mesures de performance reproductibles du moteur et des figures.
+
+Des scénarios synthétiques (1, 10, 100 et 1000 corps, tirés avec une graine
+fixe) sont évalués avec une maille de forage grossière et une maille fine. Pour
+chaque cas sont chronométrés l'estimation, la planification des forages (et
+sa mise à jour incrémentale après modification d'un corps), le modèle de
+blocs et ses courbes teneur-tonnage, l'échéancier des foreuses, le balayage
+des mailles (grille de 100 x 100 espacements), create_filon_3d,
+maillage_filons, la construction des figures 3D et leur sérialisation JSON.
+
+Le temps d'import à froid des modules chargés au démarrage de l'application
+(point d'entrée Streamlit et modules de pages) est mesuré dans des processus
+Python neufs; la médiane de plusieurs processus est comparée à un budget
+(BUDGET_IMPORT_S, multiplié par --marge-imports) ou, avec --reference, au temps
+médian de référence multiplié par MARGE_REFERENCE_IMPORT. La commande se
+termine en erreur si un budget est dépassé.
+
+Les résultats sont écrits dans un fichier JSON (environnement, paramètres,
+temps par cas et temps d'import) et peuvent être comparés à ceux d'une
+version précédente:
+
+    python -m explotarget.benchmark --sortie mesures.json
+    python -m explotarget.benchmark --sortie nouvelles.json --reference mesures.json
+    python -m explotarget.benchmark --imports-seuls --marge-imports 2
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from .balayage import balayer_mailles, mailles_balayees
+from .estimation import estimer_scenario
+from .echeancier import simuler_campagne
+from .forage import PHASES, planifier_campagne, table_forages
+from .incremental import etat_vide, evaluer
+from .intersection import MARGE_SORTIE_DEFAUT
+from .blocs import TAILLE_BLOC_DEFAUT, courbes_teneur_tonnage, modele_blocs
+
+# Nombres de corps des scénarios synthétiques
+TAILLES_SCENARIOS = [1, 10, 100, 1000]
+
+# Mailles de forage (m) des deux grilles mesurées
+GRILLES = {
+    "grossiere": {"maille_initiale_x": 100.0, "maille_initiale_y": 100.0, "maille_detail_x": 50.0, "maille_detail_y": 50.0},
+    "fine": {"maille_initiale_x": 50.0, "maille_initiale_y": 50.0, "maille_detail_x": 10.0, "maille_detail_y": 10.0},
+}
+
+# Paramètres communs de planification (valeurs par défaut de l'interface)
+PARAMETRES_FORAGE = {
+    "profondeur_forage_max": 300, "longueur_echantillon": 1.0, "cout_metre": 150, "cout_analyses": 30,
+    "azimuth_forage": 270, "inclinaison_forage": 60,
+}
+
+# Nombre de foreuses de la simulation de l'échéancier
+NB_FOREUSES = 4
+
+# Coût de mobilisation et paramètres de classification du balayage des mailles
+COUT_MOBILISATION = 50000
+PARAMETRES_CLASSIFICATION = {"maille_mesurees": 50.0, "maille_indiquees": 100.0, "facteurs_confiance": (0.95, 0.8, 0.6)}
+
+# Durée minimale cumulée de chaque mesure et bornes du nombre de répétitions
+DUREE_MIN_MESURE = 0.5
+REPETITIONS_MIN = 3
+REPETITIONS_MAX = 1000
+
+# Budgets de temps d'import à froid (s) des modules de l'application, comparés à
+# la médiane de REPETITIONS_IMPORT processus: médianes mesurées plus une marge
+# d'environ 50 %. "demarrage" regroupe les imports du point d'entrée ExploTarget6.py
+MODULES_DEMARRAGE = ["streamlit", "calculs", "vues", "vues.style"]
+BUDGET_IMPORT_S = {
+    "demarrage": 1.6,
+    "explotarget": 0.05,
+    "vues.accueil": 1.0,
+    "vues.estimation": 1.9,
+    "vues.forage": 1.7,
+    "vues.scenarios": 1.7,
+    "vues.guide": 0.9,
+}
+REPETITIONS_IMPORT = 7
+
+# Dépassement toléré du temps médian d'import d'une mesure de référence (--reference):
+# facteur, et écart minimal (s) pour les imports trop courts pour un rapport stable
+MARGE_REFERENCE_IMPORT = 1.5
+ECART_MIN_REFERENCE_IMPORT = 0.05
+
+# Espacement moyen des centres des corps des scénarios synthétiques (m)
+ESPACEMENT_SYNTHETIQUE = 1000.0
+
+# Racine de l'application (dossier contenant ExploTarget6.py, calculs.py et vues/)
+RACINE = Path(__file__).resolve().parent.parent
+
+
+def scenario_synthetique(nb_corps, graine=0):
+    """
+    Génère un scénario reproductible de corps minéralisés de type filon.
+
+    Les centres des corps sont répartis uniformément dans un carré de côté
+    ESPACEMENT_SYNTHETIQUE * sqrt(nb_corps), de sorte que la densité de corps
+    (et la part de corps qui se chevauchent) ne dépend pas de nb_corps.
+
+    Args:
+        nb_corps: nombre de corps
+        graine: graine du générateur aléatoire
+
+    Returns:
+        Une liste de dictionnaires de corps minéralisés
+    """
+    rng = np.random.default_rng(graine)
+    demi_cote = ESPACEMENT_SYNTHETIQUE * np.sqrt(nb_corps) / 2
+    return [
+        {
+            "id": f"bench-{i}",
+            "nom": f"Corps-{i + 1}",
+            "puissance": float(rng.uniform(50, 500)),
+            "epaisseur": float(rng.uniform(1, 20)),
+            "profondeur": float(rng.uniform(50, 400)),
+            "teneur": float(rng.uniform(0.5, 10)),
+            "unite_teneur": "g/t (or, argent)" if i % 2 == 0 else "% (métaux de base)",
+            "densite": float(rng.uniform(2.5, 3.2)),
+            "azimuth": float(rng.choice([0, 45, 90, 135])),
+            "inclinaison": float(rng.uniform(40, 85)),
+            "elevation_toit": float(rng.uniform(-300, -10)),
+            "est": float(rng.uniform(-demi_cote, demi_cote)),
+            "nord": float(rng.uniform(-demi_cote, demi_cote)),
+        }
+        for i in range(nb_corps)
+    ]
+
+
+def mesurer(fonction, duree_min=DUREE_MIN_MESURE):
+    """
+    Chronomètre une fonction sans argument, répétée jusqu'à cumuler duree_min secondes.
+
+    Returns:
+        Un dictionnaire {"repetitions", "min_s", "mediane_s", "moyenne_s"}
+    """
+    temps = []
+    while len(temps) < REPETITIONS_MAX and (len(temps) < REPETITIONS_MIN or sum(temps) < duree_min):
+        debut = time.perf_counter()
+        fonction()
+        temps.append(time.perf_counter() - debut)
+    return {
+        "repetitions": len(temps),
+        "min_s": min(temps),
+        "mediane_s": float(np.median(temps)),
+        "moyenne_s": float(np.mean(temps)),
+    }
+
+
+def _cas(nb_corps, grille):
+    """Fonctions mesurées pour un scénario et une grille, dans l'ordre d'exécution."""
+    # Import différé: Plotly n'est chargé que pour les mesures de figures
+    from .figures import create_filon_3d, figure_modele_3d, figure_plan_forage, maillage_filons
+
+    corps = scenario_synthetique(nb_corps)
+    mailles = GRILLES[grille]
+    parametres_figure = (mailles["maille_initiale_x"], mailles["maille_initiale_y"],
+                         mailles["maille_detail_x"], mailles["maille_detail_y"],
+                         PARAMETRES_FORAGE["azimuth_forage"], PARAMETRES_FORAGE["inclinaison_forage"],
+                         PARAMETRES_FORAGE["profondeur_forage_max"])
+    figure_modele = figure_modele_3d(corps, mailles["maille_initiale_x"], mailles["maille_initiale_y"])
+    figure_forage = figure_plan_forage(corps, *parametres_figure)
+    forages = table_forages(corps, *parametres_figure[:4], PARAMETRES_FORAGE["profondeur_forage_max"],
+                            PARAMETRES_FORAGE["azimuth_forage"], PARAMETRES_FORAGE["inclinaison_forage"])
+
+    # Replanification après modification d'un seul corps: deux versions du scénario en alternance
+    etat_forage = etat_vide("forage")
+    versions = [corps, corps[:-1] + [dict(corps[-1], teneur=corps[-1]["teneur"] * 2, puissance=corps[-1]["puissance"] + 1)]]
+    evaluer(etat_forage, corps, **mailles, **PARAMETRES_FORAGE, marge_sortie=MARGE_SORTIE_DEFAUT)
+
+    def replanifier():
+        versions.reverse()
+        return evaluer(etat_forage, versions[0], **mailles, **PARAMETRES_FORAGE, marge_sortie=MARGE_SORTIE_DEFAUT)
+
+    return {
+        "estimation": lambda: estimer_scenario(corps, 0.8),
+        "planification": lambda: planifier_campagne(corps, **mailles, **PARAMETRES_FORAGE),
+        "table_forages": lambda: table_forages(corps, *parametres_figure[:4], PARAMETRES_FORAGE["profondeur_forage_max"],
+                                               PARAMETRES_FORAGE["azimuth_forage"], PARAMETRES_FORAGE["inclinaison_forage"]),
+        "planification_un_corps": replanifier,
+        "echeancier": lambda: simuler_campagne(forages, nb_foreuses=NB_FOREUSES),
+        "balayage_mailles": lambda: balayer_mailles(corps, forages, mailles_balayees(), mailles_balayees(),
+                                                    PARAMETRES_FORAGE["longueur_echantillon"],
+                                                    PARAMETRES_FORAGE["cout_metre"], PARAMETRES_FORAGE["cout_analyses"],
+                                                    COUT_MOBILISATION, **PARAMETRES_CLASSIFICATION, phase=PHASES[1],
+                                                    maille_initiale=parametres_figure[:2]),
+        "modele_blocs": lambda: courbes_teneur_tonnage(modele_blocs(corps, TAILLE_BLOC_DEFAUT), corps),
+        "create_filon_3d": lambda: [create_filon_3d(c, i) for i, c in enumerate(corps)],
+        "maillage_filons": lambda: maillage_filons(corps),
+        "figure_modele_3d": lambda: figure_modele_3d(corps, mailles["maille_initiale_x"], mailles["maille_initiale_y"]),
+        "figure_plan_forage": lambda: figure_plan_forage(corps, *parametres_figure),
+        "json_figure_modele": figure_modele.to_json,
+        "json_figure_forage": figure_forage.to_json,
+    }
+
+
+def mesurer_import(modules, repetitions=REPETITIONS_IMPORT):
+    """
+    Mesure le temps d'import à froid de modules, chacun dans un processus Python neuf.
+
+    Args:
+        modules: noms des modules importés ensemble
+        repetitions: nombre de processus lancés
+
+    Returns:
+        Un dictionnaire {"repetitions", "min_s", "mediane_s"}
+    """
+    code = ("import sys, time; debut = time.perf_counter(); "
+            f"import {', '.join(modules)}; "
+            "sys.stdout.write(repr(time.perf_counter() - debut))")
+    temps = []
+    for _ in range(repetitions):
+        sortie = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=RACINE, check=True)
+        temps.append(float(sortie.stdout.strip().splitlines()[-1]))
+    return {"repetitions": repetitions, "min_s": min(temps), "mediane_s": float(np.median(temps))}
+
+
+def mesurer_imports(budgets=BUDGET_IMPORT_S, repetitions=REPETITIONS_IMPORT, afficher=print, marge=1.0):
+    """
+    Mesure les temps d'import des modules de l'application et compare leur médiane à leur budget.
+
+    Args:
+        budgets: budget (s) de chaque module
+        repetitions: nombre de processus lancés par module
+        afficher: fonction d'affichage des lignes de résultat (None pour n'afficher rien)
+        marge: facteur appliqué aux budgets (machine plus lente, intégration continue)
+
+    Returns:
+        Une liste de dictionnaires {"module", "budget_s", "depasse", "repetitions", "min_s", "mediane_s"}
+    """
+    resultats = []
+    for module, budget in budgets.items():
+        modules = MODULES_DEMARRAGE if module == "demarrage" else [module]
+        mesure = mesurer_import(modules, repetitions)
+        budget = budget * marge
+        resultat = {"module": module, "budget_s": budget, "depasse": mesure["mediane_s"] > budget, **mesure}
+        resultats.append(resultat)
+        if afficher is not None:
+            afficher(f"import {module:<20} {mesure['mediane_s'] * 1000:>10.0f} ms  (budget {budget * 1000:.0f} ms)"
+                     f"{'  DÉPASSÉ' if resultat['depasse'] else ''}")
+    return resultats
+
+
+def _environnement():
+    """Versions et machine, pour comparer des mesures faites dans les mêmes conditions."""
+    import pandas as pd
+    import plotly
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "plotly": plotly.__version__,
+        "machine": platform.machine(),
+        "processeur": platform.processor() or None,
+        "systeme": platform.platform(),
+    }
+
+
+def executer(tailles=TAILLES_SCENARIOS, grilles=tuple(GRILLES), cas=None, duree_min=DUREE_MIN_MESURE, afficher=print,
+             imports=True, budgets_imports=BUDGET_IMPORT_S, marge_imports=1.0):
+    """
+    Exécute les mesures.
+
+    Args:
+        tailles: nombres de corps des scénarios
+        grilles: clés de GRILLES
+        cas: noms des cas à mesurer (tous si None)
+        duree_min: durée minimale cumulée de chaque mesure (s)
+        afficher: fonction d'affichage de la progression (None: silencieux)
+        imports: mesurer aussi les temps d'import (voir mesurer_imports)
+        budgets_imports, marge_imports: budgets d'import (s) et facteur appliqué
+
+    Returns:
+        Un dictionnaire {"environnement", "parametres", "resultats", "imports"}
+    """
+    resultats = []
+    for nb_corps in tailles:
+        for grille in grilles:
+            for nom, fonction in _cas(nb_corps, grille).items():
+                if cas is not None and nom not in cas:
+                    continue
+                mesure = {"cas": nom, "nb_corps": nb_corps, "grille": grille, **mesurer(fonction, duree_min)}
+                resultats.append(mesure)
+                if afficher is not None:
+                    afficher(f"{nom:<20} {nb_corps:>5} corps  {grille:<10} {mesure['mediane_s'] * 1000:>10.2f} ms")
+    return {
+        "environnement": _environnement(),
+        "parametres": {"grilles": {grille: GRILLES[grille] for grille in grilles}, "forage": PARAMETRES_FORAGE,
+                       "duree_min_mesure": duree_min},
+        "resultats": resultats,
+        "imports": mesurer_imports(budgets_imports, afficher=afficher, marge=marge_imports) if imports else [],
+    }
+
+
+def budgets_reference(reference, marge=MARGE_REFERENCE_IMPORT):
+    """
+    Budgets d'import relatifs à une mesure de référence: temps médian de référence multiplié par marge,
+    et au moins augmenté de ECART_MIN_REFERENCE_IMPORT.
+
+    Les modules absents de la référence gardent leur budget de BUDGET_IMPORT_S.
+    """
+    budgets = dict(BUDGET_IMPORT_S)
+    budgets.update({resultat["module"]: max(resultat["mediane_s"] * marge,
+                                            resultat["mediane_s"] + ECART_MIN_REFERENCE_IMPORT)
+                    for resultat in reference.get("imports", []) if resultat["module"] in budgets})
+    return budgets
+
+
+def comparer(reference, mesures):
+    """
+    Compare deux séries de mesures cas par cas (rapport des temps médians).
+
+    Args:
+        reference, mesures: dictionnaires retournés par executer (ou relus depuis JSON)
+
+    Returns:
+        Une liste de dictionnaires {"cas", "nb_corps", "grille", "reference_s", "mesure_s", "rapport"},
+        rapport > 1 indiquant un ralentissement
+    """
+    cle = lambda resultat: (resultat["cas"], resultat["nb_corps"], resultat["grille"])
+    references = {cle(resultat): resultat for resultat in reference["resultats"]}
+    return [
+        {"cas": resultat["cas"], "nb_corps": resultat["nb_corps"], "grille": resultat["grille"],
+         "reference_s": references[cle(resultat)]["mediane_s"], "mesure_s": resultat["mediane_s"],
+         "rapport": resultat["mediane_s"] / references[cle(resultat)]["mediane_s"]}
+        for resultat in mesures["resultats"] if cle(resultat) in references
+    ]
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Mesures de performance d'ExploTarget")
+    parser.add_argument("--sortie", type=Path, default=Path("benchmark.json"), help="fichier JSON des résultats")
+    parser.add_argument("--tailles", type=int, nargs="+", default=TAILLES_SCENARIOS, help="nombres de corps")
+    parser.add_argument("--grilles", nargs="+", choices=list(GRILLES), default=list(GRILLES))
+    parser.add_argument("--cas", nargs="+", help="cas à mesurer (tous par défaut)")
+    parser.add_argument("--duree-min", type=float, default=DUREE_MIN_MESURE, help="durée minimale par mesure (s)")
+    parser.add_argument("--reference", type=Path, help="résultats précédents à comparer")
+    parser.add_argument("--imports-seuls", action="store_true", help="ne mesurer que les temps d'import")
+    parser.add_argument("--sans-imports", action="store_true", help="ne pas mesurer les temps d'import")
+    parser.add_argument("--marge-imports", type=float, default=1.0,
+                        help="facteur appliqué aux budgets d'import (BUDGET_IMPORT_S, ou référence avec --reference)")
+    args = parser.parse_args(arguments)
+
+    reference = None if args.reference is None else json.loads(args.reference.read_text(encoding="utf-8"))
+    budgets = BUDGET_IMPORT_S if reference is None else budgets_reference(reference)
+    tailles = [] if args.imports_seuls else args.tailles
+    mesures = executer(tailles, args.grilles, args.cas, args.duree_min, imports=not args.sans_imports,
+                       budgets_imports=budgets, marge_imports=args.marge_imports)
+    args.sortie.write_text(json.dumps(mesures, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Résultats écrits dans {args.sortie}")
+
+    if reference is not None:
+        print(f"\n{'cas':<20} {'corps':>5}  {'grille':<10} {'référence':>12} {'mesure':>12} {'rapport':>8}")
+        for ligne in comparer(reference, mesures):
+            print(f"{ligne['cas']:<20} {ligne['nb_corps']:>5}  {ligne['grille']:<10} "
+                  f"{ligne['reference_s'] * 1000:>10.2f}ms {ligne['mesure_s'] * 1000:>10.2f}ms {ligne['rapport']:>8.2f}")
+
+    depassements = [resultat["module"] for resultat in mesures["imports"] if resultat["depasse"]]
+    if depassements:
+        print(f"\nBudget d'import dépassé: {', '.join(depassements)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+Modèle de blocs des corps minéralisés de type filon et courbes teneur-tonnage.
+
+Chaque filon est découpé dans son repère local (axes puissance, profondeur et
+épaisseur de geometrie.axes_filon, les mêmes que create_filon_3d) en blocs de
+taille fixe. Les blocs de bordure sont tronqués aux limites du filon, de sorte
+que le volume total des blocs est exactement celui du parallélépipède.
+
+Le modèle est un tableau creux (liste de coordonnées): seuls les blocs
+appartenant à un filon sont stockés, colonne par colonne dans des tableaux
+NumPy, pour tous les corps du scénario. Chaque bloc porte sa propre teneur;
+les courbes teneur-tonnage sont calculées par tri et sommes cumulées, pour
+des coupures quelconques.
+"""
+import numpy as np
+import pandas as pd
+
+from .estimation import diviseurs_metal, tableau_corps
+from .geometrie import repere_filon
+
+# Taille des blocs par défaut (m), le long des axes puissance, profondeur et épaisseur
+TAILLE_BLOC_DEFAUT = (10.0, 10.0, 1.0)
+
+# Nombre maximal de blocs d'un modèle (borne la mémoire: environ 70 octets par bloc)
+NB_BLOCS_MAX = 20_000_000
+
+# Nombre de coupures des courbes teneur-tonnage calculées automatiquement
+NB_COUPURES_DEFAUT = 50
+
+
+def _decoupage(longueur, taille):
+    """
+    Découpe un segment [-longueur/2, longueur/2] en intervalles de taille fixe.
+
+    Returns:
+        Un tuple (centres, longueurs) des intervalles, le dernier étant tronqué
+    """
+    nb = max(int(np.ceil(longueur / taille - 1e-9)), 1)
+    debuts = -longueur / 2 + np.arange(nb) * taille
+    longueurs = np.minimum(taille, longueur / 2 - debuts)
+    return debuts + longueurs / 2, longueurs
+
+
+def nombre_blocs(corps_mineralises, taille_bloc=TAILLE_BLOC_DEFAUT):
+    """
+    Nombre de blocs de chaque corps minéralisé, sans construire le modèle.
+
+    Args:
+        corps_mineralises: liste de dictionnaires de corps minéralisés (ou DataFrame équivalent)
+        taille_bloc: taille des blocs (m) le long des axes puissance, profondeur et épaisseur
+
+    Returns:
+        Un tableau d'entiers (un nombre par corps)
+    """
+    corps_df = tableau_corps(corps_mineralises)
+    dimensions = corps_df[["puissance", "profondeur", "epaisseur"]].to_numpy(dtype=float)
+    nb = np.maximum(np.ceil(dimensions / np.asarray(taille_bloc, dtype=float) - 1e-9), 1).astype(np.int64)
+    return nb.prod(axis=1)
+
+
+def modele_blocs(corps_mineralises, taille_bloc=TAILLE_BLOC_DEFAUT, teneurs=None):
+    """
+    Discrétise les corps minéralisés en blocs orientés selon chaque filon.
+
+    Args:
+        corps_mineralises: liste de dictionnaires de corps minéralisés
+        taille_bloc: taille des blocs (m) le long des axes puissance, profondeur et épaisseur,
+            ou une taille unique pour les trois axes
+        teneurs: teneur de chaque bloc (tableau de longueur nb_blocs); par défaut,
+            la teneur moyenne du corps auquel appartient le bloc
+
+    Returns:
+        Un dictionnaire de tableaux indexés par bloc:
+        - "corps": indice du corps minéralisé
+        - "indices": indices (i, j, k) du bloc le long des axes puissance, profondeur, épaisseur
+        - "centres": coordonnées (x, y, z) du centre du bloc
+        - "volume" (m³), "tonnage" (t), "teneur"
+        et "taille_bloc" (3,) et "debuts" (nb_corps + 1,): les blocs du corps c
+        occupent les positions debuts[c]:debuts[c + 1]
+
+    Raises:
+        ValueError: si la taille des blocs n'est pas strictement positive ou si le
+            modèle dépasse NB_BLOCS_MAX blocs
+    """
+    taille_bloc = np.asarray(taille_bloc, dtype=float)
+    if taille_bloc.shape not in ((), (3,)):
+        raise ValueError("La taille des blocs doit être un nombre ou un triplet (puissance, profondeur, épaisseur)")
+    # Une taille unique s'applique aux trois axes
+    taille_bloc = np.broadcast_to(taille_bloc, (3,)).copy()
+    if np.any(taille_bloc <= 0):
+        raise ValueError("La taille des blocs doit être strictement positive")
+    nb_par_corps = nombre_blocs(corps_mineralises, taille_bloc) if len(corps_mineralises) else np.zeros(0, dtype=np.int64)
+    nb_blocs = int(nb_par_corps.sum())
+    if nb_blocs > NB_BLOCS_MAX:
+        raise ValueError(f"Le modèle compterait {nb_blocs:,} blocs (maximum {NB_BLOCS_MAX:,}): "
+                         "augmentez la taille des blocs")
+
+    debuts = np.concatenate([[0], np.cumsum(nb_par_corps)])
+    modele = {
+        "corps": np.repeat(np.arange(len(corps_mineralises), dtype=np.int32), nb_par_corps),
+        "indices": np.empty((nb_blocs, 3), dtype=np.int32),
+        "centres": np.empty((nb_blocs, 3)),
+        "volume": np.empty(nb_blocs),
+        "tonnage": np.empty(nb_blocs),
+        "teneur": np.empty(nb_blocs),
+        "taille_bloc": taille_bloc,
+        "debuts": debuts,
+    }
+
+    for corps_idx, corps in enumerate(corps_mineralises):
+        bloc = slice(debuts[corps_idx], debuts[corps_idx + 1])
+        centre, rotation, demi_dimensions = repere_filon(corps)
+        decoupages = [_decoupage(2 * demi, taille) for demi, taille in zip(demi_dimensions, taille_bloc)]
+
+        # Grille (puissance, profondeur, épaisseur), l'épaisseur variant le plus vite
+        indices = np.indices([len(centres) for centres, _ in decoupages]).reshape(3, -1).T
+        locales = np.column_stack([decoupages[axe][0][indices[:, axe]] for axe in range(3)])
+        longueurs = np.column_stack([decoupages[axe][1][indices[:, axe]] for axe in range(3)])
+
+        modele["indices"][bloc] = indices
+        modele["centres"][bloc] = centre + locales @ rotation
+        modele["volume"][bloc] = longueurs.prod(axis=1)
+        modele["tonnage"][bloc] = modele["volume"][bloc] * corps["densite"]
+        modele["teneur"][bloc] = corps["teneur"]
+
+    if teneurs is not None:
+        teneurs = np.asarray(teneurs, dtype=float)
+        if teneurs.shape != (nb_blocs,):
+            raise ValueError(f"{teneurs.size} teneurs fournies pour {nb_blocs} blocs")
+        modele["teneur"][:] = teneurs
+    return modele
+
+
+def teneurs_lognormales(modele, coefficient_variation, graine=None):
+    """
+    Tire une teneur par bloc selon une loi lognormale centrée sur la teneur moyenne de son corps.
+
+    La moyenne des teneurs tirées de chaque corps est (en espérance) sa teneur
+    moyenne, de sorte que le métal contenu sans coupure reste celui de
+    l'estimation simple.
+
+    Args:
+        modele: modèle retourné par modele_blocs (teneurs moyennes par corps)
+        coefficient_variation: écart-type relatif des teneurs des blocs (0: teneur constante)
+        graine: graine du générateur aléatoire
+
+    Returns:
+        Un tableau des teneurs des blocs
+    """
+    if coefficient_variation <= 0:
+        return modele["teneur"].copy()
+    sigma2 = np.log1p(coefficient_variation ** 2)
+    rng = np.random.default_rng(graine)
+    return modele["teneur"] * np.exp(rng.standard_normal(len(modele["teneur"])) * np.sqrt(sigma2) - sigma2 / 2)
+
+
+def courbe_teneur_tonnage(tonnage, teneur, coupures):
+    """
+    Courbe teneur-tonnage d'un ensemble de blocs.
+
+    Les blocs dont la teneur est supérieure ou égale à la coupure sont retenus.
+
+    Args:
+        tonnage: tonnage de chaque bloc (t)
+        teneur: teneur de chaque bloc
+        coupures: teneurs de coupure
+
+    Returns:
+        Un tuple (tonnage, teneur_moyenne, tonnage_teneur) de tableaux (une valeur par coupure),
+        tonnage_teneur étant la somme des tonnages × teneurs (métal avant conversion d'unité)
+    """
+    ordre = np.argsort(teneur)
+    teneurs_triees = teneur[ordre]
+    # Sommes cumulées depuis les blocs les plus riches (zéro ajouté en fin pour les coupures au-delà du maximum)
+    tonnage_cumule = np.concatenate([np.cumsum(tonnage[ordre][::-1])[::-1], [0.0]])
+    metal_cumule = np.concatenate([np.cumsum((tonnage * teneur)[ordre][::-1])[::-1], [0.0]])
+
+    position = np.searchsorted(teneurs_triees, np.asarray(coupures, dtype=float), side="left")
+    tonnage_retenu = tonnage_cumule[position]
+    metal_retenu = metal_cumule[position]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        teneur_moyenne = np.where(tonnage_retenu > 0, metal_retenu / tonnage_retenu, np.nan)
+    return tonnage_retenu, teneur_moyenne, metal_retenu
+
+
+def courbes_teneur_tonnage(modele, corps_mineralises, coupures=None, facteur_confiance=1.0,
+                           nb_coupures=NB_COUPURES_DEFAUT):
+    """
+    Courbes teneur-tonnage d'un modèle de blocs, une par unité de teneur.
+
+    Les corps exprimés en g/t et en % ne sont pas additionnés: chaque unité de
+    teneur a sa propre courbe.
+
+    Args:
+        modele: modèle retourné par modele_blocs
+        corps_mineralises: corps minéralisés du modèle (pour leurs unités de teneur)
+        coupures: teneurs de coupure (par défaut nb_coupures valeurs de 0 à la teneur maximale de chaque unité)
+        facteur_confiance: facteur appliqué au tonnage, comme dans l'estimation simple (scalaire ou un facteur par bloc)
+        nb_coupures: nombre de coupures calculées automatiquement
+
+    Returns:
+        Un DataFrame avec les colonnes unite_teneur, coupure, tonnage, teneur_moyenne,
+        metal_quantite et metal_unit
+    """
+    corps_df = tableau_corps(corps_mineralises)
+    metaux_precieux, diviseur = diviseurs_metal(corps_df["unite_teneur"])
+    unites = corps_df["unite_teneur"].to_numpy()
+    unites_blocs = unites[modele["corps"]]
+    tonnage = modele["tonnage"] * facteur_confiance
+
+    courbes = []
+    for unite in pd.unique(unites):
+        blocs = unites_blocs == unite
+        teneur = modele["teneur"][blocs]
+        coupures_unite = (np.linspace(0, teneur.max() if teneur.size else 0, nb_coupures)
+                          if coupures is None else np.asarray(coupures, dtype=float))
+        tonnage_retenu, teneur_moyenne, metal_retenu = courbe_teneur_tonnage(tonnage[blocs], teneur, coupures_unite)
+        premier = np.flatnonzero(unites == unite)[0]
+        courbes.append(pd.DataFrame({
+            "unite_teneur": unite,
+            "coupure": coupures_unite,
+            "tonnage": tonnage_retenu,
+            "teneur_moyenne": teneur_moyenne,
+            "metal_quantite": metal_retenu / diviseur[premier],
+            "metal_unit": "onces" if metaux_precieux[premier] else "tonnes",
+        }))
+    colonnes = ["unite_teneur", "coupure", "tonnage", "teneur_moyenne", "metal_quantite", "metal_unit"]
+    return pd.concat(courbes, ignore_index=True) if courbes else pd.DataFrame(columns=colonnes)
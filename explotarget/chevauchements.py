@@ -0,0 +1,116 @@
+"""
+Volumes communs aux corps minéralisés qui se chevauchent.
+
+Les corps d'un scénario placés à leurs coordonnées réelles peuvent partager
+une partie de leur volume: sans correction, ce volume est compté deux fois
+dans le tonnage total. Le volume commun est attribué au premier corps dans
+l'ordre du scénario; chaque corps suivant en est diminué. Seuls les corps qui
+précisent leurs coordonnées est et nord sont comparés: ceux des scénarios
+antérieurs, placés par défaut à l'origine, ne sont pas réputés se chevaucher.
+
+Seules les paires de corps dont les boîtes englobantes se chevauchent
+(index_spatial.paires_chevauchantes) et que le test des axes séparateurs ne
+sépare pas (filons_disjoints) sont examinées. Le volume d'un corps couvert
+par les corps qui le précèdent est mesuré par échantillonnage: les centres
+des cellules d'une grille régulière de resolution³ points dans le repère local
+du corps sont testés dans le repère de chacun de ses voisins.
+"""
+import numpy as np
+
+from .geometrie import filons_positionnes, reperes_filons
+from .index_spatial import construire_index, paires_chevauchantes
+
+# Nombre de points d'échantillonnage par axe du repère local d'un corps
+RESOLUTION_CHEVAUCHEMENT = 16
+
+# Nombre maximal de voisins testés ensemble (borne la mémoire des tests de contenance)
+TAILLE_LOT_VOISINS = 64
+
+
+def points_echantillonnage(resolution=RESOLUTION_CHEVAUCHEMENT):
+    """
+    Centres des cellules d'une grille régulière du cube [-1, 1]³.
+
+    Returns:
+        Un tableau de forme (resolution³, 3)
+    """
+    axe = (np.arange(resolution) + 0.5) / resolution * 2 - 1
+    return np.stack(np.meshgrid(axe, axe, axe, indexing="ij"), axis=-1).reshape(-1, 3)
+
+
+def filons_disjoints(centres, rotations, demi_dimensions, paires):
+    """
+    Test des axes séparateurs entre les parallélépipèdes orientés de paires de filons.
+
+    Args:
+        centres, rotations, demi_dimensions: repères des filons (voir geometrie.reperes_filons)
+        paires: tableau de forme (m, 2) des indices des filons comparés
+
+    Returns:
+        Un tableau booléen de forme (m,): vrai si les deux filons sont disjoints
+    """
+    premiers, seconds = paires[:, 0], paires[:, 1]
+    rotations_1, rotations_2 = rotations[premiers], rotations[seconds]
+    ecarts = centres[seconds] - centres[premiers]
+
+    # Axes candidats: les 3 axes de chaque filon et leurs 9 produits vectoriels
+    axes = ([rotations_1[:, a] for a in range(3)] + [rotations_2[:, b] for b in range(3)]
+            + [np.cross(rotations_1[:, a], rotations_2[:, b]) for a in range(3) for b in range(3)])
+    disjoints = np.zeros(len(paires), dtype=bool)
+    for axe in axes:
+        # Demi-étendue de chaque filon projeté sur l'axe
+        rayon_1 = (np.abs(np.einsum("nax,nx->na", rotations_1, axe)) * demi_dimensions[premiers]).sum(axis=1)
+        rayon_2 = (np.abs(np.einsum("nax,nx->na", rotations_2, axe)) * demi_dimensions[seconds]).sum(axis=1)
+        disjoints |= np.abs((ecarts * axe).sum(axis=1)) > rayon_1 + rayon_2
+    return disjoints
+
+
+def volumes_partages(corps_mineralises, resolution=RESOLUTION_CHEVAUCHEMENT, index=None):
+    """
+    Volume de chaque corps déjà compté dans un corps qui le précède.
+
+    Args:
+        corps_mineralises: liste de dictionnaires de corps minéralisés
+        resolution: nombre de points d'échantillonnage par axe
+        index: index spatial des corps (optionnel, voir index_spatial.construire_index)
+
+    Returns:
+        Un tableau de forme (n,) des volumes partagés (m³), nuls pour le premier
+        corps, pour les corps sans chevauchement et pour les corps sans coordonnées
+        (voir geometrie.filons_positionnes)
+    """
+    partages = np.zeros(len(corps_mineralises))
+    positionnes = filons_positionnes(corps_mineralises)
+    if positionnes.sum() < 2:
+        return partages
+    paires = paires_chevauchantes(index if index is not None else construire_index(corps_mineralises))
+    paires = paires[positionnes[paires].all(axis=1)]
+    if not len(paires):
+        return partages
+
+    centres, rotations, demi_dimensions = reperes_filons(corps_mineralises)
+    paires = paires[~filons_disjoints(centres, rotations, demi_dimensions, paires)]
+    if not len(paires):
+        return partages
+    unitaires = points_echantillonnage(resolution)
+
+    # Paires regroupées par corps suivant (paires[:, 1]), voisins précédents en paires[:, 0]
+    paires = paires[np.argsort(paires[:, 1], kind="stable")]
+    corps_suivants, debuts = np.unique(paires[:, 1], return_index=True)
+    for corps_idx, precedents in zip(corps_suivants, np.split(paires[:, 0], debuts[1:])):
+        points = centres[corps_idx] + (unitaires * demi_dimensions[corps_idx]) @ rotations[corps_idx]
+        restants = np.arange(len(points))
+        for debut in range(0, len(precedents), TAILLE_LOT_VOISINS):
+            lot = precedents[debut:debut + TAILLE_LOT_VOISINS]
+            # Coordonnées locales des points pas encore couverts le long de chaque axe des voisins,
+            # (point - centre) @ axe, en un produit matriciel par axe pour tout le lot
+            interieurs = np.ones((len(restants), len(lot)), dtype=bool)
+            for axe in range(3):
+                axes = rotations[lot, axe]
+                locales = points[restants] @ axes.T - (centres[lot] * axes).sum(axis=1)
+                interieurs &= np.abs(locales) <= demi_dimensions[lot, axe]
+            restants = restants[~interieurs.any(axis=1)]
+            if not len(restants):
+                break
+        partages[corps_idx] = (1 - len(restants) / len(points)) * 8 * demi_dimensions[corps_idx].prod()
+    return partages
@@ -0,0 +1,174 @@
+"""
+Classification des ressources bloc par bloc selon la distance aux recoupements.
+
+Un recoupement (point de percement) est le milieu de la traversée d'un filon
+par un forage: celui des forages planifiés sur une grille (forage.table_forages,
+intersection.intersecter_forages), ou la position moyenne des composites d'un
+forage importé situés dans le filon. Chaque bloc du modèle est classé selon
+la distance à son N-ième recoupement le plus proche dans le même corps: il est
+mesuré si au moins N recoupements sont à moins de maille_mesurees, indiqué si
+au moins N sont à moins de maille_indiquees (bornes de
+estimation.classifier_maille), inféré sinon.
+
+Contrairement à la maille moyenne du scénario, la classification suit la
+répartition réelle des forages: les bordures d'un filon et les zones mal
+recoupées sont déclassées. Les voisins sont cherchés avec l'index de cellules
+de interpolation.index_cellules, par lots de blocs.
+"""
+import numpy as np
+import pandas as pd
+
+from .estimation import CLASSIFICATIONS, diviseurs_metal, tableau_corps
+from .forage import table_forages
+from .geometrie import direction_forage, repere_filon
+from .interpolation import TAILLE_LOT_BLOCS, index_cellules, plus_proches_voisins
+from .intersection import intersecter_forages
+
+# Nombre de recoupements les plus proches pris en compte par défaut
+NB_RECOUPEMENTS_DEFAUT = 3
+
+# Colonnes de tonnage du tableau de classification, une par classe
+COLONNES_CLASSES = {"Mesurées": "tonnage_mesurees", "Indiquées": "tonnage_indiquees", "Inférées": "tonnage_inferees"}
+
+
+def recoupements_plan(corps, maille_x, maille_y, azimuth_forage=270, inclinaison_forage=60,
+                      profondeur_forage_max=np.inf):
+    """
+    Points de recoupement des forages d'une grille avec un corps minéralisé.
+
+    Args:
+        corps: dictionnaire contenant les propriétés du corps minéralisé
+        maille_x, maille_y: espacement le long de la puissance et de la profondeur (m)
+        azimuth_forage, inclinaison_forage: orientation des forages (°)
+        profondeur_forage_max: longueur maximale réalisable d'un forage (m)
+
+    Returns:
+        Un tableau (n, 3) du milieu de la traversée de chaque forage qui recoupe le filon
+    """
+    direction = direction_forage(azimuth_forage, inclinaison_forage)
+    forages = table_forages([corps], maille_x, maille_y, None, None, profondeur_forage_max, azimuth_forage,
+                            inclinaison_forage)
+    collars = forages[["x", "y", "z"]].to_numpy(dtype=float)
+    intersections = intersecter_forages(corps, collars, direction, profondeur_forage_max)
+    touche = intersections["touche"]
+    milieux = (intersections["profondeur_entree"][touche] + intersections["profondeur_sortie"][touche]) / 2
+    return collars[touche] + milieux[:, None] * direction
+
+
+def recoupements_composites(corps_mineralises, composites):
+    """
+    Points de recoupement des forages importés avec chaque corps minéralisé.
+
+    Le recoupement d'un forage est la position moyenne de ses composites situés
+    dans le filon.
+
+    Args:
+        corps_mineralises: liste de dictionnaires de corps minéralisés
+        composites: DataFrame (trou, x, y, z), voir composites.lire_composites
+
+    Returns:
+        Une liste de tableaux (n, 3), un par corps
+    """
+    coordonnees = composites[["x", "y", "z"]].to_numpy(dtype=float)
+    trous = composites["trou"].to_numpy()
+    recoupements = []
+    for corps in corps_mineralises:
+        centre, rotation, demi_dimensions = repere_filon(corps)
+        dedans = np.all(np.abs((coordonnees - centre) @ rotation.T) <= demi_dimensions + 1e-6, axis=1)
+        moyennes = pd.DataFrame(coordonnees[dedans], columns=["x", "y", "z"]).groupby(trous[dedans], sort=False).mean()
+        recoupements.append(moyennes.to_numpy())
+    return recoupements
+
+
+def classifier_blocs(modele, recoupements, maille_mesurees, maille_indiquees,
+                     nb_recoupements=NB_RECOUPEMENTS_DEFAUT, taille_lot=TAILLE_LOT_BLOCS):
+    """
+    Classe chaque bloc d'un modèle selon la distance aux recoupements de son corps.
+
+    Args:
+        modele: modèle retourné par blocs.modele_blocs
+        recoupements: liste de tableaux (n, 3) de points de recoupement, un par corps
+        maille_mesurees: distance maximale (exclue) pour des ressources mesurées (m)
+        maille_indiquees: distance maximale (incluse) pour des ressources indiquées (m)
+        nb_recoupements: nombre de recoupements qui doivent être à moins de ces distances
+        taille_lot: nombre maximal de blocs traités par lot
+
+    Returns:
+        Un dictionnaire de tableaux indexés par bloc: "classe" (indice dans
+        CLASSIFICATIONS) et "distance" (distance au nb_recoupements-ième recoupement
+        le plus proche, inf au-delà de maille_indiquees)
+    """
+    nb_blocs = len(modele["volume"])
+    resultat = {
+        "classe": np.full(nb_blocs, len(CLASSIFICATIONS) - 1, dtype=np.int8),
+        "distance": np.full(nb_blocs, np.inf),
+    }
+    for corps_idx, points in enumerate(recoupements):
+        debut_corps, fin_corps = modele["debuts"][corps_idx], modele["debuts"][corps_idx + 1]
+        if len(points) < nb_recoupements:
+            continue
+        # Cellules de la moitié du rayon de recherche: au plus trois couronnes par bloc
+        index = index_cellules(points, maille_indiquees / 2)
+        for debut in range(debut_corps, fin_corps, taille_lot):
+            blocs = slice(debut, min(debut + taille_lot, fin_corps))
+            distances, _ = plus_proches_voisins(index, points, modele["centres"][blocs], nb_recoupements,
+                                                rayon=maille_indiquees)
+            distance = distances[:, -1]
+            resultat["distance"][blocs] = distance
+            resultat["classe"][blocs] = np.where(distance < maille_mesurees, 0,
+                                                 np.where(distance <= maille_indiquees, 1, 2))
+    return resultat
+
+
+def facteurs_blocs(classes, facteurs_confiance):
+    """
+    Facteur de confiance de chaque bloc selon sa classe.
+
+    Args:
+        classes: indice dans CLASSIFICATIONS de chaque bloc
+        facteurs_confiance: facteurs (mesurées, indiquées, inférées)
+
+    Returns:
+        Un tableau des facteurs
+    """
+    return np.asarray(facteurs_confiance, dtype=float)[classes]
+
+
+def tonnages_classes(modele, corps_mineralises, classes, facteurs_confiance):
+    """
+    Tonnages mesurés, indiqués et inférés de chaque corps et du scénario.
+
+    Args:
+        modele: modèle retourné par blocs.modele_blocs (avec les teneurs des blocs)
+        corps_mineralises: corps minéralisés du modèle
+        classes: indice dans CLASSIFICATIONS de chaque bloc (voir classifier_blocs)
+        facteurs_confiance: facteurs (mesurées, indiquées, inférées) appliqués au tonnage
+
+    Returns:
+        Un DataFrame avec une ligne par corps et une ligne "Total": nom, les colonnes de
+        COLONNES_CLASSES (tonnages bruts), tonnage_ajuste, metal_quantite et metal_unit
+        (le métal total n'est renseigné que si tous les corps ont la même unité)
+    """
+    corps_df = tableau_corps(corps_mineralises)
+    nb_corps, nb_classes = len(corps_df), len(CLASSIFICATIONS)
+    metaux_precieux, diviseur = diviseurs_metal(corps_df["unite_teneur"])
+
+    # Sommes par (corps, classe) en une seule passe
+    cles = modele["corps"].astype(np.int64) * nb_classes + classes
+    tonnages = np.bincount(cles, weights=modele["tonnage"], minlength=nb_corps * nb_classes).reshape(nb_corps, nb_classes)
+    metal = np.bincount(cles, weights=modele["tonnage"] * modele["teneur"],
+                        minlength=nb_corps * nb_classes).reshape(nb_corps, nb_classes)
+    facteurs = np.asarray(facteurs_confiance, dtype=float)
+
+    tableau = pd.DataFrame({"nom": corps_df["nom"].to_numpy()})
+    for rang, classe in enumerate(CLASSIFICATIONS):
+        tableau[COLONNES_CLASSES[classe]] = tonnages[:, rang]
+    tableau["tonnage_ajuste"] = tonnages @ facteurs
+    tableau["metal_quantite"] = metal @ facteurs / diviseur
+    tableau["metal_unit"] = np.where(metaux_precieux, "onces", "tonnes")
+
+    total = tableau.drop(columns=["nom", "metal_unit"]).sum()
+    unites = tableau["metal_unit"].unique()
+    total["metal_quantite"] = total["metal_quantite"] if len(unites) == 1 else np.nan
+    ligne_total = pd.DataFrame([{"nom": "Total", **total, "metal_unit": unites[0] if len(unites) == 1 else ""}])
+    return pd.concat([tableau, ligne_total], ignore_index=True)
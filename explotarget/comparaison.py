@@ -0,0 +1,170 @@
+"""
+Évaluation par lots de plusieurs scénarios et tableau de comparaison.
+
+Chaque scénario est évalué comme dans l'application: classification selon la
+maille (estimation.classifier_maille), estimation des ressources, plan de
+forage, budget et durée de la campagne (ordonnancement des forages sur les
+foreuses, echeancier.simuler_campagne). Les paramètres sont ceux de
+PARAMETRES_DEFAUT (valeurs par défaut de l'interface), éventuellement
+remplacés par ceux du plan de forage sauvegardé dans le scénario.
+
+Les scénarios sont évalués en parallèle dans un pool de processus, un
+scénario par tâche; le moteur ne dépend pas de Streamlit et sert aussi à
+l'évaluation en ligne de commande.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .estimation import COLONNES_RESULTATS, classifier_maille, estimer_scenario
+from .echeancier import durees_phases, simuler_campagne
+from .forage import budget_campagne, planifier_campagne, table_forages
+from .intersection import MARGE_SORTIE_DEFAUT
+
+# Paramètres d'évaluation par défaut (valeurs par défaut des pages Estimation et Planification)
+PARAMETRES_DEFAUT = {
+    "maille_x": 100.0, "maille_y": 100.0,
+    "maille_mesurees": 50.0, "maille_indiquees": 100.0,
+    "facteurs_confiance": (0.95, 0.8, 0.6),
+    "maille_initiale_x": 100.0, "maille_initiale_y": 100.0, "maille_detail_x": 50.0, "maille_detail_y": 50.0,
+    "profondeur_forage_max": 300.0, "longueur_echantillon": 1.0,
+    "cout_metre": 150.0, "cout_analyses": 30.0, "cout_mobilisation": 50000.0,
+    "azimuth_forage": 270.0, "inclinaison_forage": 60.0, "marge_sortie": MARGE_SORTIE_DEFAUT,
+    "metres_par_jour": 100.0, "jours_mobilisation": 15, "nb_foreuses": 1, "vitesse_deplacement": 2000.0,
+    "jours_installation": 0.5, "delai_laboratoire": 30.0,
+}
+
+# Paramètres repris du plan de forage sauvegardé dans un scénario
+PARAMETRES_PLAN = ["maille_initiale_x", "maille_initiale_y", "maille_detail_x", "maille_detail_y",
+                   "profondeur_forage_max", "cout_metre", "cout_analyses", "cout_mobilisation",
+                   "azimuth_forage", "inclinaison_forage", "marge_sortie", "metres_par_jour", "jours_mobilisation",
+                   "nb_foreuses", "vitesse_deplacement", "jours_installation", "delai_laboratoire"]
+
+# Paramètres transmis à forage.table_forages
+PARAMETRES_FORAGES = ["maille_initiale_x", "maille_initiale_y", "maille_detail_x", "maille_detail_y",
+                      "profondeur_forage_max", "azimuth_forage", "inclinaison_forage", "marge_sortie"]
+
+# Paramètres transmis à echeancier.simuler_campagne
+PARAMETRES_ECHEANCIER = ["nb_foreuses", "metres_par_jour", "jours_mobilisation", "vitesse_deplacement",
+                         "jours_installation", "delai_laboratoire"]
+
+# Paramètres transmis à forage.planifier_campagne
+PARAMETRES_PLANIFICATION = ["maille_initiale_x", "maille_initiale_y", "maille_detail_x", "maille_detail_y",
+                            "profondeur_forage_max", "longueur_echantillon", "cout_metre", "cout_analyses",
+                            "azimuth_forage", "inclinaison_forage", "marge_sortie"]
+
+# Colonnes du tableau de comparaison, dans l'ordre d'affichage
+COLONNES_COMPARAISON = ["id", "nom", "nb_corps", "classification", "facteur_confiance", "tonnage",
+                        "metal_onces", "metal_tonnes", "nb_forages", "metres_initial", "metres_detail",
+                        "metres_total", "budget_total", "duree_totale"]
+
+
+def parametres_scenario(scenario, parametres=None, plan_sauvegarde=True):
+    """
+    Paramètres d'évaluation d'un scénario.
+
+    Args:
+        scenario: dictionnaire du scénario
+        parametres: paramètres remplaçant ceux de PARAMETRES_DEFAUT
+        plan_sauvegarde: reprendre les paramètres du plan de forage sauvegardé dans le scénario
+
+    Returns:
+        Un dictionnaire complet de paramètres
+    """
+    complets = {**PARAMETRES_DEFAUT, **(parametres or {})}
+    plan = scenario.get("plan_forage") or {}
+    if plan_sauvegarde:
+        complets.update({cle: plan[cle] for cle in PARAMETRES_PLAN if plan.get(cle) is not None})
+    return complets
+
+
+def evaluer_scenario(scenario, parametres=None, plan_sauvegarde=True):
+    """
+    Évalue un scénario: estimation des ressources, plan de forage, budget et durée.
+
+    Args:
+        scenario: dictionnaire du scénario (avec "corps_mineralises")
+        parametres: paramètres remplaçant ceux de PARAMETRES_DEFAUT
+        plan_sauvegarde: reprendre les paramètres du plan de forage sauvegardé dans le scénario
+
+    Returns:
+        Un dictionnaire {"resume" (ligne du tableau de comparaison), "estimation" (DataFrame
+        de COLONNES_RESULTATS), "forage" (DataFrame, une ligne par corps), "forages" (table des
+        forages de forage.table_forages, une ligne par forage), "budget", "parametres"}
+    """
+    p = parametres_scenario(scenario, parametres, plan_sauvegarde)
+    corps_mineralises = scenario.get("corps_mineralises") or []
+
+    classification, facteur_confiance = classifier_maille(p["maille_x"], p["maille_y"], p["maille_mesurees"],
+                                                          p["maille_indiquees"], *p["facteurs_confiance"])
+    if corps_mineralises:
+        resultats_df, total_tonnage, _ = estimer_scenario(corps_mineralises, facteur_confiance)
+    else:
+        resultats_df, total_tonnage = pd.DataFrame(columns=COLONNES_RESULTATS), 0.0
+    forages = table_forages(corps_mineralises, **{cle: p[cle] for cle in PARAMETRES_FORAGES})
+    resultats_forage, totaux = planifier_campagne(corps_mineralises, forages=forages,
+                                                  **{cle: p[cle] for cle in PARAMETRES_PLANIFICATION})
+    budget = budget_campagne(resultats_forage, p["cout_metre"], p["cout_analyses"], p["cout_mobilisation"])
+    chronologie, _ = simuler_campagne(forages, **{cle: p[cle] for cle in PARAMETRES_ECHEANCIER})
+    jours_phase1, jours_phase2 = durees_phases(chronologie, p["jours_mobilisation"])
+
+    metal = resultats_df.groupby("metal_unit")["metal_quantite"].sum()
+    resume = {
+        "id": scenario.get("id"),
+        "nom": scenario.get("nom"),
+        "nb_corps": len(corps_mineralises),
+        "classification": classification,
+        "facteur_confiance": facteur_confiance,
+        "tonnage": total_tonnage,
+        "metal_onces": float(metal.get("onces", 0.0)),
+        "metal_tonnes": float(metal.get("tonnes", 0.0)),
+        "nb_forages": totaux["total_forages_initial"] + totaux["total_forages_detaille"],
+        "metres_initial": totaux["total_metres_initial"],
+        "metres_detail": totaux["total_metres_detaille"],
+        "metres_total": totaux["total_metres_initial"] + totaux["total_metres_detaille"],
+        "budget_total": budget["cout_total"],
+        "duree_totale": float(p["jours_mobilisation"] + jours_phase1 + jours_phase2),
+    }
+    return {"resume": resume, "estimation": resultats_df, "forage": pd.DataFrame(resultats_forage),
+            "forages": forages, "budget": budget, "parametres": p}
+
+
+def evaluer_scenarios(scenarios, parametres=None, plan_sauvegarde=True, nb_processus=None):
+    """
+    Évalue plusieurs scénarios en parallèle.
+
+    Args:
+        scenarios: liste de dictionnaires de scénarios
+        parametres: paramètres remplaçant ceux de PARAMETRES_DEFAUT (communs à tous les scénarios)
+        plan_sauvegarde: reprendre les paramètres du plan de forage sauvegardé dans chaque scénario
+        nb_processus: taille du pool de processus (1: évaluation dans le processus courant)
+
+    Returns:
+        La liste des résultats de evaluer_scenario, dans l'ordre des scénarios
+    """
+    nb_processus = nb_processus or os.cpu_count() or 1
+    if nb_processus == 1 or len(scenarios) <= 1:
+        return [evaluer_scenario(scenario, parametres, plan_sauvegarde) for scenario in scenarios]
+    with ProcessPoolExecutor(max_workers=min(nb_processus, len(scenarios))) as pool:
+        futures = [pool.submit(evaluer_scenario, scenario, parametres, plan_sauvegarde) for scenario in scenarios]
+        return [future.result() for future in futures]
+
+
+def tableau_comparaison(resultats):
+    """
+    Tableau de comparaison des scénarios évalués.
+
+    Args:
+        resultats: résultats de evaluer_scenarios
+
+    Returns:
+        Un DataFrame avec les colonnes de COLONNES_COMPARAISON, une ligne par scénario,
+        complété de cout_par_once et cout_par_tonne (budget rapporté au métal, NaN sans métal)
+    """
+    tableau = pd.DataFrame([resultat["resume"] for resultat in resultats], columns=COLONNES_COMPARAISON)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for colonne, metal in (("cout_par_once", "metal_onces"), ("cout_par_tonne", "metal_tonnes")):
+            tableau[colonne] = np.where(tableau[metal] > 0, tableau["budget_total"] / tableau[metal], np.nan)
+    return tableau
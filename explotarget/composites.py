@@ -0,0 +1,262 @@
+"""
+Lecture des composites de forage (collars, levés de déviation, analyses) et
+calcul de leur position dans l'espace.
+
+Formats attendus (CSV, séparateur ',' ';' ou tabulation, noms de colonnes
+insensibles à la casse, synonymes anglais acceptés, voir CHAMPS):
+- collars: trou, x, y, z, et optionnellement azimuth, inclinaison (orientation
+  du forage s'il n'a pas de levé de déviation);
+- levés de déviation (optionnels): trou, profondeur, azimuth, inclinaison;
+- analyses: trou, de, a, teneur (une ligne par intervalle composité).
+
+Les coordonnées sont celles du modèle 3D (x vers l'Est, y vers le Nord, z
+l'altitude, 0 au sol). L'inclinaison des forages suit la convention de la
+page de planification: angle sous l'horizontale, positif vers le bas (les
+valeurs négatives des levés usuels sont acceptées et prises en valeur absolue).
+
+Les fichiers sont lus par blocs en ne conservant que les colonnes utiles; la
+position du milieu de chaque intervalle est calculée par la méthode des angles
+moyens, de façon vectorisée pour tous les forages (un million d'intervalles
+tiennent en quelques dizaines de mégaoctets).
+"""
+import csv
+import io
+
+import numpy as np
+import pandas as pd
+
+from .geometrie import direction_forage
+
+# Noms de colonnes acceptés pour chaque champ (comparés en minuscules)
+CHAMPS = {
+    "trou": ["trou", "forage", "hole_id", "holeid", "hole", "bhid"],
+    "x": ["x", "est", "easting", "east"],
+    "y": ["y", "nord", "northing", "north"],
+    "z": ["z", "elevation", "élévation", "altitude", "rl"],
+    "profondeur": ["profondeur", "depth", "at"],
+    "azimuth": ["azimuth", "azimut", "azi"],
+    "inclinaison": ["inclinaison", "dip", "pendage"],
+    "de": ["de", "from", "depuis"],
+    "a": ["a", "à", "to"],
+    "teneur": ["teneur", "grade"],
+}
+
+# Nombre de lignes lues par bloc
+TAILLE_BLOC_LIGNES = 200_000
+
+# Inclinaison des forages sans levé ni orientation au collar (vertical)
+INCLINAISON_DEFAUT = 90.0
+
+
+def _colonnes(entete, champs, colonne_teneur=None):
+    """Associe les champs demandés aux colonnes d'un en-tête (insensible à la casse)."""
+    minuscules = {colonne.strip().lower(): colonne for colonne in entete}
+    correspondances = {}
+    for champ in champs:
+        noms = [colonne_teneur.lower()] if champ == "teneur" and colonne_teneur else CHAMPS[champ]
+        trouvee = next((minuscules[nom] for nom in noms if nom in minuscules), None)
+        if trouvee is not None:
+            correspondances[trouvee] = champ
+    return correspondances
+
+
+def lire_table(flux, obligatoires, optionnels=(), colonne_teneur=None, taille_bloc=TAILLE_BLOC_LIGNES):
+    """
+    Lit un fichier CSV de forage par blocs, en ne conservant que les champs utiles.
+
+    Args:
+        flux: fichier binaire ou texte, ou chemin
+        obligatoires: champs de CHAMPS qui doivent être présents
+        optionnels: champs de CHAMPS conservés s'ils sont présents
+        colonne_teneur: nom de la colonne de teneur, si elle ne s'appelle pas "teneur" ou "grade"
+        taille_bloc: nombre de lignes lues par bloc
+
+    Returns:
+        Un DataFrame avec une colonne par champ trouvé ("trou" en texte, les autres en réels)
+
+    Raises:
+        ValueError: si un champ obligatoire est absent ou si une valeur n'est pas numérique
+    """
+    texte = flux
+    if not isinstance(flux, (str, io.TextIOBase)) and hasattr(flux, "read"):
+        flux.seek(0)
+        texte = io.TextIOWrapper(flux, encoding="utf-8-sig", newline="")
+    try:
+        if isinstance(texte, str):
+            with open(texte, encoding="utf-8-sig", newline="") as fichier:
+                debut = fichier.read(4096)
+        else:
+            debut = texte.read(4096)
+            texte.seek(0)
+        try:
+            separateur = csv.Sniffer().sniff(debut, delimiters=",;\t").delimiter
+        except csv.Error:
+            separateur = ","
+        entete = next(csv.reader(io.StringIO(debut), delimiter=separateur), [])
+
+        correspondances = _colonnes(entete, [*obligatoires, *optionnels], colonne_teneur)
+        manquants = [champ for champ in obligatoires if champ not in correspondances.values()]
+        if manquants:
+            raise ValueError(f"colonne(s) manquante(s): {', '.join(manquants)}")
+
+        types = {colonne: (str if champ == "trou" else float) for colonne, champ in correspondances.items()}
+        try:
+            blocs = [bloc.rename(columns=correspondances)
+                     for bloc in pd.read_csv(texte, sep=separateur, usecols=list(correspondances), dtype=types,
+                                             chunksize=taille_bloc)]
+        except ValueError as erreur:
+            raise ValueError(f"valeur non numérique: {erreur}") from erreur
+    finally:
+        if texte is not flux:
+            texte.detach()
+
+    table = pd.concat(blocs, ignore_index=True) if blocs else pd.DataFrame(columns=list(correspondances.values()))
+    table["trou"] = table["trou"].astype(str).str.strip()
+    return table
+
+
+def _directions(azimuth, inclinaison):
+    """Vecteurs unitaires (n, 3) des directions de forage."""
+    return direction_forage(np.asarray(azimuth, dtype=float), np.abs(np.asarray(inclinaison, dtype=float))).T
+
+
+def stations_forages(collars, leves=None):
+    """
+    Positions et directions des stations de levé de tous les forages.
+
+    Une station est ajoutée au collar (profondeur 0) de chaque forage, avec la
+    direction de son premier levé, ou à défaut l'orientation du collar, ou la
+    verticale. Entre deux stations, le forage suit la moyenne de leurs
+    directions (méthode des angles moyens); au-delà de la dernière, la
+    direction de celle-ci.
+
+    Args:
+        collars: DataFrame (trou, x, y, z[, azimuth, inclinaison])
+        leves: DataFrame (trou, profondeur, azimuth, inclinaison), ou None
+
+    Returns:
+        Un DataFrame trié par (trou, profondeur) avec les colonnes trou, profondeur,
+        x, y, z (position de la station) et dx, dy, dz (direction du tronçon qui la suit)
+    """
+    collars = collars.drop_duplicates("trou").set_index("trou")
+    azimuth = collars["azimuth"] if "azimuth" in collars else pd.Series(0.0, index=collars.index)
+    inclinaison = collars["inclinaison"] if "inclinaison" in collars else pd.Series(INCLINAISON_DEFAUT, index=collars.index)
+    tete = pd.DataFrame({"trou": collars.index, "profondeur": 0.0,
+                         "azimuth": azimuth.fillna(0.0).to_numpy(),
+                         "inclinaison": inclinaison.fillna(INCLINAISON_DEFAUT).to_numpy()})
+
+    if leves is not None and len(leves):
+        leves = leves[leves["trou"].isin(collars.index)].dropna(subset=["profondeur", "azimuth", "inclinaison"])
+        # La station du collar prend la direction du premier levé du forage
+        premiers = leves.sort_values("profondeur").drop_duplicates("trou").set_index("trou")
+        avec_leve = tete["trou"].isin(premiers.index)
+        tete.loc[avec_leve, ["azimuth", "inclinaison"]] = (
+            premiers.loc[tete.loc[avec_leve, "trou"], ["azimuth", "inclinaison"]].to_numpy())
+        stations = pd.concat([tete, leves[leves["profondeur"] > 0][tete.columns]], ignore_index=True)
+    else:
+        stations = tete
+    stations = stations.sort_values(["trou", "profondeur"], kind="stable", ignore_index=True)
+
+    # Direction de chaque tronçon: moyenne des directions de ses deux stations
+    directions = _directions(stations["azimuth"], stations["inclinaison"])
+    meme_trou = np.append(stations["trou"].to_numpy()[1:] == stations["trou"].to_numpy()[:-1], False)
+    suivantes = np.vstack([directions[1:], directions[-1:]])
+    troncons = np.where(meme_trou[:, None], directions + suivantes, directions)
+    troncons /= np.linalg.norm(troncons, axis=1, keepdims=True)
+
+    # Positions: collar + somme cumulée des tronçons précédents du même forage
+    longueurs = np.diff(stations["profondeur"].to_numpy(), append=0.0) * meme_trou
+    deplacements = pd.DataFrame(troncons * longueurs[:, None]).groupby(stations["trou"].to_numpy()).cumsum()
+    deplacements = deplacements.to_numpy() - troncons * longueurs[:, None]
+    origines = collars.loc[stations["trou"], ["x", "y", "z"]].to_numpy(dtype=float)
+
+    positions = origines + deplacements
+    return pd.DataFrame({
+        "trou": stations["trou"].to_numpy(), "profondeur": stations["profondeur"].to_numpy(),
+        "x": positions[:, 0], "y": positions[:, 1], "z": positions[:, 2],
+        "dx": troncons[:, 0], "dy": troncons[:, 1], "dz": troncons[:, 2],
+    })
+
+
+def positions_profondeurs(stations, trous, profondeurs):
+    """
+    Coordonnées de points situés à des profondeurs données le long des forages.
+
+    Args:
+        stations: DataFrame retourné par stations_forages
+        trous: identifiant du forage de chaque point
+        profondeurs: profondeur de chaque point le long du forage (m)
+
+    Returns:
+        Un tuple (positions (n, 3), connu) où connu indique les points dont le forage a un collar
+    """
+    codes_stations, forages = pd.factorize(stations["trou"])
+    codes = forages.get_indexer(np.asarray(trous))
+    connu = codes >= 0
+    profondeurs = np.asarray(profondeurs, dtype=float)
+
+    # Recherche de la dernière station au-dessus de chaque point (stations triées par forage puis profondeur)
+    echelle = float(max(stations["profondeur"].max(), np.nanmax(profondeurs, initial=0.0))) + 1.0
+    cles_stations = codes_stations * echelle + stations["profondeur"].to_numpy()
+    station = np.searchsorted(cles_stations, np.where(connu, codes, 0) * echelle + profondeurs, side="right") - 1
+    station = np.clip(station, 0, len(stations) - 1)
+
+    depart = stations[["x", "y", "z"]].to_numpy()[station]
+    direction = stations[["dx", "dy", "dz"]].to_numpy()[station]
+    positions = depart + (profondeurs - stations["profondeur"].to_numpy()[station])[:, None] * direction
+    return positions, connu
+
+
+def lire_composites(collars, analyses, leves=None, colonne_teneur=None, taille_bloc=TAILLE_BLOC_LIGNES):
+    """
+    Lit les fichiers de forage et positionne le milieu de chaque intervalle analysé.
+
+    Args:
+        collars, analyses: fichiers CSV (ou chemins) des collars et des analyses
+        leves: fichier CSV des levés de déviation (optionnel)
+        colonne_teneur: nom de la colonne de teneur des analyses (par défaut "teneur" ou "grade")
+        taille_bloc: nombre de lignes lues par bloc
+
+    Returns:
+        Un tuple (composites, rapport): DataFrame (trou, x, y, z, longueur, teneur) et
+        dictionnaire {"nb_intervalles", "nb_composites", "nb_sans_collar", "nb_sans_teneur"}
+
+    Raises:
+        ValueError: si un fichier ne contient pas les colonnes attendues
+    """
+    try:
+        table_collars = lire_table(collars, ["trou", "x", "y", "z"], ["azimuth", "inclinaison"], taille_bloc=taille_bloc)
+    except ValueError as erreur:
+        raise ValueError(f"Collars: {erreur}") from erreur
+    try:
+        table_leves = (lire_table(leves, ["trou", "profondeur", "azimuth", "inclinaison"], taille_bloc=taille_bloc)
+                       if leves is not None else None)
+    except ValueError as erreur:
+        raise ValueError(f"Levés de déviation: {erreur}") from erreur
+    try:
+        table_analyses = lire_table(analyses, ["trou", "de", "a", "teneur"], colonne_teneur=colonne_teneur,
+                                    taille_bloc=taille_bloc)
+    except ValueError as erreur:
+        raise ValueError(f"Analyses: {erreur}") from erreur
+
+    nb_intervalles = len(table_analyses)
+    sans_teneur = table_analyses["teneur"].isna() | table_analyses["teneur"].lt(0)
+    table_analyses = table_analyses[~sans_teneur]
+
+    stations = stations_forages(table_collars.dropna(subset=["x", "y", "z"]), table_leves)
+    de, a = table_analyses["de"].to_numpy(), table_analyses["a"].to_numpy()
+    positions, connu = positions_profondeurs(stations, table_analyses["trou"].to_numpy(), (de + a) / 2)
+
+    composites = pd.DataFrame({
+        "trou": table_analyses["trou"].to_numpy()[connu],
+        "x": positions[connu, 0], "y": positions[connu, 1], "z": positions[connu, 2],
+        "longueur": (a - de)[connu],
+        "teneur": table_analyses["teneur"].to_numpy()[connu],
+    })
+    rapport = {
+        "nb_intervalles": nb_intervalles,
+        "nb_composites": len(composites),
+        "nb_sans_collar": int((~connu).sum()),
+        "nb_sans_teneur": int(sans_teneur.sum()),
+    }
+    return composites, rapport
@@ -0,0 +1,299 @@
+"""
+Dépôt persistant des scénarios dans une base SQLite locale.
+
+Les scénarios, leurs corps minéralisés et leurs plans de forage sont stockés
+dans trois tables indexées. Les colonnes servent aux listes et aux recherches;
+le dictionnaire complet de chaque enregistrement est conservé en JSON
+(colonne "donnees") et restitué tel quel au chargement.
+
+Les listes sont paginées (LIMIT/OFFSET sur des colonnes indexées): afficher une
+page ne charge ni les autres scénarios ni leurs corps minéralisés.
+"""
+import json
+import sqlite3
+import uuid
+from datetime import datetime
+
+import numpy as np
+
+# Nombre de scénarios par page dans les listes
+TAILLE_PAGE_DEFAUT = 20
+
+# Ordres de tri proposés par lister_scenarios
+ORDRES = {
+    "recents": "s.date_modification DESC, s.rowid DESC",
+    "date": "s.date_creation DESC, s.rowid DESC",
+    "nom": "s.nom COLLATE NOCASE ASC",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    id TEXT PRIMARY KEY,
+    nom TEXT NOT NULL,
+    date_creation TEXT,
+    date_modification TEXT,
+    description TEXT,
+    localisation TEXT,
+    substance_principale TEXT,
+    nb_corps INTEGER NOT NULL DEFAULT 0,
+    donnees TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scenarios_nom ON scenarios (nom COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_scenarios_date_creation ON scenarios (date_creation);
+CREATE INDEX IF NOT EXISTS idx_scenarios_date_modification ON scenarios (date_modification);
+
+CREATE TABLE IF NOT EXISTS corps (
+    scenario_id TEXT NOT NULL REFERENCES scenarios (id) ON DELETE CASCADE,
+    rang INTEGER NOT NULL,
+    id TEXT,
+    nom TEXT,
+    puissance REAL,
+    epaisseur REAL,
+    profondeur REAL,
+    teneur REAL,
+    unite_teneur TEXT,
+    densite REAL,
+    donnees TEXT NOT NULL,
+    PRIMARY KEY (scenario_id, rang)
+);
+CREATE INDEX IF NOT EXISTS idx_corps_id ON corps (id);
+CREATE INDEX IF NOT EXISTS idx_corps_nom ON corps (nom);
+
+CREATE TABLE IF NOT EXISTS plans_forage (
+    scenario_id TEXT PRIMARY KEY REFERENCES scenarios (id) ON DELETE CASCADE,
+    date_creation TEXT,
+    type_forage TEXT,
+    budget_total REAL,
+    duree_totale REAL,
+    donnees TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_plans_forage_date_creation ON plans_forage (date_creation);
+"""
+
+# Colonnes des corps minéralisés copiées hors du JSON
+COLONNES_CORPS = ["id", "nom", "puissance", "epaisseur", "profondeur", "teneur", "unite_teneur", "densite"]
+
+
+def _json_defaut(valeur):
+    """Convertit les scalaires et tableaux NumPy pour json.dumps."""
+    if isinstance(valeur, np.generic):
+        return valeur.item()
+    if isinstance(valeur, np.ndarray):
+        return valeur.tolist()
+    return str(valeur)
+
+
+def _vers_json(donnees):
+    return json.dumps(donnees, default=_json_defaut, ensure_ascii=False)
+
+
+def ouvrir_depot(chemin):
+    """
+    Ouvre (et crée si besoin) la base SQLite des scénarios.
+
+    Une connexion ne doit pas être partagée entre utilisateurs simultanés: ses
+    transactions s'entremêleraient. Ouvrir une connexion par session ou par fil
+    d'exécution; SQLite sérialise les écritures des différentes connexions.
+
+    Args:
+        chemin: chemin du fichier de base de données (":memory:" pour une base temporaire)
+
+    Returns:
+        Une connexion sqlite3, utilisable successivement depuis plusieurs fils d'exécution
+        (exécutions successives d'une même session Streamlit)
+    """
+    connexion = sqlite3.connect(chemin, check_same_thread=False)
+    connexion.row_factory = sqlite3.Row
+    connexion.execute("PRAGMA foreign_keys = ON")
+    if chemin != ":memory:":
+        connexion.execute("PRAGMA journal_mode = WAL")
+    connexion.executescript(SCHEMA)
+    return connexion
+
+
+def _inserer_corps(connexion, scenario_id, corps_mineralises, rang_initial=0):
+    """Insère des corps minéralisés d'un scénario à partir d'un rang donné."""
+    connexion.executemany(
+        f"INSERT INTO corps (scenario_id, rang, {', '.join(COLONNES_CORPS)}, donnees)"
+        f" VALUES (?, ?, {', '.join('?' * len(COLONNES_CORPS))}, ?)",
+        [(scenario_id, rang_initial + rang, *(corps.get(colonne) for colonne in COLONNES_CORPS), _vers_json(corps))
+         for rang, corps in enumerate(corps_mineralises)]
+    )
+
+
+def _enregistrer(connexion, scenario):
+    """Insère ou remplace un scénario, ses corps et son plan de forage (sans valider la transaction)."""
+    scenario = dict(scenario)
+    scenario.setdefault("id", str(uuid.uuid4()))
+    scenario.setdefault("date_creation", datetime.now().strftime("%Y-%m-%d"))
+    scenario.setdefault("corps_mineralises", [])
+    corps_mineralises = scenario["corps_mineralises"]
+    plan = scenario.get("plan_forage")
+
+    connexion.execute("DELETE FROM scenarios WHERE id = ?", (scenario["id"],))
+    connexion.execute(
+        "INSERT INTO scenarios (id, nom, date_creation, date_modification, description, localisation,"
+        " substance_principale, nb_corps, donnees) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (scenario["id"], scenario.get("nom", ""), scenario["date_creation"], datetime.now().isoformat(),
+         scenario.get("description"), scenario.get("localisation"), scenario.get("substance_principale"),
+         len(corps_mineralises),
+         _vers_json({cle: valeur for cle, valeur in scenario.items() if cle not in ("corps_mineralises", "plan_forage")}))
+    )
+    _inserer_corps(connexion, scenario["id"], corps_mineralises)
+    if plan is not None:
+        connexion.execute(
+            "INSERT INTO plans_forage (scenario_id, date_creation, type_forage, budget_total, duree_totale, donnees)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (scenario["id"], plan.get("date_creation"), plan.get("type_forage"),
+             _json_defaut(plan["budget_total"]) if "budget_total" in plan else None,
+             _json_defaut(plan["duree_totale"]) if "duree_totale" in plan else None,
+             _vers_json(plan))
+        )
+    return scenario["id"]
+
+
+def enregistrer_scenario(connexion, scenario):
+    """
+    Enregistre un scénario complet (remplace la version existante de même id).
+
+    Args:
+        connexion: connexion retournée par ouvrir_depot
+        scenario: dictionnaire du scénario (avec "corps_mineralises" et éventuellement "plan_forage")
+
+    Returns:
+        L'id du scénario enregistré
+    """
+    with connexion:
+        return _enregistrer(connexion, scenario)
+
+
+def importer_scenarios(connexion, scenarios):
+    """
+    Enregistre une liste de scénarios en une seule transaction.
+
+    Returns:
+        Le nombre de scénarios enregistrés
+    """
+    with connexion:
+        for scenario in scenarios:
+            _enregistrer(connexion, scenario)
+    return len(scenarios)
+
+
+def ids_corps(connexion, scenario_id):
+    """Ensemble des id des corps minéralisés d'un scénario."""
+    return {ligne[0] for ligne in connexion.execute("SELECT id FROM corps WHERE scenario_id = ?", (scenario_id,))}
+
+
+def ajouter_corps(connexion, scenario_id, corps_mineralises):
+    """
+    Ajoute des corps minéralisés à la fin d'un scénario enregistré, sans le recharger.
+
+    Args:
+        connexion: connexion retournée par ouvrir_depot
+        scenario_id: id d'un scénario existant
+        corps_mineralises: liste de dictionnaires de corps minéralisés
+
+    Returns:
+        Le nombre de corps ajoutés
+    """
+    with connexion:
+        rang_suivant = connexion.execute(
+            "SELECT COALESCE(MAX(rang) + 1, 0) FROM corps WHERE scenario_id = ?", (scenario_id,)
+        ).fetchone()[0]
+        _inserer_corps(connexion, scenario_id, corps_mineralises, rang_suivant)
+        connexion.execute(
+            "UPDATE scenarios SET nb_corps = nb_corps + ?, date_modification = ? WHERE id = ?",
+            (len(corps_mineralises), datetime.now().isoformat(), scenario_id)
+        )
+    return len(corps_mineralises)
+
+
+def scenario_existe(connexion, scenario_id):
+    """Indique si un scénario de cet id est enregistré."""
+    return connexion.execute("SELECT 1 FROM scenarios WHERE id = ?", (scenario_id,)).fetchone() is not None
+
+
+def charger_scenario(connexion, scenario_id):
+    """
+    Charge un scénario complet.
+
+    Returns:
+        Le dictionnaire du scénario, ou None s'il n'existe pas
+    """
+    ligne = connexion.execute("SELECT donnees FROM scenarios WHERE id = ?", (scenario_id,)).fetchone()
+    if ligne is None:
+        return None
+    scenario = json.loads(ligne["donnees"])
+    scenario["corps_mineralises"] = [
+        json.loads(corps["donnees"])
+        for corps in connexion.execute("SELECT donnees FROM corps WHERE scenario_id = ? ORDER BY rang", (scenario_id,))
+    ]
+    plan = connexion.execute("SELECT donnees FROM plans_forage WHERE scenario_id = ?", (scenario_id,)).fetchone()
+    if plan is not None:
+        scenario["plan_forage"] = json.loads(plan["donnees"])
+    return scenario
+
+
+def supprimer_scenario(connexion, scenario_id):
+    """Supprime un scénario avec ses corps minéralisés et son plan de forage."""
+    with connexion:
+        connexion.execute("DELETE FROM scenarios WHERE id = ?", (scenario_id,))
+
+
+def _filtre_recherche(recherche):
+    if not recherche:
+        return "", ()
+    return " WHERE s.nom LIKE ? ESCAPE '\\' COLLATE NOCASE", (
+        "%" + recherche.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%",)
+
+
+def compter_scenarios(connexion, recherche=None):
+    """Nombre de scénarios, éventuellement filtrés par une partie de leur nom."""
+    filtre, valeurs = _filtre_recherche(recherche)
+    return connexion.execute(f"SELECT COUNT(*) FROM scenarios s{filtre}", valeurs).fetchone()[0]
+
+
+def lister_scenarios(connexion, page=0, taille_page=TAILLE_PAGE_DEFAUT, recherche=None, ordre="recents"):
+    """
+    Liste une page de résumés de scénarios, sans charger leurs corps minéralisés.
+
+    Args:
+        connexion: connexion retournée par ouvrir_depot
+        page: numéro de page (à partir de 0)
+        taille_page: nombre de scénarios par page
+        recherche: partie du nom recherchée (optionnel)
+        ordre: clé de ORDRES
+
+    Returns:
+        Une liste de dictionnaires (id, nom, date_creation, description, localisation,
+        substance_principale, nb_corps, type_forage, budget_total, duree_totale)
+    """
+    filtre, valeurs = _filtre_recherche(recherche)
+    lignes = connexion.execute(
+        "SELECT s.id, s.nom, s.date_creation, s.description, s.localisation, s.substance_principale, s.nb_corps,"
+        " p.type_forage, p.budget_total, p.duree_totale"
+        f" FROM scenarios s LEFT JOIN plans_forage p ON p.scenario_id = s.id{filtre}"
+        f" ORDER BY {ORDRES[ordre]} LIMIT ? OFFSET ?",
+        (*valeurs, taille_page, page * taille_page)
+    )
+    return [dict(ligne) for ligne in lignes]
+
+
+def statistiques_depot(connexion):
+    """
+    Statistiques globales du dépôt.
+
+    Returns:
+        Un dictionnaire {"nb_scenarios", "nb_corps"}
+    """
+    nb_scenarios, nb_corps = connexion.execute(
+        "SELECT COUNT(*), COALESCE(SUM(nb_corps), 0) FROM scenarios"
+    ).fetchone()
+    return {"nb_scenarios": nb_scenarios, "nb_corps": nb_corps}
+
+
+def exporter_scenarios(connexion):
+    """Charge tous les scénarios complets, du plus ancien au plus récent."""
+    ids = [ligne["id"] for ligne in connexion.execute("SELECT id FROM scenarios ORDER BY date_creation, rowid")]
+    return [charger_scenario(connexion, scenario_id) for scenario_id in ids]
@@ -0,0 +1,232 @@
+"""
+Ordonnancement d'une campagne de forage sur plusieurs foreuses (simulation à événements discrets).
+
+Les forages d'une table de forages (forage.table_forages) qui recoupent leur
+filon sont répartis entre plusieurs foreuses. Chaque fois qu'une foreuse se
+libère, elle se déplace vers le forage disponible le plus proche de son
+dernier collar (routage du plus proche voisin), s'installe, puis fore à
+metres_par_jour. Le plus proche voisin est cherché dans le corps où se trouve
+la foreuse; quand ce corps n'a plus de forage disponible, la foreuse rejoint
+le corps disponible dont le centre est le plus proche. Une foreuse qui n'a pas
+encore foré part du corps le plus éloigné des autres foreuses, ce qui répartit
+les foreuses sur le projet.
+
+Les forages de la phase détaillée d'un corps ne sont disponibles qu'au retour
+des analyses de tous ses forages initiaux (fin du dernier forage initial plus
+le délai du laboratoire): une foreuse sans forage disponible attend
+(jours d'attente) la prochaine libération.
+
+Les événements (libération d'une foreuse, retour d'analyses) sont traités par
+ordre chronologique avec deux files de priorité (heapq); le choix du forage
+le plus proche est une réduction NumPy sur les forages disponibles d'un seul
+corps, ce qui garde chaque affectation bornée par la taille des corps.
+"""
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from .forage import PHASES
+
+# Colonnes de la chronologie des forages (simuler_campagne), dans l'ordre d'export
+COLONNES_CHRONOLOGIE = ["id_forage", "corps", "nom_corps", "phase", "foreuse", "depart", "debut", "fin",
+                        "resultats", "deplacement", "longueur"]
+
+# Colonnes du résumé par foreuse
+COLONNES_FOREUSES = ["foreuse", "nb_forages", "metres", "jours_forage", "jours_deplacement", "jours_attente", "fin"]
+
+
+def simuler_campagne(forages, nb_foreuses=1, metres_par_jour=100.0, jours_mobilisation=15.0,
+                     vitesse_deplacement=2000.0, jours_installation=0.5, delai_laboratoire=30.0):
+    """
+    Simule le déroulement d'une campagne de forage sur plusieurs foreuses.
+
+    Args:
+        forages: table des forages (voir forage.table_forages); seuls les forages
+            qui recoupent leur filon sont forés
+        nb_foreuses: nombre de foreuses travaillant en parallèle
+        metres_par_jour: productivité de chaque foreuse (m/jour)
+        jours_mobilisation: jours avant le premier forage (toutes les foreuses)
+        vitesse_deplacement: vitesse de déplacement d'une foreuse entre deux collars (m/jour)
+        jours_installation: durée d'installation sur chaque collar (jours)
+        delai_laboratoire: délai de retour des analyses après la fin d'un forage (jours)
+
+    Returns:
+        Un tuple (chronologie, foreuses): DataFrame des COLONNES_CHRONOLOGIE, une ligne
+        par forage foré dans l'ordre d'exécution (dates en jours depuis le début du projet:
+        départ de la foreuse, début et fin du forage, retour des analyses), et DataFrame
+        des COLONNES_FOREUSES, une ligne par foreuse (jours_deplacement inclut l'installation)
+    """
+    if nb_foreuses < 1:
+        raise ValueError("Le nombre de foreuses doit être au moins 1")
+    # Forages de chaque corps contigus (tri stable: ordre des forages dans chaque corps conservé)
+    forages = forages[forages["touche"].to_numpy(dtype=bool)].sort_values("corps", kind="stable")
+    nb_forages = len(forages)
+    collars = forages[["x", "y"]].to_numpy(dtype=float)
+    longueurs = forages["longueur"].to_numpy(dtype=float)
+    corps = forages["corps"].to_numpy(dtype=np.int64)
+    detailles = forages["phase"].cat.codes.to_numpy() == 1 if nb_forages else np.zeros(0, dtype=bool)
+    nb_corps = int(corps.max()) + 1 if nb_forages else 0
+
+    # Forages de chaque corps: tranche [bornes[c], bornes[c + 1])
+    bornes = np.searchsorted(corps, np.arange(nb_corps + 1))
+    centres = np.zeros((nb_corps, 2))
+    np.add.at(centres, corps, collars)
+    centres /= np.maximum(np.diff(bornes), 1)[:, None]
+
+    # Forages initiaux restant à terminer par corps; les forages détaillés d'un corps
+    # sans forage initial sont disponibles dès la mobilisation
+    initiaux_restants = np.bincount(corps[~detailles], minlength=nb_corps)
+    fins_initiales = np.full(nb_corps, float(jours_mobilisation))
+    disponibles = ~detailles | (initiaux_restants == 0)[corps]
+    nb_disponibles = np.bincount(corps[disponibles], minlength=nb_corps)
+    liberations = []
+
+    positions = np.full((nb_foreuses, 2), np.nan)
+    corps_foreuses = np.full(nb_foreuses, -1)
+    foreuses_libres = [(float(jours_mobilisation), foreuse) for foreuse in range(nb_foreuses)]
+    ordre, affectations = [], np.zeros(nb_forages, dtype=np.int64)
+    departs, debuts, fins, deplacements = (np.zeros(nb_forages) for _ in range(4))
+    attentes = np.zeros(nb_foreuses)
+
+    while len(ordre) < nb_forages:
+        instant, foreuse = heapq.heappop(foreuses_libres)
+
+        # Retour des analyses des forages initiaux: libération des forages détaillés des corps concernés
+        while liberations and liberations[0][0] <= instant:
+            _, corps_libere = heapq.heappop(liberations)
+            tranche = slice(bornes[corps_libere], bornes[corps_libere + 1])
+            nb_disponibles[corps_libere] += detailles[tranche].sum()
+            disponibles[tranche] |= detailles[tranche]
+
+        corps_ouverts = np.flatnonzero(nb_disponibles)
+        if not len(corps_ouverts):
+            # Attente de la prochaine libération: les forages restants sont détaillés, et les forages
+            # initiaux de leur corps, tous affectés, ont programmé le retour de leurs analyses
+            if not liberations:
+                raise RuntimeError("aucun forage disponible ni retour d'analyses attendu")
+            attentes[foreuse] += liberations[0][0] - instant
+            heapq.heappush(foreuses_libres, (liberations[0][0], foreuse))
+            continue
+
+        # Corps foré: celui de la foreuse tant qu'il a des forages disponibles, sinon le plus proche;
+        # à la première affectation, le plus éloigné des foreuses déjà placées
+        corps_fore = corps_foreuses[foreuse]
+        if corps_fore < 0 or not nb_disponibles[corps_fore]:
+            placees = positions[~np.isnan(positions[:, 0])]
+            if not np.isnan(positions[foreuse, 0]):
+                corps_fore = corps_ouverts[np.argmin(np.hypot(*(centres[corps_ouverts] - positions[foreuse]).T))]
+            elif len(placees):
+                ecarts = centres[corps_ouverts, None, :] - placees[None, :, :]
+                corps_fore = corps_ouverts[np.argmax(np.hypot(ecarts[..., 0], ecarts[..., 1]).min(axis=1))]
+            else:
+                corps_fore = corps_ouverts[0]
+            corps_foreuses[foreuse] = corps_fore
+
+        # Forage disponible du corps le plus proche de la position de la foreuse
+        candidats = bornes[corps_fore] + np.flatnonzero(disponibles[bornes[corps_fore]:bornes[corps_fore + 1]])
+        if np.isnan(positions[foreuse, 0]):
+            forage, distance = candidats[0], 0.0
+        else:
+            distances = np.hypot(*(collars[candidats] - positions[foreuse]).T)
+            choix = int(np.argmin(distances))
+            forage, distance = candidats[choix], float(distances[choix])
+
+        # Déplacement, installation puis forage
+        deplacements[forage] = distance
+        departs[forage] = instant
+        debuts[forage] = instant + distance / vitesse_deplacement + jours_installation
+        fins[forage] = debuts[forage] + longueurs[forage] / metres_par_jour
+        affectations[forage] = foreuse
+        positions[foreuse] = collars[forage]
+        disponibles[forage] = False
+        nb_disponibles[corps_fore] -= 1
+        ordre.append(forage)
+        heapq.heappush(foreuses_libres, (fins[forage], foreuse))
+
+        if not detailles[forage]:
+            initiaux_restants[corps_fore] -= 1
+            fins_initiales[corps_fore] = max(fins_initiales[corps_fore], fins[forage])
+            if initiaux_restants[corps_fore] == 0 and detailles[bornes[corps_fore]:bornes[corps_fore + 1]].any():
+                heapq.heappush(liberations, (fins_initiales[corps_fore] + delai_laboratoire, corps_fore))
+
+    ordre = np.array(ordre, dtype=np.int64)
+    chronologie = pd.DataFrame({
+        "id_forage": forages["id_forage"].to_numpy()[ordre],
+        "corps": corps[ordre],
+        "nom_corps": forages["nom_corps"].to_numpy()[ordre],
+        "phase": forages["phase"].array[ordre],
+        "foreuse": affectations[ordre] + 1,
+        "depart": departs[ordre],
+        "debut": debuts[ordre],
+        "fin": fins[ordre],
+        "resultats": fins[ordre] + delai_laboratoire,
+        "deplacement": deplacements[ordre],
+        "longueur": longueurs[ordre],
+    }, columns=COLONNES_CHRONOLOGIE)
+
+    def par_foreuse(valeurs=None):
+        return np.bincount(affectations, weights=valeurs, minlength=nb_foreuses)
+
+    dernieres_fins = np.full(nb_foreuses, float(jours_mobilisation))
+    np.maximum.at(dernieres_fins, affectations, fins)
+    foreuses = pd.DataFrame({
+        "foreuse": np.arange(1, nb_foreuses + 1),
+        "nb_forages": par_foreuse().astype(np.int64),
+        "metres": par_foreuse(longueurs),
+        "jours_forage": par_foreuse(fins - debuts),
+        "jours_deplacement": par_foreuse(debuts - departs),
+        "jours_attente": attentes,
+        "fin": dernieres_fins,
+    }, columns=COLONNES_FOREUSES)
+    return chronologie, foreuses
+
+
+def durees_phases(chronologie, jours_mobilisation):
+    """
+    Durées des phases d'une campagne simulée.
+
+    La phase initiale va de la fin de la mobilisation à la fin du dernier forage
+    initial, la phase détaillée de là à la fin du dernier forage.
+
+    Returns:
+        Un tuple (jours_phase1, jours_phase2), arrondis au jour supérieur
+    """
+    initiaux = chronologie["phase"].to_numpy() == PHASES[0]
+    fins = chronologie["fin"].to_numpy(dtype=float)
+    fin_phase1 = max(float(jours_mobilisation), fins[initiaux].max(initial=0.0))
+    fin_campagne = max(fin_phase1, fins.max(initial=0.0))
+    return float(np.ceil(fin_phase1 - jours_mobilisation)), float(np.ceil(fin_campagne - fin_phase1))
+
+
+def flux_tresorerie(chronologie, foreuses, cout_metre, cout_analyses, longueur_echantillon,
+                    cout_mobilisation=0.0, cout_attente_jour=0.0):
+    """
+    Dépenses journalières et cumulées d'une campagne simulée.
+
+    La mobilisation est payée le premier jour, le forage à la fin de chaque forage
+    et les analyses au retour des résultats (au prorata du métrage échantillonné).
+    Les jours d'attente des foreuses sont facturés à cout_attente_jour, à la fin
+    de la campagne de chaque foreuse.
+
+    Args:
+        chronologie, foreuses: tables retournées par simuler_campagne
+        cout_metre: coût par mètre foré (€)
+        cout_analyses: coût des analyses par échantillon (€)
+        longueur_echantillon: longueur moyenne des échantillons (m)
+        cout_mobilisation: coût de mobilisation (€)
+        cout_attente_jour: coût d'une journée d'attente d'une foreuse (€)
+
+    Returns:
+        Un DataFrame {"jour", "depenses", "cumul"}, une ligne par jour jusqu'au
+        dernier retour d'analyses
+    """
+    longueurs = chronologie["longueur"].to_numpy(dtype=float)
+    jours = np.concatenate([[0], np.floor(chronologie["fin"].to_numpy(dtype=float)),
+                            np.floor(chronologie["resultats"].to_numpy(dtype=float)),
+                            np.floor(foreuses["fin"].to_numpy(dtype=float))]).astype(np.int64)
+    montants = np.concatenate([[cout_mobilisation], longueurs * cout_metre,
+                               longueurs / longueur_echantillon * cout_analyses,
+                               foreuses["jours_attente"].to_numpy(dtype=float) * cout_attente_jour])
+    depenses = np.bincount(jours, weights=montants)
+    return pd.DataFrame({"jour": np.arange(len(depenses)), "depenses": depenses, "cumul": np.cumsum(depenses)})
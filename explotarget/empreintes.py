@@ -0,0 +1,22 @@
+"""
+Empreintes stables des scénarios, utilisées comme clés de cache.
+
+Deux scénarios de contenu identique ont la même empreinte, quel que soit
+l'ordre des clés de leurs dictionnaires ou l'objet Python qui les porte.
+"""
+import hashlib
+import json
+
+
+def empreinte(*objets):
+    """
+    Calcule une empreinte stable d'objets sérialisables en JSON.
+
+    Args:
+        *objets: objets à combiner (listes de corps, dictionnaires de paramètres...)
+
+    Returns:
+        Une chaîne hexadécimale SHA-1
+    """
+    contenu = json.dumps(objets, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(contenu.encode()).hexdigest()
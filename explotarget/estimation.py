@@ -0,0 +1,237 @@
+"""
+Estimation des ressources minérales des corps de type filon.
+
+Reprend les formules de la page "Estimation de Ressources":
+- Volume (m³) = Puissance × Épaisseur × Profondeur
+- Volume net (m³) = Volume - volume déjà compté dans un corps précédent (chevauchements)
+- Tonnage brut (t) = Volume net × Densité
+- Tonnage ajusté (t) = Tonnage brut × Facteur de confiance
+- Métal (oz) = Tonnage ajusté × Teneur (g/t) ÷ 31.1035, ou (t) = Tonnage ajusté × Teneur (%) ÷ 100
+"""
+import numpy as np
+import pandas as pd
+
+from .chevauchements import volumes_partages
+from .geometrie import volume_filon
+
+# Conversion grammes -> onces troy
+GRAMMES_PAR_ONCE = 31.1035
+
+# Colonnes numériques des corps minéralisés utilisées par l'estimation
+COLONNES_CORPS = ["puissance", "epaisseur", "profondeur", "teneur", "densite"]
+
+# Classifications de la plus à la moins fiable
+CLASSIFICATIONS = ["Mesurées", "Indiquées", "Inférées"]
+
+# Nombre de valeurs testées par paramètre dans l'analyse de sensibilité, de 50 % à 150 % de la valeur du corps
+NB_POINTS_SENSIBILITE = 10
+
+# Colonnes du tableau de résultats, dans l'ordre d'affichage
+COLONNES_RESULTATS = ["nom", "volume", "volume_partage", "tonnage_brut", "tonnage_ajuste", "teneur",
+                      "unite_teneur", "metal_quantite", "metal_unit"]
+
+
+def classifier_maille(maille_x, maille_y, maille_mesurees, maille_indiquees,
+                      facteur_mesurees, facteur_indiquees, facteur_inferees):
+    """
+    Détermine la classification des ressources en fonction de la maille de forage.
+
+    Args:
+        maille_x, maille_y: espacement des forages (m)
+        maille_mesurees: maille maximale pour des ressources mesurées (m)
+        maille_indiquees: maille maximale pour des ressources indiquées (m)
+        facteur_mesurees, facteur_indiquees, facteur_inferees: facteurs de confiance
+
+    Returns:
+        Un tuple (classification, facteur_confiance)
+    """
+    maille_moyenne = (maille_x + maille_y) / 2
+    if maille_moyenne < maille_mesurees:
+        return "Mesurées", facteur_mesurees
+    elif maille_moyenne <= maille_indiquees:
+        return "Indiquées", facteur_indiquees
+    return "Inférées", facteur_inferees
+
+
+def unite_metal(unite_teneur):
+    """Unité de la quantité de métal associée à une unité de teneur."""
+    return "onces" if "g/t" in unite_teneur else "tonnes"
+
+
+def quantite_metal(tonnage, teneur, unite_teneur):
+    """
+    Convertit un tonnage et une teneur en quantité de métal/minéral.
+
+    Returns:
+        Un tuple (metal_quantite, metal_unit)
+    """
+    if "g/t" in unite_teneur:
+        return tonnage * teneur / GRAMMES_PAR_ONCE, "onces"  # Conversion g à onces troy
+    return tonnage * teneur / 100, "tonnes"  # Conversion % à tonnes
+
+
+def estimer_corps(corps, facteur_confiance):
+    """
+    Estime les ressources d'un corps minéralisé.
+
+    Args:
+        corps: dictionnaire contenant les propriétés du corps minéralisé
+        facteur_confiance: facteur appliqué au tonnage brut
+
+    Returns:
+        Un dictionnaire de résultats (volume, tonnages, métal)
+    """
+    volume = volume_filon(corps)
+    tonnage = volume * corps["densite"]
+    tonnage_ajuste = tonnage * facteur_confiance
+    metal_quantite, metal_unit = quantite_metal(tonnage_ajuste, corps["teneur"], corps["unite_teneur"])
+
+    return {
+        "nom": corps["nom"],
+        "volume": volume,
+        "volume_partage": 0.0,
+        "tonnage_brut": tonnage,
+        "tonnage_ajuste": tonnage_ajuste,
+        "teneur": corps["teneur"],
+        "unite_teneur": corps["unite_teneur"],
+        "metal_quantite": metal_quantite,
+        "metal_unit": metal_unit
+    }
+
+
+def sensibilite_corps(corps, facteur_confiance, nb_points=NB_POINTS_SENSIBILITE):
+    """
+    Sensibilité des ressources d'un corps à sa teneur et à son épaisseur.
+
+    Chaque paramètre varie de 50 % à 150 % de sa valeur (au moins 0.1), les
+    autres restant fixes.
+
+    Returns:
+        Un dictionnaire {"teneurs", "metal", "metal_unit", "epaisseurs", "tonnages"}:
+        quantité de métal selon la teneur et tonnage ajusté selon l'épaisseur
+    """
+    teneurs = np.linspace(max(0.1, corps["teneur"] * 0.5), corps["teneur"] * 1.5, nb_points)
+    metal, metal_unit = quantite_metal(estimer_corps(corps, facteur_confiance)["tonnage_ajuste"], teneurs,
+                                       corps["unite_teneur"])
+    epaisseurs = np.linspace(max(0.1, corps["epaisseur"] * 0.5), corps["epaisseur"] * 1.5, nb_points)
+    tonnages = volume_filon(dict(corps, epaisseur=epaisseurs)) * corps["densite"] * facteur_confiance
+    return {"teneurs": teneurs, "metal": metal, "metal_unit": metal_unit, "epaisseurs": epaisseurs, "tonnages": tonnages}
+
+
+def diviseurs_metal(unites_teneur):
+    """
+    Diviseurs de conversion teneur -> métal pour une série d'unités de teneur.
+
+    Le test "g/t" n'est effectué qu'une fois par unité distincte.
+
+    Args:
+        unites_teneur: série pandas des unités de teneur
+
+    Returns:
+        Un tuple (metaux_precieux, diviseur) de tableaux NumPy
+    """
+    codes, unites = pd.factorize(unites_teneur)
+    metaux_precieux = np.array(["g/t" in unite for unite in unites], dtype=bool)[codes]
+    return metaux_precieux, np.where(metaux_precieux, GRAMMES_PAR_ONCE, 100.0)
+
+
+def tableau_corps(corps_mineralises):
+    """
+    Convertit une liste de corps minéralisés en DataFrame colonne par colonne.
+
+    Args:
+        corps_mineralises: liste de dictionnaires de corps minéralisés, ou DataFrame
+
+    Returns:
+        Un DataFrame avec les colonnes nom, unite_teneur et COLONNES_CORPS
+    """
+    if isinstance(corps_mineralises, pd.DataFrame):
+        return corps_mineralises
+    nb_corps = len(corps_mineralises)
+    colonnes = {col: [corps[col] for corps in corps_mineralises] for col in ["nom", "unite_teneur"]}
+    for col in COLONNES_CORPS:
+        colonnes[col] = np.fromiter((corps[col] for corps in corps_mineralises), dtype=float, count=nb_corps)
+    return pd.DataFrame(colonnes)
+
+
+def estimer_tableau(corps_mineralises, facteur_confiance):
+    """
+    Estime les ressources de tous les corps minéralisés en une seule passe vectorisée.
+
+    Les colonnes numériques restent numériques: le formatage est laissé à l'affichage.
+
+    Args:
+        corps_mineralises: liste de dictionnaires de corps minéralisés (ou DataFrame équivalent)
+        facteur_confiance: facteur appliqué au tonnage brut (scalaire ou un facteur par corps)
+
+    Returns:
+        Un DataFrame avec les colonnes de COLONNES_RESULTATS
+    """
+    corps_df = tableau_corps(corps_mineralises)
+    valeurs = {col: corps_df[col].to_numpy(dtype=float) for col in COLONNES_CORPS}
+
+    volume = valeurs["puissance"] * valeurs["epaisseur"] * valeurs["profondeur"]
+    tonnage = volume * valeurs["densite"]
+    tonnage_ajuste = tonnage * np.asarray(facteur_confiance, dtype=float)
+
+    # Conversion g/t -> onces troy, % -> tonnes
+    metaux_precieux, diviseur = diviseurs_metal(corps_df["unite_teneur"])
+
+    return pd.DataFrame({
+        "nom": corps_df["nom"],
+        "volume": volume,
+        "volume_partage": 0.0,
+        "tonnage_brut": tonnage,
+        "tonnage_ajuste": tonnage_ajuste,
+        "teneur": valeurs["teneur"],
+        "unite_teneur": corps_df["unite_teneur"],
+        "metal_quantite": tonnage_ajuste * valeurs["teneur"] / diviseur,
+        "metal_unit": np.where(metaux_precieux, "onces", "tonnes"),
+    }, columns=COLONNES_RESULTATS)
+
+
+def deduire_volumes_partages(resultats_df, partages):
+    """
+    Retire des résultats par corps le volume déjà compté dans un corps précédent.
+
+    Le volume, les tonnages et la quantité de métal de chaque corps sont réduits
+    dans la proportion de son volume partagé (voir chevauchements.volumes_partages).
+
+    Args:
+        resultats_df: résultats de estimer_tableau, sans chevauchement déduit
+        partages: volume partagé de chaque corps (m³)
+
+    Returns:
+        Un nouveau DataFrame avec les colonnes de COLONNES_RESULTATS
+    """
+    partages = np.asarray(partages, dtype=float)
+    volume = resultats_df["volume"].to_numpy(dtype=float)
+    fractions = np.divide(volume - partages, volume, out=np.ones_like(volume), where=volume > 0)
+
+    resultats_df = resultats_df.copy()
+    resultats_df["volume"] = volume - partages
+    resultats_df["volume_partage"] = partages
+    for colonne in ["tonnage_brut", "tonnage_ajuste", "metal_quantite"]:
+        resultats_df[colonne] = resultats_df[colonne].to_numpy(dtype=float) * fractions
+    return resultats_df
+
+
+def estimer_scenario(corps_mineralises, facteur_confiance, chevauchements=True):
+    """
+    Estime les ressources de tous les corps minéralisés d'un scénario.
+
+    Args:
+        corps_mineralises: liste de dictionnaires de corps minéralisés
+        facteur_confiance: facteur appliqué au tonnage brut
+        chevauchements: déduire le volume commun aux corps qui se chevauchent,
+            compté une seule fois dans le premier corps (voir chevauchements)
+
+    Returns:
+        Un tuple (resultats_df, total_tonnage, total_metal)
+    """
+    resultats_df = estimer_tableau(corps_mineralises, facteur_confiance)
+    if chevauchements:
+        resultats_df = deduire_volumes_partages(resultats_df, volumes_partages(corps_mineralises))
+    total_tonnage = float(resultats_df["tonnage_ajuste"].sum())
+    total_metal = float(resultats_df["metal_quantite"].sum())
+    return resultats_df, total_tonnage, total_metal
@@ -0,0 +1,557 @@
+"""
+Construction des figures Plotly des corps minéralisés, des plans de forage,
+de l'échéancier des foreuses et des balayages de mailles.
+
+Ce module dépend de Plotly mais pas de Streamlit: les figures peuvent être
+construites, mises en cache ou sérialisées hors de l'interface.
+
+Le nombre de traces ne dépend pas du nombre de forages ni de la maille: les
+lignes de même nature (forages d'une phase, grille, lignes directrices) sont
+regroupées dans une seule trace, séparées par des NaN. Le nombre de forages
+et de lignes de grille affichés est borné par un budget (voir niveau_detail).
+Au-delà de SEUIL_FUSION_MAILLAGES corps, tous les filons sont fusionnés dans
+une seule trace Mesh3d colorée par sommet (maillage_filons).
+"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.colors import qualitative
+
+from .balayage import courbe_mailles_carrees
+from .estimation import CLASSIFICATIONS
+from .forage import PHASES, table_forages
+from .geometrie import (
+    FACES_I,
+    FACES_J,
+    FACES_K,
+    direction_forage,
+    extremites_forages,
+    faces_filons,
+    lignes_directrices_filons,
+    sommets_filon,
+    sommets_filons,
+    volume_filon,
+)
+from .intersection import MARGE_SORTIE_DEFAUT
+from .niveau_detail import BUDGET_LIGNES_GRILLE, NIVEAU_DETAIL_DEFAUT, NIVEAUX_DETAIL, decimer_points, pas_decimation
+
+# Couleurs des classifications (dans l'ordre de CLASSIFICATIONS)
+COULEURS_CLASSIFICATIONS = ['#2E7D32', '#F9A825', '#C62828']
+
+# Grandeurs des cartes de balayage des mailles et leurs titres
+GRANDEURS_BALAYAGE = {
+    "budget": "Budget (€)",
+    "metres": "Métrage (m)",
+    "nb_forages": "Forages",
+    "tonnage": "Tonnage ajusté (t)",
+    "classification": "Classification",
+}
+
+# Nombre de corps au-delà duquel les filons sont fusionnés dans une seule trace Mesh3d
+SEUIL_FUSION_MAILLAGES = 50
+
+
+# Fonction pour créer une visualisation 3D d'un corps minéralisé de type filon
+def create_filon_3d(corps, corps_idx, opacity=0.7):
+    """
+    Crée une représentation 3D d'un corps minéralisé de type filon.
+
+    Args:
+        corps: dictionnaire contenant les propriétés du corps minéralisé
+        corps_idx: indice pour la couleur
+        opacity: opacité du corps (0-1)
+
+    Returns:
+        Une trace plotly Mesh3d
+    """
+    # Sommets du parallélépipède et triangulation des faces
+    sommets = sommets_filon(corps)
+    x, y, z = sommets[:, 0], sommets[:, 1], sommets[:, 2]
+
+    # Couleur basée sur l'indice
+    colors = qualitative.Plotly
+    color = colors[corps_idx % len(colors)]
+
+    # Créer le mesh 3D
+    return go.Mesh3d(
+        x=x, y=y, z=z,
+        i=FACES_I, j=FACES_J, k=FACES_K,
+        name=corps["nom"],
+        color=color,
+        opacity=opacity,
+        hovertemplate=f"<b>{corps['nom']}</b><br>" +
+        f"Teneur: {corps['teneur']} {corps['unite_teneur']}<br>" +
+        f"Puissance: {corps['puissance']} m<br>" +
+        f"Épaisseur: {corps['epaisseur']} m<br>" +
+        f"Profondeur: {corps['profondeur']} m<br>" +
+        f"Volume: {volume_filon(corps):,.0f} m³<br>" +
+        f"Tonnage: {volume_filon(corps) * corps['densite']:,.0f} t<br>" +
+        "<extra></extra>"
+    )
+
+
+def maillage_filons(corps_mineralises, opacity=0.7, nom="Corps minéralisés"):
+    """
+    Crée une seule trace 3D regroupant les filons de plusieurs corps minéralisés.
+
+    Les sommets de tous les filons sont calculés en une fois (geometrie.sommets_filons)
+    et chaque sommet prend la couleur de son corps, comme avec create_filon_3d.
+
+    Args:
+        corps_mineralises: liste de dictionnaires de corps minéralisés
+        opacity: opacité des corps (0-1)
+        nom: nom affiché dans la légende
+
+    Returns:
+        Une trace plotly Mesh3d
+    """
+    sommets = sommets_filons(corps_mineralises).reshape(-1, 3)
+    faces_i, faces_j, faces_k = faces_filons(len(corps_mineralises))
+
+    # Couleur basée sur l'indice de chaque corps, répétée pour ses 8 sommets
+    colors = qualitative.Plotly
+    couleurs = [colors[corps_idx % len(colors)] for corps_idx in range(len(corps_mineralises))]
+
+    volumes = np.array([volume_filon(corps) for corps in corps_mineralises], dtype=float)
+    densites = np.array([corps["densite"] for corps in corps_mineralises], dtype=float)
+    infos = [f"<b>{corps['nom']}</b><br>Teneur: {corps['teneur']} {corps['unite_teneur']}"
+             for corps in corps_mineralises]
+
+    return go.Mesh3d(
+        x=sommets[:, 0], y=sommets[:, 1], z=sommets[:, 2],
+        i=faces_i, j=faces_j, k=faces_k,
+        name=nom,
+        vertexcolor=np.repeat(couleurs, 8),
+        opacity=opacity,
+        text=np.repeat(infos, 8),
+        customdata=np.repeat(np.column_stack([volumes, volumes * densites]).reshape(-1, 2), 8, axis=0),
+        hovertemplate="%{text}<br>Volume: %{customdata[0]:,.0f} m³<br>Tonnage: %{customdata[1]:,.0f} t<extra></extra>"
+    )
+
+
+def traces_filons(corps_mineralises, opacity=0.7):
+    """
+    Traces 3D des filons: une trace par corps, ou une seule trace au-delà de SEUIL_FUSION_MAILLAGES corps.
+
+    Returns:
+        Une liste de traces plotly Mesh3d
+    """
+    if len(corps_mineralises) > SEUIL_FUSION_MAILLAGES:
+        return [maillage_filons(corps_mineralises, opacity)]
+    return [create_filon_3d(corps, corps_idx, opacity) for corps_idx, corps in enumerate(corps_mineralises)]
+
+
+def _cadrage(corps_mineralises, demi_largeur_min, marge=100.0):
+    """
+    Centre et demi-largeur de la zone horizontale affichée autour des corps minéralisés.
+
+    Returns:
+        Un tuple (centre, demi_largeur): centre (x, y) de l'emprise des corps et
+        demi-largeur couvrant l'emprise plus marge, au moins demi_largeur_min
+    """
+    if not corps_mineralises:
+        return np.zeros(2), demi_largeur_min
+    sommets = sommets_filons(corps_mineralises).reshape(-1, 3)[:, :2]
+    minimum, maximum = sommets.min(axis=0), sommets.max(axis=0)
+    return (minimum + maximum) / 2, max(demi_largeur_min, float((maximum - minimum).max()) / 2 + marge)
+
+
+def surface_sol(demi_largeur=300, centre=(0.0, 0.0)):
+    """
+    Crée le plan de surface du sol (z=0).
+
+    Args:
+        demi_largeur: demi-largeur du plan (m)
+        centre: centre (x, y) du plan
+
+    Returns:
+        Une trace plotly Surface
+    """
+    x_surface = centre[0] + np.linspace(-demi_largeur, demi_largeur, 2)
+    y_surface = centre[1] + np.linspace(-demi_largeur, demi_largeur, 2)
+    X_surface, Y_surface = np.meshgrid(x_surface, y_surface)
+    Z_surface = np.zeros_like(X_surface)
+
+    return go.Surface(
+        x=X_surface, y=Y_surface, z=Z_surface,
+        colorscale=[[0, 'green'], [1, 'green']],
+        showscale=False,
+        opacity=0.3,
+        name="Surface du sol"
+    )
+
+
+def _segments(debuts, fins):
+    """Points d'une trace de segments: début, fin et NaN de séparation pour chaque segment."""
+    segments = np.full((len(debuts), 3, 3), np.nan)
+    segments[:, 0] = debuts
+    segments[:, 1] = fins
+    return segments.reshape(-1, 3)
+
+
+def _lignes_directrices(corps_mineralises, axe, nom, line):
+    """
+    Lignes suivant un axe (direction ou inclinaison) de tous les filons, en une seule trace.
+
+    Args:
+        corps_mineralises: liste de dictionnaires de corps minéralisés
+        axe: clé de geometrie.lignes_directrices_filons ("direction" ou "inclinaison")
+        nom: nom affiché dans la légende
+        line: style des lignes
+
+    Returns:
+        Une trace plotly Scatter3d
+    """
+    debuts, fins = lignes_directrices_filons(corps_mineralises)[axe]
+    segments = _segments(debuts, fins)
+    return go.Scatter3d(
+        x=segments[:, 0],
+        y=segments[:, 1],
+        z=segments[:, 2],
+        mode='lines',
+        line=line,
+        name=nom,
+        text=np.repeat([corps["nom"] for corps in corps_mineralises], 3),
+        hovertemplate=f"{nom} %{{text}}<extra></extra>"
+    )
+
+
+def _grille_surface(maille_x, maille_y, demi_largeur=200, budget_lignes=BUDGET_LIGNES_GRILLE, centre=(0.0, 0.0)):
+    """
+    Lignes de la grille de forage en surface (z=0), en une seule trace.
+
+    Args:
+        maille_x, maille_y: espacement des lignes (m)
+        demi_largeur: demi-largeur de la grille (m)
+        budget_lignes: nombre maximal de lignes dans chaque direction (None: toutes)
+        centre: centre (x, y) de la grille
+
+    Returns:
+        Une trace plotly Scatter3d
+    """
+    x_grid = np.arange(-demi_largeur, demi_largeur + 1, maille_x)
+    y_grid = np.arange(-demi_largeur, demi_largeur + 1, maille_y)
+    x_grid = x_grid[::pas_decimation(len(x_grid), budget_lignes)]
+    y_grid = y_grid[::pas_decimation(len(y_grid), budget_lignes)]
+
+    debuts = np.concatenate([np.column_stack([x_grid, np.full(len(x_grid), -demi_largeur), np.zeros(len(x_grid))]),
+                             np.column_stack([np.full(len(y_grid), -demi_largeur), y_grid, np.zeros(len(y_grid))])])
+    fins = np.concatenate([np.column_stack([x_grid, np.full(len(x_grid), demi_largeur), np.zeros(len(x_grid))]),
+                           np.column_stack([np.full(len(y_grid), demi_largeur), y_grid, np.zeros(len(y_grid))])])
+    decalage = np.array([centre[0], centre[1], 0.0])
+    debuts, fins = debuts + decalage, fins + decalage
+    segments = _segments(debuts, fins)
+    return go.Scatter3d(
+        x=segments[:, 0], y=segments[:, 1], z=segments[:, 2],
+        mode='lines',
+        line=dict(color='gray', width=1, dash='dash'),
+        hoverinfo='skip',
+        showlegend=False
+    )
+
+
+def _traces_forages(collars, fins, identifiants, nom, couleur, dash, longueurs):
+    """
+    Crée les traces d'une phase de forage: une trace de lignes et une trace de collars.
+
+    Les forages sont des segments d'une même trace, séparés par des NaN, de sorte
+    que la taille de la figure dépend du nombre de forages et non du nombre de traces.
+
+    Args:
+        collars, fins: tableaux de forme (n, 3) des extrémités des forages
+        identifiants: identifiant de chaque forage (voir forage.table_forages)
+        nom: nom de la phase affiché dans la légende (ex: "Forage initial")
+        couleur, dash: style des lignes
+        longueurs: longueur de chaque forage affichée au survol (m)
+
+    Returns:
+        Une liste de deux traces plotly Scatter3d
+    """
+    # Trois points par forage: collar, point final, NaN de séparation
+    segments = _segments(collars, fins)
+    nom_collar = f"Collar {nom[0].lower()}{nom[1:]}"
+
+    return [
+        go.Scatter3d(
+            x=segments[:, 0],
+            y=segments[:, 1],
+            z=segments[:, 2],
+            mode='lines',
+            line=dict(color=couleur, width=2, dash=dash),
+            name=nom,
+            text=np.repeat(identifiants, 3),
+            customdata=np.repeat(longueurs, 3),
+            hovertemplate=f"{nom}<br>Forage: %{{text}}<br>Longueur: %{{customdata:.1f}}m<extra></extra>"
+        ),
+        go.Scatter3d(
+            x=collars[:, 0],
+            y=collars[:, 1],
+            z=collars[:, 2],
+            mode='markers',
+            marker=dict(color=couleur, size=5),
+            name=nom_collar,
+            text=identifiants,
+            hovertemplate=f"{nom_collar}<br>Forage: %{{text}}<extra></extra>"
+        ),
+    ]
+
+
+def figure_modele_3d(corps_mineralises, maille_x, maille_y, maillages=None, budget_lignes=BUDGET_LIGNES_GRILLE):
+    """
+    Crée la représentation 3D simplifiée des corps minéralisés d'un scénario.
+
+    Args:
+        corps_mineralises: liste de dictionnaires de corps minéralisés
+        maille_x, maille_y: espacement de la grille de forage affichée en surface (m)
+        maillages: traces Mesh3d des corps déjà construites (optionnel, voir traces_filons)
+        budget_lignes: nombre maximal de lignes de grille dans chaque direction (None: toutes)
+
+    Returns:
+        Une figure plotly
+    """
+    fig = go.Figure()
+
+    # Ajout du plan de surface (z=0), centré sur l'emprise des corps
+    centre, demi_largeur = _cadrage(corps_mineralises, 300)
+    fig.add_trace(surface_sol(demi_largeur, centre))
+
+    # Ajout des corps minéralisés
+    fig.add_traces(maillages if maillages is not None else traces_filons(corps_mineralises))
+
+    if corps_mineralises:
+        # Lignes suivant l'axe de puissance (direction) et l'axe de plongement (inclinaison)
+        fig.add_trace(_lignes_directrices(corps_mineralises, "direction", "Direction",
+                                          dict(color='black', width=3)))
+        fig.add_trace(_lignes_directrices(corps_mineralises, "inclinaison", "Inclinaison",
+                                          dict(color='darkgray', width=2, dash='dash')))
+
+    # Ajout d'une grille pour la maille de forage, en retrait du bord de la surface
+    fig.add_trace(_grille_surface(maille_x, maille_y, demi_largeur - 100, budget_lignes=budget_lignes, centre=centre))
+
+    # Configuration de la mise en page
+    fig.update_layout(
+        scene=dict(
+            xaxis_title='X (m)',
+            yaxis_title='Y (m)',
+            zaxis_title='Z (m)',
+            aspectmode='data',
+            zaxis=dict(range=[-500, 50])  # Ajuster l'échelle de Z pour visualiser correctement sous terre
+        ),
+        margin=dict(l=0, r=0, b=0, t=30),
+        height=700
+    )
+    return fig
+
+
+def figure_plan_forage(corps_selectionnes, maille_initiale_x, maille_initiale_y, maille_detail_x, maille_detail_y,
+                       azimuth_forage, inclinaison_forage, profondeur_forage_max, maillages=None,
+                       marge_sortie=MARGE_SORTIE_DEFAUT, budget_forages=NIVEAUX_DETAIL[NIVEAU_DETAIL_DEFAUT],
+                       forages=None):
+    """
+    Crée la visualisation 3D du plan de forage des corps minéralisés sélectionnés.
+
+    Chaque forage est tracé jusqu'à la longueur requise pour traverser le filon;
+    les forages qui manquent le filon sont tracés en gris sur toute la profondeur maximale.
+
+    Au-delà de budget_forages, les forages affichés sont décimés uniformément dans
+    le plan (niveau_detail.decimer_points), les forages initiaux étant retenus en
+    priorité. Les nombres de forages affichés et planifiés sont donnés dans
+    fig.layout.meta ({"forages_affiches", "forages_total"}).
+
+    Args:
+        corps_selectionnes: liste de dictionnaires de corps minéralisés
+        maille_initiale_x, maille_initiale_y: maille de la phase initiale (m)
+        maille_detail_x, maille_detail_y: maille resserrée de la phase détaillée (m)
+        azimuth_forage, inclinaison_forage: orientation des forages (°)
+        profondeur_forage_max: longueur maximale des forages (m)
+        maillages: traces Mesh3d des corps déjà construites (optionnel, voir traces_filons)
+        marge_sortie: longueur forée au-delà du mur du filon (m)
+        budget_forages: nombre maximal de forages affichés (None: tous, voir niveau_detail.NIVEAUX_DETAIL)
+        forages: table des forages déjà générée pour ces paramètres (optionnel, voir forage.table_forages)
+
+    Returns:
+        Une figure plotly
+    """
+    fig = go.Figure()
+
+    # Ajout du plan de surface (z=0), centré sur l'emprise des corps
+    centre, demi_largeur = _cadrage(corps_selectionnes, 300)
+    fig.add_trace(surface_sol(demi_largeur, centre))
+
+    # Ajout des corps minéralisés
+    fig.add_traces(maillages if maillages is not None else traces_filons(corps_selectionnes, opacity=0.5))
+
+    if corps_selectionnes:
+        # Ajout des lignes suivant l'axe de puissance (direction)
+        fig.add_trace(_lignes_directrices(corps_selectionnes, "direction", "Direction", dict(color='black', width=3)))
+
+    if forages is None:
+        forages = table_forages(corps_selectionnes, maille_initiale_x, maille_initiale_y, maille_detail_x,
+                                maille_detail_y, profondeur_forage_max, azimuth_forage, inclinaison_forage, marge_sortie)
+    total_forages = len(forages)
+
+    nb_affiches = 0
+    if total_forages:
+        collars = forages[["x", "y", "z"]].to_numpy(dtype=float)
+        priorites = forages["phase"].cat.codes.to_numpy()
+        # Décimation spatiale commune à tous les corps, forages initiaux en priorité
+        retenus = decimer_points(collars, budget_forages, priorites)
+        collars, priorites = collars[retenus], priorites[retenus]
+        touche = forages["touche"].to_numpy()[retenus]
+        identifiants = forages["id_forage"].to_numpy()[retenus]
+        # Les forages qui manquent le filon sont tracés sur toute la profondeur maximale
+        longueurs = np.where(touche, forages["longueur"].to_numpy(dtype=float)[retenus], profondeur_forage_max)
+        fins = extremites_forages(collars, direction_forage(azimuth_forage, inclinaison_forage), longueurs)
+        nb_affiches = len(retenus)
+
+        # Une trace de lignes et une trace de collars par phase, tous corps confondus;
+        # les forages manqués sont regroupés à part
+        for masque, nom, couleur, dash in [(touche & (priorites == 0), "Forage initial", "red", None),
+                                           (touche & (priorites == 1), "Forage détaillé", "blue", "dash"),
+                                           (~touche, "Forage hors filon", "gray", "dot")]:
+            if masque.any():
+                fig.add_traces(_traces_forages(collars[masque], fins[masque], identifiants[masque], nom, couleur, dash,
+                                               longueurs[masque]))
+
+    # Configuration de la mise en page
+    fig.update_layout(
+        scene=dict(
+            xaxis_title='X (m)',
+            yaxis_title='Y (m)',
+            zaxis_title='Z (m)',
+            aspectmode='data',
+            zaxis=dict(range=[-profondeur_forage_max, 50])  # Ajuster l'échelle de Z pour visualiser correctement sous terre
+        ),
+        margin=dict(l=0, r=0, b=0, t=30),
+        height=700,
+        meta={"forages_affiches": nb_affiches, "forages_total": total_forages},
+        legend=dict(
+            yanchor="top",
+            y=0.99,
+            xanchor="left",
+            x=0.01
+        )
+    )
+    return fig
+
+
+def _dates(date_debut, jours):
+    """Dates (texte ISO) correspondant à des jours depuis le début du projet (NaN: None, séparateur)."""
+    dates = pd.Timestamp(date_debut) + pd.to_timedelta(np.atleast_1d(jours), unit="D")
+    return np.where(dates.isna(), None, dates.strftime("%Y-%m-%d %H:%M"))
+
+
+def figure_chronologie(chronologie, date_debut, jours_mobilisation=0):
+    """
+    Diagramme de Gantt d'une campagne simulée: une ligne par foreuse.
+
+    Les intervalles de même nature (déplacement et installation, forages de
+    chaque phase) sont regroupés dans une seule trace de segments séparés par
+    des NaN, quel que soit le nombre de forages.
+
+    Args:
+        chronologie: chronologie des forages (voir echeancier.simuler_campagne)
+        date_debut: date de début du projet
+        jours_mobilisation: durée de la mobilisation, grisée en début de diagramme (jours)
+
+    Returns:
+        Une figure plotly
+    """
+    fig = go.Figure()
+    foreuses = np.array([f"Foreuse {foreuse}" for foreuse in chronologie["foreuse"]], dtype=object)
+    forages_initiaux = chronologie["phase"].to_numpy() == PHASES[0]
+    for masque, debut, fin, nom, couleur in [
+            (np.ones(len(chronologie), dtype=bool), "depart", "debut", "Déplacement et installation", "lightgray"),
+            (forages_initiaux, "debut", "fin", "Forage initial", "red"),
+            (~forages_initiaux, "debut", "fin", "Forage détaillé", "blue")]:
+        if not masque.any():
+            continue
+        jours = np.full((masque.sum(), 3), np.nan)
+        jours[:, 0] = chronologie[debut].to_numpy(dtype=float)[masque]
+        jours[:, 1] = chronologie[fin].to_numpy(dtype=float)[masque]
+        lignes = np.full((masque.sum(), 3), None, dtype=object)
+        lignes[:, :2] = foreuses[masque, None]
+        fig.add_trace(go.Scatter(
+            x=_dates(date_debut, jours.ravel()), y=lignes.ravel(),
+            mode='lines', line=dict(color=couleur, width=14), name=nom,
+            text=np.repeat(chronologie["id_forage"].to_numpy()[masque], 3),
+            hovertemplate=f"{nom}<br>%{{text}}<br>%{{x|%d/%m/%Y}}<extra></extra>"
+        ))
+    if jours_mobilisation:
+        fig.add_vrect(x0=_dates(date_debut, 0)[0], x1=_dates(date_debut, jours_mobilisation)[0],
+                      fillcolor="gray", opacity=0.15, line_width=0, annotation_text="Mobilisation")
+    fig.update_layout(
+        xaxis_title="Date", yaxis=dict(categoryorder="category descending"),
+        height=max(250, 60 * chronologie["foreuse"].nunique() + 120),
+        margin=dict(l=0, r=0, b=0, t=30),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0)
+    )
+    return fig
+
+
+def figure_balayage(balayage, grandeur, maille_courante=None):
+    """
+    Carte de chaleur d'une grandeur d'un balayage des mailles.
+
+    Args:
+        balayage: résultats de balayage.balayer_mailles
+        grandeur: clé de GRANDEURS_BALAYAGE présente dans le balayage
+        maille_courante: couple (x, y) marqué sur la carte (optionnel)
+
+    Returns:
+        Une figure plotly
+    """
+    titre = GRANDEURS_BALAYAGE[grandeur]
+    if grandeur == "classification":
+        # Échelle discrète: une couleur par classification
+        echelle = [[borne, couleur] for rang, couleur in enumerate(COULEURS_CLASSIFICATIONS)
+                   for borne in (rang / len(CLASSIFICATIONS), (rang + 1) / len(CLASSIFICATIONS))]
+        carte = go.Heatmap(
+            z=balayage["classification"], zmin=-0.5, zmax=len(CLASSIFICATIONS) - 0.5, colorscale=echelle,
+            colorbar=dict(title=titre, tickvals=list(range(len(CLASSIFICATIONS))), ticktext=CLASSIFICATIONS),
+            text=np.array(CLASSIFICATIONS, dtype=object)[balayage["classification"]],
+            hovertemplate="X: %{x:.0f} m<br>Y: %{y:.0f} m<br>%{text}<extra></extra>"
+        )
+    else:
+        carte = go.Heatmap(z=balayage[grandeur], colorscale="Viridis", colorbar=dict(title=titre),
+                           hovertemplate=f"X: %{{x:.0f}} m<br>Y: %{{y:.0f}} m<br>{titre}: %{{z:,.0f}}<extra></extra>")
+    carte.update(x=balayage["mailles_x"], y=balayage["mailles_y"])
+    fig = go.Figure(carte)
+    if maille_courante is not None:
+        fig.add_trace(go.Scatter(x=[maille_courante[0]], y=[maille_courante[1]], mode='markers', name="Maille courante",
+                                 marker=dict(symbol='x', size=12, color='white', line=dict(color='black', width=1)),
+                                 hovertemplate="Maille courante<extra></extra>"))
+    fig.update_layout(title=titre, xaxis_title="Espacement X (m)", yaxis_title="Espacement Y (m)", height=450,
+                      showlegend=False, margin=dict(l=0, r=0, b=0, t=40))
+    return fig
+
+
+def figure_courbe_mailles(balayage, maille_courante=None):
+    """
+    Budget en fonction de l'espacement le long des mailles carrées d'un balayage,
+    coloré par classification.
+
+    Args:
+        balayage: résultats de balayage.balayer_mailles (mêmes mailles en x et en y)
+        maille_courante: espacement marqué d'une ligne verticale (optionnel)
+
+    Returns:
+        Une figure plotly
+    """
+    courbe = courbe_mailles_carrees(balayage)
+    fig = go.Figure()
+    for rang, (classification, couleur) in enumerate(zip(CLASSIFICATIONS, COULEURS_CLASSIFICATIONS)):
+        masque = courbe["classification"] == rang
+        if masque.any():
+            fig.add_trace(go.Scatter(
+                x=courbe["maille"][masque], y=courbe["budget"][masque], mode='markers', name=classification,
+                marker=dict(color=couleur, size=6),
+                customdata=np.column_stack([courbe["nb_forages"][masque], courbe["metres"][masque]]),
+                hovertemplate="Maille %{x:.0f} m<br>Budget: %{y:,.0f} €<br>Forages: %{customdata[0]:,.0f}<br>"
+                              "Métrage: %{customdata[1]:,.0f} m<extra></extra>"
+            ))
+    if maille_courante is not None:
+        fig.add_vline(x=maille_courante, line_dash="dash", line_color="gray", annotation_text="Maille courante")
+    fig.update_layout(title="Budget selon l'espacement (mailles carrées)", xaxis_title="Espacement (m)",
+                      yaxis_title="Budget (€)", height=450, legend_title="Classification")
+    return fig
@@ -0,0 +1,323 @@
+"""
+Planification des campagnes de forage (phase initiale et phase détaillée).
+
+Les forages sont implantés sur une grille couvrant le plan de chaque filon,
+exprimée en coordonnées locales (puissance, profondeur) puis transformée
+en coordonnées globales avec les axes de geometrie.axes_filon. La longueur
+de chaque forage est celle nécessaire pour traverser le mur du filon
+(intersection.intersecter_forages); les forages qui manquent le filon ne
+sont pas forés et sont signalés.
+
+table_forages génère tous les forages des corps d'un scénario (une ligne par
+position, phases initiale et détaillée) en une seule passe vectorisée; les
+nombres de forages et métrages par corps (resumer_forages), les coûts, la
+visualisation, les exports, l'optimisation des mailles et la classification
+des blocs sont tous déduits de cette table.
+"""
+import numpy as np
+import pandas as pd
+
+from .geometrie import direction_forage, reperes_filons
+from .intersection import MARGE_SORTIE_DEFAUT, intersecter_reperes, longueurs_requises
+
+# Phases de forage, dans l'ordre de la campagne (valeurs de la colonne "phase")
+PHASES = ["Initiale", "Détaillée"]
+
+# Préfixe des identifiants de forage de chaque phase
+PREFIXES_PHASES = {"Initiale": "I", "Détaillée": "D"}
+
+# Nombre minimal de forages dans chaque direction de la grille de chaque phase
+FORAGES_MIN_INITIAL = 2
+FORAGES_MIN_DETAIL = 4
+
+# Colonnes de la table des forages (table_forages), dans l'ordre d'export
+COLONNES_FORAGES = ["id_forage", "corps", "nom_corps", "phase", "x", "y", "z", "azimuth", "inclinaison",
+                    "longueur", "touche", "trop_court", "epaisseur_vraie"]
+
+
+def forages_par_axe(dimensions, mailles, minimum):
+    """
+    Nombre de forages le long d'un axe des filons (puissance ou profondeur).
+
+    Args:
+        dimensions: dimensions des filons le long de l'axe (m)
+        mailles: espacements des forages (m); diffusés (broadcasting) avec dimensions
+        minimum: nombre minimal de forages
+
+    Returns:
+        Un tableau de nombres de forages (flottants entiers)
+    """
+    return np.maximum(minimum, np.ceil(np.asarray(dimensions, dtype=float) / mailles))
+
+
+def noeuds_communs(indices, nb_initial, nb_detail):
+    """
+    Nœuds d'une grille détaillée confondus avec un nœud de la grille initiale le long d'un axe.
+
+    Les collars sont au centre des cellules, en (i + 0.5) / nb de la dimension: le
+    nœud détaillé j coïncide avec le nœud initial i si (2j + 1) nb_initial = (2i + 1) nb_detail,
+    ce qui n'arrive que si les deux nombres de forages, divisés par leur PGCD, sont impairs.
+
+    Args:
+        indices: indices des nœuds détaillés le long de l'axe
+        nb_initial, nb_detail: nombres de forages des deux grilles le long de l'axe (diffusés avec indices)
+
+    Returns:
+        Un tableau booléen: vrai pour les nœuds confondus avec un nœud initial
+    """
+    produits = (2 * np.asarray(indices, dtype=np.int64) + 1) * np.asarray(nb_initial, dtype=np.int64)
+    nb_detail = np.asarray(nb_detail, dtype=np.int64)
+    return (produits % nb_detail == 0) & ((produits // nb_detail) % 2 == 1)
+
+
+def nombres_noeuds_communs(nb_initial, nb_detail):
+    """
+    Nombre de nœuds détaillés confondus avec un nœud initial le long d'un axe (voir noeuds_communs):
+    le PGCD des deux nombres de forages quand leurs quotients par ce PGCD sont impairs, 0 sinon.
+    """
+    nb_initial = np.asarray(nb_initial, dtype=np.int64)
+    nb_detail = np.asarray(nb_detail, dtype=np.int64)
+    pgcd = np.gcd(nb_initial, nb_detail)
+    return np.where(((nb_initial // pgcd) % 2 == 1) & ((nb_detail // pgcd) % 2 == 1), pgcd, 0)
+
+
+def _positions_grilles(nb_x, nb_y):
+    """
+    Énumère les nœuds des grilles (nb_x, nb_y) de plusieurs corps.
+
+    Returns:
+        Un tuple (corps, ix, iy) de tableaux d'entiers, ix variant le plus lentement
+    """
+    nb_x, nb_y = np.asarray(nb_x, dtype=np.int64), np.asarray(nb_y, dtype=np.int64)
+    comptes = nb_x * nb_y
+    corps = np.repeat(np.arange(len(comptes)), comptes)
+    rangs = np.arange(comptes.sum()) - np.repeat(np.cumsum(comptes) - comptes, comptes)
+    return corps, rangs // nb_y[corps], rangs % nb_y[corps]
+
+
+def table_forages(corps_mineralises, maille_initiale_x, maille_initiale_y, maille_detail_x, maille_detail_y,
+                  profondeur_forage_max, azimuth_forage=270, inclinaison_forage=60, marge_sortie=MARGE_SORTIE_DEFAUT,
+                  decalage_x=0.0, decalage_y=0.0):
+    """
+    Génère la table de tous les forages planifiés des corps minéralisés, en une seule passe.
+
+    La phase initiale couvre chaque filon d'une grille d'au moins 2 x 2 forages;
+    la phase détaillée d'une grille resserrée d'au moins 4 x 4 forages, dont sont
+    exclus les nœuds (ix, iy) confondus avec un collar de la phase initiale (voir
+    noeuds_communs).
+
+    Args:
+        corps_mineralises: liste de dictionnaires de corps minéralisés
+        maille_initiale_x, maille_initiale_y: maille de la phase initiale (m)
+        maille_detail_x, maille_detail_y: maille resserrée de la phase détaillée (m); None pour
+            ne planifier que la phase initiale
+        profondeur_forage_max: longueur maximale réalisable d'un forage (m)
+        azimuth_forage, inclinaison_forage: orientation des forages (°)
+        marge_sortie: longueur forée au-delà du mur du filon (m)
+        decalage_x, decalage_y: décalage de la grille initiale en fraction de son espacement
+            (seulement sans phase détaillée)
+
+    Returns:
+        Un DataFrame des colonnes de COLONNES_FORAGES, une ligne par position de forage,
+        trié par corps puis par phase: corps est le rang du corps dans corps_mineralises,
+        longueur la longueur planifiée (0 pour un forage qui manque le filon et n'est pas foré)
+    """
+    puissances = np.array([corps["puissance"] for corps in corps_mineralises], dtype=float)
+    profondeurs = np.array([corps["profondeur"] for corps in corps_mineralises], dtype=float)
+    noms = np.array([corps["nom"] for corps in corps_mineralises], dtype=object)
+
+    detaillee = maille_detail_x is not None and maille_detail_y is not None
+    if detaillee and (decalage_x or decalage_y):
+        raise ValueError("Le décalage de grille n'est possible que sans phase détaillée")
+
+    # Nombre de forages de chaque grille; grille détaillée vide sans phase détaillée
+    nb_x = forages_par_axe(puissances, maille_initiale_x, FORAGES_MIN_INITIAL)
+    nb_y = forages_par_axe(profondeurs, maille_initiale_y, FORAGES_MIN_INITIAL)
+    nb_x_detail = forages_par_axe(puissances, maille_detail_x, FORAGES_MIN_DETAIL) if detaillee else np.zeros_like(nb_x)
+    nb_y_detail = forages_par_axe(profondeurs, maille_detail_y, FORAGES_MIN_DETAIL) if detaillee else np.zeros_like(nb_y)
+
+    # Phase initiale: tous les nœuds; phase détaillée: nœuds qui ne sont pas déjà des collars initiaux
+    corps_initial, ix_initial, iy_initial = _positions_grilles(nb_x, nb_y)
+    corps_detail, ix_detail, iy_detail = _positions_grilles(nb_x_detail, nb_y_detail)
+    conserves = ~(noeuds_communs(ix_detail, nb_x[corps_detail], nb_x_detail[corps_detail])
+                  & noeuds_communs(iy_detail, nb_y[corps_detail], nb_y_detail[corps_detail]))
+
+    corps = np.concatenate([corps_initial, corps_detail[conserves]])
+    phases = np.concatenate([np.zeros(len(corps_initial), dtype=np.int64), np.ones(conserves.sum(), dtype=np.int64)])
+    ix = np.concatenate([ix_initial, ix_detail[conserves]])
+    iy = np.concatenate([iy_initial, iy_detail[conserves]])
+    nb_x_forage = np.where(phases == 0, nb_x[corps], nb_x_detail[corps])
+    nb_y_forage = np.where(phases == 0, nb_y[corps], nb_y_detail[corps])
+
+    # Forages triés par corps, phase initiale en premier
+    ordre = np.argsort(corps, kind="stable")
+    corps, phases, ix, iy, nb_x_forage, nb_y_forage = (colonne[ordre] for colonne in
+                                                       (corps, phases, ix, iy, nb_x_forage, nb_y_forage))
+
+    # Collars en coordonnées globales, départ à la surface
+    centres, rotations, demi_dimensions = reperes_filons(corps_mineralises)
+    p = -puissances[corps] / 2 + (ix + 0.5 + decalage_x) * puissances[corps] / nb_x_forage
+    d = -profondeurs[corps] / 2 + (iy + 0.5 + decalage_y) * profondeurs[corps] / nb_y_forage
+    collars = centres[corps] + p[:, None] * rotations[corps, 0] + d[:, None] * rotations[corps, 1]
+    collars[:, 2] = 0
+
+    # Longueur requise de chaque forage pour traverser son filon
+    direction = direction_forage(azimuth_forage, inclinaison_forage)
+    intersections = intersecter_reperes(centres[corps], rotations[corps], demi_dimensions[corps], collars, direction,
+                                        profondeur_forage_max)
+    longueurs, trop_courts = longueurs_requises(intersections, profondeur_forage_max, marge_sortie)
+
+    # Identifiant: nom du corps, préfixe de la phase et numéro dans la phase
+    debuts = np.flatnonzero(np.r_[True, (corps[1:] != corps[:-1]) | (phases[1:] != phases[:-1])])
+    numeros = np.arange(len(corps)) - np.repeat(debuts, np.diff(np.r_[debuts, len(corps)])) + 1
+    prefixes = np.array([PREFIXES_PHASES[phase] for phase in PHASES], dtype=object)[phases]
+    identifiants = noms[corps] + "-" + prefixes + pd.Series(numeros).astype(str).str.zfill(4).to_numpy(dtype=object)
+
+    return pd.DataFrame({
+        "id_forage": identifiants,
+        "corps": corps,
+        "nom_corps": noms[corps],
+        "phase": pd.Categorical.from_codes(phases, PHASES),
+        "x": collars[:, 0],
+        "y": collars[:, 1],
+        "z": collars[:, 2],
+        "azimuth": np.full(len(corps), float(azimuth_forage)),
+        "inclinaison": np.full(len(corps), float(inclinaison_forage)),
+        "longueur": longueurs,
+        "touche": intersections["touche"],
+        "trop_court": trop_courts,
+        "epaisseur_vraie": intersections["epaisseur_vraie"],
+    }, columns=COLONNES_FORAGES)
+
+
+def resumer_forages(forages, noms):
+    """
+    Résume une table de forages par corps minéralisé (nombres, métrages, recoupements).
+
+    Args:
+        forages: table retournée par table_forages
+        noms: nom de chaque corps, dans l'ordre de la colonne "corps"
+
+    Returns:
+        Une liste de dictionnaires de résultats, un par corps, à chiffrer avec chiffrer_corps
+    """
+    nb_corps = len(noms)
+    corps = forages["corps"].to_numpy()
+    detaille = forages["phase"].cat.codes.to_numpy() == 1
+    touche = forages["touche"].to_numpy()
+    longueurs = forages["longueur"].to_numpy(dtype=float)
+
+    def somme(masque, poids=None):
+        return np.bincount(corps[masque], weights=None if poids is None else poids[masque], minlength=nb_corps)
+
+    nb_touche_initial = somme(touche & ~detaille)
+    epaisseurs = somme(touche & ~detaille, forages["epaisseur_vraie"].to_numpy(dtype=float))
+    profondeurs = np.zeros(nb_corps)
+    np.maximum.at(profondeurs, corps, longueurs)
+    colonnes = {
+        "nb_forages_initial": nb_touche_initial,
+        "nb_forages_detail": somme(touche & detaille),
+        "metres_initial": somme(~detaille, longueurs),
+        "metres_detail": somme(detaille, longueurs),
+        # Longueur du plus long forage requis
+        "profondeur_forage": profondeurs,
+        "nb_forages_manques_initial": somme(~touche & ~detaille),
+        "nb_forages_manques_detail": somme(~touche & detaille),
+        "nb_forages_trop_courts": somme(forages["trop_court"].to_numpy()),
+        "epaisseur_vraie_moyenne": np.divide(epaisseurs, nb_touche_initial, out=np.zeros(nb_corps),
+                                             where=nb_touche_initial > 0),
+    }
+    return [{"nom": nom, **{cle: float(valeurs[rang]) for cle, valeurs in colonnes.items()}}
+            for rang, nom in enumerate(noms)]
+
+
+def chiffrer_corps(forages, longueur_echantillon, cout_metre, cout_analyses):
+    """
+    Ajoute le nombre d'échantillons et les coûts aux forages d'un corps minéralisé.
+
+    Args:
+        forages: résultats d'un corps retournés par resumer_forages
+        longueur_echantillon: longueur moyenne des échantillons (m)
+        cout_metre: coût par mètre foré (€)
+        cout_analyses: coût des analyses par échantillon (€)
+
+    Returns:
+        Le dictionnaire de résultats complet du corps (nombres, métrages, échantillons, coûts)
+    """
+    # Nombre d'échantillons
+    nb_echantillons_initial = np.ceil(forages["metres_initial"] / longueur_echantillon)
+    nb_echantillons_detail = np.ceil(forages["metres_detail"] / longueur_echantillon)
+
+    return {
+        "nom": forages["nom"],
+        "nb_forages_initial": forages["nb_forages_initial"],
+        "nb_forages_detail": forages["nb_forages_detail"],
+        "metres_initial": forages["metres_initial"],
+        "metres_detail": forages["metres_detail"],
+        "cout_initial": forages["metres_initial"] * cout_metre + nb_echantillons_initial * cout_analyses,
+        "cout_detail": forages["metres_detail"] * cout_metre + nb_echantillons_detail * cout_analyses,
+        "nb_echantillons_initial": nb_echantillons_initial,
+        "nb_echantillons_detail": nb_echantillons_detail,
+        **{cle: valeur for cle, valeur in forages.items() if cle not in ("nom", "nb_forages_initial", "nb_forages_detail",
+                                                                      "metres_initial", "metres_detail")},
+    }
+
+
+def planifier_campagne(corps_selectionnes, longueur_echantillon, cout_metre, cout_analyses, forages=None,
+                       **parametres):
+    """
+    Calcule le plan de forage de plusieurs corps minéralisés.
+
+    Les forages de tous les corps sont générés en une seule passe (table_forages).
+
+    Args:
+        corps_selectionnes: liste de dictionnaires de corps minéralisés
+        longueur_echantillon, cout_metre, cout_analyses: paramètres de chiffrer_corps
+        forages: table des forages déjà générée pour ces corps (optionnel, sinon générée
+            avec les paramètres de table_forages)
+        **parametres: paramètres de table_forages
+
+    Returns:
+        Un tuple (resultats_forage, totaux) où totaux contient total_metres_initial,
+        total_metres_detaille, total_forages_initial et total_forages_detaille
+    """
+    if forages is None:
+        forages = table_forages(corps_selectionnes, **parametres)
+    resultats_forage = [chiffrer_corps(resultat, longueur_echantillon, cout_metre, cout_analyses)
+                        for resultat in resumer_forages(forages, [corps["nom"] for corps in corps_selectionnes])]
+    totaux = {
+        "total_metres_initial": sum(res["metres_initial"] for res in resultats_forage),
+        "total_metres_detaille": sum(res["metres_detail"] for res in resultats_forage),
+        "total_forages_initial": sum(res["nb_forages_initial"] for res in resultats_forage),
+        "total_forages_detaille": sum(res["nb_forages_detail"] for res in resultats_forage),
+    }
+    return resultats_forage, totaux
+
+
+def budget_campagne(resultats_forage, cout_metre, cout_analyses, cout_mobilisation):
+    """
+    Décompose le budget d'une campagne de forage par phase.
+
+    Args:
+        resultats_forage: résultats de planifier_campagne
+        cout_metre: coût par mètre foré (€)
+        cout_analyses: coût des analyses par échantillon (€)
+        cout_mobilisation: coût de mobilisation (€)
+
+    Returns:
+        Un dictionnaire des coûts de forage, d'analyses et totaux par phase
+    """
+    forage_initial = sum(res["metres_initial"] for res in resultats_forage) * cout_metre
+    forage_detail = sum(res["metres_detail"] for res in resultats_forage) * cout_metre
+    analyses_initial = sum(res["nb_echantillons_initial"] * cout_analyses for res in resultats_forage)
+    analyses_detail = sum(res["nb_echantillons_detail"] * cout_analyses for res in resultats_forage)
+
+    return {
+        "cout_forage_initial": forage_initial,
+        "cout_forage_detail": forage_detail,
+        "cout_analyses_initial": analyses_initial,
+        "cout_analyses_detail": analyses_detail,
+        "cout_phase_initiale": forage_initial + analyses_initial,
+        "cout_phase_detaillee": forage_detail + analyses_detail,
+        "cout_total": cout_mobilisation + forage_initial + analyses_initial + forage_detail + analyses_detail
+    }
@@ -0,0 +1,273 @@
+"""
+Géométrie des corps minéralisés de type filon.
+
+Ce module ne dépend que de NumPy : il peut être importé et exécuté
+hors de Streamlit (traitements par lots, mesures de performance).
+
+Modélisation d'un filon:
+- épaisseur: largeur perpendiculaire au plan du filon
+- puissance: plus grand allongement dans le plan du filon
+- profondeur: extension en profondeur, le long de l'inclinaison
+- est, nord: coordonnées horizontales du centre du filon (m, 0 si absentes)
+
+Les fonctions au pluriel (rotations_filons, sommets_filons, ...) traitent tous
+les corps d'un scénario en une fois: les matrices de rotation sont calculées
+une seule fois par corps et les sommets, faces et lignes directrices sont
+produits sous forme de tableaux NumPy. Les fonctions d'un seul corps
+(axes_filon, sommets_filon, ...) en sont des cas particuliers.
+"""
+import numpy as np
+
+# Indices des faces (triangulation) du parallélépipède - définit chaque face du filon
+# Front faces, back faces puis side faces
+FACES_I = [0, 0, 1, 1, 2, 2, 3, 3] + [4, 4, 5, 5, 6, 6, 7, 7] + [0, 0, 1, 1, 4, 4, 5, 5]
+FACES_J = [1, 2, 3, 0, 6, 3, 7, 2] + [5, 6, 7, 4, 2, 7, 3, 6] + [4, 1, 5, 0, 7, 0, 1, 4]
+FACES_K = [2, 0, 0, 3, 3, 7, 6, 6] + [6, 4, 4, 7, 6, 3, 7, 2] + [5, 5, 1, 4, 0, 3, 0, 7]
+
+# Signes (puissance, profondeur, épaisseur) des 8 sommets, l'épaisseur variant le plus vite
+SIGNES_SOMMETS = np.array([[p, d, e] for p in (-1, 1) for d in (-1, 1) for e in (-1, 1)], dtype=float)
+
+
+# Coordonnées horizontales du centre d'un corps qui n'en précise pas (origine du projet)
+POSITION_DEFAUT = 0.0
+
+
+def _colonne(corps_mineralises, cle, defaut=None):
+    """Valeurs d'une propriété numérique de tous les corps, en tableau de forme (n,)."""
+    if defaut is not None:
+        return np.array([corps.get(cle, defaut) for corps in corps_mineralises], dtype=float)
+    return np.array([corps[cle] for corps in corps_mineralises], dtype=float)
+
+
+def rotations_filons(azimuths, inclinaisons):
+    """
+    Calcule les matrices de rotation (axes des filons) de plusieurs filons à la fois.
+
+    Args:
+        azimuths: directions des filons en degrés (0° = Nord, 90° = Est)
+        inclinaisons: pendages des filons en degrés par rapport à l'horizontale
+
+    Returns:
+        Un tableau de forme (..., 3, 3) dont les lignes sont les axes
+        (puissance, profondeur, épaisseur) de chaque filon
+    """
+    azimuth_rad, inclinaison_rad = np.broadcast_arrays(np.radians(np.asarray(azimuths, dtype=float)),
+                                                       np.radians(np.asarray(inclinaisons, dtype=float)))
+    rotations = np.empty(azimuth_rad.shape + (3, 3))
+
+    # Axe principal (direction d'allongement - puissance)
+    rotations[..., 0, 0] = np.sin(azimuth_rad)
+    rotations[..., 0, 1] = np.cos(azimuth_rad)
+    rotations[..., 0, 2] = 0.0
+
+    # Axe de profondeur (suivant l'inclinaison), négatif en z car on va vers le bas
+    rotations[..., 1, 0] = np.sin(azimuth_rad + np.pi/2) * np.cos(inclinaison_rad)
+    rotations[..., 1, 1] = np.cos(azimuth_rad + np.pi/2) * np.cos(inclinaison_rad)
+    rotations[..., 1, 2] = -np.sin(inclinaison_rad)
+
+    # Axe d'épaisseur (perpendiculaire au plan du filon: produit vectoriel puissance x profondeur)
+    rotations[..., 2, 0] = -np.cos(azimuth_rad) * np.sin(inclinaison_rad)
+    rotations[..., 2, 1] = np.sin(azimuth_rad) * np.sin(inclinaison_rad)
+    rotations[..., 2, 2] = -np.cos(inclinaison_rad)
+    return rotations
+
+
+def filons_positionnes(corps_mineralises):
+    """
+    Indique quels corps précisent leurs coordonnées est et nord.
+
+    Les corps des scénarios antérieurs à ces coordonnées sont tous placés à
+    l'origine du projet (POSITION_DEFAUT): leur position relative est inconnue.
+
+    Returns:
+        Un tableau booléen de forme (n,)
+    """
+    return np.array([corps.get("est") is not None and corps.get("nord") is not None for corps in corps_mineralises],
+                    dtype=bool)
+
+
+def centres_filons(corps_mineralises):
+    """
+    Calcule les points centraux de plusieurs corps minéralisés.
+
+    Le centre est placé aux coordonnées (est, nord) du corps, et en profondeur
+    sous l'élévation du toit.
+
+    Returns:
+        Un tableau de forme (n, 3) des centres (x, y, z)
+    """
+    centres = np.empty((len(corps_mineralises), 3))
+    centres[:, 0] = _colonne(corps_mineralises, "est", POSITION_DEFAUT)
+    centres[:, 1] = _colonne(corps_mineralises, "nord", POSITION_DEFAUT)
+    centres[:, 2] = (_colonne(corps_mineralises, "elevation_toit")
+                     - _colonne(corps_mineralises, "epaisseur") * np.sin(np.radians(_colonne(corps_mineralises, "inclinaison"))) / 2)
+    return centres
+
+
+def reperes_filons(corps_mineralises):
+    """
+    Calcule les repères locaux orthonormés de plusieurs filons (voir repere_filon).
+
+    Returns:
+        Un tuple (centres, rotations, demi_dimensions) de formes (n, 3), (n, 3, 3) et (n, 3)
+    """
+    rotations = rotations_filons(_colonne(corps_mineralises, "azimuth"), _colonne(corps_mineralises, "inclinaison"))
+    demi_dimensions = np.column_stack([_colonne(corps_mineralises, cle)
+                                       for cle in ("puissance", "profondeur", "epaisseur")]).reshape(-1, 3) / 2
+    return centres_filons(corps_mineralises), rotations.reshape(-1, 3, 3), demi_dimensions
+
+
+def sommets_filons(corps_mineralises):
+    """
+    Génère les sommets des parallélépipèdes de plusieurs filons (voir sommets_filon).
+
+    Returns:
+        Un tableau de forme (n, 8, 3) des coordonnées x, y, z des sommets
+    """
+    centres, rotations, demi_dimensions = reperes_filons(corps_mineralises)
+    # Coordonnées locales des sommets de chaque filon, ramenées dans le repère global
+    locales = SIGNES_SOMMETS[None, :, :] * demi_dimensions[:, None, :]
+    return centres[:, None, :] + np.einsum("nsa,nax->nsx", locales, rotations)
+
+
+def faces_filons(nb_corps):
+    """
+    Indices des faces de nb_corps parallélépipèdes dont les sommets sont concaténés.
+
+    Returns:
+        Un tuple (i, j, k) de tableaux d'entiers de forme (nb_corps * len(FACES_I),),
+        à utiliser avec sommets_filons(...).reshape(-1, 3)
+    """
+    decalages = 8 * np.arange(nb_corps)[:, None]
+    return tuple((decalages + np.asarray(faces)).ravel() for faces in (FACES_I, FACES_J, FACES_K))
+
+
+def lignes_directrices_filons(corps_mineralises, longueur_inclinaison=50):
+    """
+    Calcule les lignes directrices de plusieurs filons (voir lignes_directrices).
+
+    Returns:
+        Un dictionnaire {"direction": (debuts, fins), "inclinaison": (debuts, fins)}
+        de tableaux de forme (n, 3)
+    """
+    centres, rotations, demi_dimensions = reperes_filons(corps_mineralises)
+    demi_puissance = demi_dimensions[:, :1] * rotations[:, 0]
+    return {
+        "direction": (centres - demi_puissance, centres + demi_puissance),
+        "inclinaison": (centres, centres + longueur_inclinaison * rotations[:, 1]),
+    }
+
+
+def extremites_forages(collars, direction, longueurs):
+    """
+    Points finaux de forages rectilignes.
+
+    Args:
+        collars: tableau de forme (n, 3) des collars
+        direction: vecteur unitaire commun (3,) ou un vecteur par forage (n, 3)
+        longueurs: longueur commune ou une longueur par forage (n,) (m)
+
+    Returns:
+        Un tableau de forme (n, 3) des points finaux
+    """
+    return np.asarray(collars, dtype=float) + np.asarray(longueurs, dtype=float).reshape(-1, 1) * direction
+
+
+def axes_filon(azimuth, inclinaison):
+    """
+    Calcule les vecteurs unitaires du système d'axes d'un filon.
+
+    Args:
+        azimuth: direction du filon en degrés (0° = Nord, 90° = Est)
+        inclinaison: pendage du filon en degrés par rapport à l'horizontale
+
+    Returns:
+        Un tuple (axe_puissance, axe_profondeur, axe_epaisseur) de vecteurs (x, y, z)
+    """
+    axe_puissance, axe_profondeur, axe_epaisseur = rotations_filons(azimuth, inclinaison)
+    return axe_puissance, axe_profondeur, axe_epaisseur
+
+
+def centre_filon(corps):
+    """
+    Calcule le point central d'un corps minéralisé.
+
+    Args:
+        corps: dictionnaire contenant les propriétés du corps minéralisé
+
+    Returns:
+        Le centre (x, y, z) du corps
+    """
+    return centres_filons([corps])[0]
+
+
+def repere_filon(corps):
+    """
+    Calcule le repère local orthonormé d'un filon.
+
+    Args:
+        corps: dictionnaire contenant les propriétés du corps minéralisé
+
+    Returns:
+        Un tuple (centre, rotation, demi_dimensions) où les lignes de rotation sont
+        les axes (puissance, profondeur, épaisseur), de sorte que
+        coordonnées_locales = (point - centre) @ rotation.T
+    """
+    centres, rotations, demi_dimensions = reperes_filons([corps])
+    return centres[0], rotations[0], demi_dimensions[0]
+
+
+def sommets_filon(corps):
+    """
+    Génère les 8 sommets du parallélépipède représentant un filon.
+
+    Les sommets sont ordonnés (±puissance/2, ±profondeur/2, ±épaisseur/2),
+    l'épaisseur variant le plus vite, conformément à FACES_I/J/K.
+
+    Args:
+        corps: dictionnaire contenant les propriétés du corps minéralisé
+
+    Returns:
+        Un tableau de forme (8, 3) des coordonnées x, y, z des sommets
+    """
+    return sommets_filons([corps])[0]
+
+
+def lignes_directrices(corps, longueur_inclinaison=50):
+    """
+    Calcule les lignes directrices d'un filon (direction et plongement).
+
+    Args:
+        corps: dictionnaire contenant les propriétés du corps minéralisé
+        longueur_inclinaison: longueur de la ligne de plongement (m)
+
+    Returns:
+        Un dictionnaire {"direction": (debut, fin), "inclinaison": (debut, fin)}
+    """
+    lignes = lignes_directrices_filons([corps], longueur_inclinaison)
+    return {axe: (debuts[0], fins[0]) for axe, (debuts, fins) in lignes.items()}
+
+
+def direction_forage(azimuth, inclinaison):
+    """
+    Calcule le vecteur unitaire de direction d'un forage.
+
+    Args:
+        azimuth: direction du forage en degrés (0° = Nord, 90° = Est)
+        inclinaison: angle du forage en degrés (voir l'interface de planification)
+
+    Returns:
+        Le vecteur (dx, dy, dz), dz négatif car on fore vers le bas
+    """
+    azimuth_rad = np.radians(azimuth)
+    inclinaison_rad = np.radians(inclinaison)
+    return np.array([
+        np.sin(azimuth_rad) * np.cos(inclinaison_rad),
+        np.cos(azimuth_rad) * np.cos(inclinaison_rad),
+        -np.sin(inclinaison_rad)
+    ])
+
+
+def volume_filon(corps):
+    """Volume du corps minéralisé (m³)."""
+    return corps["puissance"] * corps["epaisseur"] * corps["profondeur"]
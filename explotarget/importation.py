@@ -0,0 +1,448 @@
+"""
+Importation en flux des scénarios et des corps minéralisés dans le dépôt.
+
+Formats acceptés:
+- JSON: tableau de scénarios (avec "corps_mineralises") ou tableau de corps,
+  lu élément par élément sans charger tout le fichier;
+- CSV et Parquet: une ligne par corps minéralisé, lus par blocs.
+
+Chaque corps est validé sur les champs saisis dans le formulaire "Ajouter un
+corps minéralisé" (mêmes bornes); les coordonnées est et nord du centre sont
+facultatives et restent absentes du corps importé quand elles manquent. Les corps invalides sont rejetés avec le détail des erreurs de
+leur ligne, les doublons d'id sont ignorés, et les corps valides sont écrits
+dans le dépôt par lots.
+"""
+import codecs
+import csv
+import io
+import json
+import math
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from .depot import ajouter_corps, enregistrer_scenario, ids_corps, importer_scenarios, scenario_existe
+
+# Unités de teneur proposées par le formulaire, et abréviations acceptées
+UNITES_TENEUR = ["g/t (or, argent)", "% (métaux de base)"]
+ABREVIATIONS_UNITES = {"g/t": UNITES_TENEUR[0], "%": UNITES_TENEUR[1]}
+
+# Bornes (minimum, maximum) des champs numériques d'un corps minéralisé
+BORNES_CORPS = {
+    "puissance": (0.1, 1000.0),
+    "epaisseur": (0.1, 500.0),
+    "profondeur": (0.1, 2000.0),
+    "teneur": (0.01, 100.0),
+    "densite": (1.0, 10.0),
+    "azimuth": (0, 360),
+    "inclinaison": (0, 90),
+    "elevation_toit": (-2000.0, 0.0),
+}
+
+# Bornes des coordonnées du centre d'un corps (facultatives; absentes, le corps est placé en
+# geometrie.POSITION_DEFAUT et exclu du calcul des chevauchements)
+BORNES_POSITION = {
+    "est": (-1e7, 1e7),
+    "nord": (-1e7, 1e7),
+}
+
+# Nombre de corps (ou de scénarios) écrits par transaction
+TAILLE_LOT_IMPORT = 5000
+
+# Nombre de lignes lues par bloc (CSV, Parquet) et taille des blocs lus (JSON, octets)
+TAILLE_BLOC_LIGNES = 20000
+TAILLE_BLOC_LECTURE = 1 << 16
+
+# Distance maximale (caractères) entre une erreur JSON due à un élément tronqué en fin
+# de bloc et la fin du bloc (nombre, littéral ou échappement \uXXXX coupé)
+MARGE_ELEMENT_TRONQUE = 16
+
+# Nombre maximal d'erreurs détaillées conservées dans le rapport
+NB_ERREURS_MAX = 1000
+
+
+def _manquant(valeur):
+    return valeur is None or (isinstance(valeur, float) and math.isnan(valeur)) or valeur == ""
+
+
+def valider_corps(corps):
+    """
+    Valide et normalise un corps minéralisé importé.
+
+    Args:
+        corps: dictionnaire lu dans le fichier importé
+
+    Returns:
+        Un tuple (corps_normalise, erreurs): corps_normalise vaut None si la liste
+        des messages d'erreur n'est pas vide
+    """
+    if not isinstance(corps, dict):
+        return None, ["l'élément n'est pas un objet"]
+
+    erreurs = []
+    normalise = {"id": str(uuid.uuid4()) if _manquant(corps.get("id")) else str(corps["id"])}
+
+    nom = corps.get("nom")
+    if _manquant(nom):
+        erreurs.append("nom manquant")
+    else:
+        normalise["nom"] = str(nom).strip()
+
+    for champ, (minimum, maximum) in {**BORNES_CORPS, **BORNES_POSITION}.items():
+        valeur = corps.get(champ)
+        if _manquant(valeur):
+            if champ not in BORNES_POSITION:
+                erreurs.append(f"{champ} manquant")
+            continue
+        try:
+            valeur = float(valeur)
+        except (TypeError, ValueError):
+            erreurs.append(f"{champ} non numérique ({valeur!r})")
+            continue
+        if not minimum <= valeur <= maximum:
+            erreurs.append(f"{champ} hors de [{minimum}, {maximum}] ({valeur})")
+        normalise[champ] = valeur
+
+    unite = corps.get("unite_teneur")
+    unite = ABREVIATIONS_UNITES.get(str(unite).strip(), unite) if not _manquant(unite) else unite
+    if unite not in UNITES_TENEUR:
+        erreurs.append(f"unite_teneur inconnue ({unite!r})")
+    normalise["unite_teneur"] = unite
+
+    if erreurs:
+        return None, erreurs
+
+    # Ordre des champs du formulaire, puis champs supplémentaires renseignés
+    ordre = ["id", "nom", "puissance", "epaisseur", "profondeur", "teneur", "unite_teneur", "densite",
+             "azimuth", "inclinaison", "elevation_toit", "est", "nord"]
+    supplementaires = {cle: valeur for cle, valeur in corps.items() if cle not in normalise and not _manquant(valeur)}
+    return {**{champ: normalise[champ] for champ in ordre if champ in normalise}, **supplementaires}, []
+
+
+def rapport_vide():
+    """
+    Rapport d'importation initial.
+
+    Returns:
+        Un dictionnaire de compteurs et la liste "erreurs" des lignes rejetées
+        ({"ligne", "id", "erreurs"}), limitée à NB_ERREURS_MAX entrées
+    """
+    return {"nb_lus": 0, "nb_corps": 0, "nb_scenarios": 0, "nb_doublons": 0, "nb_rejets": 0, "erreurs": []}
+
+
+def signaler_rejet(rapport, ligne, element, erreurs):
+    """
+    Compte un élément rejeté et ajoute ses erreurs au rapport (dans la limite de NB_ERREURS_MAX).
+
+    Args:
+        rapport: rapport à compléter (voir rapport_vide)
+        ligne: numéro de ligne ou libellé de l'élément dans le fichier
+        element: élément rejeté (son "id" est repris s'il en a un)
+        erreurs: liste des messages d'erreur
+    """
+    rapport["nb_rejets"] += 1
+    if len(rapport["erreurs"]) < NB_ERREURS_MAX:
+        identifiant = element.get("id") if isinstance(element, dict) else None
+        rapport["erreurs"].append({"ligne": ligne, "id": identifiant, "erreurs": "; ".join(erreurs)})
+
+
+def iterer_tableau_json(flux, taille_bloc=TAILLE_BLOC_LECTURE):
+    """
+    Parcourt un tableau JSON élément par élément sans charger tout le fichier.
+
+    Seul l'élément en cours de lecture est conservé en mémoire. Lorsqu'un élément
+    dépasse le bloc lu, la quantité lue est doublée à chaque tentative, de sorte
+    qu'un élément volumineux n'est analysé qu'un nombre logarithmique de fois.
+    Une erreur de syntaxe située avant la fin du bloc (hors chaîne non terminée)
+    ne peut pas venir d'un élément tronqué: elle est signalée sans lire la suite.
+
+    Args:
+        flux: fichier ouvert en mode binaire ou texte (UTF-8)
+        taille_bloc: nombre d'octets ou de caractères lus à la fois
+
+    Returns:
+        Un itérateur sur les éléments du tableau
+
+    Raises:
+        ValueError: si le contenu n'est pas un tableau JSON valide
+    """
+    decodeur = json.JSONDecoder()
+    decodeur_texte = codecs.getincrementaldecoder("utf-8-sig")()
+    tampon = ""
+    position = 0
+    fin_fichier = False
+
+    def lire(taille):
+        nonlocal tampon, position, fin_fichier
+        bloc = flux.read(taille)
+        if not bloc:
+            fin_fichier = True
+            tampon = tampon[position:] + (decodeur_texte.decode(b"", final=True) if not isinstance(bloc, str) else "")
+        else:
+            tampon = tampon[position:] + (bloc if isinstance(bloc, str) else decodeur_texte.decode(bloc))
+        position = 0
+
+    def caractere_suivant():
+        # Premier caractère non blanc (None en fin de fichier)
+        nonlocal position
+        while True:
+            while position < len(tampon) and tampon[position].isspace():
+                position += 1
+            if position < len(tampon):
+                return tampon[position]
+            if fin_fichier:
+                return None
+            lire(taille_bloc)
+
+    if caractere_suivant() != "[":
+        raise ValueError("le fichier doit contenir un tableau JSON")
+    position += 1
+
+    attendu_separateur = False
+    while True:
+        caractere = caractere_suivant()
+        if caractere is None:
+            raise ValueError("tableau JSON non terminé")
+        if caractere == "]":
+            return
+        if attendu_separateur:
+            if caractere != ",":
+                raise ValueError(f"',' ou ']' attendu, '{caractere}' trouvé")
+            position += 1
+            attendu_separateur = False
+            continue
+
+        taille = taille_bloc
+        while True:
+            try:
+                element, fin = decodeur.raw_decode(tampon, position)
+                # Un élément qui se termine en fin de tampon peut être tronqué (nombre)
+                if fin < len(tampon) or fin_fichier:
+                    break
+            except json.JSONDecodeError as erreur:
+                # Une chaîne non terminée est signalée à son début: seule la suite du fichier la départage
+                tronque = (erreur.pos + MARGE_ELEMENT_TRONQUE >= len(tampon)
+                           or erreur.msg.startswith("Unterminated string"))
+                if fin_fichier or not tronque:
+                    raise ValueError(f"JSON invalide: {erreur.msg}") from erreur
+            lire(taille)
+            taille *= 2
+        position = fin
+        attendu_separateur = True
+        yield element
+
+
+def iterer_csv(flux, taille_bloc=TAILLE_BLOC_LIGNES):
+    """
+    Parcourt les lignes d'un fichier CSV de corps minéralisés par blocs.
+
+    Le séparateur (',' ';' ou tabulation) est détecté sur le début du fichier.
+
+    Returns:
+        Un itérateur de tuples (numero_ligne, dictionnaire); la ligne d'en-tête est la ligne 1
+    """
+    # Flux texte UTF-8 lu sans copie du contenu; détaché en fin de lecture pour ne pas fermer le fichier
+    texte = flux if isinstance(flux, io.TextIOBase) else io.TextIOWrapper(flux, encoding="utf-8-sig", newline="")
+    try:
+        debut = texte.read(4096)
+        try:
+            separateur = csv.Sniffer().sniff(debut, delimiters=",;\t").delimiter
+        except csv.Error:
+            separateur = ","
+        texte.seek(0)
+
+        ligne = 2
+        for bloc in pd.read_csv(texte, sep=separateur, chunksize=taille_bloc, dtype={"id": str, "nom": str}):
+            for enregistrement in bloc.to_dict("records"):
+                yield ligne, enregistrement
+                ligne += 1
+    finally:
+        if texte is not flux:
+            texte.detach()
+
+
+def iterer_parquet(flux, taille_bloc=TAILLE_BLOC_LIGNES):
+    """
+    Parcourt les lignes d'un fichier Parquet de corps minéralisés par lots (nécessite pyarrow).
+
+    Returns:
+        Un itérateur de tuples (numero_ligne, dictionnaire), à partir de la ligne 1
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as erreur:
+        raise ValueError("la lecture des fichiers Parquet nécessite le paquet pyarrow") from erreur
+
+    ligne = 1
+    for lot in pq.ParquetFile(flux).iter_batches(batch_size=taille_bloc):
+        for enregistrement in lot.to_pylist():
+            yield ligne, enregistrement
+            ligne += 1
+
+
+def _accepter_corps(ligne, element, ids_vus, rapport):
+    """Valide un corps lu et l'ajoute aux id vus; retourne None s'il est rejeté ou en double."""
+    rapport["nb_lus"] += 1
+    corps, erreurs = valider_corps(element)
+    if erreurs:
+        signaler_rejet(rapport, ligne, element, erreurs)
+        return None
+    if corps["id"] in ids_vus:
+        rapport["nb_doublons"] += 1
+        return None
+    ids_vus.add(corps["id"])
+    return corps
+
+
+def _importer_corps(connexion, scenario_id, lignes, rapport):
+    """Valide, dédoublonne et ajoute par lots des corps à un scénario du dépôt."""
+    ids_vus = ids_corps(connexion, scenario_id)
+    lot = []
+    for ligne, element in lignes:
+        corps = _accepter_corps(ligne, element, ids_vus, rapport)
+        if corps is not None:
+            lot.append(corps)
+        if len(lot) >= TAILLE_LOT_IMPORT:
+            rapport["nb_corps"] += ajouter_corps(connexion, scenario_id, lot)
+            lot = []
+    if lot:
+        rapport["nb_corps"] += ajouter_corps(connexion, scenario_id, lot)
+
+
+def valider_scenario(indice, scenario, rapport):
+    """
+    Valide les corps d'un scénario importé (voir valider_corps).
+
+    Args:
+        indice: rang du scénario dans le fichier (à partir de 0)
+        scenario: dictionnaire du scénario, avec "corps_mineralises"
+        rapport: rapport complété des corps lus et rejetés (voir rapport_vide)
+
+    Returns:
+        Le scénario sans ses corps rejetés ni doublons, avec un id, un nom et une date de création
+    """
+    ids_vus = set()
+    corps_valides = [
+        corps for corps in (
+            _accepter_corps(f"scénario {indice + 1}, corps {rang + 1}", element, ids_vus, rapport)
+            for rang, element in enumerate(scenario.get("corps_mineralises") or [])
+        ) if corps is not None
+    ]
+    return {
+        **scenario,
+        "id": str(scenario["id"]) if not _manquant(scenario.get("id")) else str(uuid.uuid4()),
+        "nom": str(scenario.get("nom") or f"Scénario importé {indice + 1}"),
+        "date_creation": scenario.get("date_creation") or datetime.now().strftime("%Y-%m-%d"),
+        "corps_mineralises": corps_valides,
+    }
+
+
+def _est_scenario(element):
+    return isinstance(element, dict) and "corps_mineralises" in element
+
+
+def importer_json(connexion, flux, scenario_id=None, rapport=None):
+    """
+    Importe un tableau JSON de scénarios ou de corps minéralisés.
+
+    Les scénarios (éléments avec "corps_mineralises") remplacent ceux de même id
+    dans le dépôt; un id déjà vu dans le fichier est ignoré. Les autres éléments
+    sont des corps ajoutés au scénario scenario_id.
+
+    Args:
+        connexion: connexion retournée par ouvrir_depot
+        flux: fichier JSON ouvert
+        scenario_id: scénario recevant les corps isolés (obligatoire si le fichier en contient)
+        rapport: rapport à compléter (voir rapport_vide)
+
+    Returns:
+        Le rapport d'importation
+    """
+    rapport = rapport if rapport is not None else rapport_vide()
+    ids_scenarios = set()
+    ids_vus = ids_corps(connexion, scenario_id) if scenario_id is not None else set()
+    scenarios, corps_isoles = [], []
+    nb_corps_scenarios = 0
+
+    for indice, element in enumerate(iterer_tableau_json(flux)):
+        if not _est_scenario(element):
+            if scenario_id is None:
+                rapport["nb_lus"] += 1
+                signaler_rejet(rapport, indice + 1, element, ["corps hors scénario: aucun scénario cible"])
+                continue
+            corps = _accepter_corps(indice + 1, element, ids_vus, rapport)
+            if corps is not None:
+                corps_isoles.append(corps)
+        else:
+            scenario = valider_scenario(indice, element, rapport)
+            if scenario["id"] in ids_scenarios:
+                rapport["nb_doublons"] += 1
+                continue
+            ids_scenarios.add(scenario["id"])
+            scenarios.append(scenario)
+            nb_corps_scenarios += len(scenario["corps_mineralises"])
+
+        # Écriture par lots
+        if len(corps_isoles) >= TAILLE_LOT_IMPORT:
+            rapport["nb_corps"] += ajouter_corps(connexion, scenario_id, corps_isoles)
+            corps_isoles = []
+        if nb_corps_scenarios >= TAILLE_LOT_IMPORT or len(scenarios) >= TAILLE_LOT_IMPORT:
+            rapport["nb_scenarios"] += importer_scenarios(connexion, scenarios)
+            rapport["nb_corps"] += nb_corps_scenarios
+            scenarios, nb_corps_scenarios = [], 0
+
+    if corps_isoles:
+        rapport["nb_corps"] += ajouter_corps(connexion, scenario_id, corps_isoles)
+    if scenarios:
+        rapport["nb_scenarios"] += importer_scenarios(connexion, scenarios)
+        rapport["nb_corps"] += nb_corps_scenarios
+    return rapport
+
+
+def importer_fichier(connexion, flux, nom_fichier, scenario_id=None, nom_scenario=None):
+    """
+    Importe un fichier de scénarios (JSON) ou de corps minéralisés (JSON, CSV, Parquet).
+
+    Args:
+        connexion: connexion retournée par ouvrir_depot
+        flux: fichier ouvert (mode binaire)
+        nom_fichier: nom du fichier, dont l'extension détermine le format
+        scenario_id: scénario existant recevant les corps; un nouveau scénario
+            est créé si None et que le fichier contient des corps
+        nom_scenario: nom du scénario créé (par défaut, le nom du fichier)
+
+    Returns:
+        Le rapport d'importation (voir rapport_vide), complété de "scenario_id"
+        (scénario ayant reçu les corps) et "erreur_fichier" (erreur fatale ou None)
+    """
+    rapport = rapport_vide()
+    rapport.update(scenario_id=scenario_id, erreur_fichier=None)
+    extension = Path(nom_fichier).suffix.lower()
+
+    def scenario_cible():
+        if rapport["scenario_id"] is None or not scenario_existe(connexion, rapport["scenario_id"]):
+            rapport["scenario_id"] = enregistrer_scenario(connexion, {
+                "id": rapport["scenario_id"] or str(uuid.uuid4()),
+                "nom": nom_scenario or Path(nom_fichier).stem,
+                "date_creation": datetime.now().strftime("%Y-%m-%d"),
+                "corps_mineralises": [],
+            })
+        return rapport["scenario_id"]
+
+    try:
+        if extension == ".json":
+            premier = next(iterer_tableau_json(flux), None)
+            flux.seek(0)
+            corps_seuls = premier is not None and not _est_scenario(premier)
+            importer_json(connexion, flux, scenario_cible() if corps_seuls else scenario_id, rapport)
+        elif extension == ".csv":
+            _importer_corps(connexion, scenario_cible(), iterer_csv(flux), rapport)
+        elif extension == ".parquet":
+            _importer_corps(connexion, scenario_cible(), iterer_parquet(flux), rapport)
+        else:
+            raise ValueError(f"format de fichier non pris en charge ({extension or 'sans extension'})")
+    except (ValueError, UnicodeDecodeError, pd.errors.ParserError) as erreur:
+        rapport["erreur_fichier"] = str(erreur)
+    return rapport
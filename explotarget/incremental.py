@@ -0,0 +1,175 @@
+"""
+Évaluation incrémentale des résultats par corps minéralisé.
+
+Chaque calcul de CALCULS produit une ligne de résultats par corps et déclare
+les paramètres globaux dont il dépend (par exemple, le facteur de confiance
+pour l'estimation, les mailles et l'orientation des forages pour la
+planification, mais pas les coûts). L'état d'un calcul conserve, pour chaque
+corps, l'empreinte de ses champs et des paramètres dont il dépend avec sa
+ligne de résultats: lors d'une nouvelle évaluation, seuls les corps ajoutés ou
+modifiés sont recalculés (tous si un paramètre change), en un seul appel
+vectorisé, et les totaux sont mis à jour par différence.
+
+Un calcul peut aussi déclarer un détail: une table par corps (par exemple les
+forages de la planification), retirée de la ligne de résultats et conservée
+avec elle sous forme de colonnes (tableaux NumPy ou catégoriels); la table de
+tous les corps est reconstituée colonne par colonne dans etat["details"].
+
+L'état est un dictionnaire (voir etat_vide), que l'interface conserve d'une
+exécution à l'autre dans la session.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .empreintes import empreinte
+from .estimation import COLONNES_RESULTATS, estimer_tableau
+from .forage import COLONNES_FORAGES, resumer_forages, table_forages
+
+
+def _estimation(corps_mineralises, facteur_confiance):
+    return estimer_tableau(corps_mineralises, facteur_confiance).to_dict("records")
+
+
+def _forage(corps_mineralises, **parametres):
+    # Forages de tous les corps en une passe, puis les colonnes des forages de chaque corps (vues)
+    forages = table_forages(corps_mineralises, **parametres)
+    resultats = resumer_forages(forages, [corps["nom"] for corps in corps_mineralises])
+    debuts = np.searchsorted(forages["corps"].to_numpy(), np.arange(len(corps_mineralises) + 1))
+    colonnes = {colonne: forages[colonne].array if isinstance(forages[colonne].dtype, pd.CategoricalDtype)
+                else forages[colonne].to_numpy() for colonne in COLONNES_FORAGES}
+    return [{**resultat, "forages": {colonne: valeurs[debuts[rang]:debuts[rang + 1]]
+                                     for colonne, valeurs in colonnes.items()}}
+            for rang, resultat in enumerate(resultats)]
+
+
+# Calculs disponibles: fonction (liste de corps, paramètres -> une ligne par corps),
+# paramètres dont elle dépend, colonnes du tableau, totaux (nom -> colonne sommée)
+# et détail (clé de la ligne portant la table du corps, None sans détail)
+CALCULS = {
+    "estimation": {
+        "fonction": _estimation,
+        "dependances": ("facteur_confiance",),
+        "colonnes": COLONNES_RESULTATS,
+        "totaux": {"total_tonnage": "tonnage_ajuste", "total_metal": "metal_quantite"},
+        "detail": None,
+    },
+    "forage": {
+        "fonction": _forage,
+        "dependances": ("maille_initiale_x", "maille_initiale_y", "maille_detail_x", "maille_detail_y",
+                        "profondeur_forage_max", "azimuth_forage", "inclinaison_forage", "marge_sortie"),
+        "colonnes": None,
+        "totaux": {"total_metres_initial": "metres_initial", "total_metres_detaille": "metres_detail",
+                   "total_forages_initial": "nb_forages_initial", "total_forages_detaille": "nb_forages_detail"},
+        "detail": "forages",
+    },
+}
+
+
+def etat_vide(calcul):
+    """
+    État initial d'une évaluation incrémentale.
+
+    Args:
+        calcul: clé de CALCULS
+
+    Returns:
+        Un dictionnaire {"calcul", "parametres", "corps", "ordre", "totaux", "tableau", "details"}
+    """
+    if calcul not in CALCULS:
+        raise ValueError(f"Calcul inconnu: {calcul}")
+    return {"calcul": calcul, "parametres": None, "corps": {}, "ordre": [],
+            "totaux": dict.fromkeys(CALCULS[calcul]["totaux"], 0.0), "tableau": None, "details": None}
+
+
+def _cles_corps(corps_mineralises):
+    """Clé de chaque corps: son id (ou sa position), suffixée de son rang parmi les corps de même id."""
+    vus = {}
+    cles = []
+    for rang, corps in enumerate(corps_mineralises):
+        identifiant = str(corps.get("id", f"#{rang}"))
+        vus[identifiant] = vus.get(identifiant, -1) + 1
+        cles.append(f"{identifiant}/{vus[identifiant]}" if vus[identifiant] else identifiant)
+    return cles
+
+
+def _details(etat, cles):
+    """Table de détail de tous les corps, dans l'ordre des corps; la colonne "corps" est leur rang."""
+    details = [etat["corps"][cle]["detail"] for cle in cles]
+    if not details:
+        return pd.DataFrame(columns=COLONNES_FORAGES)
+    # Concaténation colonne par colonne (bien plus rapide que pd.concat de nombreuses petites tables)
+    table = pd.DataFrame({
+        colonne: (union_categoricals([detail[colonne] for detail in details])
+                  if isinstance(valeurs, pd.Categorical)
+                  else np.concatenate([detail[colonne] for detail in details]))
+        for colonne, valeurs in details[0].items()
+    })
+    table["corps"] = np.repeat(np.arange(len(details)), [len(next(iter(detail.values()))) for detail in details])
+    return table
+
+
+def evaluer(etat, corps_mineralises, **parametres):
+    """
+    Met à jour une évaluation incrémentale pour les corps et paramètres courants.
+
+    Args:
+        etat: état retourné par etat_vide, modifié en place
+        corps_mineralises: liste de dictionnaires de corps minéralisés
+        **parametres: paramètres globaux; seuls ceux déclarés dans les dépendances
+            du calcul sont utilisés
+
+    Returns:
+        Un tuple (tableau, totaux, nb_recalcules): DataFrame des résultats dans l'ordre
+        des corps, dictionnaire des totaux et nombre de corps recalculés. Pour un
+        calcul avec détail, la table de détail de tous les corps est dans etat["details"]
+
+    Raises:
+        ValueError: si un paramètre dont dépend le calcul est absent
+    """
+    calcul = CALCULS[etat["calcul"]]
+    manquants = [nom for nom in calcul["dependances"] if nom not in parametres]
+    if manquants:
+        raise ValueError(f"Paramètre(s) manquant(s): {', '.join(manquants)}")
+    parametres = {nom: parametres[nom] for nom in calcul["dependances"]}
+    empreinte_parametres = empreinte(parametres)
+
+    # Un changement de paramètre invalide tous les corps
+    if empreinte_parametres != etat["parametres"]:
+        etat["parametres"] = empreinte_parametres
+        etat["corps"] = {}
+
+    cles = _cles_corps(corps_mineralises)
+    empreintes = [empreinte(corps) for corps in corps_mineralises]
+    a_calculer = [rang for rang, (cle, valeur) in enumerate(zip(cles, empreintes))
+                  if etat["corps"].get(cle, {}).get("empreinte") != valeur]
+
+    # Totaux mis à jour par différence: retrait des corps supprimés ou modifiés, ajout des nouvelles lignes
+    anciens = set(etat["corps"]) - set(cles) | {cles[rang] for rang in a_calculer}
+    totaux = etat["totaux"] if etat["corps"] else dict.fromkeys(calcul["totaux"], 0.0)
+    for cle in anciens & set(etat["corps"]):
+        for total, colonne in calcul["totaux"].items():
+            totaux[total] -= etat["corps"][cle]["ligne"][colonne]
+        del etat["corps"][cle]
+
+    if a_calculer:
+        lignes = calcul["fonction"]([corps_mineralises[rang] for rang in a_calculer], **parametres)
+        for rang, ligne in zip(a_calculer, lignes):
+            detail = ligne.pop(calcul["detail"]) if calcul["detail"] else None
+            etat["corps"][cles[rang]] = {"empreinte": empreintes[rang], "ligne": ligne, "detail": detail}
+            for total, colonne in calcul["totaux"].items():
+                totaux[total] += ligne[colonne]
+
+    # Recalcul exact des totaux quand tous les corps ont été recalculés (pas d'erreur d'arrondi cumulée)
+    if len(a_calculer) == len(cles):
+        totaux = {total: math.fsum(etat["corps"][cle]["ligne"][colonne] for cle in cles)
+                  for total, colonne in calcul["totaux"].items()}
+    etat["totaux"] = totaux
+
+    if a_calculer or anciens or etat["ordre"] != cles or etat["tableau"] is None:
+        etat["tableau"] = pd.DataFrame([etat["corps"][cle]["ligne"] for cle in cles], columns=calcul["colonnes"])
+        etat["details"] = _details(etat, cles) if calcul["detail"] else None
+        etat["ordre"] = cles
+    return etat["tableau"], dict(totaux), len(a_calculer)
@@ -0,0 +1,182 @@
+"""
+Index spatial des corps minéralisés d'un scénario.
+
+Chaque corps est représenté par sa boîte englobante alignée sur les axes
+(calculée à partir des sommets de geometrie.sommets_filons). Les boîtes sont
+réparties dans les cellules carrées d'une grille horizontale (x, y): un corps
+est inscrit dans toutes les cellules que sa boîte recouvre. Les requêtes de
+voisinage et de chevauchement ne comparent que les corps qui partagent une
+cellule, ce qui évite de tester toutes les paires de corps d'un scénario.
+
+L'index est un dictionnaire de tableaux NumPy (voir construire_index), calculé
+en une seule passe vectorisée.
+"""
+import numpy as np
+
+from .geometrie import sommets_filons
+
+# Nombre moyen maximal de cellules recouvertes par un corps: au-delà, la taille
+# des cellules est doublée (cas d'un corps très grand parmi de petits corps)
+CELLULES_PAR_CORPS_MAX = 64
+
+
+def boites_filons(corps_mineralises):
+    """
+    Boîtes englobantes alignées sur les axes des corps minéralisés.
+
+    Returns:
+        Un tuple (minimums, maximums) de tableaux de forme (n, 3)
+    """
+    sommets = sommets_filons(corps_mineralises)
+    return sommets.min(axis=1), sommets.max(axis=1)
+
+
+def _cellules(index, minimums_xy, maximums_xy):
+    """Premières et dernières cellules (ix, iy) recouvertes par des rectangles horizontaux."""
+    premieres = np.floor((minimums_xy - index["origine"]) / index["taille_cellule"]).astype(np.int64)
+    dernieres = np.floor((maximums_xy - index["origine"]) / index["taille_cellule"]).astype(np.int64)
+    return premieres, dernieres
+
+
+def _inscrire(premieres, dernieres):
+    """
+    Énumère les cellules recouvertes par chaque rectangle.
+
+    Returns:
+        Un tuple (rangs, ix, iy): rang du rectangle et indices de chaque cellule recouverte
+    """
+    nombres = dernieres - premieres + 1
+    comptes = nombres.prod(axis=1)
+    rangs = np.repeat(np.arange(len(comptes)), comptes)
+    # Position de chaque cellule dans son rectangle, iy variant le plus vite
+    positions = np.arange(comptes.sum()) - np.repeat(np.cumsum(comptes) - comptes, comptes)
+    hauteurs = nombres[rangs, 1]
+    return rangs, premieres[rangs, 0] + positions // hauteurs, premieres[rangs, 1] + positions % hauteurs
+
+
+def construire_index(corps_mineralises, taille_cellule=None):
+    """
+    Construit l'index spatial des corps minéralisés.
+
+    Args:
+        corps_mineralises: liste de dictionnaires de corps minéralisés
+        taille_cellule: côté des cellules de la grille (m); par défaut, la médiane
+            de la plus grande dimension horizontale des boîtes
+
+    Returns:
+        Un dictionnaire {"minimums", "maximums", "origine", "taille_cellule",
+        "largeur", "cles", "corps"}: boîtes des corps, grille, et couples
+        (clé de cellule, corps) triés par clé
+    """
+    minimums, maximums = boites_filons(corps_mineralises)
+    nb_corps = len(minimums)
+    index = {"minimums": minimums, "maximums": maximums, "origine": np.zeros(2), "taille_cellule": 1.0,
+             "largeur": 1, "cles": np.zeros(0, dtype=np.int64), "corps": np.zeros(0, dtype=np.int64)}
+    if nb_corps == 0:
+        return index
+
+    etendues = (maximums - minimums)[:, :2]
+    if taille_cellule is None:
+        taille_cellule = float(np.median(etendues.max(axis=1)))
+    taille_cellule = max(float(taille_cellule), 1e-6)
+    index["origine"] = minimums[:, :2].min(axis=0)
+
+    # Taille des cellules bornée par le nombre total d'inscriptions
+    while True:
+        index["taille_cellule"] = taille_cellule
+        premieres, dernieres = _cellules(index, minimums[:, :2], maximums[:, :2])
+        if (dernieres - premieres + 1).prod(axis=1).sum() <= CELLULES_PAR_CORPS_MAX * nb_corps:
+            break
+        taille_cellule *= 2
+
+    rangs, ix, iy = _inscrire(premieres, dernieres)
+    index["largeur"] = int(dernieres[:, 1].max()) + 1
+    cles = ix * index["largeur"] + iy
+    ordre = np.argsort(cles, kind="stable")
+    index["cles"], index["corps"] = cles[ordre], rangs[ordre]
+    return index
+
+
+def corps_dans_boite(index, minimum, maximum):
+    """
+    Corps dont la boîte englobante intersecte une boîte donnée.
+
+    Args:
+        index: index retourné par construire_index
+        minimum, maximum: coins (x, y, z) de la boîte recherchée
+
+    Returns:
+        Un tableau trié des indices des corps
+    """
+    minimum, maximum = np.asarray(minimum, dtype=float), np.asarray(maximum, dtype=float)
+    if not len(index["cles"]):
+        return np.zeros(0, dtype=np.int64)
+
+    # Cellules recouvertes par la boîte, limitées à l'emprise de la grille
+    premieres, dernieres = _cellules(index, minimum[None, :2], maximum[None, :2])
+    premieres = np.maximum(premieres, 0)
+    dernieres = np.minimum(dernieres, [int(index["cles"][-1]) // index["largeur"], index["largeur"] - 1])
+    if (dernieres < premieres).any():
+        return np.zeros(0, dtype=np.int64)
+    _, ix, iy = _inscrire(premieres, dernieres)
+    cles = ix * index["largeur"] + iy
+    debuts = np.searchsorted(index["cles"], cles, side="left")
+    fins = np.searchsorted(index["cles"], cles, side="right")
+    comptes = fins - debuts
+    positions = np.repeat(debuts - np.cumsum(comptes) + comptes, comptes) + np.arange(comptes.sum())
+    candidats = np.unique(index["corps"][positions])
+
+    intersecte = ((index["minimums"][candidats] <= maximum) & (index["maximums"][candidats] >= minimum)).all(axis=1)
+    return candidats[intersecte]
+
+
+def corps_voisins(index, point, rayon):
+    """
+    Corps dont la boîte englobante est à moins de rayon d'un point.
+
+    Args:
+        index: index retourné par construire_index
+        point: coordonnées (x, y, z) du point
+        rayon: distance maximale (m)
+
+    Returns:
+        Un tableau trié des indices des corps
+    """
+    point = np.asarray(point, dtype=float)
+    candidats = corps_dans_boite(index, point - rayon, point + rayon)
+    # Distance du point à chaque boîte (nulle à l'intérieur)
+    ecarts = np.maximum(index["minimums"][candidats] - point, 0) + np.maximum(point - index["maximums"][candidats], 0)
+    return candidats[np.linalg.norm(ecarts, axis=1) <= rayon]
+
+
+def paires_chevauchantes(index):
+    """
+    Paires de corps dont les boîtes englobantes se chevauchent (volume commun non nul).
+
+    Seuls les corps inscrits dans une même cellule sont comparés.
+
+    Args:
+        index: index retourné par construire_index
+
+    Returns:
+        Un tableau d'entiers de forme (m, 2) des paires (i, j), i < j, triées
+    """
+    cles, corps = index["cles"], index["corps"]
+    if len(cles) < 2:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    # Pour chaque inscription, nombre d'inscriptions suivantes dans la même cellule
+    debuts_cellules = np.flatnonzero(np.r_[True, cles[1:] != cles[:-1]])
+    tailles = np.diff(np.r_[debuts_cellules, len(cles)])
+    rangs = np.arange(len(cles)) - np.repeat(debuts_cellules, tailles)
+    suivants = np.repeat(tailles, tailles) - rangs - 1
+
+    premiers = np.repeat(np.arange(len(cles)), suivants)
+    seconds = premiers + np.arange(suivants.sum()) - np.repeat(np.cumsum(suivants) - suivants, suivants) + 1
+    paires = np.sort(np.column_stack([corps[premiers], corps[seconds]]), axis=1)
+    paires = np.unique(paires, axis=0).reshape(-1, 2)
+
+    minimums, maximums = index["minimums"], index["maximums"]
+    chevauche = ((minimums[paires[:, 0]] < maximums[paires[:, 1]])
+                 & (minimums[paires[:, 1]] < maximums[paires[:, 0]])).all(axis=1)
+    return paires[chevauche]
@@ -0,0 +1,237 @@
+"""
+Interpolation des teneurs des blocs à partir des composites de forage.
+
+Deux méthodes: inverse des distances (IDW) et plus proche voisin. La recherche
+des composites se fait dans un ellipsoïde aligné sur chaque filon (rayons le
+long de la puissance, de la profondeur et de l'épaisseur): les coordonnées
+sont exprimées dans le repère du filon (geometrie.repere_filon) puis divisées
+par les rayons, ce qui ramène l'ellipsoïde à une sphère de rayon 1.
+
+L'index spatial est une grille de cellules cubiques dont les points sont triés
+par cellule; l'arête des cellules est adaptée à la densité des composites
+(environ nb_max composites par cellule, entre rayon / NB_DIVISIONS_MAX et
+rayon / NB_DIVISIONS_MIN). Les plus proches voisins sont cherchés
+par couronnes de cellules de plus en plus larges: un bloc est terminé dès que
+ses nb_max voisins sont plus proches que la couronne suivante, comme avec un
+arbre k-d, mais entièrement en opérations NumPy vectorisées.
+
+Les blocs sont traités par lots dont la taille est adaptée à la densité des
+composites, de sorte que la mémoire reste bornée (NB_PAIRES_MAX couples
+bloc-composite simultanés) même avec un million de composites.
+"""
+import numpy as np
+
+from .geometrie import repere_filon, sommets_filon
+
+# Méthodes d'interpolation disponibles
+METHODES = {"idw": "Inverse des distances", "ppv": "Plus proche voisin"}
+
+# Rayons de recherche par défaut (m), le long des axes puissance, profondeur et épaisseur
+RAYONS_DEFAUT = (100.0, 50.0, 10.0)
+
+# Bornes du nombre de cellules de l'index par rayon de recherche
+NB_DIVISIONS_MIN = 2
+NB_DIVISIONS_MAX = 4
+
+# Nombre maximal de blocs par lot et de couples bloc-composite examinés simultanément
+TAILLE_LOT_BLOCS = 100_000
+NB_PAIRES_MAX = 4_000_000
+
+
+def index_cellules(points, taille_cellule):
+    """
+    Construit un index spatial de points par cellules cubiques.
+
+    Args:
+        points: coordonnées (n, 3)
+        taille_cellule: arête des cellules
+
+    Returns:
+        Un dictionnaire {"ordre", "cles", "debuts", "effectifs", "origine", "forme", "taille_cellule"}:
+        les points de la cellule cles[c] sont ordre[debuts[c]:debuts[c] + effectifs[c]]
+    """
+    cellules = np.floor(points / taille_cellule).astype(np.int64)
+    origine = cellules.min(axis=0) if len(points) else np.zeros(3, dtype=np.int64)
+    forme = (cellules.max(axis=0) - origine + 1) if len(points) else np.ones(3, dtype=np.int64)
+    cles_points = np.ravel_multi_index((cellules - origine).T, forme)
+    ordre = np.argsort(cles_points, kind="stable")
+    cles, debuts, effectifs = np.unique(cles_points[ordre], return_index=True, return_counts=True)
+    return {"ordre": ordre, "cles": cles, "debuts": debuts, "effectifs": effectifs,
+            "origine": origine, "forme": forme, "taille_cellule": taille_cellule}
+
+
+def _couronne(rang):
+    """Décalages (n, 3) des cellules à distance de Tchebychev exactement égale à rang."""
+    cube = np.indices((2 * rang + 1,) * 3).reshape(3, -1).T - rang
+    return cube[np.abs(cube).max(axis=1) == rang] if rang > 0 else cube
+
+
+def _fusionner(requetes, distances2, indices, meilleures_d2, meilleurs_idx):
+    """Conserve, pour chaque requête, ses nb_max candidats les plus proches (tableaux mis à jour en place)."""
+    nb_max = meilleures_d2.shape[1]
+    concernees = np.flatnonzero(np.bincount(requetes, minlength=len(meilleures_d2)))
+    anciens = meilleurs_idx[concernees] >= 0
+    requetes = np.concatenate([requetes, np.repeat(concernees, anciens.sum(axis=1))])
+    distances2 = np.concatenate([distances2, meilleures_d2[concernees][anciens]])
+    indices = np.concatenate([indices, meilleurs_idx[concernees][anciens]])
+
+    # Tri par requête puis par distance en une seule clé (distances au carré dans [0, 1])
+    ordre = np.argsort(requetes + distances2 / (1 + distances2.max(initial=0.0)) * 0.5)
+    requetes, distances2, indices = requetes[ordre], distances2[ordre], indices[ordre]
+    debut_groupe = np.flatnonzero(np.r_[True, requetes[1:] != requetes[:-1]])
+    rangs = np.arange(len(requetes)) - np.repeat(debut_groupe, np.diff(np.r_[debut_groupe, len(requetes)]))
+    garde = rangs < nb_max
+
+    meilleures_d2[concernees] = np.inf
+    meilleurs_idx[concernees] = -1
+    meilleures_d2[requetes[garde], rangs[garde]] = distances2[garde]
+    meilleurs_idx[requetes[garde], rangs[garde]] = indices[garde]
+
+
+def plus_proches_voisins(index, points, requetes, nb_max, rayon=1.0):
+    """
+    Cherche les nb_max points les plus proches de chaque requête, dans un rayon donné.
+
+    Args:
+        index: index retourné par index_cellules sur points
+        points: coordonnées (n, 3) des points indexés
+        requetes: coordonnées (m, 3) des points de requête
+        nb_max: nombre maximal de voisins par requête
+        rayon: distance maximale de recherche
+
+    Returns:
+        Un tuple (distances (m, nb_max), indices (m, nb_max)) trié par distance croissante,
+        complété par inf et -1 quand moins de nb_max points sont dans le rayon
+    """
+    taille = index["taille_cellule"]
+    nb_couronnes = int(np.ceil(rayon / taille))
+    meilleures_d2 = np.full((len(requetes), nb_max), np.inf)
+    meilleurs_idx = np.full((len(requetes), nb_max), -1, dtype=np.int64)
+    if len(points) == 0:
+        return meilleures_d2, meilleurs_idx
+
+    cellules = np.floor(requetes / taille).astype(np.int64) - index["origine"]
+    actives = np.arange(len(requetes))
+    for rang in range(nb_couronnes + 1):
+        paires = [], [], []
+        nb_paires = 0
+        for decalage in _couronne(rang):
+            voisines = cellules[actives] + decalage
+            dans_grille = np.all((voisines >= 0) & (voisines < index["forme"]), axis=1)
+            cles = np.ravel_multi_index(voisines[dans_grille].T, index["forme"])
+            position = np.minimum(np.searchsorted(index["cles"], cles), len(index["cles"]) - 1)
+            trouvee = index["cles"][position] == cles
+            effectifs = index["effectifs"][position[trouvee]]
+            if effectifs.sum() == 0:
+                continue
+
+            # Couples (requête, point) de toutes les cellules trouvées
+            requetes_paires = np.repeat(actives[dans_grille][trouvee], effectifs)
+            rangs_points = (np.repeat(index["debuts"][position[trouvee]] - np.cumsum(effectifs) + effectifs, effectifs)
+                            + np.arange(effectifs.sum()))
+            points_paires = index["ordre"][rangs_points]
+            distances2 = ((points[points_paires] - requetes[requetes_paires]) ** 2).sum(axis=1)
+            dans_rayon = distances2 <= rayon ** 2
+            for liste, valeurs in zip(paires, (requetes_paires, distances2, points_paires)):
+                liste.append(valeurs[dans_rayon])
+            nb_paires += int(dans_rayon.sum())
+            if nb_paires >= NB_PAIRES_MAX:
+                _fusionner(*(np.concatenate(liste) for liste in paires), meilleures_d2, meilleurs_idx)
+                paires, nb_paires = ([], [], []), 0
+        if nb_paires:
+            _fusionner(*(np.concatenate(liste) for liste in paires), meilleures_d2, meilleurs_idx)
+
+        # Requêtes terminées: nb_max voisins plus proches que toute cellule non encore examinée
+        termine = meilleures_d2[actives, -1] <= (rang * taille) ** 2
+        actives = actives[~termine]
+        if len(actives) == 0:
+            break
+    return np.sqrt(meilleures_d2), meilleurs_idx
+
+
+def interpoler_teneurs(modele, corps_mineralises, composites, methode="idw", rayons=RAYONS_DEFAUT, puissance=2.0,
+                       nb_max=16, nb_min=1, limiter_au_corps=True, taille_lot=TAILLE_LOT_BLOCS):
+    """
+    Interpole la teneur de chaque bloc d'un modèle à partir des composites de forage.
+
+    Args:
+        modele: modèle retourné par blocs.modele_blocs
+        corps_mineralises: corps minéralisés du modèle
+        composites: DataFrame (x, y, z, teneur), voir composites.lire_composites
+        methode: clé de METHODES
+        rayons: rayons de l'ellipsoïde de recherche (m) le long des axes puissance, profondeur et épaisseur
+        puissance: exposant de l'inverse des distances (distances mesurées dans l'ellipsoïde)
+        nb_max: nombre maximal de composites utilisés par bloc
+        nb_min: nombre minimal de composites pour estimer un bloc
+        limiter_au_corps: n'utiliser pour un corps que les composites situés dans son volume
+        taille_lot: nombre maximal de blocs traités par lot
+
+    Returns:
+        Un dictionnaire de tableaux indexés par bloc: "teneur" (teneur interpolée, ou teneur
+        actuelle du modèle pour les blocs non estimés), "estime", "nb_composites" et
+        "distance" (distance réduite au composite le plus proche, 1 = bord de l'ellipsoïde)
+    """
+    if methode not in METHODES:
+        raise ValueError(f"Méthode d'interpolation inconnue: {methode}")
+    if methode == "ppv":
+        nb_max, nb_min = 1, 1
+    rayons = np.asarray(rayons, dtype=float)
+    coordonnees = composites[["x", "y", "z"]].to_numpy(dtype=float)
+    teneurs_composites = composites["teneur"].to_numpy(dtype=float)
+
+    # Composites triés selon x pour extraire rapidement ceux proches de chaque corps
+    ordre_x = np.argsort(coordonnees[:, 0], kind="stable")
+    x_tries = coordonnees[ordre_x, 0]
+
+    nb_blocs = len(modele["volume"])
+    resultat = {
+        "teneur": modele["teneur"].copy(),
+        "estime": np.zeros(nb_blocs, dtype=bool),
+        "nb_composites": np.zeros(nb_blocs, dtype=np.int32),
+        "distance": np.full(nb_blocs, np.inf),
+    }
+    for corps_idx, corps in enumerate(corps_mineralises):
+        debut_corps, fin_corps = modele["debuts"][corps_idx], modele["debuts"][corps_idx + 1]
+        centre, rotation, demi_dimensions = repere_filon(corps)
+
+        # Composites dans la boîte englobante du corps (élargie des rayons sans limite au corps)
+        sommets = sommets_filon(corps)
+        marge = 0.0 if limiter_au_corps else rayons.max()
+        bas, haut = sommets.min(axis=0) - marge, sommets.max(axis=0) + marge
+        candidats = ordre_x[np.searchsorted(x_tries, bas[0]):np.searchsorted(x_tries, haut[0], side="right")]
+        candidats = candidats[np.all((coordonnees[candidats] >= bas) & (coordonnees[candidats] <= haut), axis=1)]
+        locales = (coordonnees[candidats] - centre) @ rotation.T
+        if limiter_au_corps:
+            dedans = np.all(np.abs(locales) <= demi_dimensions + 1e-6, axis=1)
+            candidats, locales = candidats[dedans], locales[dedans]
+        if len(candidats) == 0:
+            continue
+
+        reduites = locales / rayons
+        # Cellules contenant en moyenne environ nb_max composites
+        volume = np.prod(np.maximum(np.ptp(reduites, axis=0), 1.0 / NB_DIVISIONS_MAX))
+        taille_cellule = np.clip(np.cbrt(volume * nb_max / len(reduites)), 1.0 / NB_DIVISIONS_MAX, 1.0 / NB_DIVISIONS_MIN)
+        index = index_cellules(reduites, taille_cellule)
+        # Lots de blocs bornés par le nombre de couples examinés dans les cellules les plus denses
+        lot = int(np.clip(NB_PAIRES_MAX // max(int(index["effectifs"].max()) * nb_max, 1), 1000, taille_lot))
+        for debut in range(debut_corps, fin_corps, lot):
+            blocs = slice(debut, min(debut + lot, fin_corps))
+            requetes = ((modele["centres"][blocs] - centre) @ rotation.T) / rayons
+            distances, voisins = plus_proches_voisins(index, reduites, requetes, nb_max)
+
+            valides = voisins >= 0
+            nb_voisins = valides.sum(axis=1)
+            estime = nb_voisins >= max(nb_min, 1)
+            teneurs_voisins = np.where(valides, teneurs_composites[candidats[np.maximum(voisins, 0)]], 0.0)
+            if methode == "ppv":
+                teneur = teneurs_voisins[:, 0]
+            else:
+                poids = np.where(valides, 1.0 / np.maximum(distances, 1e-9) ** puissance, 0.0)
+                with np.errstate(invalid="ignore"):
+                    teneur = (poids * teneurs_voisins).sum(axis=1) / poids.sum(axis=1)
+
+            resultat["teneur"][blocs] = np.where(estime, teneur, resultat["teneur"][blocs])
+            resultat["estime"][blocs] = estime
+            resultat["nb_composites"][blocs] = nb_voisins
+            resultat["distance"][blocs] = distances[:, 0]
+    return resultat
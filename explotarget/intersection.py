@@ -0,0 +1,115 @@
+"""
+Intersection des forages avec les corps minéralisés de type filon.
+
+Chaque filon est un parallélépipède orienté (geometrie.repere_filon). Les forages
+sont des demi-droites partant de leur collar; l'intersection est calculée pour
+tous les forages à la fois par la méthode des plans parallèles (« slabs ») dans
+le repère local du filon, ou de leurs filons respectifs (intersecter_reperes).
+Un forage dont le toit du filon est au-delà de la longueur maximale réalisable
+ne recoupe pas le filon: il n'est ni foré ni compté.
+"""
+import numpy as np
+
+from .geometrie import repere_filon
+
+# Longueur forée au-delà du mur du filon pour s'assurer de l'avoir traversé (m)
+MARGE_SORTIE_DEFAUT = 10.0
+
+
+def intersecter_forages(corps, collars, directions, profondeur_max=np.inf):
+    """
+    Calcule l'intersection de forages rectilignes avec un corps minéralisé.
+
+    Args:
+        corps: dictionnaire contenant les propriétés du corps minéralisé
+        collars: tableau de forme (n, 3) des points de départ des forages
+        directions: vecteur unitaire (3,) commun ou tableau (n, 3) de directions
+        profondeur_max: longueur maximale réalisable d'un forage (m)
+
+    Returns:
+        Un dictionnaire de tableaux de longueur n:
+        - "touche": True si le forage recoupe le filon à moins de profondeur_max de son collar
+        - "profondeur_entree", "profondeur_sortie": longueurs forées au toit et au mur (NaN si manqué)
+        - "longueur_intersectee": longueur forée dans le filon (0 si manqué)
+        - "epaisseur_vraie": épaisseur recoupée mesurée perpendiculairement au plan du filon
+    """
+    centre, rotation, demi = repere_filon(corps)
+    return intersecter_reperes(centre, rotation, demi, collars, directions, profondeur_max)
+
+
+def intersecter_reperes(centres, rotations, demi_dimensions, collars, directions, profondeur_max=np.inf):
+    """
+    Calcule l'intersection de forages rectilignes avec des filons donnés par leur repère.
+
+    Chaque forage peut viser son propre filon: le repère est commun à tous les
+    forages ou donné forage par forage, ce qui permet de traiter les forages de
+    tous les corps d'un scénario en un seul appel.
+
+    Args:
+        centres: centre (3,) commun ou tableau (n, 3) (voir geometrie.reperes_filons)
+        rotations: matrice (3, 3) commune ou tableau (n, 3, 3) dont les lignes sont les axes du filon
+        demi_dimensions: demi-dimensions (3,) communes ou tableau (n, 3)
+        collars: tableau de forme (n, 3) des points de départ des forages
+        directions: vecteur unitaire (3,) commun ou tableau (n, 3) de directions
+        profondeur_max: longueur maximale réalisable d'un forage (m)
+
+    Returns:
+        Le dictionnaire de tableaux de longueur n décrit dans intersecter_forages
+    """
+    collars = np.atleast_2d(np.asarray(collars, dtype=float))
+    directions = np.broadcast_to(np.asarray(directions, dtype=float), collars.shape)
+    rotations = np.asarray(rotations, dtype=float)
+    demi = np.asarray(demi_dimensions, dtype=float)
+
+    # Passage dans le repère local (puissance, profondeur, épaisseur)
+    if rotations.ndim == 2:
+        origine = (collars - centres) @ rotations.T
+        vecteur = directions @ rotations.T
+    else:
+        origine = np.einsum("nx,nax->na", collars - centres, rotations)
+        vecteur = np.einsum("nx,nax->na", directions, rotations)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t1 = (-demi - origine) / vecteur
+        t2 = (demi - origine) / vecteur
+    t_min = np.minimum(t1, t2)
+    t_max = np.maximum(t1, t2)
+
+    # Direction parallèle à une paire de faces: intervalle infini si le forage est entre les faces, vide sinon
+    parallele = vecteur == 0
+    dedans = np.abs(origine) <= demi
+    t_min = np.where(parallele, np.where(dedans, -np.inf, np.inf), t_min)
+    t_max = np.where(parallele, np.where(dedans, np.inf, -np.inf), t_max)
+
+    entree = np.maximum(t_min.max(axis=1), 0)
+    sortie = t_max.min(axis=1)
+    # Le toit doit être atteint avant la longueur maximale
+    touche = (entree <= sortie) & (sortie > 0) & (entree <= profondeur_max)
+
+    longueur = np.where(touche, sortie - entree, 0.0)
+    return {
+        "touche": touche,
+        "profondeur_entree": np.where(touche, entree, np.nan),
+        "profondeur_sortie": np.where(touche, sortie, np.nan),
+        "longueur_intersectee": longueur,
+        "epaisseur_vraie": longueur * np.abs(vecteur[:, 2]),
+    }
+
+
+def longueurs_requises(intersections, profondeur_forage_max, marge_sortie=MARGE_SORTIE_DEFAUT):
+    """
+    Calcule la longueur à forer pour traverser le filon et dépasser son mur.
+
+    Args:
+        intersections: résultat de intersecter_forages (avec la même profondeur_max)
+        profondeur_forage_max: longueur maximale réalisable (m)
+        marge_sortie: longueur forée au-delà du mur (m)
+
+    Returns:
+        Un tuple (longueurs, trop_courts): longueurs planifiées (0 pour un forage qui
+        manque le filon, plafonnées à profondeur_forage_max) et indicateur des forages
+        dont la longueur requise dépasse la profondeur maximale
+    """
+    requises = np.where(intersections["touche"], intersections["profondeur_sortie"] + marge_sortie, 0.0)
+    trop_courts = requises > profondeur_forage_max
+    return np.minimum(requises, profondeur_forage_max), trop_courts
@@ -0,0 +1,270 @@
+"""
+Évaluation en ligne de commande de fichiers de scénarios, sans Streamlit.
+
+Lit des fichiers JSON de scénarios (format de "Exporter tous les scénarios":
+tableau de scénarios avec leurs corps minéralisés, ou un scénario seul), ou
+des dossiers qui en contiennent, évalue les scénarios en parallèle avec la
+même logique que l'application (explotarget.comparaison) et écrit les tables
+de résultats en CSV, Parquet et/ou JSON:
+
+- scenarios: une ligne par scénario (tableau de comparaison et fichier source);
+- ressources: estimation des ressources, une ligne par corps;
+- forages: plan de forage, une ligne par corps;
+- plans_forage: forages planifiés (forage.table_forages), une ligne par forage;
+- budgets: budget par phase et paramètres d'évaluation, une ligne par scénario.
+
+    python -m explotarget.lots scenarios.json exports/ --sortie resultats --formats csv parquet
+    python -m explotarget.lots exports/ --parametres parametres.json --processus 4
+
+Les fichiers sont lus en flux et les scénarios évalués par lots de
+TAILLE_LOT_SCENARIOS; les corps invalides sont rejetés comme à l'importation.
+Les scénarios d'un fichier ne rejoignent les lots (et les compteurs du rapport)
+qu'une fois le fichier entièrement lu: un fichier illisible n'est pas évalué
+en partie.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from .comparaison import PARAMETRES_DEFAUT, evaluer_scenarios, tableau_comparaison
+from .importation import NB_ERREURS_MAX, iterer_tableau_json, rapport_vide, signaler_rejet, valider_scenario
+
+# Formats de sortie disponibles
+FORMATS = ["csv", "parquet", "json"]
+
+# Nombre de scénarios évalués ensemble (borne la mémoire des gros dossiers)
+TAILLE_LOT_SCENARIOS = 64
+
+# Tables écrites dans le dossier de sortie
+TABLES = ["scenarios", "ressources", "forages", "plans_forage", "budgets"]
+
+
+def fichiers_scenarios(chemins):
+    """
+    Liste les fichiers JSON désignés par des chemins de fichiers ou de dossiers.
+
+    Args:
+        chemins: chemins de fichiers, ou de dossiers parcourus récursivement
+
+    Returns:
+        Une liste triée de chemins de fichiers, sans doublons
+
+    Raises:
+        ValueError: si un chemin n'existe pas
+    """
+    fichiers = []
+    for chemin in map(Path, chemins):
+        if chemin.is_dir():
+            fichiers.extend(sorted(chemin.rglob("*.json")))
+        elif chemin.is_file():
+            fichiers.append(chemin)
+        else:
+            raise ValueError(f"chemin introuvable: {chemin}")
+    return list(dict.fromkeys(fichiers))
+
+
+def lire_scenarios(chemin, rapport):
+    """
+    Parcourt les scénarios d'un fichier JSON, validés comme à l'importation.
+
+    Args:
+        chemin: fichier JSON (tableau de scénarios ou scénario seul)
+        rapport: rapport d'importation complété (voir importation.rapport_vide)
+
+    Returns:
+        Un itérateur de scénarios, chacun complété de la clé "fichier"
+
+    Raises:
+        ValueError: si le fichier n'est pas un JSON de scénarios valide
+    """
+    with open(chemin, "rb") as flux:
+        debut = flux.read(4096).lstrip().lstrip(b"\xef\xbb\xbf").lstrip()
+        flux.seek(0)
+        if debut.startswith(b"{"):
+            try:
+                elements = [json.load(flux)]
+            except json.JSONDecodeError as erreur:
+                raise ValueError(f"JSON invalide: {erreur.msg}") from erreur
+        else:
+            elements = iterer_tableau_json(flux)
+
+        for indice, element in enumerate(elements):
+            if not isinstance(element, dict) or "corps_mineralises" not in element:
+                signaler_rejet(rapport, f"{chemin}: élément {indice + 1}", element, ["l'élément n'est pas un scénario"])
+                continue
+            scenario = valider_scenario(indice, element, rapport)
+            rapport["nb_scenarios"] += 1
+            rapport["nb_corps"] += len(scenario["corps_mineralises"])
+            yield {**scenario, "fichier": str(chemin)}
+
+
+def _fusionner_rapport(rapport, rapport_fichier):
+    """Ajoute les compteurs et les erreurs du rapport de lecture d'un fichier au rapport global."""
+    for cle, valeur in rapport_fichier.items():
+        if cle == "erreurs":
+            rapport["erreurs"].extend(valeur[:NB_ERREURS_MAX - len(rapport["erreurs"])])
+        else:
+            rapport[cle] += valeur
+
+
+def _avec_scenario(table, scenario):
+    """Ajoute en tête d'une table l'id et le nom de son scénario."""
+    table = table.copy()
+    table.insert(0, "scenario", scenario["nom"])
+    table.insert(0, "scenario_id", scenario["id"])
+    return table
+
+
+def _tables_lot(scenarios, resultats):
+    """Tables de résultats d'un lot de scénarios évalués."""
+    comparaison = tableau_comparaison(resultats)
+    comparaison.insert(2, "fichier", [scenario["fichier"] for scenario in scenarios])
+
+    budgets = []
+    for scenario, resultat in zip(scenarios, resultats):
+        parametres = dict(resultat["parametres"])
+        for classe, facteur in zip(["mesurees", "indiquees", "inferees"], parametres.pop("facteurs_confiance")):
+            parametres[f"facteur_{classe}"] = facteur
+        budgets.append({"scenario_id": scenario["id"], "scenario": scenario["nom"], **resultat["budget"],
+                        "duree_totale": resultat["resume"]["duree_totale"], **parametres})
+
+    return {
+        "scenarios": comparaison,
+        "ressources": [_avec_scenario(resultat["estimation"], scenario) for scenario, resultat in zip(scenarios, resultats)],
+        "forages": [_avec_scenario(resultat["forage"], scenario) for scenario, resultat in zip(scenarios, resultats)],
+        "plans_forage": [_avec_scenario(resultat["forages"], scenario)
+                         for scenario, resultat in zip(scenarios, resultats)],
+        "budgets": pd.DataFrame(budgets),
+    }
+
+
+def ecrire_table(table, chemin, formats):
+    """
+    Écrit une table dans chacun des formats demandés.
+
+    Args:
+        table: DataFrame à écrire
+        chemin: chemin sans extension
+        formats: formats de FORMATS
+
+    Returns:
+        La liste des fichiers écrits
+
+    Raises:
+        ValueError: si un format est inconnu, ou si Parquet est demandé sans pyarrow
+    """
+    fichiers = []
+    for format_sortie in formats:
+        fichier = Path(chemin).with_suffix(f".{format_sortie}")
+        if format_sortie == "csv":
+            table.to_csv(fichier, index=False)
+        elif format_sortie == "parquet":
+            try:
+                table.to_parquet(fichier, index=False)
+            except ImportError as erreur:
+                raise ValueError("l'écriture des fichiers Parquet nécessite le paquet pyarrow") from erreur
+        elif format_sortie == "json":
+            table.to_json(fichier, orient="records", force_ascii=False, indent=2)
+        else:
+            raise ValueError(f"format de sortie inconnu: {format_sortie}")
+        fichiers.append(fichier)
+    return fichiers
+
+
+def evaluer_fichiers(chemins, dossier_sortie, formats=("csv",), parametres=None, plan_sauvegarde=True,
+                     nb_processus=None, taille_lot=TAILLE_LOT_SCENARIOS, afficher=print):
+    """
+    Évalue les scénarios de fichiers JSON et écrit les tables de résultats.
+
+    Args:
+        chemins: fichiers ou dossiers de scénarios (voir fichiers_scenarios)
+        dossier_sortie: dossier recevant les tables (créé si besoin)
+        formats: formats de sortie (voir FORMATS)
+        parametres: paramètres remplaçant ceux de comparaison.PARAMETRES_DEFAUT
+        plan_sauvegarde: reprendre les paramètres du plan de forage sauvegardé dans chaque scénario
+        nb_processus: taille du pool de processus (1: évaluation dans le processus courant)
+        taille_lot: nombre de scénarios évalués ensemble
+        afficher: fonction d'affichage de la progression (None: silencieux)
+
+    Returns:
+        Un rapport: compteurs et erreurs de lecture (voir importation.rapport_vide), complété de
+        "nb_fichiers", "erreurs_fichiers" ({"fichier", "erreur"}) et "fichiers_ecrits"
+    """
+    rapport = rapport_vide()
+    rapport.update(nb_fichiers=0, erreurs_fichiers=[], fichiers_ecrits=[])
+    tables = {nom: [] for nom in TABLES}
+
+    def evaluer_lot(lot):
+        resultats = evaluer_scenarios(lot, parametres, plan_sauvegarde, nb_processus)
+        for nom, valeur in _tables_lot(lot, resultats).items():
+            tables[nom].extend(valeur if isinstance(valeur, list) else [valeur])
+        if afficher is not None:
+            afficher(f"{sum(len(table) for table in tables['scenarios'])} scénario(s) évalué(s)")
+
+    lot = []
+    for fichier in fichiers_scenarios(chemins):
+        rapport["nb_fichiers"] += 1
+        rapport_fichier = rapport_vide()
+        try:
+            scenarios = list(lire_scenarios(fichier, rapport_fichier))
+        except (ValueError, UnicodeDecodeError, OSError) as erreur:
+            rapport["erreurs_fichiers"].append({"fichier": str(fichier), "erreur": str(erreur)})
+            if afficher is not None:
+                afficher(f"{fichier}: {erreur}")
+            continue
+        _fusionner_rapport(rapport, rapport_fichier)
+        lot.extend(scenarios)
+        while len(lot) >= taille_lot:
+            evaluer_lot(lot[:taille_lot])
+            lot = lot[taille_lot:]
+    if lot:
+        evaluer_lot(lot)
+
+    dossier_sortie = Path(dossier_sortie)
+    dossier_sortie.mkdir(parents=True, exist_ok=True)
+    for nom, morceaux in tables.items():
+        morceaux = [morceau for morceau in morceaux if len(morceau)]
+        table = pd.concat(morceaux, ignore_index=True) if morceaux else pd.DataFrame()
+        rapport["fichiers_ecrits"].extend(str(fichier) for fichier in ecrire_table(table, dossier_sortie / nom, formats))
+    return rapport
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Évaluation par lots de scénarios ExploTarget (estimation, forages, budget)")
+    parser.add_argument("chemins", nargs="+", help="fichiers JSON de scénarios ou dossiers qui en contiennent")
+    parser.add_argument("--sortie", type=Path, default=Path("resultats"), help="dossier des tables de résultats")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=["csv"], help="formats de sortie")
+    parser.add_argument("--parametres", type=Path,
+                        help=f"fichier JSON de paramètres d'évaluation (clés: {', '.join(PARAMETRES_DEFAUT)})")
+    parser.add_argument("--sans-plan-sauvegarde", action="store_true",
+                        help="ignorer les paramètres des plans de forage sauvegardés dans les scénarios")
+    parser.add_argument("--processus", type=int, help="taille du pool de processus (par défaut: nombre de processeurs)")
+    args = parser.parse_args(arguments)
+
+    parametres = None
+    if args.parametres is not None:
+        parametres = json.loads(args.parametres.read_text(encoding="utf-8"))
+        inconnus = sorted(set(parametres) - set(PARAMETRES_DEFAUT))
+        if inconnus:
+            parser.error(f"paramètre(s) inconnu(s): {', '.join(inconnus)}")
+
+    try:
+        rapport = evaluer_fichiers(args.chemins, args.sortie, args.formats, parametres,
+                                   not args.sans_plan_sauvegarde, args.processus)
+    except ValueError as erreur:
+        parser.error(str(erreur))
+
+    print(f"{rapport['nb_scenarios']} scénario(s) et {rapport['nb_corps']} corps évalués "
+          f"depuis {rapport['nb_fichiers']} fichier(s); {rapport['nb_rejets']} élément(s) rejeté(s)")
+    for erreur in rapport["erreurs"][:20]:
+        print(f"  {erreur['ligne']}: {erreur['erreurs']}")
+    for fichier in rapport["fichiers_ecrits"]:
+        print(f"Écrit: {fichier}")
+    return 1 if rapport["erreurs_fichiers"] or rapport["nb_scenarios"] == 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
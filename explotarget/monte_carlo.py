@@ -0,0 +1,252 @@
+"""
+Simulation Monte Carlo de l'incertitude sur le tonnage et le métal contenu.
+
+Chaque paramètre incertain d'un corps minéralisé (teneur, épaisseur, puissance,
+profondeur, densité) est multiplié par un facteur aléatoire de valeur centrale 1,
+tiré selon la loi choisie par l'utilisateur. Les tirages sont traités par lots
+vectorisés, peuvent être corrélés entre paramètres (copule gaussienne) et sont
+reproductibles avec une graine, quelle que soit la taille des lots.
+
+Comme dans estimation.estimer_scenario, le volume commun aux corps qui se
+chevauchent n'est compté qu'une fois: le tonnage nominal de chaque corps est
+réduit dans la proportion de son volume partagé avant les tirages.
+
+Convention des percentiles: P10 est la valeur dépassée dans 90 % des tirages
+(estimation basse), P90 celle dépassée dans 10 % des tirages (estimation haute).
+"""
+import numpy as np
+
+from .chevauchements import volumes_partages
+from .estimation import diviseurs_metal, tableau_corps
+
+# Paramètres pouvant être rendus incertains, dans l'ordre de la matrice de corrélation
+PARAMETRES_INCERTAINS = ["teneur", "epaisseur", "puissance", "profondeur", "densite"]
+
+# Lois disponibles pour les facteurs multiplicatifs
+LOIS = ["triangulaire", "uniforme", "normale", "lognormale"]
+
+# Nombre maximal de valeurs tirées simultanément (borne la mémoire des lots)
+TAILLE_LOT_MAX = 2_000_000
+
+
+def distributions_defaut():
+    """
+    Distributions par défaut: facteur triangulaire entre 0.8 et 1.2 pour chaque paramètre.
+
+    Returns:
+        Un dictionnaire {parametre: {"loi", "min", "mode", "max", "ecart_relatif"}}
+    """
+    return {
+        parametre: {"loi": "triangulaire", "min": 0.8, "mode": 1.0, "max": 1.2, "ecart_relatif": 0.1}
+        for parametre in PARAMETRES_INCERTAINS
+    }
+
+
+def _cdf_normale(z):
+    """Fonction de répartition de la loi normale centrée réduite (approximation d'Abramowitz-Stegun 7.1.26)."""
+    x = np.abs(z) / np.sqrt(2)
+    t = 1 / (1 + 0.3275911 * x)
+    polynome = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1 - polynome * np.exp(-x * x)
+    return 0.5 * (1 + np.sign(z) * erf)
+
+
+def _loi_bornee(distribution):
+    """Indique si la loi est définie par un minimum et un maximum (tirée par inversion d'une uniforme)."""
+    if distribution["loi"] not in LOIS:
+        raise ValueError(f"Loi inconnue: {distribution['loi']}")
+    return distribution["loi"] in ("triangulaire", "uniforme")
+
+
+def _facteurs_uniformes(u, distribution):
+    """Transforme des tirages uniformes sur [0, 1] en facteurs d'une loi bornée."""
+    a, b = distribution["min"], distribution["max"]
+    if distribution["loi"] == "uniforme":
+        return a + (b - a) * u
+    c = min(max(distribution.get("mode", 1.0), a), b)
+    if b <= a:
+        return np.full_like(u, a)
+    seuil = (c - a) / (b - a)
+    return np.where(u < seuil,
+                    a + np.sqrt(u * (b - a) * (c - a)),
+                    b - np.sqrt((1 - u) * (b - a) * (b - c)))
+
+
+def _facteurs(z, distribution):
+    """
+    Transforme des tirages normaux centrés réduits en facteurs multiplicatifs.
+
+    Args:
+        z: tableau de tirages normaux centrés réduits
+        distribution: dictionnaire décrivant la loi (voir distributions_defaut)
+
+    Returns:
+        Un tableau de facteurs positifs de même forme que z
+    """
+    if _loi_bornee(distribution):
+        return _facteurs_uniformes(_cdf_normale(z), distribution)
+    if distribution["loi"] == "normale":
+        return np.maximum(1 + distribution["ecart_relatif"] * z, 0)
+    # Loi lognormale de moyenne 1 et de coefficient de variation ecart_relatif
+    sigma2 = np.log(1 + distribution["ecart_relatif"] ** 2)
+    return np.exp(-sigma2 / 2 + np.sqrt(sigma2) * z)
+
+
+def matrice_correlation(correlations, parametres=PARAMETRES_INCERTAINS):
+    """
+    Construit la matrice de corrélation des paramètres incertains.
+
+    Args:
+        correlations: dictionnaire {(parametre_a, parametre_b): coefficient}; une
+            corrélation avec un paramètre certain (absent de parametres) est ignorée
+        parametres: ordre des paramètres dans la matrice
+
+    Returns:
+        La matrice de corrélation symétrique
+
+    Raises:
+        ValueError: si un paramètre n'est pas dans PARAMETRES_INCERTAINS ou si la
+            matrice n'est pas définie positive
+    """
+    matrice = np.eye(len(parametres))
+    for (a, b), coefficient in (correlations or {}).items():
+        inconnus = [nom for nom in (a, b) if nom not in PARAMETRES_INCERTAINS]
+        if inconnus:
+            raise ValueError(f"Corrélation sur un paramètre inconnu: {', '.join(map(str, inconnus))} "
+                             f"(paramètres possibles: {', '.join(PARAMETRES_INCERTAINS)})")
+        if a not in parametres or b not in parametres:
+            continue
+        i, j = parametres.index(a), parametres.index(b)
+        matrice[i, j] = matrice[j, i] = coefficient
+    if np.any(np.linalg.eigvalsh(matrice) <= 0):
+        raise ValueError("La matrice de corrélation doit être définie positive.")
+    return matrice
+
+
+def simuler_monte_carlo(corps_mineralises, distributions=None, facteur_confiance=1.0, nb_tirages=100_000,
+                        correlations=None, graine=None, independants=False, taille_lot=None,
+                        chevauchements=True):
+    """
+    Simule la distribution du tonnage ajusté et du métal contenu d'un scénario.
+
+    Args:
+        corps_mineralises: liste de dictionnaires de corps minéralisés
+        distributions: lois des facteurs par paramètre (voir distributions_defaut);
+            un paramètre absent est considéré comme certain
+        facteur_confiance: facteur appliqué au tonnage brut
+        nb_tirages: nombre de tirages
+        correlations: dictionnaire {(parametre_a, parametre_b): coefficient}
+        graine: graine du générateur aléatoire, pour des résultats reproductibles
+        independants: si True, chaque corps reçoit ses propres tirages; sinon un même
+            tirage s'applique à tous les corps (incertitude commune, plus rapide)
+        taille_lot: nombre de tirages traités par lot (par défaut borné par TAILLE_LOT_MAX)
+        chevauchements: déduire le volume commun aux corps qui se chevauchent, compté
+            une seule fois dans le premier corps (voir chevauchements.volumes_partages)
+
+    Returns:
+        Un dictionnaire avec les tirages "tonnage" et "metal" du scénario (un par tirage)
+        et les moyennes par corps "tonnage_corps" et "metal_corps"
+    """
+    distributions = distributions if distributions is not None else distributions_defaut()
+    corps_df = tableau_corps(corps_mineralises)
+    nb_corps = len(corps_df)
+
+    # Valeurs nominales par corps, réduites de la part de volume déjà comptée dans un corps précédent
+    volume = (corps_df["puissance"].to_numpy(dtype=float) * corps_df["epaisseur"].to_numpy(dtype=float)
+              * corps_df["profondeur"].to_numpy(dtype=float))
+    if chevauchements:
+        volume_net = volume - volumes_partages(corps_mineralises)
+        fractions = np.divide(volume_net, volume, out=np.ones_like(volume), where=volume > 0)
+    else:
+        fractions = np.ones(nb_corps)
+    tonnage_nominal = volume * fractions * corps_df["densite"].to_numpy(dtype=float) * facteur_confiance
+    _, diviseur = diviseurs_metal(corps_df["unite_teneur"])
+    metal_par_tonne = corps_df["teneur"].to_numpy(dtype=float) / diviseur
+    metal_nominal = tonnage_nominal * metal_par_tonne
+
+    parametres = [p for p in PARAMETRES_INCERTAINS if p in distributions]
+    matrice = matrice_correlation(correlations, parametres)
+    correles = not np.array_equal(matrice, np.eye(len(parametres)))
+    cholesky = np.linalg.cholesky(matrice) if correles else None
+
+    # Un générateur par paramètre (un seul pour les tirages corrélés): chaque flux est
+    # consommé dans l'ordre des tirages, les résultats ne dépendent pas de la taille des lots
+    germes = np.random.SeedSequence(graine).spawn(max(1, len(parametres)))
+    generateurs = [np.random.default_rng(germe) for germe in germes]
+    tonnage = np.empty(nb_tirages)
+    metal = np.empty(nb_tirages)
+    tonnage_corps = np.zeros(nb_corps)
+    metal_corps = np.zeros(nb_corps)
+
+    # Tirages communs: un seul facteur par tirage; indépendants: un facteur par tirage et par corps
+    largeur = nb_corps if independants else 1
+    if taille_lot is None:
+        taille_lot = max(1, TAILLE_LOT_MAX // max(1, largeur * max(1, len(parametres))))
+
+    for debut in range(0, nb_tirages, taille_lot):
+        fin = min(nb_tirages, debut + taille_lot)
+        facteur_tonnage = np.ones((fin - debut, largeur))
+        facteur_teneur = np.ones((fin - debut, largeur))
+        if correles:
+            z = generateurs[0].standard_normal((fin - debut, largeur, len(parametres))) @ cholesky.T
+        for k, parametre in enumerate(parametres):
+            distribution = distributions[parametre]
+            if correles:
+                facteurs = _facteurs(z[..., k], distribution)
+            elif _loi_bornee(distribution):
+                # Sans corrélation, les lois bornées sont tirées directement par inversion
+                facteurs = _facteurs_uniformes(generateurs[k].random((fin - debut, largeur)), distribution)
+            else:
+                facteurs = _facteurs(generateurs[k].standard_normal((fin - debut, largeur)), distribution)
+            if parametre == "teneur":
+                facteur_teneur = facteurs
+            else:
+                facteur_tonnage = facteur_tonnage * facteurs
+
+        if independants:
+            tonnages_lot = facteur_tonnage * tonnage_nominal
+            metaux_lot = tonnages_lot * facteur_teneur * metal_par_tonne
+            tonnage[debut:fin] = tonnages_lot.sum(axis=1)
+            metal[debut:fin] = metaux_lot.sum(axis=1)
+            tonnage_corps += tonnages_lot.sum(axis=0)
+            metal_corps += metaux_lot.sum(axis=0)
+        else:
+            facteur_metal = (facteur_tonnage * facteur_teneur)[:, 0]
+            tonnage[debut:fin] = facteur_tonnage[:, 0] * tonnage_nominal.sum()
+            metal[debut:fin] = facteur_metal * metal_nominal.sum()
+            tonnage_corps += facteur_tonnage[:, 0].sum() * tonnage_nominal
+            metal_corps += facteur_metal.sum() * metal_nominal
+
+    return {
+        "tonnage": tonnage,
+        "metal": metal,
+        "tonnage_corps": tonnage_corps / max(1, nb_tirages),
+        "metal_corps": metal_corps / max(1, nb_tirages),
+    }
+
+
+def statistiques_tirages(tirages):
+    """
+    Résume une série de tirages.
+
+    Returns:
+        Un dictionnaire {"P10", "P50", "P90", "moyenne", "ecart_type"}
+    """
+    p10, p50, p90 = np.percentile(tirages, [10, 50, 90])
+    return {"P10": p10, "P50": p50, "P90": p90, "moyenne": np.mean(tirages), "ecart_type": np.std(tirages)}
+
+
+def courbe_depassement(tirages, nb_points=200):
+    """
+    Calcule la courbe de dépassement (probabilité que la valeur soit dépassée).
+
+    Args:
+        tirages: série de tirages
+        nb_points: nombre de points de la courbe retournée
+
+    Returns:
+        Un tuple (valeurs, probabilites_depassement)
+    """
+    probabilites = np.linspace(0, 1, nb_points)
+    valeurs = np.quantile(tirages, 1 - probabilites)
+    return valeurs, probabilites
@@ -0,0 +1,103 @@
+"""
+Niveaux de détail des vues 3D: budgets d'affichage et décimation spatiale.
+
+Les vues 3D restent interactives tant que le nombre de points envoyés au
+navigateur est borné. Chaque niveau de NIVEAUX_DETAIL fixe le nombre maximal
+de forages affichés; au-delà, les forages sont décimés de façon spatialement
+uniforme (un forage par cellule d'une grille horizontale dont la taille est
+ajustée au budget), en privilégiant les forages de priorité la plus basse
+(par exemple la phase initiale devant la phase détaillée). Les lignes des
+grilles régulières (grille de surface) sont décimées par un pas constant.
+
+Le niveau "Complet" affiche tous les forages: l'interface commence par un
+niveau réduit et laisse l'utilisateur passer progressivement au détail complet.
+"""
+import numpy as np
+
+# Nombre maximal de forages affichés par niveau de détail (None: tous les forages)
+NIVEAUX_DETAIL = {"Aperçu": 1_000, "Standard": 5_000, "Détaillé": 20_000, "Complet": None}
+NIVEAU_DETAIL_DEFAUT = "Standard"
+
+# Nombre maximal de lignes de la grille de forage affichées dans chaque direction
+BUDGET_LIGNES_GRILLE = 100
+
+# Nombre maximal d'ajustements de la taille des cellules de décimation, et part du
+# budget à partir de laquelle la décimation est acceptée
+ITERATIONS_DECIMATION = 12
+REMPLISSAGE_BUDGET = 0.9
+
+
+def pas_decimation(nombre, budget):
+    """
+    Pas de décimation d'une suite régulière pour en retenir au plus budget éléments.
+
+    Args:
+        nombre: nombre d'éléments de la suite
+        budget: nombre maximal d'éléments retenus (None: tous)
+
+    Returns:
+        Un entier >= 1: un élément sur pas est retenu
+    """
+    if budget is None or nombre <= budget:
+        return 1
+    return int(np.ceil(nombre / max(budget, 1)))
+
+
+def decimer_points(points, budget, priorites=None):
+    """
+    Sélectionne au plus budget points répartis uniformément dans le plan horizontal.
+
+    Les points sont regroupés dans les cellules carrées d'une grille (x, y) et un
+    seul point est retenu par cellule: celui de plus basse priorité, puis le
+    premier dans l'ordre des points. La taille des cellules part de la densité
+    moyenne des points et est ajustée pour retenir entre REMPLISSAGE_BUDGET * budget
+    et budget points.
+
+    Args:
+        points: tableau (n, 2) ou (n, 3) de coordonnées (seuls x et y sont utilisés)
+        budget: nombre maximal de points retenus (None: tous)
+        priorites: priorité de chaque point (optionnel, les plus basses sont retenues en premier)
+
+    Returns:
+        Un tableau trié des indices des points retenus
+    """
+    points = np.asarray(points, dtype=float)
+    nb_points = len(points)
+    if budget is None or nb_points <= budget:
+        return np.arange(nb_points)
+    if budget <= 0:
+        return np.arange(0)
+
+    xy = points[:, :2]
+    minimum = xy.min(axis=0)
+    etendue = np.maximum(xy.max(axis=0) - minimum, 1e-9)
+    # Taille initiale: budget cellules sur l'emprise (ou le long d'une emprise linéaire)
+    surface = etendue[0] * etendue[1]
+    cellule = np.sqrt(surface / budget) if surface > 1e-6 * etendue.max() ** 2 else etendue.max() / budget
+    ordre = (np.lexsort((np.arange(nb_points), priorites)) if priorites is not None
+             else np.arange(nb_points))
+
+    # Recherche de la taille des cellules par dichotomie géométrique entre une taille
+    # qui dépasse le budget (trop_petite) et une taille qui le respecte (suffisante)
+    trop_petite, suffisante, meilleurs = None, None, None
+    for _ in range(ITERATIONS_DECIMATION):
+        cellules = np.floor((xy[ordre] - minimum) / cellule).astype(np.int64)
+        cles = cellules[:, 0] * (int(etendue[1] / cellule) + 2) + cellules[:, 1]
+        _, premiers = np.unique(cles, return_index=True)
+        retenus = ordre[premiers]
+        if len(retenus) <= budget:
+            suffisante = cellule
+            if meilleurs is None or len(retenus) > len(meilleurs):
+                meilleurs = retenus
+            if len(retenus) >= REMPLISSAGE_BUDGET * budget:
+                break
+        else:
+            trop_petite = cellule
+        if trop_petite is not None and suffisante is not None:
+            cellule = np.sqrt(trop_petite * suffisante)
+        else:
+            # Taille ajustée en proportion de l'écart au budget (avec une marge pour converger)
+            cellule *= np.sqrt(len(retenus) / budget) * (1.05 if len(retenus) > budget else 1.0)
+    if meilleurs is None:
+        meilleurs = np.sort(retenus)[::pas_decimation(len(retenus), budget)]
+    return np.sort(meilleurs)
@@ -0,0 +1,222 @@
+"""
+Optimisation des plans de forage: recherche de l'orientation, de la maille et
+du décalage de grille qui minimisent le coût de forage de chaque corps.
+
+Chaque candidat (azimuth, inclinaison, maille_x, maille_y, décalage_x, décalage_y)
+est évalué par intersection de sa grille de forages (forage.table_forages, phase
+initiale seule) avec le filon (intersection.intersecter_forages). La maille effective est mesurée entre les
+points de recoupement dans le plan du filon, puis classée avec
+estimation.classifier_maille. La confiance d'un candidat est le facteur de
+confiance de sa classification multiplié par la proportion de forages qui
+recoupent le filon.
+
+Les candidats sont évalués par lots dans un pool de processus; le résultat de
+chaque corps comprend tous les candidats, le front de Pareto coût/confiance et
+le candidat le moins coûteux qui atteint la classification visée.
+"""
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .estimation import CLASSIFICATIONS, classifier_maille
+from .forage import FORAGES_MIN_INITIAL, forages_par_axe, table_forages
+from .geometrie import direction_forage, repere_filon
+from .intersection import MARGE_SORTIE_DEFAUT, intersecter_forages
+
+# Nombre de candidats évalués par tâche du pool de processus
+TAILLE_LOT_CANDIDATS = 64
+
+
+def grille_candidats(azimuths, inclinaisons, mailles_x, mailles_y, decalages=(0.0,)):
+    """
+    Construit la liste des candidats à évaluer (produit cartésien des valeurs).
+
+    Args:
+        azimuths, inclinaisons: orientations des forages à tester (°)
+        mailles_x, mailles_y: espacements le long de la puissance et de la profondeur (m)
+        decalages: décalages de la grille à tester, en fraction de l'espacement
+
+    Returns:
+        Une liste de dictionnaires de paramètres de candidat
+    """
+    return [
+        {"azimuth_forage": azimuth, "inclinaison_forage": inclinaison,
+         "maille_x": maille_x, "maille_y": maille_y,
+         "decalage_x": decalage_x, "decalage_y": decalage_y}
+        for azimuth, inclinaison, maille_x, maille_y, decalage_x, decalage_y
+        in itertools.product(azimuths, inclinaisons, mailles_x, mailles_y, decalages, decalages)
+    ]
+
+
+def _maille_effective(locales, touche, forme, axe, dimension):
+    """
+    Espacement des points de recoupement le long d'un axe de la grille.
+
+    L'espacement médian entre points voisins est borné inférieurement par la
+    dimension du filon divisée par le nombre de rangées qui le recoupent, de
+    sorte que des recoupements rapprochés sur une partie seulement du filon ne
+    comptent pas comme une maille serrée.
+
+    Args:
+        locales: coordonnée locale (puissance pour axe=0, profondeur pour axe=1) des points de recoupement
+        touche: indicateur de recoupement de chaque forage
+        forme: forme (nb_x, nb_y) de la grille de forages
+        axe: axe de la grille (0: puissance, 1: profondeur)
+        dimension: extension du filon le long de cet axe (m)
+
+    Returns:
+        L'espacement en mètres
+    """
+    grille = np.where(touche, locales, np.nan).reshape(forme)
+    nb_rangees = int(np.isfinite(grille).any(axis=1 - axe).sum())
+    if nb_rangees == 0:
+        return float(dimension)
+    ecart = np.abs(np.diff(grille, axis=axe))
+    ecart_median = float(np.nanmedian(ecart)) if np.isfinite(ecart).any() else 0.0
+    return max(ecart_median, dimension / nb_rangees)
+
+
+def evaluer_candidat(corps, candidat, profondeur_forage_max, longueur_echantillon, cout_metre, cout_analyses,
+                     maille_mesurees, maille_indiquees, facteurs_confiance, marge_sortie=MARGE_SORTIE_DEFAUT):
+    """
+    Évalue le coût et la confiance d'une grille de forages sur un corps minéralisé.
+
+    Args:
+        corps: dictionnaire contenant les propriétés du corps minéralisé
+        candidat: paramètres du candidat (voir grille_candidats)
+        profondeur_forage_max: longueur maximale réalisable d'un forage (m)
+        longueur_echantillon: longueur moyenne des échantillons (m)
+        cout_metre: coût par mètre foré (€)
+        cout_analyses: coût des analyses par échantillon (€)
+        maille_mesurees, maille_indiquees: mailles maximales de classification (m)
+        facteurs_confiance: facteurs (mesurées, indiquées, inférées)
+        marge_sortie: longueur forée au-delà du mur du filon (m)
+
+    Returns:
+        Un dictionnaire des paramètres du candidat et de ses résultats
+    """
+    maille_x, maille_y = candidat["maille_x"], candidat["maille_y"]
+    nb_forages_x = forages_par_axe(corps["puissance"], maille_x, FORAGES_MIN_INITIAL)
+    nb_forages_y = forages_par_axe(corps["profondeur"], maille_y, FORAGES_MIN_INITIAL)
+    direction = direction_forage(candidat["azimuth_forage"], candidat["inclinaison_forage"])
+
+    forages = table_forages([corps], maille_x, maille_y, None, None, profondeur_forage_max,
+                            candidat["azimuth_forage"], candidat["inclinaison_forage"], marge_sortie,
+                            candidat["decalage_x"], candidat["decalage_y"])
+    collars = forages[["x", "y", "z"]].to_numpy(dtype=float)
+    longueurs = forages["longueur"].to_numpy(dtype=float)
+    trop_courts = forages["trop_court"].to_numpy()
+    touche = forages["touche"].to_numpy()
+    intersections = intersecter_forages(corps, collars, direction, profondeur_forage_max)
+
+    # Points de recoupement (milieu de la passe minéralisée) dans le repère du filon
+    milieu = (intersections["profondeur_entree"] + intersections["profondeur_sortie"]) / 2
+    centre, rotation, _ = repere_filon(corps)
+    locales = (collars + milieu[:, None] * direction - centre) @ rotation.T
+    forme = (int(nb_forages_x), int(nb_forages_y))
+    maille_x_effective = _maille_effective(locales[:, 0], touche, forme, 0, corps["puissance"])
+    maille_y_effective = _maille_effective(locales[:, 1], touche, forme, 1, corps["profondeur"])
+
+    classification, facteur = classifier_maille(maille_x_effective, maille_y_effective,
+                                                maille_mesurees, maille_indiquees, *facteurs_confiance)
+    taux_recoupement = float(touche.mean())
+
+    metres = float(longueurs.sum())
+    nb_echantillons = np.ceil(metres / longueur_echantillon)
+    return {
+        **candidat,
+        "nb_forages": int(touche.sum()),
+        "nb_forages_manques": int((~touche).sum()),
+        "nb_forages_trop_courts": int(trop_courts.sum()),
+        "metres": metres,
+        "cout": metres * cout_metre + nb_echantillons * cout_analyses,
+        "maille_x_effective": maille_x_effective,
+        "maille_y_effective": maille_y_effective,
+        "classification": classification,
+        "taux_recoupement": taux_recoupement,
+        "confiance": facteur * taux_recoupement,
+    }
+
+
+def _evaluer_lot(corps, candidats, parametres):
+    """Évalue un lot de candidats sur un corps (tâche exécutée dans le pool de processus)."""
+    return [evaluer_candidat(corps, candidat, **parametres) for candidat in candidats]
+
+
+def front_pareto(evaluations):
+    """
+    Extrait le front de Pareto coût/confiance des candidats évalués.
+
+    Un candidat appartient au front si aucun autre candidat n'est à la fois
+    moins coûteux (ou de même coût) et plus confiant.
+
+    Args:
+        evaluations: DataFrame avec les colonnes "cout" et "confiance"
+
+    Returns:
+        Le sous-ensemble du DataFrame sur le front, trié par coût croissant
+    """
+    tri = evaluations.sort_values(["cout", "confiance"], ascending=[True, False])
+    confiance = tri["confiance"].to_numpy()
+    meilleure_precedente = np.maximum.accumulate(np.concatenate([[-np.inf], confiance[:-1]]))
+    return tri[confiance > meilleure_precedente]
+
+
+def optimiser_plan(corps_selectionnes, candidats, profondeur_forage_max, longueur_echantillon, cout_metre, cout_analyses,
+                   maille_mesurees, maille_indiquees, facteurs_confiance, classification_cible="Indiquées",
+                   taux_recoupement_min=0.9, marge_sortie=MARGE_SORTIE_DEFAUT, nb_processus=None):
+    """
+    Recherche, pour chaque corps, le plan de forage le moins coûteux qui atteint la classification visée.
+
+    Args:
+        corps_selectionnes: liste de dictionnaires de corps minéralisés
+        candidats: candidats à évaluer (voir grille_candidats)
+        profondeur_forage_max, longueur_echantillon, cout_metre, cout_analyses: voir evaluer_candidat
+        maille_mesurees, maille_indiquees, facteurs_confiance: paramètres de classification
+        classification_cible: classification minimale à atteindre ("Mesurées" ou "Indiquées")
+        taux_recoupement_min: proportion minimale de forages recoupant le filon
+        marge_sortie: longueur forée au-delà du mur du filon (m)
+        nb_processus: taille du pool de processus (1: évaluation dans le processus courant)
+
+    Returns:
+        Une liste (une entrée par corps) de dictionnaires {"nom", "evaluations",
+        "front_pareto", "meilleur"}, "meilleur" valant None si aucun candidat n'atteint la cible
+    """
+    parametres = dict(profondeur_forage_max=profondeur_forage_max, longueur_echantillon=longueur_echantillon,
+                      cout_metre=cout_metre, cout_analyses=cout_analyses, maille_mesurees=maille_mesurees,
+                      maille_indiquees=maille_indiquees, facteurs_confiance=tuple(facteurs_confiance),
+                      marge_sortie=marge_sortie)
+
+    # Découpage en tâches (corps, lot de candidats)
+    lots = [candidats[debut:debut + TAILLE_LOT_CANDIDATS] for debut in range(0, len(candidats), TAILLE_LOT_CANDIDATS)]
+    taches = [(corps_idx, corps, lot) for corps_idx, corps in enumerate(corps_selectionnes) for lot in lots]
+
+    nb_processus = nb_processus or os.cpu_count() or 1
+    evaluations = [[] for _ in corps_selectionnes]
+    if nb_processus == 1 or len(taches) <= 1:
+        for corps_idx, corps, lot in taches:
+            evaluations[corps_idx].extend(_evaluer_lot(corps, lot, parametres))
+    else:
+        with ProcessPoolExecutor(max_workers=min(nb_processus, len(taches))) as pool:
+            futures = [(corps_idx, pool.submit(_evaluer_lot, corps, lot, parametres))
+                       for corps_idx, corps, lot in taches]
+            for corps_idx, future in futures:
+                evaluations[corps_idx].extend(future.result())
+
+    rang_cible = CLASSIFICATIONS.index(classification_cible)
+    resultats = []
+    for corps, evaluations_corps in zip(corps_selectionnes, evaluations):
+        df = pd.DataFrame(evaluations_corps)
+        recoupe = df[df["nb_forages"] > 0] if len(df) else df
+        admissibles = recoupe[recoupe["classification"].map(CLASSIFICATIONS.index).le(rang_cible)
+                              & recoupe["taux_recoupement"].ge(taux_recoupement_min)] if len(recoupe) else recoupe
+        resultats.append({
+            "nom": corps["nom"],
+            "evaluations": df,
+            "front_pareto": front_pareto(recoupe) if len(recoupe) else recoupe,
+            "meilleur": admissibles.sort_values("cout").iloc[0].to_dict() if len(admissibles) else None,
+        })
+    return resultats
@@ -0,0 +1,29 @@
+"""Modèle de blocs des filons (blocs.modele_blocs)."""
+import numpy as np
+import pytest
+
+from explotarget.benchmark import scenario_synthetique
+from explotarget.blocs import modele_blocs, nombre_blocs
+
+
+@pytest.mark.parametrize("taille_bloc", [(10.0, 10.0, 1.0), (7.0, 13.0, 0.3), (1000.0, 1000.0, 100.0), 12.5])
+def test_tonnage_des_blocs_egal_au_parallelepipede(taille_bloc):
+    corps = scenario_synthetique(4)
+    modele = modele_blocs(corps, taille_bloc)
+    tonnages = np.add.reduceat(modele["tonnage"], modele["debuts"][:-1])
+    attendus = [c["puissance"] * c["profondeur"] * c["epaisseur"] * c["densite"] for c in corps]
+    np.testing.assert_allclose(tonnages, attendus, rtol=1e-12)
+    np.testing.assert_array_equal(np.diff(modele["debuts"]), nombre_blocs(corps, taille_bloc))
+
+
+def test_taille_bloc_unique():
+    corps = scenario_synthetique(2)
+    modele = modele_blocs(corps, 5.0)
+    np.testing.assert_array_equal(modele["taille_bloc"], [5.0, 5.0, 5.0])
+    np.testing.assert_array_equal(modele["centres"], modele_blocs(corps, (5.0, 5.0, 5.0))["centres"])
+
+
+@pytest.mark.parametrize("taille_bloc", [0.0, (10.0, -1.0, 1.0), (10.0, 10.0)])
+def test_taille_bloc_invalide(taille_bloc):
+    with pytest.raises(ValueError, match="taille des blocs"):
+        modele_blocs(scenario_synthetique(1), taille_bloc)
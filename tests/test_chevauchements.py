@@ -0,0 +1,40 @@
+"""Volumes communs aux corps qui se chevauchent (chevauchements.volumes_partages)."""
+from explotarget.benchmark import scenario_synthetique
+from explotarget.chevauchements import volumes_partages
+from explotarget.estimation import estimer_scenario, estimer_tableau
+from explotarget.importation import valider_corps
+
+
+def _corps_superposes():
+    """Deux corps synthétiques placés au même centre."""
+    corps = scenario_synthetique(2)
+    for c in corps:
+        c.update(est=0.0, nord=0.0)
+    return corps
+
+
+def test_corps_positionnes_superposes():
+    assert volumes_partages(_corps_superposes())[1] > 0
+
+
+def test_corps_sans_coordonnees_sans_deduction():
+    corps = _corps_superposes()
+    for c in corps:
+        del c["est"], c["nord"]
+    assert not volumes_partages(corps).any()
+    _, total_tonnage, _ = estimer_scenario(corps, 0.8)
+    assert total_tonnage == estimer_tableau(corps, 0.8)["tonnage_ajuste"].sum()
+
+
+def test_seul_corps_positionne_sans_deduction():
+    corps = _corps_superposes()
+    del corps[0]["est"], corps[0]["nord"]
+    assert not volumes_partages(corps).any()
+
+
+def test_import_sans_coordonnees():
+    corps = dict(scenario_synthetique(1)[0])
+    del corps["est"], corps["nord"]
+    normalise, erreurs = valider_corps(corps)
+    assert not erreurs
+    assert "est" not in normalise and "nord" not in normalise
@@ -0,0 +1,91 @@
+"""Dépôt SQLite des scénarios (depot)."""
+import threading
+
+import pytest
+
+from explotarget.benchmark import scenario_synthetique
+from explotarget.depot import (ajouter_corps, charger_scenario, compter_scenarios, enregistrer_scenario,
+                               exporter_scenarios, lister_scenarios, ouvrir_depot, statistiques_depot,
+                               supprimer_scenario)
+
+
+def _scenario(nom, nb_corps=2, **champs):
+    return {"nom": nom, "corps_mineralises": scenario_synthetique(nb_corps), **champs}
+
+
+@pytest.fixture
+def depot(tmp_path):
+    connexion = ouvrir_depot(str(tmp_path / "depot.sqlite"))
+    yield connexion
+    connexion.close()
+
+
+def test_aller_retour(depot):
+    scenario = _scenario("Filons nord", 3, description="test", plan_forage={"budget_total": 1.5e6, "maille": [50, 25]})
+    scenario_id = enregistrer_scenario(depot, scenario)
+    charge = charger_scenario(depot, scenario_id)
+    assert charge["corps_mineralises"] == scenario["corps_mineralises"]
+    assert charge["plan_forage"] == scenario["plan_forage"]
+    assert charge["nom"] == "Filons nord" and charge["description"] == "test"
+    assert charger_scenario(depot, "inconnu") is None
+
+    ajouter_corps(depot, scenario_id, scenario_synthetique(1, graine=1))
+    charge = charger_scenario(depot, scenario_id)
+    assert len(charge["corps_mineralises"]) == 4
+    assert charge["corps_mineralises"][-1] == scenario_synthetique(1, graine=1)[0]
+    assert statistiques_depot(depot) == {"nb_scenarios": 1, "nb_corps": 4}
+
+    # Réenregistrement: remplace la version existante, corps compris
+    enregistrer_scenario(depot, {**charge, "corps_mineralises": charge["corps_mineralises"][:1]})
+    assert len(charger_scenario(depot, scenario_id)["corps_mineralises"]) == 1
+    supprimer_scenario(depot, scenario_id)
+    assert statistiques_depot(depot) == {"nb_scenarios": 0, "nb_corps": 0}
+
+
+def test_pagination(depot):
+    for rang in range(45):
+        enregistrer_scenario(depot, _scenario(f"Scénario {rang:02d}", 0))
+    pages = [lister_scenarios(depot, page=page, taille_page=20, ordre="nom") for page in range(4)]
+    assert [len(page) for page in pages] == [20, 20, 5, 0]
+    noms = [resume["nom"] for page in pages for resume in page]
+    assert noms == [f"Scénario {rang:02d}" for rang in range(45)]
+    assert len(exporter_scenarios(depot)) == compter_scenarios(depot) == 45
+
+
+@pytest.mark.parametrize("recherche, attendus", [
+    ("100%", {"Teneur 100%"}),
+    ("a_b", {"a_b"}),
+    ("\\", {"c\\d"}),
+    ("TENEUR", {"Teneur 100%", "Teneur 1000"}),
+])
+def test_recherche_echappee(depot, recherche, attendus):
+    for nom in ["Teneur 100%", "Teneur 1000", "a_b", "axb", "c\\d"]:
+        enregistrer_scenario(depot, _scenario(nom, 0))
+    assert {resume["nom"] for resume in lister_scenarios(depot, recherche=recherche)} == attendus
+    assert compter_scenarios(depot, recherche) == len(attendus)
+
+
+def test_connexions_concurrentes(tmp_path):
+    chemin = str(tmp_path / "depot.sqlite")
+    ouvrir_depot(chemin).close()
+    erreurs = []
+
+    def enregistrer(prefixe):
+        connexion = ouvrir_depot(chemin)
+        try:
+            for rang in range(20):
+                enregistrer_scenario(connexion, _scenario(f"{prefixe}-{rang}", 1))
+        except Exception as erreur:
+            erreurs.append(erreur)
+        finally:
+            connexion.close()
+
+    fils = [threading.Thread(target=enregistrer, args=(prefixe,)) for prefixe in "AB"]
+    for fil in fils:
+        fil.start()
+    for fil in fils:
+        fil.join()
+    assert not erreurs
+    connexion = ouvrir_depot(chemin)
+    assert statistiques_depot(connexion) == {"nb_scenarios": 40, "nb_corps": 40}
+    connexion.close()
@@ -0,0 +1,80 @@
+"""Ordonnancement des forages sur plusieurs foreuses (echeancier.simuler_campagne)."""
+import numpy as np
+import pytest
+
+from explotarget.benchmark import scenario_synthetique
+from explotarget.echeancier import COLONNES_CHRONOLOGIE, durees_phases, simuler_campagne
+from explotarget.forage import PHASES, planifier_campagne, table_forages
+
+PARAMETRES_FORAGES = {"maille_initiale_x": 100.0, "maille_initiale_y": 100.0, "maille_detail_x": 50.0,
+                      "maille_detail_y": 50.0, "profondeur_forage_max": 1000.0}
+
+# Ni déplacement, ni installation, ni délai d'analyses: une foreuse fore sans interruption
+SANS_INTERRUPTION = {"vitesse_deplacement": np.inf, "jours_installation": 0.0, "delai_laboratoire": 0.0}
+
+
+def _forages(nb_corps):
+    return table_forages(scenario_synthetique(nb_corps), **PARAMETRES_FORAGES)
+
+
+def test_une_foreuse_duree_metrage_sur_cadence():
+    corps = scenario_synthetique(1)
+    forages = table_forages(corps, **PARAMETRES_FORAGES)
+    _, totaux = planifier_campagne(corps, 1.0, 150.0, 30.0, forages=forages)
+    chronologie, foreuses = simuler_campagne(forages, 1, 80.0, 15.0, **SANS_INTERRUPTION)
+    initiaux = chronologie["phase"] == PHASES[0]
+    assert chronologie.loc[initiaux, "fin"].max() == pytest.approx(15.0 + totaux["total_metres_initial"] / 80.0)
+    assert chronologie["fin"].max() == pytest.approx(
+        15.0 + (totaux["total_metres_initial"] + totaux["total_metres_detaille"]) / 80.0)
+    assert foreuses["jours_attente"].sum() == 0
+
+
+def test_une_foreuse_plusieurs_corps():
+    forages = _forages(5)
+    chronologie, foreuses = simuler_campagne(forages, 1, 100.0, 10.0, **SANS_INTERRUPTION)
+    metres = forages.loc[forages["touche"], "longueur"].sum()
+    assert chronologie["fin"].max() == pytest.approx(10.0 + metres / 100.0)
+    assert foreuses["metres"].sum() == pytest.approx(metres)
+
+
+@pytest.mark.parametrize("nb_foreuses", [1, 3, 8])
+def test_forages_detailles_apres_analyses_initiales(nb_foreuses):
+    forages = _forages(6)
+    chronologie, _ = simuler_campagne(forages, nb_foreuses, 100.0, 15.0, delai_laboratoire=30.0)
+    assert sorted(chronologie["id_forage"]) == sorted(forages.loc[forages["touche"], "id_forage"])
+    initiaux = chronologie["phase"] == PHASES[0]
+    fins_initiales = chronologie[initiaux].groupby("corps")["fin"].max()
+    debuts_detail = chronologie[~initiaux].groupby("corps")["debut"].min()
+    assert (debuts_detail >= fins_initiales.reindex(debuts_detail.index) + 30.0 - 1e-9).all()
+    # Une foreuse ne fore qu'un forage à la fois
+    for _, forages_foreuse in chronologie.groupby("foreuse"):
+        assert (forages_foreuse["depart"].to_numpy()[1:] >= forages_foreuse["fin"].to_numpy()[:-1] - 1e-9).all()
+
+
+def test_jours_attente():
+    forages = table_forages(scenario_synthetique(1), **PARAMETRES_FORAGES)
+    chronologie, foreuses = simuler_campagne(forages, 1, 100.0, 15.0, vitesse_deplacement=2000.0,
+                                             jours_installation=0.5, delai_laboratoire=30.0)
+    # Une seule foreuse sur un seul corps attend tout le délai du laboratoire
+    assert foreuses["jours_attente"].iloc[0] == pytest.approx(30.0)
+    jours_phase1, jours_phase2 = durees_phases(chronologie, 15.0)
+    assert jours_phase1 + jours_phase2 >= 30.0
+
+
+def test_plan_vide():
+    forages = table_forages([], **PARAMETRES_FORAGES)
+    chronologie, foreuses = simuler_campagne(forages, 2, 100.0, 15.0)
+    assert chronologie.empty and list(chronologie.columns) == COLONNES_CHRONOLOGIE
+    assert list(foreuses["nb_forages"]) == [0, 0] and list(foreuses["fin"]) == [15.0, 15.0]
+    assert durees_phases(chronologie, 15.0) == (0.0, 0.0)
+
+
+def test_table_non_triee():
+    forages = _forages(4)
+    melangees = forages.sample(frac=1.0, random_state=0)
+    chronologie, foreuses = simuler_campagne(melangees, 2, 100.0, 15.0, delai_laboratoire=30.0)
+    assert sorted(chronologie["id_forage"]) == sorted(forages.loc[forages["touche"], "id_forage"])
+    initiaux = chronologie["phase"] == PHASES[0]
+    fins_initiales = chronologie[initiaux].groupby("corps")["fin"].max()
+    debuts_detail = chronologie[~initiaux].groupby("corps")["debut"].min()
+    assert (debuts_detail >= fins_initiales.reindex(debuts_detail.index) + 30.0 - 1e-9).all()
@@ -0,0 +1,73 @@
+"""Positions des forages des phases initiale et détaillée (forage.table_forages)."""
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from explotarget.balayage import balayer_mailles
+from explotarget.benchmark import scenario_synthetique
+from explotarget.forage import PHASES, forages_par_axe, table_forages
+
+# (puissance, profondeur, maille initiale, maille détaillée): rapports pairs, impairs et non entiers
+CAS = [
+    (400.0, 200.0, (200.0, 100.0), (100.0, 50.0)),
+    (300.0, 300.0, (100.0, 100.0), (100.0 / 3, 100.0 / 3)),
+    (500.0, 90.0, (100.0, 30.0), (20.0, 10.0)),
+    (350.0, 250.0, (120.0, 100.0), (50.0, 25.0)),
+    (90.0, 60.0, (50.0, 50.0), (10.0, 20.0)),
+]
+
+
+def _centres(nb):
+    """Centres des cellules d'un axe, en fraction exacte de la dimension."""
+    return [Fraction(2 * i + 1, 2 * nb) for i in range(nb)]
+
+
+def _corps(puissance, profondeur):
+    return dict(scenario_synthetique(1)[0], puissance=puissance, profondeur=profondeur)
+
+
+@pytest.mark.parametrize("puissance, profondeur, initiale, detail", CAS)
+def test_forages_detailles_hors_collars_initiaux(puissance, profondeur, initiale, detail):
+    forages = table_forages([_corps(puissance, profondeur)], *initiale, *detail, 1000)
+    initiaux = forages["phase"] == PHASES[0]
+    collars = np.round(forages[["x", "y"]].to_numpy(), 6)
+    communs = {tuple(c) for c in collars[initiaux]} & {tuple(c) for c in collars[~initiaux]}
+    assert not communs
+    assert len(np.unique(collars, axis=0)) == len(collars)
+
+
+@pytest.mark.parametrize("puissance, profondeur, initiale, detail", CAS)
+def test_seuls_les_noeuds_confondus_sont_exclus(puissance, profondeur, initiale, detail):
+    nb_x, nb_y = (int(forages_par_axe(dimension, maille, 2))
+                  for dimension, maille in zip((puissance, profondeur), initiale))
+    nb_x_detail, nb_y_detail = (int(forages_par_axe(dimension, maille, 4))
+                                for dimension, maille in zip((puissance, profondeur), detail))
+    # Nœuds détaillés qui ne sont pas au même centre de cellule qu'un nœud initial (calcul exact)
+    noeuds_initiaux = {(p, d) for p in _centres(nb_x) for d in _centres(nb_y)}
+    attendus = sum((p, d) not in noeuds_initiaux for p in _centres(nb_x_detail) for d in _centres(nb_y_detail))
+
+    forages = table_forages([_corps(puissance, profondeur)], *initiale, *detail, 1000)
+    assert (forages["phase"] == PHASES[1]).sum() == attendus
+    assert (forages["phase"] == PHASES[0]).sum() == nb_x * nb_y
+
+
+@pytest.mark.parametrize("puissance, profondeur, initiale, detail", CAS)
+def test_balayage_compte_les_memes_positions(puissance, profondeur, initiale, detail):
+    corps = [_corps(puissance, profondeur)]
+    forages = table_forages(corps, *initiale, *detail, 1000)
+    # Tous les forages comptés (proportion de recoupement ramenée à 1)
+    forages["touche"] = True
+    balayage = balayer_mailles(corps, forages, [detail[0]], [detail[1]], 1.0, 100.0, 30.0, 0.0, 50.0, 100.0,
+                               (0.95, 0.8, 0.6), phase=PHASES[1], maille_initiale=initiale)
+    assert balayage["nb_forages"][0, 0] == pytest.approx(len(forages))
+
+
+def test_phase_initiale_seule_decalee():
+    corps = _corps(400.0, 200.0)
+    forages = table_forages([corps], 100.0, 50.0, None, None, 1000, decalage_x=0.25)
+    assert (forages["phase"] == PHASES[0]).all() and len(forages) == 4 * 4
+    centres = table_forages([corps], 100.0, 50.0, None, None, 1000)
+    assert not np.allclose(forages[["x", "y"]].to_numpy(), centres[["x", "y"]].to_numpy())
+    with pytest.raises(ValueError):
+        table_forages([corps], 100.0, 50.0, 50.0, 25.0, 1000, decalage_x=0.25)
@@ -0,0 +1,38 @@
+"""Lecture par blocs des tableaux JSON de corps minéralisés (importation.iterer_tableau_json)."""
+import io
+import json
+
+import pytest
+
+from explotarget.benchmark import scenario_synthetique
+from explotarget.importation import iterer_tableau_json
+
+ELEMENTS = scenario_synthetique(50) + [1.5e-7, -12, True, None, "é\U0001f600", [], {"a": [1, 2.25]}]
+
+
+class _FluxCompte(io.BytesIO):
+    """Flux binaire qui compte les octets lus."""
+
+    def __init__(self, contenu):
+        super().__init__(contenu)
+        self.lus = 0
+
+    def read(self, taille=-1):
+        bloc = super().read(taille)
+        self.lus += len(bloc)
+        return bloc
+
+
+@pytest.mark.parametrize("taille_bloc", [1, 3, 7, 64, 1 << 16])
+def test_elements_coupes_entre_blocs(taille_bloc):
+    contenu = json.dumps(ELEMENTS, ensure_ascii=False).encode("utf-8")
+    assert list(iterer_tableau_json(io.BytesIO(contenu), taille_bloc)) == ELEMENTS
+
+
+def test_element_invalide_signale_sans_lire_la_suite():
+    elements = [json.dumps(corps) for corps in scenario_synthetique(2000)]
+    elements[10] = '{"nom": "A" "teneur": 1}'
+    flux = _FluxCompte(("[" + ", ".join(elements) + "]").encode("utf-8"))
+    with pytest.raises(ValueError, match="JSON invalide"):
+        list(iterer_tableau_json(flux, 1024))
+    assert flux.lus <= 8 * 1024 < len(flux.getvalue()) / 10
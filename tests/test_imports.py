@@ -0,0 +1,33 @@
+"""Import paresseux du paquet et budgets d'import (benchmark)."""
+import pkgutil
+import subprocess
+import sys
+
+import explotarget
+from explotarget.benchmark import ECART_MIN_REFERENCE_IMPORT, MARGE_REFERENCE_IMPORT, budgets_reference
+
+
+def test_import_paquet_sans_sous_modules():
+    code = "import sys, explotarget; print(sorted(m for m in sys.modules if m.startswith(('explotarget.', 'pandas'))))"
+    sortie = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert sortie.stdout.strip() == "[]"
+
+
+def test_noms_publics_resolus():
+    for nom in explotarget.__all__:
+        assert getattr(explotarget, nom) is not None
+    assert set(explotarget.__all__) <= set(dir(explotarget))
+
+
+def test_budgets_reference():
+    reference = {"imports": [{"module": "vues.guide", "mediane_s": 1.0}, {"module": "explotarget", "mediane_s": 0.001}]}
+    budgets = budgets_reference(reference)
+    assert budgets["vues.guide"] == MARGE_REFERENCE_IMPORT
+    assert budgets["explotarget"] == 0.001 + ECART_MIN_REFERENCE_IMPORT
+
+
+def test_noms_publics_distincts_des_sous_modules():
+    # Un nom public homonyme d'un sous-module serait remplacé par le module à son chargement
+    sous_modules = {module.name for module in pkgutil.iter_modules(explotarget.__path__)}
+    assert not sous_modules & set(explotarget.__all__)
+    assert set(explotarget.NOMS_SOUS_MODULES) <= sous_modules
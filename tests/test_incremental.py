@@ -0,0 +1,78 @@
+"""Évaluation incrémentale (incremental.evaluer) comparée à un recalcul complet."""
+import pandas as pd
+import pytest
+
+from explotarget.benchmark import scenario_synthetique
+from explotarget.incremental import CALCULS, etat_vide, evaluer
+
+PARAMETRES = {
+    "facteur_confiance": 0.8,
+    "maille_initiale_x": 100.0, "maille_initiale_y": 100.0,
+    "maille_detail_x": 50.0, "maille_detail_y": 50.0,
+    "profondeur_forage_max": 1000.0, "azimuth_forage": 270.0, "inclinaison_forage": 60.0,
+    "marge_sortie": 0.0,
+}
+
+
+def _modifier(corps, rang, **champs):
+    return [dict(c, **champs) if i == rang else c for i, c in enumerate(corps)]
+
+
+# (nom, transformation des corps, changement de paramètres)
+ETAPES = [
+    ("ajout", lambda corps: corps + scenario_synthetique(8, graine=1)[6:], {}),
+    ("modification", lambda corps: _modifier(corps, 2, puissance=corps[2]["puissance"] * 1.5), {}),
+    ("suppression", lambda corps: corps[:3] + corps[4:], {}),
+    ("reordonnancement", lambda corps: corps[::-1], {}),
+    ("parametre", lambda corps: corps, {"facteur_confiance": 0.6, "maille_initiale_x": 80.0}),
+]
+
+
+def _comparer(etat, corps, parametres, resultat):
+    """Résultat et détails d'une évaluation incrémentale égaux à ceux d'un recalcul complet."""
+    tableau, totaux, _ = resultat
+    complet = etat_vide(etat["calcul"])
+    tableau_complet, totaux_complets, nb = evaluer(complet, corps, **parametres)
+    assert nb == len(corps)
+    pd.testing.assert_frame_equal(tableau, tableau_complet)
+    assert totaux == pytest.approx(totaux_complets, rel=1e-12)
+    if CALCULS[etat["calcul"]]["detail"]:
+        assert len(complet["details"]) and set(complet["details"]["corps"]) == set(range(len(corps)))
+        # Les catégories peuvent être unies dans un autre ordre: comparaison des valeurs
+        pd.testing.assert_frame_equal(etat["details"].astype(object), complet["details"].astype(object))
+
+
+@pytest.mark.parametrize("calcul", list(CALCULS))
+def test_evaluation_incrementale_egale_recalcul_complet(calcul):
+    corps = scenario_synthetique(6)
+    parametres = dict(PARAMETRES)
+    etat = etat_vide(calcul)
+    _comparer(etat, corps, parametres, evaluer(etat, corps, **parametres))
+    for nom, transformer, changement in ETAPES:
+        corps = transformer(corps)
+        parametres.update(changement)
+        resultat = evaluer(etat, corps, **parametres)
+        _comparer(etat, corps, parametres, resultat)
+
+
+@pytest.mark.parametrize("calcul", list(CALCULS))
+def test_seuls_les_corps_modifies_sont_recalcules(calcul):
+    corps = scenario_synthetique(6)
+    etat = etat_vide(calcul)
+    assert evaluer(etat, corps, **PARAMETRES)[2] == 6
+    assert evaluer(etat, corps, **PARAMETRES)[2] == 0
+    assert evaluer(etat, _modifier(corps, 1, teneur=1.0), **PARAMETRES)[2] == 1
+    assert evaluer(etat, corps[::-1], **PARAMETRES)[2] == 1
+
+
+def test_parametre_hors_dependances_ne_recalcule_pas():
+    etat = etat_vide("forage")
+    corps = scenario_synthetique(4)
+    evaluer(etat, corps, **PARAMETRES)
+    assert evaluer(etat, corps, **PARAMETRES, cout_metre=250.0)[2] == 0
+    assert evaluer(etat, corps, **dict(PARAMETRES, azimuth_forage=90.0))[2] == 4
+
+
+def test_parametre_manquant():
+    with pytest.raises(ValueError, match="facteur_confiance"):
+        evaluer(etat_vide("estimation"), scenario_synthetique(2))
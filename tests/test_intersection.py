@@ -0,0 +1,66 @@
+"""Intersection des forages avec les filons (intersection, forage.table_forages)."""
+import numpy as np
+import pytest
+
+from explotarget.echeancier import simuler_campagne
+from explotarget.forage import resumer_forages, table_forages
+from explotarget.geometrie import direction_forage
+from explotarget.intersection import intersecter_forages, longueurs_requises
+from explotarget.optimisation import evaluer_candidat
+
+
+def _filon(elevation_toit, inclinaison=0.0):
+    """Filon de 200 m x 100 m et 10 m d'épaisseur sous l'origine (à plat: centré sur elevation_toit)."""
+    return {"nom": "F", "puissance": 200.0, "profondeur": 100.0, "epaisseur": 10.0, "teneur": 2.0,
+            "unite_teneur": "g/t (or, argent)", "densite": 2.7, "azimuth": 0.0, "inclinaison": inclinaison,
+            "elevation_toit": elevation_toit, "est": 0.0, "nord": 0.0}
+
+
+VERTICAL = direction_forage(0, 90)
+
+
+def test_forage_vertical_traverse_le_filon():
+    intersections = intersecter_forages(_filon(-50.0), [[0.0, 0.0, 0.0]], VERTICAL)
+    assert intersections["touche"][0]
+    assert intersections["profondeur_entree"][0] == pytest.approx(45.0)
+    assert intersections["profondeur_sortie"][0] == pytest.approx(55.0)
+    assert intersections["epaisseur_vraie"][0] == pytest.approx(10.0)
+    longueurs, trop_courts = longueurs_requises(intersections, 300.0, 10.0)
+    assert longueurs[0] == pytest.approx(65.0) and not trop_courts[0]
+
+
+def test_forage_a_cote_du_filon():
+    intersections = intersecter_forages(_filon(-50.0), [[500.0, 0.0, 0.0]], VERTICAL)
+    assert not intersections["touche"][0]
+    assert np.isnan(intersections["profondeur_entree"][0])
+    assert longueurs_requises(intersections, 300.0)[0][0] == 0
+
+
+def test_filon_hors_de_portee():
+    intersections = intersecter_forages(_filon(-800.0), [[0.0, 0.0, 0.0]], VERTICAL, 300.0)
+    assert not intersections["touche"][0]
+    longueurs, trop_courts = longueurs_requises(intersections, 300.0)
+    assert longueurs[0] == 0 and not trop_courts[0]
+
+
+def test_filon_atteint_mais_pas_traverse():
+    intersections = intersecter_forages(_filon(-295.0), [[0.0, 0.0, 0.0]], VERTICAL, 300.0)
+    assert intersections["touche"][0]
+    longueurs, trop_courts = longueurs_requises(intersections, 300.0)
+    assert longueurs[0] == 300.0 and trop_courts[0]
+
+
+def test_plan_hors_de_portee_non_compte():
+    corps = [_filon(-800.0)]
+    forages = table_forages(corps, 100.0, 50.0, 50.0, 25.0, 300.0, 0, 90)
+    assert len(forages) > 0
+    assert not forages["touche"].any() and not forages["trop_court"].any()
+    assert (forages["longueur"] == 0).all()
+    resume = resumer_forages(forages, ["F"])[0]
+    assert resume["nb_forages_initial"] == resume["nb_forages_detail"] == 0
+    assert resume["nb_forages_manques_initial"] + resume["nb_forages_manques_detail"] == len(forages)
+    assert simuler_campagne(forages, 1, 50.0)[0].empty
+    candidat = {"maille_x": 100.0, "maille_y": 50.0, "azimuth_forage": 0, "inclinaison_forage": 90,
+                "decalage_x": 0.5, "decalage_y": 0.5}
+    resultat = evaluer_candidat(corps[0], candidat, 300.0, 1.0, 100.0, 30.0, 50.0, 100.0, (0.95, 0.8, 0.6))
+    assert resultat["nb_forages"] == 0 and resultat["metres"] == 0
@@ -0,0 +1,40 @@
+"""Évaluation de fichiers de scénarios en ligne de commande (lots)."""
+import json
+
+import pandas as pd
+
+from explotarget.benchmark import scenario_synthetique
+from explotarget.lots import evaluer_fichiers
+
+
+def _scenarios(nb, prefixe):
+    return [{"id": f"{prefixe}-{rang}", "nom": f"{prefixe} {rang}", "corps_mineralises": scenario_synthetique(2, rang)}
+            for rang in range(nb)]
+
+
+def test_fichier_illisible_non_evalue(tmp_path):
+    (tmp_path / "a.json").write_text(json.dumps(_scenarios(3, "A")), encoding="utf-8")
+    # Deux scénarios valides puis un élément mal formé
+    valides = ", ".join(json.dumps(scenario) for scenario in _scenarios(2, "B"))
+    (tmp_path / "b.json").write_text(f"[{valides}, {{\"nom\": \"C\" \"corps_mineralises\": []}}]", encoding="utf-8")
+
+    rapport = evaluer_fichiers([tmp_path], tmp_path / "sortie", nb_processus=1, taille_lot=2, afficher=None)
+    assert rapport["nb_fichiers"] == 2
+    assert [erreur["fichier"] for erreur in rapport["erreurs_fichiers"]] == [str(tmp_path / "b.json")]
+    assert rapport["nb_scenarios"] == 3 and rapport["nb_corps"] == 6
+    scenarios = pd.read_csv(tmp_path / "sortie" / "scenarios.csv")
+    assert list(scenarios["id"]) == ["A-0", "A-1", "A-2"]
+    assert set(pd.read_csv(tmp_path / "sortie" / "ressources.csv")["scenario_id"]) == {"A-0", "A-1", "A-2"}
+
+
+def test_plans_de_forage(tmp_path):
+    (tmp_path / "a.json").write_text(json.dumps(_scenarios(2, "A")), encoding="utf-8")
+    evaluer_fichiers([tmp_path / "a.json"], tmp_path / "sortie", nb_processus=1, afficher=None)
+    plans = pd.read_csv(tmp_path / "sortie" / "plans_forage.csv")
+    forages = pd.read_csv(tmp_path / "sortie" / "forages.csv")
+    assert {"scenario_id", "id_forage", "phase", "x", "y", "longueur"} <= set(plans.columns)
+    assert not plans.duplicated(["scenario_id", "id_forage"]).any()
+    # Forages qui recoupent leur filon: mêmes nombres que le résumé par corps
+    touches = plans.groupby("scenario_id")["touche"].sum()
+    attendus = forages.groupby("scenario_id")[["nb_forages_initial", "nb_forages_detail"]].sum().sum(axis=1)
+    assert touches.to_dict() == attendus.astype(int).to_dict()
@@ -0,0 +1,111 @@
+"""Simulation Monte Carlo (monte_carlo.simuler_monte_carlo)."""
+import numpy as np
+import pytest
+
+from explotarget.benchmark import scenario_synthetique
+from explotarget.estimation import estimer_scenario
+from explotarget.monte_carlo import (
+    courbe_depassement, distributions_defaut, matrice_correlation, simuler_monte_carlo, statistiques_tirages,
+)
+
+NORMALES = {parametre: {"loi": "normale", "ecart_relatif": 0.1} for parametre in ("teneur", "epaisseur", "puissance")}
+
+
+@pytest.mark.parametrize("correlations", [None, {("teneur", "epaisseur"): 0.5}])
+@pytest.mark.parametrize("independants", [False, True])
+def test_graine_reproductible(correlations, independants):
+    corps = scenario_synthetique(3)
+    simulations = [simuler_monte_carlo(corps, nb_tirages=2000, graine=graine, correlations=correlations,
+                                       independants=independants) for graine in (7, 7, 8)]
+    np.testing.assert_array_equal(simulations[0]["tonnage"], simulations[1]["tonnage"])
+    np.testing.assert_array_equal(simulations[0]["metal"], simulations[1]["metal"])
+    assert not np.array_equal(simulations[0]["tonnage"], simulations[2]["tonnage"])
+
+
+@pytest.mark.parametrize("correlations", [None, {("puissance", "profondeur"): -0.4}])
+@pytest.mark.parametrize("independants", [False, True])
+def test_invariance_taille_lot(correlations, independants):
+    corps = scenario_synthetique(3)
+    distributions = dict(distributions_defaut(), profondeur={"loi": "lognormale", "ecart_relatif": 0.2})
+    simulations = [simuler_monte_carlo(corps, distributions, nb_tirages=1000, graine=3, correlations=correlations,
+                                       independants=independants, taille_lot=taille_lot)
+                   for taille_lot in (None, 1, 37, 1000)]
+    for simulation in simulations[1:]:
+        np.testing.assert_array_equal(simulation["tonnage"], simulations[0]["tonnage"])
+        np.testing.assert_array_equal(simulation["metal"], simulations[0]["metal"])
+        np.testing.assert_allclose(simulation["tonnage_corps"], simulations[0]["tonnage_corps"], rtol=1e-12)
+
+
+def test_convention_percentiles():
+    tirages = np.arange(1, 1001, dtype=float)
+    statistiques = statistiques_tirages(np.random.default_rng(0).permutation(tirages))
+    # P10: estimation basse, dépassée dans 90 % des tirages; P90: estimation haute, dépassée dans 10 %
+    assert np.mean(tirages > statistiques["P10"]) == pytest.approx(0.9, abs=1e-3)
+    assert np.mean(tirages > statistiques["P90"]) == pytest.approx(0.1, abs=1e-3)
+    assert statistiques["P10"] < statistiques["P50"] < statistiques["P90"]
+    valeurs, probabilites = courbe_depassement(tirages, nb_points=11)
+    for valeur, probabilite in zip(valeurs[1:-1], probabilites[1:-1]):
+        assert np.mean(tirages > valeur) == pytest.approx(probabilite, abs=2e-3)
+
+
+def test_sans_incertitude_egal_valeur_nominale():
+    corps = scenario_synthetique(4)
+    simulation = simuler_monte_carlo(corps, {}, facteur_confiance=0.8, nb_tirages=10, graine=0)
+    tonnage = sum(c["puissance"] * c["epaisseur"] * c["profondeur"] * c["densite"] * 0.8 for c in corps)
+    np.testing.assert_allclose(simulation["tonnage"], tonnage, rtol=1e-12)
+
+
+@pytest.mark.parametrize("independants", [False, True])
+def test_volumes_partages_deduits(independants):
+    corps = scenario_synthetique(3)
+    for c in corps[:2]:
+        c.update(est=0.0, nord=0.0)
+    resultats_df, total_tonnage, total_metal = estimer_scenario(corps, 0.8)
+    assert resultats_df["volume_partage"].iat[1] > 0
+    simulation = simuler_monte_carlo(corps, {}, facteur_confiance=0.8, nb_tirages=10, graine=0,
+                                     independants=independants)
+    np.testing.assert_allclose(simulation["tonnage"], total_tonnage, rtol=1e-12)
+    np.testing.assert_allclose(simulation["metal"], total_metal, rtol=1e-12)
+    np.testing.assert_allclose(simulation["tonnage_corps"], resultats_df["tonnage_ajuste"], rtol=1e-12)
+    sans_deduction = simuler_monte_carlo(corps, {}, facteur_confiance=0.8, nb_tirages=10, chevauchements=False)
+    assert sans_deduction["tonnage"][0] > total_tonnage
+
+
+@pytest.mark.parametrize("coefficient", [-0.8, 0.8])
+def test_correlation_modifie_la_dispersion(coefficient):
+    corps = scenario_synthetique(1)
+    independant = simuler_monte_carlo(corps, NORMALES, nb_tirages=50_000, graine=1)
+    correle = simuler_monte_carlo(corps, NORMALES, nb_tirages=50_000, graine=1,
+                                  correlations={("epaisseur", "puissance"): coefficient})
+    # Variance du produit de deux facteurs d'écart relatif 0.1: environ 0.01 * (2 + 2 * coefficient)
+    rapport = np.std(correle["tonnage"]) / np.std(independant["tonnage"])
+    assert rapport == pytest.approx(np.sqrt(1 + coefficient), rel=0.05)
+
+
+def test_correlation_teneur_epaisseur():
+    corps = scenario_synthetique(1)
+    simulation = simuler_monte_carlo(corps, NORMALES, nb_tirages=50_000, graine=2,
+                                     correlations={("teneur", "epaisseur"): 0.7})
+    teneurs = simulation["metal"] / simulation["tonnage"]
+    # Le tonnage porte aussi la puissance: corrélation 0.7 / sqrt(2) avec la teneur
+    assert np.corrcoef(simulation["tonnage"], teneurs)[0, 1] == pytest.approx(0.7 / np.sqrt(2), abs=0.02)
+
+
+def test_correlation_parametre_inconnu():
+    with pytest.raises(ValueError, match="epaiseur"):
+        simuler_monte_carlo(scenario_synthetique(1), nb_tirages=10, correlations={("teneur", "epaiseur"): 0.5})
+    with pytest.raises(ValueError, match="inconnu"):
+        matrice_correlation({("teneur", "porosite"): 0.2})
+
+
+def test_correlation_parametre_certain_ignoree():
+    distributions = {"teneur": {"loi": "normale", "ecart_relatif": 0.1}}
+    simulation = simuler_monte_carlo(scenario_synthetique(1), distributions, nb_tirages=100, graine=0,
+                                     correlations={("teneur", "epaisseur"): 0.5})
+    assert np.ptp(simulation["tonnage"]) == 0
+
+
+def test_matrice_non_definie_positive():
+    with pytest.raises(ValueError, match="définie positive"):
+        matrice_correlation({("teneur", "epaisseur"): 0.9, ("teneur", "puissance"): 0.9,
+                             ("epaisseur", "puissance"): -0.9})
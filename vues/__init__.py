@@ -0,0 +1,52 @@
+"""
+Pages de l'interface Streamlit.
+
+Chaque page est un module exposant afficher(depot). L'application est
+multipage (st.navigation): à chaque exécution, seul le code de la page
+affichée est exécuté, et le module d'une page n'est importé qu'à sa première
+visite, de sorte que le démarrage et l'affichage des pages légères ne
+chargent pas les bibliothèques de graphiques (Plotly) ni les calculs utilisés
+seulement par les autres pages.
+"""
+import importlib
+from functools import partial
+
+import streamlit as st
+
+# Pages du menu principal, dans l'ordre du menu: module qui les affiche,
+# icône et chemin d'URL
+PAGES = {
+    "Accueil": {"module": "vues.accueil", "icone": ":material/home:", "url": "accueil"},
+    "Estimation de Ressources": {"module": "vues.estimation", "icone": ":material/diamond:", "url": "estimation"},
+    "Planification de Forage": {"module": "vues.forage", "icone": ":material/construction:", "url": "forage"},
+    "Scénarios": {"module": "vues.scenarios", "icone": ":material/account_tree:", "url": "scenarios"},
+    "Guide Utilisateur": {"module": "vues.guide", "icone": ":material/menu_book:", "url": "guide"},
+}
+
+
+def afficher_page(nom, depot):
+    """
+    Affiche le corps d'une page du menu.
+
+    Args:
+        nom: clé de PAGES
+        depot: connexion au dépôt des scénarios
+    """
+    importlib.import_module(PAGES[nom]["module"]).afficher(depot)
+
+
+def pages_navigation(depot):
+    """
+    Construit les pages de l'application multipage.
+
+    Args:
+        depot: connexion au dépôt des scénarios, partagée par toutes les pages
+
+    Returns:
+        Une liste de st.Page à passer à st.navigation, la première étant la page par défaut
+    """
+    return [
+        st.Page(partial(afficher_page, nom, depot), title=nom, icon=page["icone"], url_path=page["url"],
+                default=rang == 0)
+        for rang, (nom, page) in enumerate(PAGES.items())
+    ]
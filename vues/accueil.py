@@ -0,0 +1,73 @@
+"""
+Page d'accueil: présentation, derniers projets et statistiques du dépôt de scénarios.
+"""
+import streamlit as st
+
+from explotarget import lister_scenarios, statistiques_depot
+
+
+def afficher(depot):
+    """Affiche la page d'accueil."""
+    st.markdown('<h1 class="main-header">Preliminary Explo Target Estimation</h1>', unsafe_allow_html=True)
+    st.markdown('<h3 style="text-align: center;">Logiciel d\'estimation de ressources minérales pour l\'exploration</h3>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.markdown("### 🚀 Caractéristiques principales")
+        st.markdown("""
+        - Estimation rapide des ressources minérales
+        - Planification efficace des campagnes de forage
+        - Analyse de sensibilité des paramètres clés
+        - Comparaison de différents scénarios d'exploration
+        - Optimisation budgétaire pour les phases suivantes
+        """)
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.markdown("### 📊 Derniers projets")
+        derniers_scenarios = lister_scenarios(depot, taille_page=3)
+        if len(derniers_scenarios) > 0:
+            for scenario in derniers_scenarios:
+                st.markdown(f"**{scenario['nom']}** - {scenario['date_creation']}")
+                st.markdown(f"Corps minéralisés: {scenario['nb_corps']}")
+                st.markdown("---")
+        else:
+            st.info("Aucun projet existant. Créez votre premier scénario dans l'onglet 'Scénarios'.")
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.markdown("### 🔍 Démarrage rapide")
+        st.markdown("""
+        1. **Créez un nouveau scénario** dans l'onglet "Scénarios"
+        2. **Ajoutez des corps minéralisés** avec leurs caractéristiques
+        3. **Estimez les ressources** en fonction de la maille de forage
+        4. **Planifiez** des forages additionnels pour affiner l'estimation
+        5. **Exportez** vos résultats et votre plan de forage
+        """)
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.markdown("### 📈 Statistiques du projet")
+        
+        statistiques = statistiques_depot(depot)
+        metrics_col1, metrics_col2, metrics_col3 = st.columns(3)
+        with metrics_col1:
+            st.metric("Scénarios", statistiques["nb_scenarios"])
+        with metrics_col2:
+            st.metric("Corps minéralisés", statistiques["nb_corps"])
+        with metrics_col3:
+            st.metric("Version", "1.2.0")
+            
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.markdown("### 👤 À propos de l'auteur")
+        st.markdown("""
+        **Didier Ouedraogo, P.Geo.**
+        
+        Expert en géologie minière et exploration avec plus de 20 ans d'expérience dans le développement de méthodes d'estimation de ressources et la planification de campagnes de forage.
+        """)
+        st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,18 @@
+"""
+Fonctions partagées par les pages de l'application.
+"""
+import base64
+
+
+# Fonction pour télécharger les données
+def download_data(df, filename):
+    csv = df.to_csv(index=False)
+    b64 = base64.b64encode(csv.encode()).decode()
+    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}.csv">Télécharger les données (CSV)</a>'
+    return href
+
+
+# Fonction pour créer un PDF rapport
+def create_download_link(val, filename):
+    b64 = base64.b64encode(val).decode()
+    return f'<a href="data:application/octet-stream;base64,{b64}" download="{filename}.pdf">Télécharger le rapport PDF</a>'
@@ -0,0 +1,666 @@
+"""
+Page "Estimation de Ressources": saisie des corps minéralisés, estimation,
+graphiques, modèle 3D, modèle de blocs (courbes teneur-tonnage) et incertitude
+Monte Carlo.
+
+Le balayage des mailles, l'analyse de sensibilité, le modèle de blocs et
+l'incertitude Monte Carlo sont des fragments (st.fragment): leurs widgets ne
+réexécutent que leur section, à partir des résultats de la dernière exécution
+complète de la page.
+"""
+import uuid
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from explotarget import (
+    CLASSIFICATIONS, COLONNES_CLASSES, LOIS, MAILLE_MAX_BALAYAGE, MAILLE_MIN_BALAYAGE, METHODES, NB_MAILLES_BALAYAGE,
+    NB_RECOUPEMENTS_DEFAUT, PARAMETRES_INCERTAINS, RAYONS_DEFAUT, TAILLE_BLOC_DEFAUT, charger_scenario,
+    classifier_maille, courbe_depassement, deduire_volumes_partages, empreinte, filons_positionnes, lister_scenarios,
+    statistiques_tirages,
+)
+from explotarget.comparaison import parametres_scenario
+from calculs import (
+    balayage_mailles, composites_forage, courbes_modele_blocs, courbes_sensibilite, evaluation_incrementale,
+    figure_balayage_mailles, figure_courbe_balayage, figure_modele, simulation_monte_carlo, volumes_chevauchements,
+)
+from vues.commun import download_data
+
+
+def afficher(depot):
+    """Affiche la page d'estimation des ressources du scénario courant."""
+    st.markdown('<h1 class="main-header">Estimation de Ressources Minérales</h1>', unsafe_allow_html=True)
+    
+    # Section pour sélectionner/créer un scénario
+    scenario_tab1, scenario_tab2 = st.tabs(["Scénario actuel", "Sélectionner un scénario"])
+    
+    with scenario_tab1:
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.subheader("Scénario courant")
+        scenario_name = st.text_input("Nom du scénario", st.session_state.current_scenario["nom"])
+        st.session_state.current_scenario["nom"] = scenario_name
+        
+        # Afficher les corps minéralisés du scénario actuel
+        if len(st.session_state.current_scenario["corps_mineralises"]) > 0:
+            st.markdown("### Corps minéralisés dans ce scénario")
+            corps_df = pd.DataFrame(st.session_state.current_scenario["corps_mineralises"])
+            st.dataframe(corps_df[["nom", "puissance", "epaisseur", "profondeur", "teneur", "densite"]])
+        else:
+            st.info("Aucun corps minéralisé défini. Ajoutez-en un dans le formulaire ci-dessous.")
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with scenario_tab2:
+        recherche_scenario = st.text_input("Rechercher un scénario par nom", key="recherche_chargement")
+        scenarios_trouves = lister_scenarios(depot, taille_page=50, recherche=recherche_scenario)
+        if len(scenarios_trouves) > 0:
+            selected_scenario = st.selectbox(
+                "Sélectionner un scénario existant",
+                options=range(len(scenarios_trouves)),
+                format_func=lambda i: f"{scenarios_trouves[i]['nom']} - {scenarios_trouves[i]['date_creation']}"
+            )
+            if st.button("Charger ce scénario"):
+                st.session_state.current_scenario = charger_scenario(depot, scenarios_trouves[selected_scenario]["id"])
+                st.success(f"Scénario '{st.session_state.current_scenario['nom']}' chargé avec succès!")
+                st.rerun()
+        elif recherche_scenario:
+            st.info("Aucun scénario ne correspond à cette recherche.")
+        else:
+            st.info("Aucun scénario sauvegardé. Créez un nouveau scénario et ajoutez-y des corps minéralisés.")
+    
+    # Formulaire pour ajouter un corps minéralisé
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown('<h2 class="sub-header">Ajouter un corps minéralisé</h2>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        nom_corps = st.text_input("Nom du corps minéralisé", "Corps-" + str(len(st.session_state.current_scenario["corps_mineralises"]) + 1))
+        puissance = st.number_input("Puissance (m)", min_value=0.1, max_value=1000.0, value=100.0, step=10.0,
+                                  help="Plus grand allongement du corps minéralisé dans son plan")
+        epaisseur = st.number_input("Épaisseur (m)", min_value=0.1, max_value=500.0, value=5.0, step=0.5,
+                                   help="Largeur perpendiculaire au plan du filon (ce que traverseraient les forages)")
+        profondeur = st.number_input("Profondeur (m)", min_value=0.1, max_value=2000.0, value=200.0, step=10.0,
+                                    help="Extension en profondeur le long de l'inclinaison")
+    
+    with col2:
+        teneur = st.number_input("Teneur moyenne", min_value=0.01, max_value=100.0, value=1.5, step=0.1)
+        unite_teneur = st.selectbox("Unité de teneur", ["g/t (or, argent)", "% (métaux de base)"])
+        densite = st.number_input("Densité (t/m³)", min_value=1.0, max_value=10.0, value=2.7, step=0.1)
+        
+        azimuth = st.number_input("Azimuth (°)", min_value=0, max_value=360, value=90, step=5,
+                                help="Direction du corps minéralisé, 0° = Nord, 90° = Est, etc.")
+        inclinaison = st.number_input("Inclinaison (°)", min_value=0, max_value=90, value=60, step=5,
+                                     help="Angle d'inclinaison par rapport à l'horizontale")
+        elevation_toit = st.number_input("Élévation du toit (m)", min_value=-2000.0, max_value=0.0, value=-50.0, step=10.0,
+                                        help="Élévation du point le plus haut du corps minéralisé (valeur négative pour sous la surface)")
+        col_est, col_nord = st.columns(2)
+        with col_est:
+            est = st.number_input("Est du centre (m)", min_value=-1e7, max_value=1e7, value=0.0, step=10.0,
+                                  help="Coordonnée est (X) du centre du corps minéralisé")
+        with col_nord:
+            nord = st.number_input("Nord du centre (m)", min_value=-1e7, max_value=1e7, value=0.0, step=10.0,
+                                   help="Coordonnée nord (Y) du centre du corps minéralisé")
+    
+    if st.button("Ajouter ce corps minéralisé"):
+        nouveau_corps = {
+            "id": str(uuid.uuid4()),
+            "nom": nom_corps,
+            "puissance": puissance,
+            "epaisseur": epaisseur,
+            "profondeur": profondeur,
+            "teneur": teneur,
+            "unite_teneur": unite_teneur,
+            "densite": densite,
+            "azimuth": azimuth,
+            "inclinaison": inclinaison,
+            "elevation_toit": elevation_toit,
+            "est": est,
+            "nord": nord
+        }
+        st.session_state.current_scenario["corps_mineralises"].append(nouveau_corps)
+        st.success(f"Corps minéralisé '{nom_corps}' ajouté avec succès!")
+        st.rerun()
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Calcul et affichage des résultats
+    if len(st.session_state.current_scenario["corps_mineralises"]) > 0:
+        st.markdown('<h2 class="sub-header">Paramètres de la maille de forage</h2>', unsafe_allow_html=True)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            maille_x = st.number_input("Espacement en X (m)", min_value=10.0, max_value=1000.0, value=100.0, step=10.0)
+        with col2:
+            maille_y = st.number_input("Espacement en Y (m)", min_value=10.0, max_value=1000.0, value=100.0, step=10.0)
+        with col3:
+            substance = st.selectbox(
+                "Substance principale",
+                ["Or", "Argent", "Cuivre", "Zinc", "Plomb", "Nickel", "Fer", "Autre"]
+            )
+        
+        # Paramètres de classification personnalisables
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.subheader("Paramètres de classification des ressources")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            maille_mesurees = st.number_input("Maille max. pour ressources mesurées (m)", min_value=10.0, max_value=100.0, value=50.0, step=5.0)
+            facteur_mesurees = st.number_input("Facteur de confiance - Mesurées", min_value=0.5, max_value=1.0, value=0.95, step=0.01)
+        with col2:
+            maille_indiquees = st.number_input("Maille max. pour ressources indiquées (m)", min_value=50.0, max_value=200.0, value=100.0, step=10.0)
+            facteur_indiquees = st.number_input("Facteur de confiance - Indiquées", min_value=0.5, max_value=1.0, value=0.8, step=0.01)
+        with col3:
+            facteur_inferees = st.number_input("Facteur de confiance - Inférées", min_value=0.3, max_value=0.8, value=0.6, step=0.01)
+        st.markdown('</div>', unsafe_allow_html=True)
+            
+        # Déterminer la classification en fonction de la maille
+        classification, facteur_confiance = classifier_maille(
+            maille_x, maille_y, maille_mesurees, maille_indiquees,
+            facteur_mesurees, facteur_indiquees, facteur_inferees
+        )
+            
+        st.markdown('<div class="highlight">', unsafe_allow_html=True)
+        st.markdown(f"**Classification des ressources basée sur la maille**: {classification} (facteur de confiance: {facteur_confiance:.2f})")
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Calcul des ressources pour chaque corps et total
+        st.markdown('<h2 class="sub-header">Estimation des ressources</h2>', unsafe_allow_html=True)
+        
+        # Empreinte des corps du scénario: clé des calculs mis en cache
+        empreinte_scenario = empreinte(st.session_state.current_scenario["corps_mineralises"])
+        # Seuls les corps ajoutés ou modifiés depuis la dernière exécution sont recalculés
+        resultats_df, totaux_estimation, _ = evaluation_incrementale(
+            "estimation", st.session_state.current_scenario["corps_mineralises"], facteur_confiance=facteur_confiance
+        )
+        total_tonnage, total_metal = totaux_estimation["total_tonnage"], totaux_estimation["total_metal"]
+        # Volume commun aux corps qui se chevauchent, compté une seule fois (dans le premier corps)
+        volumes_partages = volumes_chevauchements(empreinte_scenario, st.session_state.current_scenario["corps_mineralises"])
+        if volumes_partages.any():
+            resultats_df = deduire_volumes_partages(resultats_df, volumes_partages)
+            total_tonnage, total_metal = resultats_df["tonnage_ajuste"].sum(), resultats_df["metal_quantite"].sum()
+        
+        # Afficher les résultats par corps minéralisé
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.subheader("Résultats par corps minéralisé")
+        
+        # Les colonnes restent numériques, le formatage n'est appliqué qu'à l'affichage
+        st.dataframe(
+            resultats_df[["nom", "volume", "volume_partage", "tonnage_ajuste", "teneur", "unite_teneur", "metal_quantite",
+                          "metal_unit"]]
+            .style.format({col: '{:,.0f}' for col in ["volume", "volume_partage", "tonnage_ajuste", "metal_quantite"]})
+        )
+        if volumes_partages.any():
+            st.info(f"{int((volumes_partages > 0).sum())} corps chevauchent un corps précédent: "
+                    f"{volumes_partages.sum():,.0f} m³ communs ne sont comptés qu'une fois (colonne volume_partage).")
+        sans_coordonnees = int((~filons_positionnes(st.session_state.current_scenario["corps_mineralises"])).sum())
+        if sans_coordonnees and len(st.session_state.current_scenario["corps_mineralises"]) > 1:
+            st.caption(f"{sans_coordonnees} corps sans coordonnées est/nord (scénario antérieur): leur position relative "
+                       "est inconnue, aucun chevauchement n'est déduit pour eux.")
+        
+        # Afficher le total
+        st.markdown(f"""
+        <div class="highlight">
+        <h3>Résultat total pour le scénario "{st.session_state.current_scenario["nom"]}":</h3>
+        <p>Tonnage total: <b>{total_tonnage:,.0f} tonnes</b></p>
+        <p>Quantité de métal: <b>{total_metal:,.0f} {resultats_df["metal_unit"].iat[0]}</b></p>
+        <p>Classification: <b>{classification}</b></p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Ajouter un bouton pour exporter les résultats
+        st.markdown(download_data(resultats_df, f"resultats_{st.session_state.current_scenario['nom']}"), unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Balayage des espacements: budget, forages et classification sur une grille de mailles (x, y)
+        # (fragment: ses paramètres ne réexécutent que cette section)
+        @st.fragment
+        def afficher_balayage():
+            with st.expander("Balayage des mailles de forage"):
+                col1, col2 = st.columns(2)
+                with col1:
+                    mailles_bornes = st.slider("Espacements balayés (m)", min_value=5.0, max_value=500.0,
+                                               value=(MAILLE_MIN_BALAYAGE, MAILLE_MAX_BALAYAGE), step=5.0)
+                    nb_mailles = st.select_slider("Espacements par axe", options=[25, 50, 100, 200], value=NB_MAILLES_BALAYAGE)
+                with col2:
+                    grandeur_balayage = st.selectbox("Grandeur affichée", ["budget", "metres", "nb_forages", "tonnage"],
+                                                     format_func={"budget": "Budget", "metres": "Métrage",
+                                                                  "nb_forages": "Nombre de forages",
+                                                                  "tonnage": "Tonnage ajusté"}.get)
+                    st.caption("Forages, coûts et orientation: plan de forage sauvegardé dans le scénario, "
+                               "sinon valeurs par défaut de la page de planification.")
+            
+                # Table de référence: une seule grille de forages à la maille courante
+                p = parametres_scenario(st.session_state.current_scenario)
+                parametres_reference = dict(
+                    maille_initiale_x=maille_x, maille_initiale_y=maille_y, maille_detail_x=maille_x, maille_detail_y=maille_y,
+                    profondeur_forage_max=p["profondeur_forage_max"], azimuth_forage=p["azimuth_forage"],
+                    inclinaison_forage=p["inclinaison_forage"], marge_sortie=p["marge_sortie"]
+                )
+                facteurs_balayage = (facteur_mesurees, facteur_indiquees, facteur_inferees)
+                balayage = balayage_mailles(
+                    empreinte_scenario, st.session_state.current_scenario["corps_mineralises"], parametres_reference,
+                    mailles_bornes[0], mailles_bornes[1], nb_mailles,
+                    longueur_echantillon=p["longueur_echantillon"], cout_metre=p["cout_metre"],
+                    cout_analyses=p["cout_analyses"], cout_mobilisation=p["cout_mobilisation"],
+                    maille_mesurees=maille_mesurees, maille_indiquees=maille_indiquees,
+                    facteurs_confiance=facteurs_balayage, tonnage_brut=total_tonnage / facteur_confiance
+                )
+                empreinte_balayage = empreinte([empreinte_scenario, parametres_reference, p["longueur_echantillon"],
+                                                p["cout_metre"], p["cout_analyses"], p["cout_mobilisation"],
+                                                maille_mesurees, maille_indiquees, facteurs_balayage,
+                                                total_tonnage / facteur_confiance, mailles_bornes, nb_mailles])
+            
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.plotly_chart(figure_balayage_mailles(empreinte_balayage, balayage, grandeur_balayage,
+                                                            (maille_x, maille_y)), use_container_width=True)
+                with col2:
+                    st.plotly_chart(figure_balayage_mailles(empreinte_balayage, balayage, "classification",
+                                                            (maille_x, maille_y)), use_container_width=True)
+                st.plotly_chart(figure_courbe_balayage(empreinte_balayage, balayage, (maille_x + maille_y) / 2),
+                                use_container_width=True)
+                st.caption("""
+                Une seule grille de forages (au moins 2 x 2 par corps) est balayée. Le métrage d'une position est le
+                métrage moyen par position de chaque corps à la maille courante: il est exact à la maille courante (croix)
+                et estimé ailleurs. Les analyses sont comptées au prorata du métrage.
+                """)
+        
+        afficher_balayage()
+        
+        # Visualisation des résultats
+        st.markdown('<h2 class="sub-header">Visualisation</h2>', unsafe_allow_html=True)
+        
+        viz_tab1, viz_tab2, viz_tab4, viz_tab3 = st.tabs(["Graphiques", "Modèle 3D simplifié", "Modèle de blocs",
+                                                          "Incertitude (Monte Carlo)"])
+        
+        with viz_tab1:
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                # Graphique de distribution des tonnages
+                fig1 = px.bar(
+                    resultats_df,
+                    x="nom",
+                    y="tonnage_ajuste",
+                    title="Distribution des tonnages par corps minéralisé",
+                    labels={"nom": "Corps minéralisé", "tonnage_ajuste": "Tonnage ajusté"},
+                    text_auto='.2s'
+                )
+                fig1.update_layout(height=400)
+                st.plotly_chart(fig1, use_container_width=True)
+            
+            with col2:
+                # Graphique de distribution des teneurs
+                fig2 = px.bar(
+                    resultats_df,
+                    x="nom",
+                    y="teneur",
+                    title=f"Distribution des teneurs par corps minéralisé",
+                    labels={"nom": "Corps minéralisé", "teneur": f"Teneur"},
+                    text_auto='.2f'
+                )
+                fig2.update_layout(height=400)
+                st.plotly_chart(fig2, use_container_width=True)
+                
+            # Analyse de sensibilité (fragment: le choix du corps ne réexécute que cette section)
+            @st.fragment
+            def afficher_sensibilite():
+                st.subheader("Analyse de sensibilité")
+                
+                corps_sensibilite = st.selectbox(
+                    "Sélectionner un corps minéralisé pour l'analyse de sensibilité",
+                    options=range(len(st.session_state.current_scenario["corps_mineralises"])),
+                    format_func=lambda i: st.session_state.current_scenario["corps_mineralises"][i]["nom"]
+                )
+                
+                corps = st.session_state.current_scenario["corps_mineralises"][corps_sensibilite]
+                sensibilite = courbes_sensibilite(empreinte(corps), corps, facteur_confiance)
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    # Sensibilité à la teneur
+                    fig_sens1 = px.line(
+                        x=sensibilite["teneurs"], 
+                        y=sensibilite["metal"],
+                        markers=True,
+                        title=f"Sensibilité à la teneur - {corps['nom']}",
+                        labels={"x": f"Teneur ({corps['unite_teneur']})", "y": f"Quantité de métal ({sensibilite['metal_unit']})"}
+                    )
+                    st.plotly_chart(fig_sens1, use_container_width=True)
+                
+                with col2:
+                    # Sensibilité à l'épaisseur
+                    fig_sens2 = px.line(
+                        x=sensibilite["epaisseurs"], 
+                        y=sensibilite["tonnages"],
+                        markers=True,
+                        title=f"Sensibilité à l'épaisseur - {corps['nom']}",
+                        labels={"x": "Épaisseur (m)", "y": "Tonnage (tonnes)"}
+                    )
+                    st.plotly_chart(fig_sens2, use_container_width=True)
+            
+            afficher_sensibilite()
+                
+        with viz_tab2:
+            st.subheader("Représentation 3D simplifiée des corps minéralisés")
+            
+            # Création d'une visualisation 3D simplifiée (mise en cache)
+            fig = figure_modele(empreinte_scenario, st.session_state.current_scenario["corps_mineralises"], maille_x, maille_y)
+            
+            st.plotly_chart(fig, use_container_width=True)
+            st.caption("""
+            Cette visualisation 3D simplifiée montre les corps minéralisés de type filon selon leur orientation et dimensions.
+            - La surface verte représente le niveau du sol (z=0)
+            - La ligne noire montre la direction principale du filon (azimuth)
+            - La ligne pointillée grise indique la direction de plongement (inclinaison)
+            - L'épaisseur est perpendiculaire au plan du filon
+            - La puissance est le plus grand allongement dans le plan du filon
+            - La profondeur est l'extension en profondeur le long de l'inclinaison
+            """)
+        
+        with viz_tab4:
+            # Modèle de blocs (fragment: ses paramètres ne réexécutent que cette section)
+            @st.fragment
+            def afficher_modele_blocs():
+                st.subheader("Modèle de blocs et courbes teneur-tonnage")
+                st.markdown("Chaque filon est découpé en blocs orientés selon ses axes (puissance, profondeur, épaisseur). "
+                            "La teneur de chaque bloc est soit tirée autour de la teneur moyenne du corps, soit interpolée "
+                            "depuis des composites de forage.")
+            
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    bloc_puissance = st.number_input("Bloc - puissance (m)", min_value=1.0, max_value=500.0, value=TAILLE_BLOC_DEFAUT[0], step=1.0)
+                with col2:
+                    bloc_profondeur = st.number_input("Bloc - profondeur (m)", min_value=1.0, max_value=500.0, value=TAILLE_BLOC_DEFAUT[1], step=1.0)
+                with col3:
+                    bloc_epaisseur = st.number_input("Bloc - épaisseur (m)", min_value=0.1, max_value=100.0, value=TAILLE_BLOC_DEFAUT[2], step=0.5)
+            
+                source_teneurs = st.radio("Teneur des blocs", ["Tirage autour de la teneur moyenne", "Interpolation depuis des composites de forage"],
+                                          horizontal=True, key="blocs_source")
+                coefficient_variation, graine_blocs = 0.0, 0
+                composites, parametres_interpolation, identifiants_composites = None, None, None
+                if source_teneurs == "Tirage autour de la teneur moyenne":
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        coefficient_variation = st.number_input("Coefficient de variation des teneurs", min_value=0.0, max_value=3.0, value=0.5, step=0.1,
+                                                                help="0: teneur uniforme égale à la teneur moyenne du corps")
+                    with col2:
+                        graine_blocs = st.number_input("Graine aléatoire", min_value=0, max_value=2**31 - 1, value=42, step=1, key="blocs_graine")
+                else:
+                    st.markdown("Fichiers CSV: collars (trou, x, y, z), levés de déviation optionnels (trou, profondeur, azimuth, "
+                                "inclinaison) et analyses (trou, de, a, teneur), dans le repère du modèle 3D.")
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        fichier_collars = st.file_uploader("Collars", type=["csv"], key="composites_collars")
+                    with col2:
+                        fichier_leves = st.file_uploader("Levés de déviation (optionnel)", type=["csv"], key="composites_leves")
+                    with col3:
+                        fichier_analyses = st.file_uploader("Analyses", type=["csv"], key="composites_analyses")
+                
+                    col1, col2, col3, col4 = st.columns(4)
+                    with col1:
+                        methode = st.selectbox("Méthode", list(METHODES), format_func=METHODES.get)
+                    with col2:
+                        colonne_teneur = st.text_input("Colonne de teneur", value="", help="Par défaut: teneur ou grade")
+                    with col3:
+                        puissance_idw = st.number_input("Puissance (inverse des distances)", min_value=1.0, max_value=4.0, value=2.0, step=0.5,
+                                                        disabled=methode != "idw")
+                    with col4:
+                        nb_max_composites = st.number_input("Composites max. par bloc", min_value=1, max_value=64, value=16, step=1,
+                                                            disabled=methode != "idw")
+                
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        rayon_puissance = st.number_input("Rayon de recherche - puissance (m)", min_value=1.0, max_value=2000.0, value=RAYONS_DEFAUT[0], step=10.0)
+                    with col2:
+                        rayon_profondeur = st.number_input("Rayon de recherche - profondeur (m)", min_value=1.0, max_value=2000.0, value=RAYONS_DEFAUT[1], step=10.0)
+                    with col3:
+                        rayon_epaisseur = st.number_input("Rayon de recherche - épaisseur (m)", min_value=0.5, max_value=500.0, value=RAYONS_DEFAUT[2], step=1.0)
+                
+                    if fichier_collars is None or fichier_analyses is None:
+                        st.info("Téléversez au moins les collars et les analyses pour interpoler les teneurs.")
+                    else:
+                        identifiants_composites = tuple(
+                            fichier.file_id if fichier is not None else None
+                            for fichier in (fichier_collars, fichier_analyses, fichier_leves)
+                        )
+                        try:
+                            composites, rapport_composites = composites_forage(
+                                identifiants_composites, fichier_collars, fichier_analyses, fichier_leves, colonne_teneur.strip()
+                            )
+                        except ValueError as e:
+                            st.error(f"Erreur dans les fichiers de forage: {str(e)}")
+                        else:
+                            st.caption(f"{rapport_composites['nb_composites']:,} composites positionnés sur "
+                                       f"{rapport_composites['nb_intervalles']:,} intervalles "
+                                       f"({rapport_composites['nb_sans_collar']:,} sans collar, "
+                                       f"{rapport_composites['nb_sans_teneur']:,} sans teneur).")
+                            parametres_interpolation = {
+                                "methode": methode, "rayons": (rayon_puissance, rayon_profondeur, rayon_epaisseur),
+                                "puissance": puissance_idw, "nb_max": int(nb_max_composites),
+                            }
+            
+            
+                # Classification bloc par bloc selon la distance aux recoupements des forages
+                st.markdown("**Classification des blocs**")
+                mode_classification = st.radio(
+                    "Classification des blocs",
+                    ["Maille du scénario (uniforme)", "Recoupements des forages planifiés", "Recoupements des composites importés"],
+                    horizontal=True, key="blocs_classification", label_visibility="collapsed",
+                    help="Un bloc est mesuré (indiqué) si au moins N recoupements de son corps sont à moins de la maille "
+                         "max. des ressources mesurées (indiquées)"
+                )
+                parametres_classification = None
+                if mode_classification != "Maille du scénario (uniforme)":
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        nb_recoupements = st.number_input("Nombre de recoupements (N)", min_value=1, max_value=12,
+                                                          value=NB_RECOUPEMENTS_DEFAUT, step=1)
+                    parametres_classification = {
+                        "source": "plan", "nb_recoupements": int(nb_recoupements),
+                        "maille_mesurees": maille_mesurees, "maille_indiquees": maille_indiquees,
+                        "facteurs": (facteur_mesurees, facteur_indiquees, facteur_inferees),
+                    }
+                    if mode_classification == "Recoupements des forages planifiés":
+                        with col2:
+                            azimuth_classification = st.number_input("Azimuth des forages (°)", min_value=0, max_value=360, value=270, step=5,
+                                                                     key="blocs_azimuth_forage")
+                        with col3:
+                            inclinaison_classification = st.number_input("Inclinaison des forages (°)", min_value=0, max_value=90, value=60, step=5,
+                                                                         key="blocs_inclinaison_forage")
+                        profondeur_classification = parametres_scenario(st.session_state.current_scenario)["profondeur_forage_max"]
+                        parametres_classification.update(maille_x=maille_x, maille_y=maille_y,
+                                                         azimuth_forage=azimuth_classification,
+                                                         inclinaison_forage=inclinaison_classification,
+                                                         profondeur_forage_max=profondeur_classification)
+                        st.caption(f"Forages implantés sur la maille du scénario ({maille_x:.0f} m × {maille_y:.0f} m), "
+                                   f"d'au plus {profondeur_classification:.0f} m (plan de forage sauvegardé ou valeur par défaut).")
+                    elif composites is None:
+                        st.info("Téléversez des composites de forage (interpolation ci-dessus) pour classer les blocs "
+                                "selon leurs recoupements.")
+                        parametres_classification = None
+                    else:
+                        parametres_classification["source"] = "composites"
+            
+                if source_teneurs == "Tirage autour de la teneur moyenne" or parametres_interpolation is not None:
+                    try:
+                        nb_blocs, tonnage_blocs, courbes_df, nb_blocs_estimes, classes_df = courbes_modele_blocs(
+                            empreinte_scenario, st.session_state.current_scenario["corps_mineralises"],
+                            (bloc_puissance, bloc_profondeur, bloc_epaisseur), coefficient_variation, int(graine_blocs),
+                            facteur_confiance, identifiants_composites, composites, parametres_interpolation,
+                            parametres_classification
+                        )
+                    except ValueError as e:
+                        st.error(f"Erreur dans le modèle de blocs: {str(e)}")
+                    else:
+                        if nb_blocs_estimes is not None:
+                            st.caption(f"{nb_blocs_estimes:,} blocs sur {nb_blocs:,} ont au moins un composite dans leur ellipsoïde "
+                                       "de recherche; les autres gardent la teneur moyenne de leur corps.")
+                        col1, col2 = st.columns(2)
+                        col1.metric("Nombre de blocs", f"{nb_blocs:,}")
+                        col2.metric("Tonnage du modèle (t)", f"{tonnage_blocs:,.0f}")
+                
+                        if classes_df is not None:
+                            colonnes_classes = {COLONNES_CLASSES[classe]: f"{classe} (t)" for classe in CLASSIFICATIONS}
+                            fig_classes = px.bar(
+                                classes_df[classes_df["nom"] != "Total"].melt(id_vars="nom", value_vars=list(colonnes_classes),
+                                                                              var_name="classe", value_name="tonnage")
+                                .replace({"classe": {colonne: classe for classe, colonne in COLONNES_CLASSES.items()}}),
+                                x="nom", y="tonnage", color="classe", title="Tonnage brut par classe et par corps",
+                                labels={"nom": "Corps minéralisé", "tonnage": "Tonnage (t)", "classe": "Classification"},
+                                color_discrete_sequence=['#2E7D32', '#F9A825', '#C62828']
+                            )
+                            fig_classes.update_layout(height=400)
+                            st.plotly_chart(fig_classes, use_container_width=True)
+                            st.dataframe(
+                                classes_df.rename(columns={**colonnes_classes, "nom": "Corps", "tonnage_ajuste": "Tonnage ajusté (t)",
+                                                           "metal_quantite": "Métal", "metal_unit": "Unité"})
+                                .style.format({**{colonne: '{:,.0f}' for colonne in colonnes_classes.values()},
+                                               "Tonnage ajusté (t)": '{:,.0f}', "Métal": '{:,.0f}'}, na_rep="-"),
+                                hide_index=True
+                            )
+                
+                        for unite, courbe in courbes_df.groupby("unite_teneur", sort=False):
+                            metal_unit = courbe["metal_unit"].iat[0]
+                            col1, col2 = st.columns(2)
+                    
+                            with col1:
+                                fig_gt = go.Figure()
+                                fig_gt.add_trace(go.Scatter(x=courbe["coupure"], y=courbe["tonnage"], mode='lines',
+                                                            name="Tonnage", line=dict(color='#34495E', width=3)))
+                                fig_gt.add_trace(go.Scatter(x=courbe["coupure"], y=courbe["teneur_moyenne"], mode='lines',
+                                                            name="Teneur moyenne", yaxis="y2", line=dict(color='#E67E22', width=3)))
+                                fig_gt.update_layout(title=f"Courbe teneur-tonnage ({unite})", xaxis_title=f"Teneur de coupure ({unite})",
+                                                     yaxis_title="Tonnage au-dessus de la coupure (t)",
+                                                     yaxis2=dict(title="Teneur moyenne", overlaying="y", side="right"),
+                                                     height=400, legend=dict(orientation="h", y=-0.2))
+                                st.plotly_chart(fig_gt, use_container_width=True)
+                    
+                            with col2:
+                                fig_metal = go.Figure(go.Scatter(x=courbe["coupure"], y=courbe["metal_quantite"], mode='lines',
+                                                                 line=dict(color='#4CAF50', width=3)))
+                                fig_metal.update_layout(title=f"Métal au-dessus de la coupure ({unite})",
+                                                        xaxis_title=f"Teneur de coupure ({unite})",
+                                                        yaxis_title=f"Quantité de métal ({metal_unit})", height=400)
+                                st.plotly_chart(fig_metal, use_container_width=True)
+                    
+                            # Tableau à une dizaine de coupures
+                            st.dataframe(
+                                courbe.iloc[::max(len(courbe) // 10, 1)][["coupure", "tonnage", "teneur_moyenne", "metal_quantite"]]
+                                .rename(columns={"coupure": f"Coupure ({unite})", "tonnage": "Tonnage (t)",
+                                                 "teneur_moyenne": "Teneur moyenne", "metal_quantite": f"Métal ({metal_unit})"})
+                                .style.format({"Tonnage (t)": '{:,.0f}', f"Métal ({metal_unit})": '{:,.0f}',
+                                               f"Coupure ({unite})": '{:.2f}', "Teneur moyenne": '{:.2f}'}),
+                                hide_index=True
+                            )
+                
+                        if classes_df is None:
+                            st.caption("Les tonnages sont ajustés par le facteur de confiance de la classification. "
+                                       "Sans coupure, le tonnage du modèle de blocs est celui de l'estimation simple "
+                                       "avant déduction des volumes communs aux corps qui se chevauchent.")
+                        else:
+                            st.caption("Le tonnage de chaque bloc est ajusté par le facteur de confiance de sa classe, "
+                                       "déterminée par la distance à son N-ième recoupement le plus proche dans le même corps.")
+                        if volumes_partages.any():
+                            st.caption("Les blocs des corps qui se chevauchent sont tous comptés: le volume commun, déduit "
+                                       "de l'estimation, n'est pas retiré du modèle de blocs.")
+            
+            afficher_modele_blocs()
+        
+        with viz_tab3:
+            # Incertitude Monte Carlo (fragment: ses paramètres ne réexécutent que cette section)
+            @st.fragment
+            def afficher_monte_carlo():
+                st.subheader("Analyse d'incertitude Monte Carlo")
+                st.markdown("Chaque paramètre est multiplié par un facteur aléatoire de valeur centrale 1, "
+                            "tiré selon la loi choisie, pour tous les corps minéralisés du scénario.")
+            
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    nb_tirages = st.number_input("Nombre de tirages", min_value=1000, max_value=1000000, value=100000, step=10000)
+                with col2:
+                    graine = st.number_input("Graine aléatoire", min_value=0, max_value=2**31 - 1, value=42, step=1,
+                                             help="Une même graine redonne les mêmes résultats")
+                with col3:
+                    independants = st.checkbox("Tirages indépendants par corps", value=False,
+                                               help="Sinon, une même incertitude s'applique à tous les corps (plus prudent et plus rapide)")
+            
+                # Lois des facteurs multiplicatifs par paramètre
+                libelles = {"teneur": "Teneur", "epaisseur": "Épaisseur", "puissance": "Puissance",
+                            "profondeur": "Profondeur", "densite": "Densité"}
+                distributions = {}
+                for parametre in PARAMETRES_INCERTAINS:
+                    col1, col2, col3, col4 = st.columns(4)
+                    with col1:
+                        loi = st.selectbox(f"Loi - {libelles[parametre]}", LOIS, key=f"mc_loi_{parametre}")
+                    distribution = {"loi": loi}
+                    if loi in ("triangulaire", "uniforme"):
+                        with col2:
+                            distribution["min"] = st.number_input("Facteur min.", min_value=0.0, max_value=1.0, value=0.8, step=0.05, key=f"mc_min_{parametre}")
+                        with col3:
+                            if loi == "triangulaire":
+                                distribution["mode"] = st.number_input("Facteur le plus probable", min_value=0.0, max_value=3.0, value=1.0, step=0.05, key=f"mc_mode_{parametre}")
+                        with col4:
+                            distribution["max"] = st.number_input("Facteur max.", min_value=1.0, max_value=3.0, value=1.2, step=0.05, key=f"mc_max_{parametre}")
+                    else:
+                        with col2:
+                            distribution["ecart_relatif"] = st.number_input("Écart relatif (coefficient de variation)", min_value=0.0, max_value=1.0, value=0.1, step=0.01, key=f"mc_cv_{parametre}")
+                    distributions[parametre] = distribution
+            
+                col1, col2 = st.columns(2)
+                with col1:
+                    correlation_teneur_epaisseur = st.slider("Corrélation teneur / épaisseur", min_value=-0.9, max_value=0.9, value=0.0, step=0.1)
+                with col2:
+                    correlation_puissance_profondeur = st.slider("Corrélation puissance / profondeur", min_value=-0.9, max_value=0.9, value=0.0, step=0.1)
+            
+                try:
+                    simulation = simulation_monte_carlo(
+                        empreinte_scenario, st.session_state.current_scenario["corps_mineralises"], distributions,
+                        facteur_confiance, int(nb_tirages), int(graine), independants,
+                        {("teneur", "epaisseur"): correlation_teneur_epaisseur,
+                         ("puissance", "profondeur"): correlation_puissance_profondeur}
+                    )
+                except ValueError as e:
+                    st.error(f"Erreur dans la simulation: {str(e)}")
+                else:
+                    metal_unit = resultats_df["metal_unit"].iat[0]
+                    stats_tonnage = statistiques_tirages(simulation["tonnage"])
+                    stats_metal = statistiques_tirages(simulation["metal"])
+                
+                    st.table(pd.DataFrame({
+                        "Percentile": ["P10 (bas)", "P50 (médian)", "P90 (haut)", "Moyenne"],
+                        "Tonnage (t)": [f"{stats_tonnage[k]:,.0f}" for k in ["P10", "P50", "P90", "moyenne"]],
+                        f"Métal ({metal_unit})": [f"{stats_metal[k]:,.0f}" for k in ["P10", "P50", "P90", "moyenne"]]
+                    }))
+                
+                    for cle, titre, unite in [("tonnage", "Tonnage", "t"), ("metal", "Quantité de métal", metal_unit)]:
+                        col1, col2 = st.columns(2)
+                    
+                        with col1:
+                            # Histogramme pré-calculé: seules les classes sont envoyées au navigateur
+                            effectifs, bornes = np.histogram(simulation[cle], bins=60)
+                            fig_hist = go.Figure(go.Bar(
+                                x=(bornes[:-1] + bornes[1:]) / 2, y=effectifs / effectifs.sum() * 100,
+                                width=np.diff(bornes), marker_color='#4CAF50'
+                            ))
+                            fig_hist.update_layout(title=f"Distribution - {titre}", xaxis_title=f"{titre} ({unite})",
+                                                   yaxis_title="Fréquence (%)", height=400, bargap=0)
+                            st.plotly_chart(fig_hist, use_container_width=True)
+                    
+                        with col2:
+                            valeurs, probabilites = courbe_depassement(simulation[cle])
+                            fig_dep = go.Figure(go.Scatter(x=valeurs, y=probabilites * 100, mode='lines',
+                                                           line=dict(color='#34495E', width=3)))
+                            fig_dep.update_layout(title=f"Courbe de dépassement - {titre}", xaxis_title=f"{titre} ({unite})",
+                                                  yaxis_title="Probabilité de dépassement (%)", height=400)
+                            st.plotly_chart(fig_dep, use_container_width=True)
+                
+                    st.caption("P10: valeur dépassée dans 90 % des tirages; P90: valeur dépassée dans 10 % des tirages.")
+                    if volumes_partages.any():
+                        st.caption("Le tonnage de chaque corps est réduit de la part de son volume déjà comptée "
+                                   "dans un corps précédent, comme dans l'estimation.")
+            
+            afficher_monte_carlo()
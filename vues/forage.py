@@ -0,0 +1,574 @@
+"""
+Page "Planification de Forage": plan de forage, budget, visualisation 3D,
+échéancier, export, optimisation des plans et balayage des espacements.
+
+La vue 3D, l'échéancier (avec les exports qui en dépendent) et le balayage des
+espacements sont des fragments (st.fragment): leurs widgets ne réexécutent que
+leur section, à partir du plan calculé à la dernière exécution complète de la page.
+"""
+import json
+from datetime import datetime
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from explotarget import (
+    CLASSIFICATIONS, MAILLE_MAX_BALAYAGE, MAILLE_MIN_BALAYAGE, MARGE_SORTIE_DEFAUT, NB_MAILLES_BALAYAGE,
+    NIVEAU_DETAIL_DEFAUT, NIVEAUX_DETAIL, PHASES,
+    budget_campagne, chiffrer_corps, durees_phases, empreinte, enregistrer_scenario, flux_tresorerie, grille_candidats,
+)
+from explotarget.comparaison import PARAMETRES_FORAGES
+from calculs import (
+    balayage_mailles, details_incrementaux, echeancier_campagne, evaluation_incrementale, figure_balayage_mailles,
+    figure_courbe_balayage, figure_echeancier, figure_forage, optimisation_forage,
+)
+
+
+def afficher(depot):
+    """Affiche la page de planification de la campagne de forage."""
+    st.markdown('<h1 class="main-header">Planification de Campagne de Forage</h1>', unsafe_allow_html=True)
+    
+    if len(st.session_state.current_scenario["corps_mineralises"]) == 0:
+        st.warning("Aucun corps minéralisé défini. Veuillez d'abord créer des corps minéralisés dans l'onglet 'Estimation de Ressources'.")
+    else:
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.subheader("Configuration de la campagne de forage")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            type_forage = st.selectbox(
+                "Type de forage",
+                ["Carottage diamanté (DDH)", "Circulation inverse (RC)"]
+            )
+            
+            maille_initiale_x = st.number_input("Maille initiale - Espacement X (m)", min_value=10.0, max_value=500.0, value=100.0, step=10.0)
+            maille_initiale_y = st.number_input("Maille initiale - Espacement Y (m)", min_value=10.0, max_value=500.0, value=100.0, step=10.0)
+            
+            maille_detail_x = st.number_input("Maille détaillée - Espacement X (m)", min_value=5.0, max_value=250.0, value=50.0, step=5.0)
+            maille_detail_y = st.number_input("Maille détaillée - Espacement Y (m)", min_value=5.0, max_value=250.0, value=50.0, step=5.0)
+        
+        with col2:
+            cout_metre = st.number_input("Coût par mètre foré (€)", min_value=10, max_value=1000, value=150, step=10)
+            cout_mobilisation = st.number_input("Coût de mobilisation (€)", min_value=0, max_value=500000, value=50000, step=5000)
+            cout_analyses = st.number_input("Coût des analyses par échantillon (€)", min_value=1, max_value=500, value=30, step=5)
+            
+            longueur_echantillon = st.number_input("Longueur moyenne des échantillons (m)", min_value=0.1, max_value=5.0, value=1.0, step=0.1)
+        
+        # Nouveaux paramètres de forage personnalisables
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.subheader("Paramètres des forages")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            azimuth_forage = st.number_input("Azimuth des forages (°)", min_value=0, max_value=360, value=270, step=5,
+                                           help="Direction des forages, 0° = Nord, 90° = Est, etc.")
+        with col2:
+            inclinaison_forage = st.number_input("Inclinaison des forages (°)", min_value=0, max_value=90, value=60, step=5,
+                                              help="Angle par rapport à la verticale, 0° = vertical, 90° = horizontal")
+        with col3:
+            profondeur_forage_max = st.number_input("Profondeur max. des forages (m)", min_value=50, max_value=2000, value=300, step=50,
+                                                 help="Longueur maximale réalisable d'un forage")
+        with col4:
+            marge_sortie = st.number_input("Marge après le mur (m)", min_value=0.0, max_value=100.0, value=MARGE_SORTIE_DEFAUT, step=1.0,
+                                         help="Longueur forée au-delà du mur du filon pour s'assurer de l'avoir traversé")
+            
+        st.markdown('</div>', unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Sélection des corps à forer
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.subheader("Corps minéralisés à forer")
+        
+        corps_a_forer = st.multiselect(
+            "Sélectionner les corps minéralisés pour la campagne de forage",
+            options=[corps["nom"] for corps in st.session_state.current_scenario["corps_mineralises"]],
+            default=[corps["nom"] for corps in st.session_state.current_scenario["corps_mineralises"]]
+        )
+        
+        if not corps_a_forer:
+            st.warning("Veuillez sélectionner au moins un corps minéralisé.")
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Calcul du plan de forage
+        if corps_a_forer:
+            st.markdown('<h2 class="sub-header">Plan de forage</h2>', unsafe_allow_html=True)
+            
+            # Filtrer les corps minéralisés sélectionnés
+            corps_selectionnes = [corps for corps in st.session_state.current_scenario["corps_mineralises"] 
+                                if corps["nom"] in corps_a_forer]
+            
+            # Calcul pour chaque corps
+            parametres_forage = dict(
+                maille_initiale_x=maille_initiale_x, maille_initiale_y=maille_initiale_y,
+                maille_detail_x=maille_detail_x, maille_detail_y=maille_detail_y,
+                profondeur_forage_max=profondeur_forage_max, longueur_echantillon=longueur_echantillon,
+                cout_metre=cout_metre, cout_analyses=cout_analyses,
+                azimuth_forage=azimuth_forage, inclinaison_forage=inclinaison_forage, marge_sortie=marge_sortie
+            )
+            # Grilles de forage recalculées pour les seuls corps modifiés; les coûts sont appliqués ensuite
+            forages_df, totaux, _ = evaluation_incrementale("forage", corps_selectionnes, **parametres_forage)
+            # Table forage par forage, générée une seule fois et réutilisée par la figure et l'export
+            table_forages_df = details_incrementaux("forage")
+            resultats_forage = [chiffrer_corps(forages, longueur_echantillon, cout_metre, cout_analyses)
+                                for forages in forages_df.to_dict("records")]
+            empreinte_selection = empreinte(corps_selectionnes)
+            total_metres_initial = totaux["total_metres_initial"]
+            total_metres_detaille = totaux["total_metres_detaille"]
+            total_forages_initial = totaux["total_forages_initial"]
+            total_forages_detaille = totaux["total_forages_detaille"]
+            budget = budget_campagne(resultats_forage, cout_metre, cout_analyses, cout_mobilisation)
+            
+            # Forages qui manquent le filon ou dont la longueur requise dépasse la profondeur max.
+            total_manques = sum(res["nb_forages_manques_initial"] + res["nb_forages_manques_detail"] for res in resultats_forage)
+            total_trop_courts = sum(res["nb_forages_trop_courts"] for res in resultats_forage)
+            if total_manques > 0:
+                st.warning(f"{total_manques:.0f} position(s) de forage ne recoupent pas le filon avec l'orientation choisie "
+                           f"ou n'atteignent pas son toit en {profondeur_forage_max} m, et ne sont pas comptées dans le plan.")
+            if total_trop_courts > 0:
+                st.warning(f"{total_trop_courts:.0f} forage(s) nécessiteraient plus de {profondeur_forage_max} m pour traverser "
+                           "le filon: leur longueur est limitée à la profondeur max.")
+            
+            # Affichage des résultats
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown('<div class="card">', unsafe_allow_html=True)
+                st.subheader("Plan de forage initial")
+                
+                df_initial = pd.DataFrame([{
+                    "Corps": res["nom"],
+                    "Nombre de forages": f"{res['nb_forages_initial']:.0f}",
+                    "Hors filon": f"{res['nb_forages_manques_initial']:.0f}",
+                    "Métrage (m)": f"{res['metres_initial']:,.0f}",
+                    "Échantillons": f"{res['nb_echantillons_initial']:,.0f}",
+                    "Coût (€)": f"{res['cout_initial']:,.0f}"
+                } for res in resultats_forage])
+                
+                st.table(df_initial)
+                
+                st.markdown(f"""
+                <div class="highlight">
+                <p><b>Total phase initiale:</b></p>
+                <ul>
+                    <li>Nombre de forages: {total_forages_initial:.0f}</li>
+                    <li>Métrage total: {total_metres_initial:,.0f} m</li>
+                    <li>Coût forage: {budget["cout_forage_initial"]:,.0f} €</li>
+                    <li>Coût analyses: {budget["cout_analyses_initial"]:,.0f} €</li>
+                    <li>Coût total (incl. mobilisation): {cout_mobilisation + budget["cout_phase_initiale"]:,.0f} €</li>
+                </ul>
+                </div>
+                """, unsafe_allow_html=True)
+                st.markdown('</div>', unsafe_allow_html=True)
+            
+            with col2:
+                st.markdown('<div class="card">', unsafe_allow_html=True)
+                st.subheader("Plan de forage détaillé")
+                
+                df_detail = pd.DataFrame([{
+                    "Corps": res["nom"],
+                    "Nombre de forages": f"{res['nb_forages_detail']:.0f}",
+                    "Hors filon": f"{res['nb_forages_manques_detail']:.0f}",
+                    "Métrage (m)": f"{res['metres_detail']:,.0f}",
+                    "Échantillons": f"{res['nb_echantillons_detail']:,.0f}",
+                    "Coût (€)": f"{res['cout_detail']:,.0f}"
+                } for res in resultats_forage])
+                
+                st.table(df_detail)
+                
+                st.markdown(f"""
+                <div class="highlight">
+                <p><b>Total phase détaillée:</b></p>
+                <ul>
+                    <li>Nombre de forages: {total_forages_detaille:.0f}</li>
+                    <li>Métrage total: {total_metres_detaille:,.0f} m</li>
+                    <li>Coût forage: {budget["cout_forage_detail"]:,.0f} €</li>
+                    <li>Coût analyses: {budget["cout_analyses_detail"]:,.0f} €</li>
+                    <li>Coût total (excl. mobilisation): {budget["cout_phase_detaillee"]:,.0f} €</li>
+                </ul>
+                </div>
+                """, unsafe_allow_html=True)
+                st.markdown('</div>', unsafe_allow_html=True)
+            
+            # Visualisation du plan de forage
+            st.markdown('<h2 class="sub-header">Visualisation du plan de forage</h2>', unsafe_allow_html=True)
+            
+            # Vue 3D (fragment: le niveau de détail ne réexécute que cette section)
+            @st.fragment
+            def afficher_plan_3d():
+                # Niveau de détail: nombre maximal de forages affichés, jusqu'au plan complet
+                niveau_detail = st.select_slider("Niveau de détail", options=list(NIVEAUX_DETAIL), value=NIVEAU_DETAIL_DEFAUT,
+                                                 key="forage_niveau_detail",
+                                                 help="Nombre maximal de forages affichés; au-delà, les forages sont "
+                                                      "décimés uniformément en plan (forages initiaux en priorité).")
+            
+                # Créer une visualisation 3D du plan de forage (mise en cache)
+                fig = figure_forage(empreinte_selection, corps_selectionnes, maille_initiale_x, maille_initiale_y,
+                                    maille_detail_x, maille_detail_y, azimuth_forage, inclinaison_forage, profondeur_forage_max,
+                                    marge_sortie, NIVEAUX_DETAIL[niveau_detail], table_forages_df)
+            
+                st.plotly_chart(fig, use_container_width=True)
+                forages_affiches, forages_total = fig.layout.meta["forages_affiches"], fig.layout.meta["forages_total"]
+                if forages_affiches < forages_total:
+                    st.info(f"{forages_affiches:,} forages affichés sur {forages_total:,} positions planifiées "
+                            f"(niveau « {niveau_detail} »). Choisissez un niveau plus élevé pour afficher davantage de détail.")
+                st.caption(f"""
+                Cette visualisation 3D montre le plan de forage proposé pour les corps minéralisés de type filon.
+                Les forages initiaux (rouges) sont complétés par des forages détaillés (bleus) en maille resserrée.
+                Tous les forages ont un azimut de {azimuth_forage}°, une inclinaison de {inclinaison_forage}° 
+                et s'arrêtent {marge_sortie:.0f} m après le mur du filon (au plus {profondeur_forage_max} m).
+                Les positions qui ne recoupent pas le filon sont tracées en gris.
+                """)
+            
+            afficher_plan_3d()
+            
+            # Résumé du budget de forage
+            st.markdown('<h2 class="sub-header">Budget total de la campagne de forage</h2>', unsafe_allow_html=True)
+            
+            cout_total = budget["cout_total"]
+            
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                st.metric("Total Forages", f"{total_forages_initial + total_forages_detaille:.0f}")
+                st.metric("Type de Forage", type_forage)
+            
+            with col2:
+                st.metric("Métrage Total", f"{total_metres_initial + total_metres_detaille:,.0f} m")
+                st.metric("Coût par Mètre", f"{cout_metre} €/m")
+            
+            with col3:
+                st.metric("Budget Total", f"{cout_total:,.0f} €")
+                st.metric("Densité de Forage", f"{(total_forages_initial + total_forages_detaille) / sum(corps['puissance'] * corps['profondeur'] / 10000 for corps in corps_selectionnes):,.1f} forages/ha")
+            
+            # Échéancier: ordonnancement des forages du plan sur les foreuses, suivi des exports qui en
+            # dépendent (fragment: les hypothèses de l'échéancier ne réexécutent que cette section)
+            @st.fragment
+            def afficher_echeancier():
+                st.markdown('<div class="card">', unsafe_allow_html=True)
+                st.subheader("Échéancier prévisionnel")
+            
+                # Hypothèses
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    nb_foreuses = st.number_input("Nombre de foreuses", min_value=1, max_value=20, value=1, step=1)
+                    metres_par_jour = st.slider("Productivité par foreuse (mètres par jour)", min_value=20, max_value=300, value=100, step=10)
+                    jours_mobilisation = st.slider("Jours de mobilisation/préparation", min_value=1, max_value=60, value=15, step=1)
+                with col2:
+                    vitesse_deplacement = st.number_input("Vitesse de déplacement (m/jour)", min_value=100.0, max_value=50000.0, value=2000.0, step=100.0,
+                                                          help="Vitesse de déplacement d'une foreuse d'un collar au suivant")
+                    jours_installation = st.number_input("Installation par forage (jours)", min_value=0.0, max_value=10.0, value=0.5, step=0.25)
+                    delai_laboratoire = st.number_input("Délai du laboratoire (jours)", min_value=0, max_value=180, value=30, step=5,
+                                                        help="Les forages détaillés d'un corps commencent au retour des analyses de ses forages initiaux")
+                with col3:
+                    cout_attente_jour = st.number_input("Coût d'attente par foreuse (€/jour)", min_value=0, max_value=50000, value=0, step=500,
+                                                        help="Journées d'attente facturées quand une foreuse n'a aucun forage disponible")
+                    import datetime as dt
+                    date_debut = st.date_input("Date de début du projet", dt.date.today())
+            
+                # Simulation à événements discrets (mise en cache par plan et hypothèses)
+                parametres_echeancier = dict(nb_foreuses=int(nb_foreuses), metres_par_jour=metres_par_jour,
+                                             jours_mobilisation=jours_mobilisation, vitesse_deplacement=vitesse_deplacement,
+                                             jours_installation=jours_installation, delai_laboratoire=delai_laboratoire)
+                chronologie, foreuses = echeancier_campagne(empreinte([empreinte_selection, parametres_forage]),
+                                                            table_forages_df, **parametres_echeancier)
+                jours_phase1, jours_phase2 = durees_phases(chronologie, jours_mobilisation)
+                date_fin_phase1 = date_debut + dt.timedelta(days=jours_mobilisation + jours_phase1)
+                date_fin_phase2 = date_fin_phase1 + dt.timedelta(days=jours_phase2)
+            
+                echeancier_df = pd.DataFrame({
+                    'Étape': ['Mobilisation et préparation', 'Phase 1 - Forages initiaux', 'Phase 2 - Forages détaillés', 'Total'],
+                    'Durée (jours)': [jours_mobilisation, jours_phase1, jours_phase2, jours_mobilisation + jours_phase1 + jours_phase2],
+                    'Date de début': [date_debut, date_debut + dt.timedelta(days=jours_mobilisation), date_fin_phase1, date_debut],
+                    'Date de fin': [date_debut + dt.timedelta(days=jours_mobilisation), date_fin_phase1, date_fin_phase2, date_fin_phase2],
+                    'Budget (€)': [cout_mobilisation, 
+                                 budget["cout_phase_initiale"],
+                                 budget["cout_phase_detaillee"],
+                                 cout_total]
+                })
+            
+                echeancier_df['Budget (€)'] = echeancier_df['Budget (€)'].map('{:,.0f}'.format)
+            
+                st.table(echeancier_df)
+            
+                # Diagramme de Gantt des foreuses (mis en cache)
+                empreinte_echeancier = empreinte([empreinte_selection, parametres_forage, parametres_echeancier])
+                st.plotly_chart(figure_echeancier(empreinte_echeancier, chronologie, date_debut, jours_mobilisation),
+                                use_container_width=True)
+            
+                st.dataframe(pd.DataFrame({
+                    "Foreuse": foreuses["foreuse"],
+                    "Forages": foreuses["nb_forages"],
+                    "Métrage (m)": foreuses["metres"].map('{:,.0f}'.format),
+                    "Jours de forage": foreuses["jours_forage"].map('{:,.1f}'.format),
+                    "Jours de déplacement et installation": foreuses["jours_deplacement"].map('{:,.1f}'.format),
+                    "Jours d'attente": foreuses["jours_attente"].map('{:,.1f}'.format),
+                    "Fin": [date_debut + dt.timedelta(days=float(fin)) for fin in foreuses["fin"]],
+                }), hide_index=True, use_container_width=True)
+            
+                # Courbe des dépenses cumulées
+                flux = flux_tresorerie(chronologie, foreuses, cout_metre, cout_analyses, longueur_echantillon,
+                                       cout_mobilisation, cout_attente_jour)
+                dates_flux = [date_debut + dt.timedelta(days=int(jour)) for jour in flux["jour"]]
+                fig_flux = go.Figure(go.Scatter(x=dates_flux, y=flux["cumul"], mode='lines', line_shape='hv', fill='tozeroy',
+                                                name="Dépenses cumulées",
+                                                hovertemplate="%{x|%d/%m/%Y}<br>Cumul: %{y:,.0f} €<extra></extra>"))
+                fig_flux.update_layout(title="Dépenses cumulées de la campagne", xaxis_title="Date",
+                                       yaxis_title="Dépenses cumulées (€)", height=400)
+                st.plotly_chart(fig_flux, use_container_width=True)
+                st.caption("""
+                Les forages du plan sont répartis entre les foreuses: chaque foreuse libérée rejoint le forage disponible
+                le plus proche, dans son corps puis dans le corps le plus proche. La mobilisation est payée au début du projet,
+                le forage à la fin de chaque forage et les analyses au retour des résultats du laboratoire.
+                """)
+                st.markdown('</div>', unsafe_allow_html=True)
+            
+                # Exportation du plan de forage
+                st.markdown('<div class="card">', unsafe_allow_html=True)
+                st.subheader("Exportation du plan de forage")
+            
+                # Préparation des données pour l'export
+                export_data = {
+                    "scenario": st.session_state.current_scenario["nom"],
+                    "date_creation": datetime.now().strftime("%Y-%m-%d"),
+                    "parametres_forage": {
+                        "type_forage": type_forage,
+                        "maille_initiale": {"x": maille_initiale_x, "y": maille_initiale_y},
+                        "maille_detaillee": {"x": maille_detail_x, "y": maille_detail_y},
+                        "orientation_forage": {"azimuth": azimuth_forage, "inclinaison": inclinaison_forage},
+                        "profondeur_max": profondeur_forage_max,
+                        "marge_sortie": marge_sortie,
+                        "couts": {
+                            "metre": cout_metre,
+                            "mobilisation": cout_mobilisation,
+                            "analyses": cout_analyses
+                        }
+                    },
+                    "corps_mineralises": corps_selectionnes,
+                    "resultats_forage": resultats_forage,
+                    "budget_total": cout_total,
+                    "echeancier": {
+                        "date_debut": date_debut.strftime("%Y-%m-%d"),
+                        "date_fin": date_fin_phase2.strftime("%Y-%m-%d"),
+                        "duree_totale": int(jours_mobilisation + jours_phase1 + jours_phase2),
+                        **parametres_echeancier
+                    }
+                }
+            
+                # Export au format JSON
+                json_str = json.dumps(export_data, default=str, indent=4)
+                json_bytes = json_str.encode()
+            
+                # Bouton de téléchargement
+                st.download_button(
+                    label="Télécharger le plan de forage (JSON)",
+                    data=json_bytes,
+                    file_name=f"plan_forage_{st.session_state.current_scenario['nom']}_{datetime.now().strftime('%Y%m%d')}.json",
+                    mime="application/json"
+                )
+            
+                col1, col2 = st.columns(2)
+            
+                with col1:
+                    # Export au format Excel (simulé avec CSV)
+                    resume_df = pd.DataFrame({
+                        'Métrique': ['Scénario', 'Date de création', 'Nombre de corps minéralisés', 
+                                  'Type de forage', 'Azimuth forage', 'Inclinaison forage',
+                                  'Forages initiaux', 'Forages détaillés',
+                                  'Métrage total', 'Budget total', 'Durée estimée'],
+                        'Valeur': [st.session_state.current_scenario["nom"], datetime.now().strftime("%Y-%m-%d"),
+                                 len(corps_selectionnes), type_forage, 
+                                 f"{azimuth_forage}°", f"{inclinaison_forage}°",
+                                 f"{total_forages_initial:.0f}", f"{total_forages_detaille:.0f}",
+                                 f"{total_metres_initial + total_metres_detaille:,.0f} m",
+                                 f"{cout_total:,.0f} €",
+                                 f"{jours_mobilisation + jours_phase1 + jours_phase2:.0f} jours"]
+                    })
+                
+                    csv = resume_df.to_csv(index=False).encode()
+                
+                    st.download_button(
+                        label="Télécharger le résumé (CSV)",
+                        data=csv,
+                        file_name=f"resume_forage_{st.session_state.current_scenario['nom']}_{datetime.now().strftime('%Y%m%d')}.csv",
+                        mime="text/csv"
+                    )
+                
+                    # Table forage par forage (collars, orientation, longueur planifiée)
+                    st.download_button(
+                        label="Télécharger la table des forages (CSV)",
+                        data=table_forages_df.to_csv(index=False).encode(),
+                        file_name=f"forages_{st.session_state.current_scenario['nom']}_{datetime.now().strftime('%Y%m%d')}.csv",
+                        mime="text/csv"
+                    )
+                
+                    # Chronologie forage par forage (foreuse, dates de début et de fin, retour des analyses)
+                    st.download_button(
+                        label="Télécharger la chronologie des forages (CSV)",
+                        data=chronologie.to_csv(index=False).encode(),
+                        file_name=f"chronologie_forages_{st.session_state.current_scenario['nom']}_{datetime.now().strftime('%Y%m%d')}.csv",
+                        mime="text/csv"
+                    )
+            
+                with col2:
+                    # Sauvegarder dans les scénarios
+                    if st.button("Sauvegarder ce plan dans le scénario actuel"):
+                        # Ajouter les informations de forage au scénario
+                        st.session_state.current_scenario["plan_forage"] = {
+                            "date_creation": datetime.now().strftime("%Y-%m-%d"),
+                            "type_forage": type_forage,
+                            "maille_initiale_x": maille_initiale_x,
+                            "maille_initiale_y": maille_initiale_y,
+                            "maille_detail_x": maille_detail_x,
+                            "maille_detail_y": maille_detail_y,
+                            "azimuth_forage": azimuth_forage,
+                            "inclinaison_forage": inclinaison_forage,
+                            "profondeur_forage_max": profondeur_forage_max,
+                            "marge_sortie": marge_sortie,
+                            "cout_metre": cout_metre,
+                            "cout_mobilisation": cout_mobilisation,
+                            "cout_analyses": cout_analyses,
+                            "budget_total": cout_total,
+                            "duree_totale": jours_mobilisation + jours_phase1 + jours_phase2,
+                            **parametres_echeancier,
+                            "resultats_forage": resultats_forage
+                        }
+                    
+                        # Mettre à jour le scénario s'il existe déjà, sinon l'ajouter
+                        enregistrer_scenario(depot, st.session_state.current_scenario)
+                    
+                        st.success("Plan de forage sauvegardé dans le scénario!")
+            
+                st.markdown('</div>', unsafe_allow_html=True)
+            
+            afficher_echeancier()
+            
+            # Optimisation de l'orientation, de la maille et du décalage des forages
+            st.markdown('<h2 class="sub-header">Optimisation du plan de forage</h2>', unsafe_allow_html=True)
+            
+            with st.expander("Rechercher le plan le moins coûteux pour chaque corps"):
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    pas_azimuth = st.select_slider("Pas d'azimuth testé (°)", options=[15, 30, 45, 90], value=30)
+                    inclinaisons_testees = st.multiselect("Inclinaisons testées (°)", [30, 45, 60, 75, 90], default=[45, 60, 75, 90])
+                    decalages_testes = st.multiselect("Décalages de grille testés (fraction de maille)", [0.0, 0.25, 0.5], default=[0.0, 0.5])
+                with col2:
+                    mailles_testees = st.multiselect("Mailles testées (m)", [25.0, 50.0, 75.0, 100.0, 150.0, 200.0],
+                                                     default=[25.0, 50.0, 100.0])
+                    classification_cible = st.selectbox("Classification visée", CLASSIFICATIONS[:2], index=1)
+                    taux_recoupement_min = st.slider("Proportion minimale de forages recoupant le filon", 0.5, 1.0, 0.9, 0.05)
+                with col3:
+                    opt_maille_mesurees = st.number_input("Maille max. mesurées (m)", min_value=10.0, max_value=100.0, value=50.0, step=5.0)
+                    opt_maille_indiquees = st.number_input("Maille max. indiquées (m)", min_value=50.0, max_value=200.0, value=100.0, step=10.0)
+                    facteurs_optimisation = (0.95, 0.8, 0.6)
+                    st.caption("Facteurs de confiance: mesurées 0.95, indiquées 0.8, inférées 0.6")
+                
+                candidats = grille_candidats(list(range(0, 360, pas_azimuth)), inclinaisons_testees,
+                                             mailles_testees, mailles_testees, decalages_testes or [0.0])
+                st.write(f"{len(candidats):,} candidats par corps minéralisé")
+                
+                if candidats and st.button("Lancer l'optimisation"):
+                    with st.spinner("Évaluation des candidats..."):
+                        optimisation = optimisation_forage(
+                            empreinte_selection, corps_selectionnes, candidats,
+                            profondeur_forage_max=profondeur_forage_max, longueur_echantillon=longueur_echantillon,
+                            cout_metre=cout_metre, cout_analyses=cout_analyses,
+                            maille_mesurees=opt_maille_mesurees, maille_indiquees=opt_maille_indiquees,
+                            facteurs_confiance=facteurs_optimisation, classification_cible=classification_cible,
+                            taux_recoupement_min=taux_recoupement_min, marge_sortie=marge_sortie
+                        )
+                    
+                    df_meilleurs = pd.DataFrame([{
+                        "Corps": res["nom"],
+                        "Azimuth (°)": f"{res['meilleur']['azimuth_forage']:.0f}" if res["meilleur"] else "-",
+                        "Inclinaison (°)": f"{res['meilleur']['inclinaison_forage']:.0f}" if res["meilleur"] else "-",
+                        "Maille (m)": f"{res['meilleur']['maille_x']:.0f} x {res['meilleur']['maille_y']:.0f}" if res["meilleur"] else "-",
+                        "Décalage": f"{res['meilleur']['decalage_x']:.2f} / {res['meilleur']['decalage_y']:.2f}" if res["meilleur"] else "-",
+                        "Forages": f"{res['meilleur']['nb_forages']:.0f}" if res["meilleur"] else "-",
+                        "Métrage (m)": f"{res['meilleur']['metres']:,.0f}" if res["meilleur"] else "-",
+                        "Coût (€)": f"{res['meilleur']['cout']:,.0f}" if res["meilleur"] else "Cible non atteinte",
+                        "Classification": res["meilleur"]["classification"] if res["meilleur"] else "-",
+                    } for res in optimisation])
+                    st.table(df_meilleurs)
+                    
+                    # Front de Pareto coût / confiance de chaque corps
+                    fig_pareto = go.Figure()
+                    for corps_idx, res in enumerate(optimisation):
+                        front = res["front_pareto"]
+                        if len(front):
+                            fig_pareto.add_trace(go.Scatter(
+                                x=front["cout"], y=front["confiance"], mode='lines+markers', line_shape='hv',
+                                name=res["nom"],
+                                customdata=front[["azimuth_forage", "inclinaison_forage", "maille_x", "maille_y"]].to_numpy(),
+                                hovertemplate="Coût: %{x:,.0f} €<br>Confiance: %{y:.2f}<br>"
+                                              "Azimuth %{customdata[0]}°, inclinaison %{customdata[1]}°<br>"
+                                              "Maille %{customdata[2]} x %{customdata[3]} m<extra></extra>"
+                            ))
+                    fig_pareto.update_layout(title="Front de Pareto coût / confiance", xaxis_title="Coût (€)",
+                                             yaxis_title="Confiance", height=450)
+                    st.plotly_chart(fig_pareto, use_container_width=True)
+                    st.caption("""
+                    La confiance d'un plan est le facteur de confiance de la classification obtenue avec la maille
+                    effective des points de recoupement, multiplié par la proportion de forages qui recoupent le filon.
+                    Chaque point du front est un plan qu'aucun autre plan ne surpasse à la fois en coût et en confiance.
+                    """)
+            
+            # Balayage de l'espacement d'une phase, l'autre phase restant à sa maille courante
+            # (fragment: ses paramètres ne réexécutent que cette section)
+            @st.fragment
+            def afficher_balayage():
+                with st.expander("Balayer les espacements d'une phase (carte des coûts)"):
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        phase_balayee = st.radio("Phase balayée", PHASES, horizontal=True, key="balayage_phase")
+                        grandeur_balayage = st.selectbox("Grandeur affichée", ["budget", "metres", "nb_forages"],
+                                                         format_func={"budget": "Budget", "metres": "Métrage",
+                                                                      "nb_forages": "Nombre de forages"}.get,
+                                                         key="balayage_grandeur")
+                    with col2:
+                        mailles_bornes = st.slider("Espacements balayés (m)", min_value=5.0, max_value=500.0,
+                                                   value=(MAILLE_MIN_BALAYAGE, MAILLE_MAX_BALAYAGE), step=5.0,
+                                                   key="balayage_bornes")
+                        nb_mailles = st.select_slider("Espacements par axe", options=[25, 50, 100, 200],
+                                                      value=NB_MAILLES_BALAYAGE, key="balayage_nb")
+                    with col3:
+                        bal_maille_mesurees = st.number_input("Maille max. mesurées (m)", min_value=10.0, max_value=100.0,
+                                                              value=50.0, step=5.0, key="balayage_mesurees")
+                        bal_maille_indiquees = st.number_input("Maille max. indiquées (m)", min_value=50.0, max_value=200.0,
+                                                               value=100.0, step=10.0, key="balayage_indiquees")
+                
+                    maille_initiale, maille_detail = (maille_initiale_x, maille_initiale_y), (maille_detail_x, maille_detail_y)
+                    parametres_balayage = dict(
+                        longueur_echantillon=longueur_echantillon, cout_metre=cout_metre, cout_analyses=cout_analyses,
+                        cout_mobilisation=cout_mobilisation, maille_mesurees=bal_maille_mesurees,
+                        maille_indiquees=bal_maille_indiquees, facteurs_confiance=(0.95, 0.8, 0.6), phase=phase_balayee,
+                        maille_initiale=maille_initiale, maille_detail=maille_detail
+                    )
+                    # La table des forages du plan courant sert de référence (métrage moyen par position)
+                    balayage = balayage_mailles(empreinte_selection, corps_selectionnes,
+                                                {cle: parametres_forage[cle] for cle in PARAMETRES_FORAGES},
+                                                mailles_bornes[0], mailles_bornes[1], nb_mailles,
+                                                _forages=table_forages_df, **parametres_balayage)
+                    empreinte_balayage = empreinte([empreinte_selection, parametres_forage, parametres_balayage,
+                                                    mailles_bornes, nb_mailles])
+                    maille_courante = maille_initiale if phase_balayee == PHASES[0] else maille_detail
+                
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.plotly_chart(figure_balayage_mailles(empreinte_balayage, balayage, grandeur_balayage, maille_courante),
+                                        use_container_width=True)
+                    with col2:
+                        st.plotly_chart(figure_balayage_mailles(empreinte_balayage, balayage, "classification", maille_courante),
+                                        use_container_width=True)
+                    st.plotly_chart(figure_courbe_balayage(empreinte_balayage, balayage, sum(maille_courante) / 2),
+                                    use_container_width=True)
+                    st.caption(f"""
+                    La maille de la phase {"détaillée" if phase_balayee == PHASES[0] else "initiale"} reste celle du plan
+                    courant; la classification est celle de la maille détaillée. Le métrage d'une position est le métrage
+                    moyen par position de chaque corps et de chaque phase du plan courant: il est exact à la maille courante
+                    (croix) et estimé ailleurs. Les analyses sont comptées au prorata du métrage.
+                    """)
+            
+            afficher_balayage()
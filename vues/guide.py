@@ -0,0 +1,106 @@
+"""
+Page "Guide Utilisateur".
+
+Le texte statique du guide (sections 1 à 7) est un document Markdown
+pré-rédigé (guide.md), lu une seule fois puis servi depuis le cache; seules
+la FAQ et la présentation de l'auteur, qui utilisent des widgets, sont
+construites à l'exécution.
+"""
+from pathlib import Path
+
+import streamlit as st
+
+# Document Markdown du guide (sections statiques)
+CHEMIN_GUIDE = Path(__file__).with_name("guide.md")
+
+# Questions fréquentes (question, réponse en Markdown)
+FAQ = [
+    ("Comment définir correctement les paramètres d'un filon?", 
+     """Pour un filon:
+     - La **puissance** est le plus grand allongement dans la direction principale du filon
+     - L'**épaisseur** est la largeur perpendiculaire au plan du filon
+     - La **profondeur** est l'extension le long de l'inclinaison du filon
+     - L'**inclinaison** est l'angle du filon par rapport à l'horizontale (pendage)
+     - L'**azimuth** est la direction principale du filon (angle par rapport au Nord)"""),
+    
+    ("Quelle précision puis-je attendre des estimations?", 
+     """Les estimations fournies sont sommaires et adaptées aux phases préliminaires d'exploration. 
+     La précision dépend de la qualité des données d'entrée et de la complexité géologique. 
+     Typiquement, attendez-vous à une marge d'erreur de ±30% pour les ressources inférées."""),
+    
+    ("Comment intégrer des données réelles de forage?", 
+     """L'onglet **Modèle de blocs** de la page d'estimation importe des composites de forage: 
+     téléversez les collars (trou, x, y, z), les levés de déviation (optionnels) et les analyses 
+     (trou, de, a, teneur) au format CSV, dans le repère du modèle 3D. La teneur des blocs est 
+     alors interpolée (inverse des distances ou plus proche voisin) et les blocs peuvent être 
+     classés selon leur distance aux recoupements des forages importés. Les dimensions des corps 
+     minéralisés restent saisies manuellement."""),
+    
+    ("L'application prend-elle en compte la variabilité de la teneur?", 
+     """L'estimation utilise une teneur moyenne pour chaque corps minéralisé. 
+     L'onglet **Incertitude (Monte Carlo)** de la page d'estimation permet de tirer 
+     la teneur, l'épaisseur, la puissance, la profondeur et la densité selon des lois 
+     au choix et d'obtenir des fourchettes P10/P50/P90 du tonnage et du métal."""),
+    
+    ("Comment estimer la densité si je n'ai pas de mesures?", 
+     """Vous pouvez utiliser des valeurs typiques selon le type de roche et de minéralisation:
+     - Roches sédimentaires: 2.2-2.6 t/m³
+     - Roches ignées felsiques: 2.5-2.8 t/m³
+     - Roches ignées mafiques: 2.8-3.1 t/m³
+     - Minéralisation sulfurée massive: 3.5-4.5 t/m³
+     - Minéralisation disséminée: 2.7-3.0 t/m³"""),
+    
+    ("Les coûts de forage sont-ils réalistes?", 
+     """Les coûts de forage varient considérablement selon la région, l'accessibilité, 
+     la profondeur et les conditions du terrain. Les valeurs par défaut sont indicatives 
+     et doivent être ajustées en fonction de votre contexte spécifique et des devis des prestataires."""),
+    
+    ("Puis-je utiliser cette application pour des rapports officiels?", 
+     """Cette application est conçue comme un outil d'aide à la décision pour les phases 
+     préliminaires d'exploration. Les estimations qu'elle fournit ne sont pas conformes 
+     aux codes comme le JORC, NI 43-101 ou PERC, qui nécessitent des procédures plus rigoureuses 
+     et la supervision d'une personne qualifiée.""")
+]
+
+
+@st.cache_resource
+def contenu_guide(chemin=CHEMIN_GUIDE):
+    """Texte Markdown du guide, lu au premier affichage de la page."""
+    return Path(chemin).read_text(encoding="utf-8")
+
+
+def afficher(depot):
+    """Affiche le guide utilisateur."""
+    st.markdown(contenu_guide(), unsafe_allow_html=True)
+    
+    # Section FAQ
+    st.markdown('<h2 id="faq" class="sub-header">8. FAQ</h2>', unsafe_allow_html=True)
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    
+    for question, answer in FAQ:
+        with st.expander(question):
+            st.markdown(answer)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # À propos de l'auteur
+    st.markdown('<h2 class="sub-header">À propos de l\'auteur</h2>', unsafe_allow_html=True)
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([1, 3])
+    
+    with col1:
+        st.image("https://via.placeholder.com/200x200.png?text=Photo", width=150)
+    
+    with col2:
+        st.markdown("### Didier Ouedraogo, P.Geo.")
+        st.markdown("""
+        Expert en géologie minière et exploration avec plus de 20 ans d'expérience dans le développement de méthodes d'estimation de ressources et la planification de campagnes de forage.
+        
+        Spécialiste de l'exploration aurifère en Afrique de l'Ouest et au Moyen Orient, Didier a travaillé sur de nombreux projets d'exploration, de la phase initiale jusqu'à l'étude de faisabilité.
+        
+        Cette application a été développée pour partager son expertise et aider les géologues d'exploration à optimiser leurs programmes de forage et à mieux estimer les ressources minérales potentielles dès les premières phases d'exploration.
+        
+        *Pour toute question ou suggestion d'amélioration, n'hésitez pas à contacter l'auteur.*
+        """)
+    st.markdown('</div>', unsafe_allow_html=True)
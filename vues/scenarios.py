@@ -0,0 +1,258 @@
+"""
+Page "Scénarios": création, liste paginée, chargement, suppression,
+export et import des scénarios du dépôt, et comparaison de scénarios.
+"""
+import json
+import uuid
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from explotarget import (
+    charger_scenario, compter_scenarios, empreinte, enregistrer_scenario, exporter_scenarios, importer_fichier,
+    lister_scenarios, supprimer_scenario,
+)
+from explotarget.comparaison import PARAMETRES_DEFAUT
+from explotarget.depot import TAILLE_PAGE_DEFAUT
+from calculs import comparaison_scenarios
+from vues.commun import download_data
+
+# Nombre maximal de scénarios proposés à la comparaison
+NB_SCENARIOS_COMPARAISON = 200
+
+
+def afficher(depot):
+    """Affiche la page de gestion des scénarios."""
+    st.markdown('<h1 class="main-header">Gestion des Scénarios</h1>', unsafe_allow_html=True)
+    
+    # Onglets pour créer ou gérer les scénarios
+    tabs = st.tabs(["Créer un scénario", "Gérer les scénarios", "Comparer des scénarios"])
+    
+    with tabs[0]:
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.subheader("Créer un nouveau scénario")
+        
+        nouveau_nom = st.text_input("Nom du scénario", "Nouveau scénario")
+        description = st.text_area("Description", "Description du scénario d'exploration")
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            localisation = st.text_input("Localisation", "Site minier")
+        
+        with col2:
+            substance_principale = st.selectbox(
+                "Substance principale",
+                ["Or", "Argent", "Cuivre", "Zinc", "Plomb", "Nickel", "Fer", "Autre"]
+            )
+        
+        with col3:
+            unite_mesure = st.selectbox(
+                "Unité de mesure principale",
+                ["g/t (or, argent)", "% (métaux de base)"]
+            )
+        
+        if st.button("Créer ce scénario"):
+            nouveau_scenario = {
+                "id": str(uuid.uuid4()),
+                "nom": nouveau_nom,
+                "description": description,
+                "localisation": localisation,
+                "substance_principale": substance_principale,
+                "unite_mesure": unite_mesure,
+                "date_creation": datetime.now().strftime("%Y-%m-%d"),
+                "corps_mineralises": []
+            }
+            
+            enregistrer_scenario(depot, nouveau_scenario)
+            st.session_state.current_scenario = nouveau_scenario
+            
+            st.success(f"Scénario '{nouveau_nom}' créé avec succès!")
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with tabs[1]:
+        nb_scenarios = compter_scenarios(depot)
+        if nb_scenarios > 0:
+            st.markdown('<div class="card">', unsafe_allow_html=True)
+            st.subheader("Scénarios existants")
+            
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                recherche_scenario = st.text_input("Rechercher par nom", key="recherche_gestion")
+            with col2:
+                ordre_scenarios = st.selectbox("Trier par", ["recents", "date", "nom"],
+                                               format_func={"recents": "Dernière modification", "date": "Date de création",
+                                                            "nom": "Nom"}.get)
+            nb_trouves = compter_scenarios(depot, recherche_scenario) if recherche_scenario else nb_scenarios
+            nb_pages = max(1, -(-nb_trouves // TAILLE_PAGE_DEFAUT))
+            with col3:
+                page_scenarios = st.number_input("Page", min_value=1, max_value=nb_pages, value=1, step=1)
+            st.caption(f"{nb_trouves} scénario(s) - page {page_scenarios} sur {nb_pages}")
+            
+            for scenario in lister_scenarios(depot, page=page_scenarios - 1, recherche=recherche_scenario,
+                                             ordre=ordre_scenarios):
+                with st.expander(f"{scenario['nom']} - {scenario['date_creation']}"):
+                    col1, col2 = st.columns([3, 1])
+                    
+                    with col1:
+                        st.markdown(f"**Description**: {scenario['description'] or 'Aucune description'}")
+                        st.markdown(f"**Localisation**: {scenario['localisation'] or 'Non spécifiée'}")
+                        st.markdown(f"**Substance principale**: {scenario['substance_principale'] or 'Non spécifiée'}")
+                        st.markdown(f"**Corps minéralisés**: {scenario['nb_corps']}")
+                        
+                        if scenario['type_forage'] is not None:
+                            st.markdown("---")
+                            st.markdown("**Plan de forage:**")
+                            st.markdown(f"• Type de forage: {scenario['type_forage']}")
+                            st.markdown(f"• Budget total: {scenario['budget_total']:,.0f} €")
+                            st.markdown(f"• Durée estimée: {scenario['duree_totale']:.0f} jours")
+                    
+                    with col2:
+                        if st.button("Charger", key=f"load_{scenario['id']}"):
+                            st.session_state.current_scenario = charger_scenario(depot, scenario["id"])
+                            st.success(f"Scénario '{scenario['nom']}' chargé!")
+                            st.rerun()
+                        
+                        if st.button("Supprimer", key=f"delete_{scenario['id']}"):
+                            if st.session_state.current_scenario["id"] == scenario["id"]:
+                                st.session_state.current_scenario = {
+                                    "id": str(uuid.uuid4()),
+                                    "nom": "Nouveau scénario",
+                                    "date_creation": datetime.now().strftime("%Y-%m-%d"),
+                                    "corps_mineralises": []
+                                }
+                            
+                            supprimer_scenario(depot, scenario["id"])
+                            st.success(f"Scénario '{scenario['nom']}' supprimé!")
+                            st.rerun()
+            st.markdown('</div>', unsafe_allow_html=True)
+            
+        else:
+            st.info("Aucun scénario créé. Utilisez l'onglet 'Créer un scénario' pour commencer.")
+        
+        # Exportation/importation des scénarios
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.subheader("Exporter/Importer des scénarios")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            if nb_scenarios > 0 and st.button("Exporter tous les scénarios"):
+                json_str = json.dumps(exporter_scenarios(depot), default=str, indent=4)
+                json_bytes = json_str.encode()
+                
+                st.download_button(
+                    label="Télécharger les données (JSON)",
+                    data=json_bytes,
+                    file_name=f"scenarios_mineralest_{datetime.now().strftime('%Y%m%d')}.json",
+                    mime="application/json"
+                )
+        
+        with col2:
+            uploaded_file = st.file_uploader("Importer des scénarios ou des corps minéralisés", type=["json", "csv", "parquet"],
+                                             help="JSON: liste de scénarios ou de corps minéralisés. "
+                                                  "CSV/Parquet: une ligne par corps minéralisé (colonnes du formulaire d'ajout).")
+            destination_corps = st.radio("Corps minéralisés importés", ["Nouveau scénario", "Scénario courant"], horizontal=True,
+                                         help="Scénario recevant les corps d'un fichier CSV, Parquet ou d'une liste JSON de corps")
+            if uploaded_file is not None and st.button("Importer"):
+                scenario_cible = None
+                if destination_corps == "Scénario courant":
+                    scenario_cible = enregistrer_scenario(depot, st.session_state.current_scenario)
+                with st.spinner("Importation en cours..."):
+                    rapport = importer_fichier(depot, uploaded_file, uploaded_file.name, scenario_id=scenario_cible)
+                
+                if rapport["erreur_fichier"]:
+                    st.error(f"Erreur lors de l'importation: {rapport['erreur_fichier']}")
+                if rapport["scenario_id"] is not None and rapport["scenario_id"] == st.session_state.current_scenario["id"]:
+                    st.session_state.current_scenario = charger_scenario(depot, rapport["scenario_id"])
+                st.success(f"{rapport['nb_scenarios']} scénario(s) et {rapport['nb_corps']:,} corps minéralisé(s) importés "
+                           f"({rapport['nb_lus']:,} corps lus).")
+                if rapport["nb_doublons"] > 0:
+                    st.info(f"{rapport['nb_doublons']:,} doublon(s) d'id ignoré(s).")
+                if rapport["nb_rejets"] > 0:
+                    st.warning(f"{rapport['nb_rejets']:,} ligne(s) rejetée(s):")
+                    st.dataframe(pd.DataFrame(rapport["erreurs"]), use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with tabs[2]:
+        afficher_comparaison(depot)
+
+
+def afficher_comparaison(depot):
+    """Évalue plusieurs scénarios du dépôt en parallèle et affiche leur comparaison."""
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.subheader("Comparer des scénarios")
+    st.markdown("Les scénarios sélectionnés sont évalués en parallèle (estimation, plan de forage, budget et durée) "
+                "avec les mêmes paramètres, puis comparés.")
+    
+    recherche = st.text_input("Rechercher par nom", key="recherche_comparaison")
+    scenarios_proposes = lister_scenarios(depot, taille_page=NB_SCENARIOS_COMPARAISON, recherche=recherche)
+    libelles = {scenario["id"]: f"{scenario['nom']} - {scenario['date_creation']} ({scenario['nb_corps']} corps)"
+                for scenario in scenarios_proposes}
+    ids_selectionnes = st.multiselect("Scénarios à comparer", options=list(libelles), format_func=libelles.get,
+                                      key="scenarios_comparaison")
+    
+    with st.expander("Paramètres d'évaluation"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            maille_x = st.number_input("Espacement en X (m)", min_value=10.0, max_value=1000.0, value=PARAMETRES_DEFAUT["maille_x"], step=10.0, key="comparaison_maille_x")
+            maille_y = st.number_input("Espacement en Y (m)", min_value=10.0, max_value=1000.0, value=PARAMETRES_DEFAUT["maille_y"], step=10.0, key="comparaison_maille_y")
+        with col2:
+            maille_mesurees = st.number_input("Maille max. pour ressources mesurées (m)", min_value=10.0, max_value=100.0, value=PARAMETRES_DEFAUT["maille_mesurees"], step=5.0, key="comparaison_maille_mesurees")
+            maille_indiquees = st.number_input("Maille max. pour ressources indiquées (m)", min_value=50.0, max_value=200.0, value=PARAMETRES_DEFAUT["maille_indiquees"], step=10.0, key="comparaison_maille_indiquees")
+        with col3:
+            metres_par_jour = st.number_input("Productivité (mètres par jour)", min_value=20.0, max_value=300.0, value=PARAMETRES_DEFAUT["metres_par_jour"], step=10.0, key="comparaison_metres_par_jour")
+            nb_foreuses = st.number_input("Nombre de foreuses", min_value=1, max_value=20, value=PARAMETRES_DEFAUT["nb_foreuses"], step=1, key="comparaison_nb_foreuses")
+            plan_sauvegarde = st.checkbox("Reprendre le plan de forage sauvegardé", value=True,
+                                          help="Sinon, les mailles, l'orientation, les coûts et l'échéancier par défaut de la page de planification sont utilisés")
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    if len(ids_selectionnes) < 2:
+        st.info("Sélectionnez au moins deux scénarios à comparer.")
+        return
+    
+    parametres = {"maille_x": maille_x, "maille_y": maille_y, "maille_mesurees": maille_mesurees,
+                  "maille_indiquees": maille_indiquees, "metres_par_jour": metres_par_jour, "nb_foreuses": int(nb_foreuses)}
+    scenarios = [charger_scenario(depot, scenario_id) for scenario_id in ids_selectionnes]
+    scenarios = [scenario for scenario in scenarios if scenario is not None]
+    with st.spinner(f"Évaluation de {len(scenarios)} scénarios..."):
+        comparaison = comparaison_scenarios(empreinte(scenarios), scenarios, parametres, plan_sauvegarde)
+    
+    st.dataframe(
+        comparaison.drop(columns=["id"]).rename(columns={
+            "nom": "Scénario", "nb_corps": "Corps", "classification": "Classification", "facteur_confiance": "Facteur",
+            "tonnage": "Tonnage (t)", "metal_onces": "Métal (onces)", "metal_tonnes": "Métal (tonnes)",
+            "nb_forages": "Forages", "metres_initial": "Métrage initial (m)", "metres_detail": "Métrage détaillé (m)",
+            "metres_total": "Métrage total (m)", "budget_total": "Budget (€)", "duree_totale": "Durée (jours)",
+            "cout_par_once": "Coût par once (€)", "cout_par_tonne": "Coût par tonne de métal (€)",
+        }).style.format({"Facteur": '{:.2f}', "Tonnage (t)": '{:,.0f}', "Métal (onces)": '{:,.0f}', "Métal (tonnes)": '{:,.0f}',
+                         "Forages": '{:,.0f}', "Métrage initial (m)": '{:,.0f}', "Métrage détaillé (m)": '{:,.0f}',
+                         "Métrage total (m)": '{:,.0f}', "Budget (€)": '{:,.0f}', "Durée (jours)": '{:,.0f}',
+                         "Coût par once (€)": '{:,.2f}', "Coût par tonne de métal (€)": '{:,.2f}'}, na_rep="-"),
+        hide_index=True
+    )
+    st.markdown(download_data(comparaison, "comparaison_scenarios"), unsafe_allow_html=True)
+    
+    # Graphiques de comparaison, deux par ligne (import différé: Plotly n'est chargé que pour une comparaison)
+    import plotly.express as px
+    
+    graphiques = [("tonnage", "Tonnage ajusté (t)", '#34495E')]
+    graphiques += [(colonne, titre, '#4CAF50') for colonne, titre in
+                   (("metal_onces", "Métal précieux (onces)"), ("metal_tonnes", "Métaux de base (tonnes)"))
+                   if comparaison[colonne].any()]
+    graphiques += [("budget_total", "Budget total (€)", '#E67E22'), ("duree_totale", "Durée totale (jours)", '#8E44AD')]
+    for debut in range(0, len(graphiques), 2):
+        for colonne_graphique, (colonne, titre, couleur) in zip(st.columns(2), graphiques[debut:debut + 2]):
+            with colonne_graphique:
+                fig = px.bar(comparaison, x="nom", y=colonne, title=titre, text_auto='.3s',
+                             labels={"nom": "Scénario", colonne: titre}, color_discrete_sequence=[couleur])
+                fig.update_layout(height=380)
+                st.plotly_chart(fig, use_container_width=True)
+    
+    fig_metres = px.bar(comparaison, x="nom", y=["metres_initial", "metres_detail"], title="Métrage foré par phase (m)",
+                        labels={"nom": "Scénario", "value": "Métrage (m)", "variable": "Phase"},
+                        color_discrete_map={"metres_initial": '#E74C3C', "metres_detail": '#3498DB'})
+    fig_metres.for_each_trace(lambda trace: trace.update(name={"metres_initial": "Initiale", "metres_detail": "Détaillée"}[trace.name]))
+    fig_metres.update_layout(height=400)
+    st.plotly_chart(fig_metres, use_container_width=True)
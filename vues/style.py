@@ -0,0 +1,81 @@
+"""
+Style CSS de l'application, injecté à chaque exécution de la page.
+"""
+
+CSS = """
+<style>
+    .main-header {
+        font-size: 2.5rem;
+        color: #2C3E50;
+        text-align: center;
+        margin-bottom: 1rem;
+        font-weight: 700;
+    }
+    .sub-header {
+        font-size: 1.8rem;
+        color: #34495E;
+        margin-top: 2rem;
+        margin-bottom: 1rem;
+        font-weight: 600;
+    }
+    .card {
+        border-radius: 10px;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+        padding: 20px;
+        margin-bottom: 20px;
+        background-color: white;
+    }
+    .highlight {
+        background-color: #f8f9fa;
+        padding: 15px;
+        border-radius: 5px;
+        border-left: 5px solid #4CAF50;
+    }
+    .styled-table {
+        border-collapse: collapse;
+        width: 100%;
+        border-radius: 8px;
+        overflow: hidden;
+        box-shadow: 0 0 20px rgba(0, 0, 0, 0.1);
+    }
+    .styled-table thead tr {
+        background-color: #34495E;
+        color: #ffffff;
+        text-align: left;
+    }
+    .styled-table th,
+    .styled-table td {
+        padding: 12px 15px;
+    }
+    .styled-table tbody tr {
+        border-bottom: 1px solid #dddddd;
+    }
+    .styled-table tbody tr:nth-of-type(even) {
+        background-color: #f3f3f3;
+    }
+    .styled-table tbody tr:last-of-type {
+        border-bottom: 2px solid #34495E;
+    }
+    .footer {
+        text-align: center;
+        padding: 20px;
+        font-size: 0.8rem;
+        color: #666;
+        border-top: 1px solid #eee;
+        margin-top: 30px;
+    }
+    .stTabs [data-baseweb="tab-list"] {
+        gap: 8px;
+    }
+    .stTabs [data-baseweb="tab"] {
+        background-color: #f0f2f6;
+        border-radius: 4px 4px 0px 0px;
+        padding: 10px 16px;
+        font-weight: 600;
+    }
+    .stTabs [aria-selected="true"] {
+        background-color: #4CAF50 !important;
+        color: white !important;
+    }
+</style>
+"""